@@ -5,11 +5,10 @@ No schemas, no function calling - just pure chat with native history management
 import logging
 import os
 from typing import Optional, Tuple
-from google.cloud import aiplatform
-from google.oauth2 import service_account
 from vertexai.generative_models import GenerativeModel, ChatSession
 from decouple import config
 
+from backend.clients import get_client
 from .gemini_service import resolve_model_name
 
 logger = logging.getLogger(__name__)
@@ -30,53 +29,9 @@ class ChatService:
         if not self.project_id:
             logger.warning("GCP_PROJECT_ID not set, Vertex AI may not work correctly")
         
-        # Get credentials
-        credentials = self._get_credentials()
-        
-        # Initialize Vertex AI
+        # Vertex AI is initialised once per process (backend.clients registry).
         if self.project_id:
-            try:
-                if credentials:
-                    aiplatform.init(
-                        project=self.project_id,
-                        location=self.location,
-                        credentials=credentials
-                    )
-                    logger.info(f"Vertex AI initialized for project: {self.project_id}, location: {self.location} (with service account)")
-                else:
-                    aiplatform.init(project=self.project_id, location=self.location)
-                    logger.info(f"Vertex AI initialized for project: {self.project_id}, location: {self.location} (using default credentials)")
-            except Exception as e:
-                logger.error(f"Failed to initialize Vertex AI: {e}")
-    
-    def _get_credentials(self):
-        """Get service account credentials if available"""
-        creds_path = config('GOOGLE_APPLICATION_CREDENTIALS', default=None)
-        
-        if not creds_path:
-            try:
-                from django.conf import settings
-                base_dir = settings.BASE_DIR
-            except:
-                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            
-            default_path = os.path.join(base_dir, '.credentials', 'vertex-ai-service-account.json')
-            if os.path.exists(default_path):
-                creds_path = default_path
-                logger.info(f"Found Vertex AI credentials at: {creds_path}")
-        
-        if creds_path and os.path.exists(creds_path):
-            try:
-                credentials = service_account.Credentials.from_service_account_file(creds_path)
-                logger.info(f"Successfully loaded Vertex AI credentials from: {creds_path}")
-                return credentials
-            except Exception as e:
-                logger.error(f"Failed to load credentials from {creds_path}: {e}", exc_info=True)
-        else:
-            if creds_path:
-                logger.warning(f"Credentials file not found at: {creds_path}")
-        
-        return None
+            get_client('vertexai')
     
     def start_chat(
         self,
@@ -9,7 +9,7 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from firebase_admin import auth
-import firebase_admin
+from backend.clients import get_client
 from .models import AIConversation
 from .gemini_agent import GeminiAgent
 from .prompts import get_prompt_for_type
@@ -30,14 +30,7 @@ User = get_user_model()
 
 def ensure_firebase_initialized():
     """Ensure Firebase is initialized before use"""
-    if not firebase_admin._apps:
-        try:
-            from backend.settings import initialize_firebase
-            initialize_firebase()
-        except Exception as e:
-            logger.error(f"Failed to initialize Firebase: {e}")
-            return False
-    return True
+    return get_client('firebase') is not None
 
 
 @database_sync_to_async
@@ -213,6 +206,7 @@ class BaseAIConsumer(AsyncWebsocketConsumer):
         self.idle_timeout_task = None
         self.IDLE_TIMEOUT = 30 * 60  # 30 minutes of inactivity
         self.HEARTBEAT_INTERVAL = 30  # Send ping every 30 seconds
+        self.IDLE_CHECK_INTERVAL = 60  # How often the idle loop checks last_activity
     
     async def connect(self):
         """Handle WebSocket connection"""
@@ -419,7 +413,7 @@ class BaseAIConsumer(AsyncWebsocketConsumer):
         """Close connection if idle for too long"""
         try:
             while True:
-                await asyncio.sleep(60)  # Check every minute
+                await asyncio.sleep(self.IDLE_CHECK_INTERVAL)
                 
                 if not self.authenticated:
                     break
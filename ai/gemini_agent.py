@@ -6,12 +6,11 @@ import json
 import os
 import time
 from typing import Dict, List, Optional, Any, AsyncGenerator, Tuple
-from google.cloud import aiplatform
-from google.oauth2 import service_account
 from vertexai.generative_models import GenerativeModel, ChatSession, Tool, FunctionDeclaration, Part
 from google.api_core import exceptions as google_exceptions
 from decouple import config
 
+from backend.clients import get_client
 from .gemini_service import resolve_model_name
 
 # Handle imports for both script and module usage
@@ -59,60 +58,9 @@ class GeminiAgent:
         if not self.project_id:
             logger.warning("GCP_PROJECT_ID not set, Vertex AI may not work correctly")
         
-        # Get credentials
-        credentials = self._get_credentials()
-        
-        # Initialize Vertex AI
+        # Vertex AI is initialised once per process (backend.clients registry).
         if self.project_id:
-            try:
-                if credentials:
-                    aiplatform.init(
-                        project=self.project_id,
-                        location=self.location,
-                        credentials=credentials
-                    )
-                    logger.info(f"Vertex AI initialized for project: {self.project_id}, location: {self.location} (with service account)")
-                else:
-                    aiplatform.init(project=self.project_id, location=self.location)
-                    logger.info(f"Vertex AI initialized for project: {self.project_id}, location: {self.location} (using default credentials)")
-            except Exception as e:
-                logger.error(f"Failed to initialize Vertex AI: {e}")
-    
-    def _get_credentials(self):
-        """Get service account credentials if available"""
-        # Check for explicit credentials file path
-        creds_path = config('GOOGLE_APPLICATION_CREDENTIALS', default=None)
-        
-        # If not set, try default location for our service account
-        if not creds_path:
-            # Get project root: ai/gemini_agent.py -> ai/ (1 level) -> project root (2 levels)
-            # Or use BASE_DIR from Django settings if available
-            try:
-                from django.conf import settings
-                base_dir = settings.BASE_DIR
-            except:
-                # Fallback: calculate from current file location
-                # ai/gemini_agent.py -> go up 2 levels to project root
-                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            
-            default_path = os.path.join(base_dir, '.credentials', 'vertex-ai-service-account.json')
-            if os.path.exists(default_path):
-                creds_path = default_path
-                logger.info(f"Found Vertex AI credentials at: {creds_path}")
-        
-        if creds_path and os.path.exists(creds_path):
-            try:
-                credentials = service_account.Credentials.from_service_account_file(creds_path)
-                logger.info(f"Successfully loaded Vertex AI credentials from: {creds_path}")
-                return credentials
-            except Exception as e:
-                logger.error(f"Failed to load credentials from {creds_path}: {e}", exc_info=True)
-        else:
-            if creds_path:
-                logger.warning(f"Credentials file not found at: {creds_path}")
-        
-        # Return None to use default credentials (for Cloud Run)
-        return None
+            get_client('vertexai')
     
     def _get_model(
         self, 
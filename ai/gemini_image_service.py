@@ -40,12 +40,12 @@ Direct Testing:
 import logging
 import os
 from typing import Dict, List, Optional, Any, Union
-from google.cloud import aiplatform
-from google.oauth2 import service_account
 from vertexai.preview.vision_models import ImageGenerationModel
 from google.api_core import exceptions as google_exceptions
 from decouple import config
 
+from backend.clients import get_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,62 +95,9 @@ class GeminiImageService:
         if not self.project_id:
             logger.warning("GCP_PROJECT_ID not set, Vertex AI may not work correctly")
         
-        # Get credentials
-        credentials = self._get_credentials()
-        
-        # Initialize Vertex AI
+        # Vertex AI is initialised once per process (backend.clients registry).
         if self.project_id:
-            try:
-                if credentials:
-                    aiplatform.init(
-                        project=self.project_id,
-                        location=self.location,
-                        credentials=credentials
-                    )
-                    logger.info(f"Vertex AI initialized for project: {self.project_id}, location: {self.location} (with service account)")
-                else:
-                    aiplatform.init(project=self.project_id, location=self.location)
-                    logger.info(f"Vertex AI initialized for project: {self.project_id}, location: {self.location} (using default credentials)")
-            except Exception as e:
-                logger.error(f"Failed to initialize Vertex AI: {e}", exc_info=True)
-                raise
-    
-    def _get_credentials(self) -> Optional[service_account.Credentials]:
-        """
-        Get service account credentials if available.
-        
-        Checks:
-        1. GOOGLE_APPLICATION_CREDENTIALS environment variable
-        2. Default location: .credentials/vertex-ai-service-account.json
-        
-        Returns:
-            Service account credentials or None if not found
-        """
-        creds_path = config('GOOGLE_APPLICATION_CREDENTIALS', default=None)
-        
-        # If not set, try default location
-        if not creds_path:
-            try:
-                from django.conf import settings
-                base_dir = settings.BASE_DIR
-            except:
-                # Fallback: calculate from current file location
-                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            
-            default_path = os.path.join(base_dir, '.credentials', 'vertex-ai-service-account.json')
-            if os.path.exists(default_path):
-                creds_path = default_path
-                logger.info(f"Found Vertex AI credentials at: {creds_path}")
-        
-        if creds_path and os.path.exists(creds_path):
-            try:
-                credentials = service_account.Credentials.from_service_account_file(creds_path)
-                logger.info(f"Successfully loaded Vertex AI credentials from: {creds_path}")
-                return credentials
-            except Exception as e:
-                logger.error(f"Failed to load credentials from {creds_path}: {e}", exc_info=True)
-        
-        return None
+            get_client('vertexai', required=True)
     
     def generate_image(
         self,
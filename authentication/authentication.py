@@ -2,7 +2,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from firebase_admin import auth
-import firebase_admin
+from backend.clients import get_client
 import logging
 import hashlib
 from django.db import IntegrityError
@@ -14,14 +14,7 @@ User = get_user_model()
 # Initialize Firebase if not already initialized
 def ensure_firebase_initialized():
     """Ensure Firebase is initialized before use"""
-    if not firebase_admin._apps:
-        try:
-            from backend.settings import initialize_firebase
-            initialize_firebase()
-        except Exception as e:
-            logger.error(f"Failed to initialize Firebase: {e}")
-            return False
-    return True
+    return get_client('firebase') is not None
 
 
 def ensure_public_handle(user_obj, decoded_token, max_attempts=10, max_length=20):
@@ -1,8 +1,8 @@
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 from firebase_admin import auth
-import firebase_admin
 from django.conf import settings
+from backend.clients import get_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,12 +26,10 @@ class FirebaseAuthenticationMiddleware(MiddlewareMixin):
         This can be used for additional Firebase-specific processing,
         logging, or route protection.
         """
-        # Firebase is already initialized in settings.py
-        
         # Add Firebase user info to request if available
         auth_header = request.META.get('HTTP_AUTHORIZATION')
         
-        if auth_header and auth_header.startswith('Bearer '):
+        if auth_header and auth_header.startswith('Bearer ') and get_client('firebase') is not None:
             token = auth_header.split(' ')[1]
             try:
                 # Decode token and add Firebase user info to request
@@ -5,7 +5,7 @@ from rest_framework.views import APIView
 from rest_framework.generics import RetrieveUpdateAPIView
 from django.contrib.auth import get_user_model
 from firebase_admin import auth
-from .authentication import FirebaseAuthentication, ensure_public_handle
+from .authentication import FirebaseAuthentication, ensure_firebase_initialized, ensure_public_handle
 from .serializers import (
     AuthTokenSerializer, UserProfileSerializer, RoleUpdateSerializer,
     TeacherProfileSerializer, StudentProfileSerializer, ParentProfileSerializer
@@ -38,6 +38,7 @@ def verify_firebase_token_with_retry(token, max_retries=2, retry_delay=1):
     decoded_token = None
     last_error = None
     
+    ensure_firebase_initialized()
     for attempt in range(max_retries + 1):
         try:
             # Try to verify token - Firebase Admin SDK handles clock skew internally
@@ -86,6 +87,7 @@ def verify_token(request):
     
     try:
         # Verify the Firebase ID token
+        ensure_firebase_initialized()
         decoded_token = auth.verify_id_token(token)
         
         return Response({
@@ -304,6 +306,7 @@ def student_signup(request):
     
     try:
         # Verify the Firebase ID token
+        ensure_firebase_initialized()
         decoded_token = auth.verify_id_token(token)
         firebase_uid = decoded_token.get('uid')
         email = decoded_token.get('email')
@@ -557,6 +560,7 @@ def teacher_signup(request):
 
         # Verify Firebase token
         try:
+            ensure_firebase_initialized()
             decoded_token = auth.verify_id_token(token)
             firebase_uid = decoded_token['uid']
             email = decoded_token.get('email', '')
@@ -712,6 +716,7 @@ def teacher_login(request):
     
     try:
         # Verify the Firebase ID token
+        ensure_firebase_initialized()
         decoded_token = auth.verify_id_token(token)
         firebase_uid = decoded_token.get('uid')
         email = decoded_token.get('email')
@@ -794,6 +799,7 @@ def parent_signup(request):
 
         # Verify Firebase token
         try:
+            ensure_firebase_initialized()
             decoded_token = auth.verify_id_token(token)
             firebase_uid = decoded_token['uid']
             email = decoded_token.get('email', '')
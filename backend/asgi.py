@@ -21,6 +21,10 @@ logger = logging.getLogger(__name__)
 # is populated before importing code that may import ORM models.
 django_asgi_app = get_asgi_application()
 
+from backend.clients import install_warm_up
+
+install_warm_up()
+
 # Import routing after Django setup
 from ai.routing import websocket_urlpatterns as ai_websocket_urlpatterns
 from courses.routing import websocket_urlpatterns as courses_websocket_urlpatterns
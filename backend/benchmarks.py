@@ -0,0 +1,395 @@
+"""
+Query-budget benchmarks for the endpoints the frontend calls on every page load.
+
+seed_dataset() builds a synthetic school at a named scale (teachers, courses,
+lessons with a quiz, classes with weekly sessions and upcoming events,
+enrollments, quiz attempts and SMS logs), using the same course/lesson/quiz
+shapes as the create_sample_courses and enroll_students commands.
+run_benchmarks() then measures query count, wall time and response size per
+endpoint (see ENDPOINTS) as the seeded teacher, student or staff user.
+
+QUERY_BUDGETS hold the allowed query count per endpoint and scale; a request
+that needs more fails the benchmark. QUERY_GROWTH_BOUNDS cap how many more
+queries an endpoint may need at a larger scale than at a smaller one, so an
+N+1 fails even when every count is inside its budget; endpoints that still
+have one are listed in KNOWN_QUERY_GROWTH. Wall time and response size are
+reported but not budgeted (they depend on the machine). Used by
+`python manage.py benchmark_endpoints` and backend/tests/test_endpoint_budgets.py.
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import time as dt_time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.template import Context, Template
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.query_profiler import profile_queries
+
+User = get_user_model()
+
+
+@dataclass(frozen=True)
+class Scale:
+    teachers: int
+    courses_per_teacher: int
+    lessons_per_course: int
+    classes_per_course: int
+    students_per_class: int
+    sessions_per_class: int = 2
+    quiz_attempts_per_enrollment: int = 2
+    sms_per_class: int = 3
+
+
+SCALES = {
+    'small': Scale(teachers=1, courses_per_teacher=2, lessons_per_course=4, classes_per_course=1, students_per_class=3),
+    'medium': Scale(teachers=2, courses_per_teacher=3, lessons_per_course=8, classes_per_course=2, students_per_class=6),
+    'large': Scale(teachers=4, courses_per_teacher=5, lessons_per_course=12, classes_per_course=3, students_per_class=10),
+}
+
+
+@dataclass
+class BenchmarkData:
+    teacher: object
+    student: object
+    staff: object
+    counts: dict = field(default_factory=dict)
+
+
+def seed_dataset(scale: Scale, prefix: str = 'bench') -> BenchmarkData:
+    """
+    Create the dataset for `scale`. The first teacher and first student are the
+    benchmark users; the student is enrolled in one class of every course.
+    Intended to run inside a transaction that is rolled back afterwards.
+    """
+    from communication.models import SmsRoutingLog
+    from courses.models import Class, ClassEvent, ClassSession, Course, Lesson, Question, Quiz, QuizAttempt
+    from student.models import EnrolledCourse
+    from student.signals import suppress_enrollment_notifications
+    from users.models import StudentProfile
+
+    password = make_password(None)
+    now = timezone.now()
+    today = timezone.localdate()
+    week_start = today - timedelta(days=today.weekday())
+
+    def make_user(kind, n, **extra):
+        return User(
+            username=f'{prefix}-{kind}-{n}@example.com',
+            email=f'{prefix}-{kind}-{n}@example.com',
+            first_name=kind.title(),
+            last_name=str(n),
+            firebase_uid=f'{prefix}-{kind}-{n}-uid',
+            password=password,
+            **extra,
+        )
+
+    teachers = User.objects.bulk_create(
+        [make_user('teacher', n, role='teacher') for n in range(scale.teachers)]
+    )
+    staff = make_user('staff', 0, is_staff=True, is_superuser=True)
+    staff.save()
+
+    students_per_course = scale.classes_per_course * scale.students_per_class
+    student_users = User.objects.bulk_create(
+        [make_user('student', n, role='student') for n in range(students_per_course)]
+    )
+    profiles = StudentProfile.objects.bulk_create(
+        [StudentProfile(user=user) for user in student_users]
+    )
+
+    counts = {'courses': 0, 'lessons': 0, 'classes': 0, 'enrollments': 0, 'quiz_attempts': 0, 'sms_logs': 0}
+    attempts, sms_logs = [], []
+    with suppress_enrollment_notifications():
+        for t, teacher in enumerate(teachers):
+            for c in range(scale.courses_per_teacher):
+                course = Course.objects.create(
+                    title=f'{prefix.title()} Course {t}-{c}',
+                    description='Learn to code with colorful blocks!',
+                    long_description='Create interactive stories, games, and animations.',
+                    teacher=teacher,
+                    category='Programming',
+                    age_range='Ages 6-10',
+                    level='beginner',
+                    price=Decimal('199.00'),
+                    features=['Visual block-based coding', 'Game creation'],
+                    featured=c == 0,
+                    max_students=scale.students_per_class,
+                    status='published',
+                )
+                counts['courses'] += 1
+                lessons = [
+                    Lesson.objects.create(
+                        course=course,
+                        title=f'Lesson {n + 1}',
+                        description='Introduction and basic concepts',
+                        order=n + 1,
+                        duration=45,
+                        type='live_class' if n % 2 == 0 else 'text_lesson',
+                    )
+                    for n in range(scale.lessons_per_course)
+                ]
+                counts['lessons'] += len(lessons)
+                quiz = Quiz.objects.create(title=f'{lessons[0].title} Quiz', passing_score=70, max_attempts=3)
+                quiz.lessons.add(lessons[0])
+                Question.objects.bulk_create([
+                    Question(
+                        quiz=quiz, question_text='Scratch uses visual blocks.', order=1, points=1,
+                        type='true_false', content={'correct_answer': True},
+                    ),
+                    Question(
+                        quiz=quiz, question_text='What does a loop do?', order=2, points=1,
+                        type='short_answer', content={'correct_answer': 'repeats'},
+                    ),
+                ])
+
+                for k in range(scale.classes_per_course):
+                    klass = Class.objects.create(
+                        name=f'Group {k + 1}',
+                        course=course,
+                        teacher=teacher,
+                        max_capacity=scale.students_per_class,
+                        start_date=week_start,
+                    )
+                    counts['classes'] += 1
+                    ClassSession.objects.bulk_create([
+                        ClassSession(
+                            class_instance=klass,
+                            # From today's weekday, so "classes today" does not depend on the run date.
+                            day_of_week=(today.weekday() + k + s * 2) % 7,
+                            start_time=dt_time(16 + s % 3, 0),
+                            end_time=dt_time(17 + s % 3, 0),
+                            session_number=s + 1,
+                        )
+                        for s in range(scale.sessions_per_class)
+                    ])
+                    ClassEvent.objects.bulk_create([
+                        ClassEvent(
+                            class_instance=klass,
+                            title=f'{lesson.title} live',
+                            event_type='lesson',
+                            lesson=lesson,
+                            start_time=now + timedelta(days=d + 1),
+                            end_time=now + timedelta(days=d + 1, hours=1),
+                        )
+                        for d, lesson in enumerate(lessons[:3])
+                    ])
+                    class_profiles = profiles[k * scale.students_per_class:(k + 1) * scale.students_per_class]
+                    klass.students.add(*[p.user for p in class_profiles])
+                    for profile in class_profiles:
+                        enrollment = EnrolledCourse.objects.create(
+                            student_profile=profile,
+                            course=course,
+                            status='active',
+                            enrolled_by=teacher,
+                            total_lessons_count=len(lessons),
+                            payment_status='paid',
+                            amount_paid=Decimal('199.00'),
+                        )
+                        counts['enrollments'] += 1
+                        attempts += [
+                            QuizAttempt(
+                                student=profile.user, quiz=quiz, enrollment=enrollment, attempt_number=a + 1,
+                                started_at=now - timedelta(days=a + 1), completed_at=now - timedelta(days=a + 1),
+                                score=Decimal('80.00'), graded=True, points_earned=2, passed=True,
+                            )
+                            for a in range(scale.quiz_attempts_per_enrollment)
+                        ]
+                    sms_logs += [
+                        SmsRoutingLog(
+                            twilio_number='+15550000000', student_phone=f'+1555{n:07d}', teacher=teacher,
+                            course=course, course_class=klass, direction='outbound', body='Class starts soon',
+                        )
+                        for n in range(scale.sms_per_class)
+                    ]
+    QuizAttempt.objects.bulk_create(attempts)
+    SmsRoutingLog.objects.bulk_create(sms_logs)
+    counts['quiz_attempts'] = len(attempts)
+    counts['sms_logs'] = len(sms_logs)
+    return BenchmarkData(teacher=teachers[0], student=student_users[0], staff=staff, counts=counts)
+
+
+# Measurement ------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    # 'anonymous', 'teacher', 'student' or 'staff'
+    user: str
+    path: str = ''
+
+
+ENDPOINTS = [
+    Endpoint('public_courses_list', 'anonymous', '/api/courses/public/'),
+    Endpoint('student_course_dashboard', 'student', '/api/courses/student/dashboard/'),
+    Endpoint('dashboard_overview', 'student', '/api/student/dashboard-overview/'),
+    # Parents sign in with the student's account.
+    Endpoint('parent_dashboard', 'student', '/api/student/parent/dashboard/'),
+    Endpoint('teacher_dashboard', 'teacher', '/api/courses/teacher/dashboard/'),
+    Endpoint('teacher_students_master', 'teacher', '/api/courses/teacher/students/master/'),
+    Endpoint('admin_dashboard_snapshot', 'staff'),
+]
+
+# Maximum queries per request at each scale: the counts measured when the
+# budget was last set, so any increase fails. Endpoints whose count grows
+# with the scale still have an N+1 (see KNOWN_QUERY_GROWTH); lower their
+# budgets when they are fixed.
+QUERY_BUDGETS = {
+    'public_courses_list': {'small': 10, 'medium': 26, 'large': 50},
+    'student_course_dashboard': {'small': 14, 'medium': 30, 'large': 86},
+    'dashboard_overview': {'small': 7, 'medium': 7, 'large': 7},
+    'parent_dashboard': {'small': 17, 'medium': 29, 'large': 71},
+    'teacher_dashboard': {'small': 24, 'medium': 54, 'large': 168},
+    'teacher_students_master': {'small': 7, 'medium': 7, 'large': 7},
+    'admin_dashboard_snapshot': {'small': 35, 'medium': 35, 'large': 35},
+}
+
+# Extra queries an endpoint may need at a larger scale than at a smaller one.
+# A page-load endpoint should not issue queries per row, so the bound is 0.
+QUERY_GROWTH_BOUNDS = {endpoint.name: 0 for endpoint in ENDPOINTS}
+
+# Endpoints that still exceed their growth bound (an N+1 to fix). Their
+# QUERY_BUDGETS only pin today's counts; remove them from here once fixed.
+KNOWN_QUERY_GROWTH = frozenset({
+    'public_courses_list',
+    'student_course_dashboard',
+    'parent_dashboard',
+    'teacher_dashboard',
+})
+
+
+@dataclass
+class Measurement:
+    endpoint: str
+    scale: str
+    status: int
+    queries: int
+    wall_ms: float
+    db_ms: float
+    response_bytes: int
+    top_repeat: tuple | None = None
+
+    @property
+    def budget(self) -> int | None:
+        return QUERY_BUDGETS.get(self.endpoint, {}).get(self.scale)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.queries > self.budget
+
+
+_SNAPSHOT_TEMPLATE = '{% load admin_dashboard %}{% admin_dashboard_snapshot as snapshot %}{{ snapshot }}'
+
+
+def _request(endpoint: Endpoint, user):
+    if endpoint.name == 'admin_dashboard_snapshot':
+        request = RequestFactory().get('/admin/')
+        request.user = user
+        body = Template(_SNAPSHOT_TEMPLATE).render(Context({'request': request}))
+        return 200, body.encode()
+    client = APIClient()
+    if user is not None:
+        client.force_authenticate(user)
+    response = client.get(endpoint.path)
+    return response.status_code, response.content
+
+
+def measure(endpoint: Endpoint, data: BenchmarkData, scale: str, warm: bool = True) -> Measurement:
+    """One request (after an unmeasured warm-up request when `warm`) as the endpoint's user."""
+    user = {'anonymous': None, 'teacher': data.teacher, 'student': data.student, 'staff': data.staff}[endpoint.user]
+    if warm:
+        _request(endpoint, user)
+    start = time.perf_counter()
+    with profile_queries() as profile:
+        status, body = _request(endpoint, user)
+    wall_ms = (time.perf_counter() - start) * 1000
+    duplicates = profile.duplicates()
+    return Measurement(
+        endpoint=endpoint.name,
+        scale=scale,
+        status=status,
+        queries=profile.count,
+        wall_ms=wall_ms,
+        db_ms=profile.db_ms,
+        response_bytes=len(body),
+        top_repeat=duplicates[0] if duplicates else None,
+    )
+
+
+def run_benchmarks(data: BenchmarkData, scale: str, names=None) -> list[Measurement]:
+    return [measure(endpoint, data, scale) for endpoint in ENDPOINTS if not names or endpoint.name in names]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def measure_scale(scale: str, names=None, on_seeded=None) -> list[Measurement]:
+    """Seed `scale` and run the benchmarks inside a transaction that is rolled back."""
+    measurements = []
+    try:
+        with override_settings(RATE_LIMIT_ENABLED=False), transaction.atomic():
+            data = seed_dataset(SCALES[scale], prefix=f'bench-{scale}')
+            if on_seeded:
+                on_seeded(data)
+            measurements = run_benchmarks(data, scale, names)
+            raise _Rollback
+    except _Rollback:
+        pass
+    return measurements
+
+
+@dataclass(frozen=True)
+class Growth:
+    endpoint: str
+    smaller: str
+    larger: str
+    queries: tuple[int, int]
+    bound: int
+
+    @property
+    def extra(self) -> int:
+        return self.queries[1] - self.queries[0]
+
+    @property
+    def over_bound(self) -> bool:
+        return self.extra > self.bound
+
+    @property
+    def known(self) -> bool:
+        return self.endpoint in KNOWN_QUERY_GROWTH
+
+
+def query_growth(results: dict) -> list[Growth]:
+    """Query growth per endpoint between the smallest and largest measured scale."""
+    scales = [scale for scale in SCALES if results.get(scale)]
+    if len(scales) < 2:
+        return []
+    smaller = {m.endpoint: m.queries for m in results[scales[0]]}
+    larger = {m.endpoint: m.queries for m in results[scales[-1]]}
+    return [
+        Growth(name, scales[0], scales[-1], (smaller[name], larger[name]), QUERY_GROWTH_BOUNDS.get(name, 0))
+        for name in smaller
+        if name in larger
+    ]
+
+
+def measurements_json(results: dict) -> str:
+    """{scale: [Measurement]} as JSON (for CI artifacts and comparing runs)."""
+    return json.dumps(
+        {
+            scale: [dict(vars(m), budget=m.budget) for m in measurements]
+            for scale, measurements in results.items()
+        },
+        indent=2,
+        default=str,
+    )
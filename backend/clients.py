@@ -0,0 +1,307 @@
+"""
+Lazy registry for third-party client singletons (Firebase Admin, GCS, Slack,
+Vertex AI).
+
+Nothing here talks to the network at import time. A client is built the
+first time get_client(name) asks for it, once per process, and the build
+time is recorded so cold-start cost is visible (client_timings(), the
+`manage.py startup_profile` command).
+
+A failed build is remembered with a backoff (CLIENT_RETRY_BACKOFF_SECONDS,
+doubling per consecutive failure up to CLIENT_RETRY_BACKOFF_MAX_SECONDS):
+until it expires get_client() fails fast instead of every request
+re-running a slow, failing initialisation. Tests and credential rotation
+can drop a client with reset_client(name).
+
+With CLIENT_WARMUP_ON_FIRST_REQUEST enabled, install_warm_up() (called
+from the WSGI/ASGI entry points) builds every warm-able client on a
+background thread once the server has received its first request, so the
+instance is already serving traffic while the clients initialise.
+
+Usage:
+
+    from backend.clients import get_client
+
+    client = get_client('gcs')  # None when GCS is not configured
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from django.conf import settings
+
+from backend.work_queue import retry_delay
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ClientSpec:
+    factory: Callable[[], Any]
+    warm: bool = True
+    instance: Any = None
+    built: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    init_seconds: float | None = None
+    error: str = ''
+    failures: int = 0
+    retry_at: float = 0.0
+    last_exception: BaseException | None = None
+
+
+_registry: dict[str, _ClientSpec] = {}
+_warm_up_started = threading.Event()
+
+
+def register(name: str, factory: Callable[[], Any], *, warm: bool = True) -> None:
+    """Register a factory. It returns the client, or None when not configured."""
+    _registry[name] = _ClientSpec(factory=factory, warm=warm)
+
+
+def get_client(name: str, *, required: bool = False):
+    """
+    The process-wide client for `name`, built on first use.
+
+    Returns None when the client is not configured or failed to build;
+    required=True re-raises the build error instead.
+    """
+    spec = _registry[name]
+    if spec.built:
+        return spec.instance
+    with spec.lock:
+        if spec.built:
+            return spec.instance
+        if spec.last_exception is not None and time.monotonic() < spec.retry_at:
+            if required:
+                raise spec.last_exception
+            return None
+        started = time.perf_counter()
+        try:
+            instance = spec.factory()
+        except Exception as e:
+            spec.init_seconds = time.perf_counter() - started
+            spec.error = f'{type(e).__name__}: {e}'
+            spec.failures += 1
+            spec.last_exception = e
+            backoff = retry_delay(
+                spec.failures,
+                base_seconds=int(getattr(settings, 'CLIENT_RETRY_BACKOFF_SECONDS', 15)),
+                max_seconds=int(getattr(settings, 'CLIENT_RETRY_BACKOFF_MAX_SECONDS', 300)),
+            ).total_seconds()
+            spec.retry_at = time.monotonic() + backoff
+            logger.error(
+                "Client %s failed to initialise in %.3fs (retrying in %ds): %s",
+                name, spec.init_seconds, backoff, e,
+            )
+            if required:
+                raise
+            return None
+        spec.init_seconds = time.perf_counter() - started
+        spec.instance = instance
+        spec.built = True
+        spec.error = ''
+        spec.failures = 0
+        spec.last_exception = None
+        logger.info(
+            "Client %s initialised in %.3fs%s",
+            name,
+            spec.init_seconds,
+            '' if instance is not None else ' (not configured)',
+        )
+        return instance
+
+
+def reset_client(name: str | None = None) -> None:
+    """Forget one client (or all) so the next get_client() rebuilds it."""
+    for key in ([name] if name else list(_registry)):
+        spec = _registry[key]
+        with spec.lock:
+            spec.instance = None
+            spec.built = False
+            spec.init_seconds = None
+            spec.error = ''
+            spec.failures = 0
+            spec.retry_at = 0.0
+            spec.last_exception = None
+
+
+def client_timings() -> list[dict]:
+    """Init cost per registered client, for logs and the startup profile."""
+    return [
+        {
+            'name': name,
+            'built': spec.built,
+            'configured': spec.instance is not None,
+            'init_seconds': spec.init_seconds,
+            'error': spec.error,
+        }
+        for name, spec in _registry.items()
+    ]
+
+
+def warm_up_clients(names=None) -> list[dict]:
+    """Build the given (default: every warm-able) client now. Returns client_timings()."""
+    for name, spec in _registry.items():
+        if (names is None and spec.warm) or (names is not None and name in names):
+            get_client(name)
+    return client_timings()
+
+
+def install_warm_up() -> None:
+    """Warm clients on a background thread after the first request arrives (if enabled)."""
+    if not getattr(settings, 'CLIENT_WARMUP_ON_FIRST_REQUEST', False):
+        return
+    from django.core.signals import request_started
+
+    def _on_first_request(**kwargs):
+        if _warm_up_started.is_set():
+            return
+        _warm_up_started.set()
+        request_started.disconnect(dispatch_uid='client_warm_up')
+
+        def _run():
+            time.sleep(max(0.0, float(getattr(settings, 'CLIENT_WARMUP_DELAY_SECONDS', 2))))
+            try:
+                warm_up_clients()
+            except Exception as e:
+                logger.warning("Client warm-up failed: %s", e, exc_info=True)
+
+        threading.Thread(target=_run, daemon=True, name='client-warm-up').start()
+
+    request_started.connect(_on_first_request, weak=False, dispatch_uid='client_warm_up')
+
+
+# Built-in clients ------------------------------------------------------------
+
+def _firebase_credentials():
+    """Service account from Secret Manager (production) or FIREBASE_* settings, else None."""
+    from decouple import config
+    from firebase_admin import credentials
+
+    if config('USE_SECRET_MANAGER', default=False, cast=bool):
+        try:
+            from backend.secret_manager import get_secret_manager_client
+
+            # Secret Manager lives in the GCP project, not the Firebase project.
+            secret_client = get_secret_manager_client('esaasolution')
+            firebase_credentials = secret_client.get_firebase_credentials() if secret_client else None
+            if firebase_credentials:
+                return credentials.Certificate(firebase_credentials), 'Secret Manager'
+            logger.warning("Failed to retrieve Firebase credentials from Secret Manager")
+        except Exception as e:
+            logger.error("Secret Manager error, falling back to environment variables: %s", e)
+
+    if all([
+        settings.FIREBASE_PRIVATE_KEY_ID,
+        settings.FIREBASE_PRIVATE_KEY,
+        settings.FIREBASE_CLIENT_EMAIL,
+        settings.FIREBASE_CLIENT_ID,
+    ]):
+        return credentials.Certificate({
+            "type": "service_account",
+            "project_id": settings.FIREBASE_PROJECT_ID,
+            "private_key_id": settings.FIREBASE_PRIVATE_KEY_ID,
+            "private_key": settings.FIREBASE_PRIVATE_KEY.replace('\\n', '\n'),  # Handle escaped newlines
+            "client_email": settings.FIREBASE_CLIENT_EMAIL,
+            "client_id": settings.FIREBASE_CLIENT_ID,
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+            "client_x509_cert_url": settings.FIREBASE_CLIENT_X509_CERT_URL,
+            "universe_domain": "googleapis.com",
+        }), 'environment variables'
+    return None, 'default credentials'
+
+
+def _init_firebase():
+    """The default Firebase Admin app (firebase_admin.auth uses it), or None when not configured."""
+    project_id = getattr(settings, 'FIREBASE_PROJECT_ID', '')
+    if not project_id:
+        logger.warning("Firebase project ID not configured")
+        return None
+    import firebase_admin
+
+    if firebase_admin._apps:
+        return firebase_admin.get_app()
+    cred, source = _firebase_credentials()
+    app = firebase_admin.initialize_app(cred, {'projectId': project_id})
+    logger.info("Firebase initialized with %s for project: %s", source, project_id)
+    return app
+
+
+def _build_gcs_client():
+    try:
+        from google.cloud import storage
+    except ImportError:
+        return None
+    if not getattr(settings, 'GS_BUCKET_NAME', None):
+        return None
+    project = getattr(settings, 'GS_PROJECT_ID', None)
+    creds = getattr(settings, 'GS_CREDENTIALS', None)
+    if creds:
+        if isinstance(creds, str):
+            return storage.Client.from_service_account_json(creds, project=project)
+        return storage.Client(credentials=creds, project=project)
+    return storage.Client(project=project)
+
+
+def _build_slack_client():
+    token = getattr(settings, 'SLACK_BOT_TOKEN', '') or ''
+    if not token:
+        return None
+    from slack_sdk import WebClient
+
+    # No auth.test round trip: a bad token surfaces on the first post instead.
+    return WebClient(token=token, timeout=10)
+
+
+def vertex_ai_credentials():
+    """Service account credentials for Vertex AI, or None for default credentials."""
+    from decouple import config
+    from google.oauth2 import service_account
+
+    creds_path = config('GOOGLE_APPLICATION_CREDENTIALS', default=None)
+    if not creds_path:
+        default_path = os.path.join(settings.BASE_DIR, '.credentials', 'vertex-ai-service-account.json')
+        if os.path.exists(default_path):
+            creds_path = default_path
+    if creds_path and os.path.exists(creds_path):
+        return service_account.Credentials.from_service_account_file(creds_path)
+    if creds_path:
+        logger.warning("Vertex AI credentials file not found at: %s", creds_path)
+    return None
+
+
+def _init_vertex_ai():
+    """aiplatform.init() once per process. Returns the (project, location) it used."""
+    from decouple import config
+
+    project_id = config('GCP_PROJECT_ID', default=None)
+    location = config('VERTEX_AI_LOCATION', default='us-central1')
+    if not project_id:
+        return None
+    from google.cloud import aiplatform
+
+    credentials = vertex_ai_credentials()
+    if credentials:
+        aiplatform.init(project=project_id, location=location, credentials=credentials)
+    else:
+        aiplatform.init(project=project_id, location=location)
+    logger.info(
+        "Vertex AI initialized for project: %s, location: %s (%s)",
+        project_id,
+        location,
+        'with service account' if credentials else 'using default credentials',
+    )
+    return project_id, location
+
+
+register('firebase', _init_firebase)
+register('gcs', _build_gcs_client)
+register('slack', _build_slack_client)
+register('vertexai', _init_vertex_ai)
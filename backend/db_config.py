@@ -0,0 +1,133 @@
+"""
+Connection settings for DATABASES: connection reuse with health checks,
+pgbouncer-compatible options, connect timeouts and per-workload statement
+timeouts, plus the optional read replica used by backend.db_router.
+
+settings.py builds the primary entry (DATABASE_URL or DB_* variables) and
+passes it through build_databases(). Statement timeouts are set per workload:
+web requests get DB_STATEMENT_TIMEOUT_MS, manage.py commands (migrate, cron
+jobs) get DB_COMMAND_STATEMENT_TIMEOUT_MS, and replica connections get
+DB_REPLICA_STATEMENT_TIMEOUT_MS. A block of code that needs a different limit
+can wrap itself in statement_timeout().
+
+Connection reuse defaults to off when served by an ASGI server (Daphne in
+production): sync views run in sync_to_async worker threads, each holding its
+own persistent connection that is only closed when a later request ends on
+the same thread, so reused connections pile up towards max_connections.
+Behind pgbouncer those are cheap pooler connections and reuse stays on.
+"""
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+REPLICA_ALIAS = 'replica'
+
+# manage.py subcommands that serve web traffic rather than run a batch job.
+_SERVER_COMMANDS = {'runserver', 'runserver_plus'}
+_ASGI_SERVERS = {'daphne', 'uvicorn', 'hypercorn'}
+
+
+def current_workload(argv=None) -> str:
+    """'command' when running a manage.py subcommand (migrate, cron jobs), else 'web'."""
+    argv = sys.argv if argv is None else argv
+    if len(argv) > 1 and argv[0].endswith('manage.py') and argv[1] not in _SERVER_COMMANDS:
+        return 'command'
+    return 'web'
+
+
+def served_via_asgi(argv=None) -> bool:
+    """True when the process is an ASGI server (`daphne ...` or `python -m daphne ...`)."""
+    argv = sys.argv if argv is None else argv
+    return bool(argv) and bool(_ASGI_SERVERS & set(Path(argv[0]).parts))
+
+
+def default_conn_max_age(*, pgbouncer: bool, argv=None) -> int:
+    """DB_CONN_MAX_AGE default: 60s, except under ASGI without pgbouncer (0)."""
+    if served_via_asgi(argv) and not pgbouncer:
+        return 0
+    return 60
+
+
+def tune_database(
+    db: dict,
+    *,
+    conn_max_age: int,
+    health_checks: bool,
+    connect_timeout: int,
+    statement_timeout_ms: int,
+    pgbouncer: bool = False,
+) -> dict:
+    """
+    Copy of `db` with connection reuse and, for PostgreSQL, connect and
+    statement timeouts. With `pgbouncer` (transaction pooling) server-side
+    cursors are disabled and the statement timeout is left to the role
+    (ALTER ROLE ... SET statement_timeout), since pgbouncer rejects the
+    `options` startup parameter.
+    """
+    db = dict(db)
+    db['CONN_MAX_AGE'] = conn_max_age
+    db['CONN_HEALTH_CHECKS'] = health_checks and conn_max_age != 0
+    if 'postgresql' not in db.get('ENGINE', ''):
+        return db
+
+    options = dict(db.get('OPTIONS') or {})
+    if connect_timeout:
+        options.setdefault('connect_timeout', connect_timeout)
+    if pgbouncer:
+        db['DISABLE_SERVER_SIDE_CURSORS'] = True
+    elif statement_timeout_ms:
+        startup = options.get('options', '')
+        if 'statement_timeout' not in startup:
+            options['options'] = f'{startup} -c statement_timeout={statement_timeout_ms}'.strip()
+    db['OPTIONS'] = options
+    return db
+
+
+def build_databases(
+    default: dict,
+    *,
+    replica: dict | None = None,
+    conn_max_age: int = 60,
+    health_checks: bool = True,
+    connect_timeout: int = 5,
+    pgbouncer: bool = False,
+    web_statement_timeout_ms: int = 30000,
+    command_statement_timeout_ms: int = 0,
+    replica_statement_timeout_ms: int = 30000,
+    workload: str | None = None,
+) -> dict:
+    """DATABASES with the tuned primary and, when given, the replica under REPLICA_ALIAS."""
+    workload = workload or current_workload()
+    primary_timeout = command_statement_timeout_ms if workload == 'command' else web_statement_timeout_ms
+    common = dict(
+        conn_max_age=conn_max_age,
+        health_checks=health_checks,
+        connect_timeout=connect_timeout,
+        pgbouncer=pgbouncer,
+    )
+    databases = {'default': tune_database(default, statement_timeout_ms=primary_timeout, **common)}
+    if replica:
+        replica = tune_database(replica, statement_timeout_ms=replica_statement_timeout_ms, **common)
+        # Tests read and write through the primary; the replica alias points at the same test DB.
+        replica['TEST'] = {'MIRROR': 'default'}
+        databases[REPLICA_ALIAS] = replica
+    return databases
+
+
+@contextmanager
+def statement_timeout(ms: int, using: str = 'default'):
+    """
+    Run the block in a transaction with `SET LOCAL statement_timeout` (0 lifts
+    the limit). Transaction-scoped, so safe behind pgbouncer. No-op on
+    databases other than PostgreSQL.
+    """
+    from django.db import connections, transaction
+
+    with transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [int(ms)])
+        yield
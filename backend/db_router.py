@@ -0,0 +1,76 @@
+"""
+Read-replica routing. Reads go to the replica (backend.db_config.REPLICA_ALIAS)
+only inside replica_reads(), which ReplicaRoutingMiddleware opens for GET
+requests to the dashboard and catalog routes; everything else, including all
+writes, uses the primary.
+
+Read-your-writes: the first write inside a replica_reads() block pins the
+rest of the block to the primary, and so does an open transaction on the
+primary. Across requests, the middleware pins a client to the primary for
+DATABASE_REPLICA_STICKY_SECONDS after it writes.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from backend.db_config import REPLICA_ALIAS
+
+
+@dataclass
+class _ReadState:
+    replica: bool = False
+    wrote: bool = False
+
+
+_read_state: ContextVar[_ReadState | None] = ContextVar('db_read_state', default=None)
+
+
+def replica_alias() -> str | None:
+    """The replica alias when one is configured."""
+    return REPLICA_ALIAS if REPLICA_ALIAS in settings.DATABASES else None
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """
+    Allow reads in the block to use the replica (when `enabled` and one is
+    configured). Yields the block's state; `state.wrote` is True once anything
+    in the block wrote to the database.
+    """
+    state = _ReadState(replica=enabled and replica_alias() is not None)
+    token = _read_state.set(state)
+    try:
+        yield state
+    finally:
+        _read_state.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _read_state.get()
+        if state is None or not state.replica or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _read_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -0,0 +1,71 @@
+"""
+Send read-only dashboard and catalog requests to the read replica
+(backend.db_router), when DATABASE_REPLICA_URL is configured.
+
+GET/HEAD requests under DATABASE_REPLICA_PATH_PREFIXES read from the replica
+unless the client wrote within the last DATABASE_REPLICA_STICKY_SECONDS; a
+request that writes (any method) starts that window, so a student who just
+enrolled or a teacher who just saved a lesson sees their change on the next
+dashboard load despite replication lag. Clients are identified like the
+per-user rate limits (Firebase uid, else IP), and the window is kept in the
+shared cache. If the cache is unreachable, reads stay on the primary.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+from backend.db_router import replica_alias, replica_reads
+from backend.rate_limit_middleware import request_identity
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ("GET", "HEAD")
+
+
+def _pin_key(identity: str) -> str:
+    return f"db-primary-pin:{identity}"
+
+
+def replica_path(path: str) -> bool:
+    return any(path.startswith(prefix) for prefix in getattr(settings, "DATABASE_REPLICA_PATH_PREFIXES", ()))
+
+
+def recently_wrote(identity: str) -> bool:
+    try:
+        return cache.get(_pin_key(identity)) is not None
+    except Exception as e:
+        logger.debug("Replica stickiness check failed, reading from primary: %s", e)
+        return True
+
+
+def mark_wrote(identity: str) -> None:
+    seconds = int(getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5))
+    if seconds <= 0:
+        return
+    try:
+        cache.set(_pin_key(identity), 1, timeout=seconds)
+    except Exception as e:
+        logger.warning("Could not pin %s to the primary after a write: %s", identity, e)
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        identity = request_identity(request, "user")
+        use_replica = (
+            request.method in READ_METHODS
+            and replica_path(request.path)
+            and not recently_wrote(identity)
+        )
+        with replica_reads(use_replica) as state:
+            response = self.get_response(request)
+        if state.wrote or (request.method not in READ_METHODS and response.status_code < 400):
+            mark_wrote(identity)
+        return response
@@ -0,0 +1,82 @@
+"""
+Opt-in request profiling (QUERY_PROFILING_ENABLED): query count, DB vs total
+time, repeated statements (N+1) and the slowest statement per request.
+
+Profiled requests feed backend.query_profiler.endpoint_stats, which the staff
+page at /staff/profiling/ renders as rolling per-endpoint percentiles. The
+Server-Timing header (visible in the browser's network panel) exposes query
+counts and timings, so it is only sent to staff users and to requests whose
+X-Profiling-Token header matches QUERY_PROFILING_HEADER_TOKEN. Requests
+that repeat one statement QUERY_PROFILING_N_PLUS_ONE_THRESHOLD times or more are
+logged as possible N+1s.
+"""
+
+import hmac
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from backend.query_profiler import endpoint_stats, profile_queries
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_name(request) -> str:
+    """METHOD + URL pattern (e.g. "GET /api/courses/<uuid:course_id>/"), so ids do not split stats."""
+    match = getattr(request, "resolver_match", None)
+    route = f"/{match.route}" if match is not None and match.route else "(unresolved)"
+    return f"{request.method} {route}"
+
+
+def timing_visible(request) -> bool:
+    """
+    Whether the response may carry Server-Timing: staff (checked after the
+    view, so DRF-authenticated users count) or a matching debug token.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and getattr(user, "is_staff", False):
+        return True
+    token = getattr(settings, "QUERY_PROFILING_HEADER_TOKEN", "")
+    sent = request.headers.get("X-Profiling-Token", "")
+    return bool(token) and hmac.compare_digest(sent.encode(), token.encode())
+
+
+class QueryProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "QUERY_PROFILING_SAMPLE_RATE", 1.0)
+        self.n_plus_one_threshold = getattr(settings, "QUERY_PROFILING_N_PLUS_ONE_THRESHOLD", 5)
+        endpoint_stats.window = getattr(settings, "QUERY_PROFILING_WINDOW", endpoint_stats.window)
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+        start = time.perf_counter()
+        with profile_queries() as profile:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = profile.db_ms
+        duplicates = profile.duplicates()
+
+        if timing_visible(request):
+            response["Server-Timing"] = ", ".join([
+                f'db;dur={db_ms:.1f};desc="{profile.count} queries"',
+                f"app;dur={max(total_ms - db_ms, 0):.1f}",
+                f"total;dur={total_ms:.1f}",
+            ])
+
+        endpoint = endpoint_name(request)
+        endpoint_stats.record(endpoint, profile, total_ms)
+        if duplicates and duplicates[0][1] >= self.n_plus_one_threshold:
+            fp, repeats = duplicates[0]
+            logger.warning(
+                "Possible N+1 on %s: %s queries, %sx %s",
+                endpoint, profile.count, repeats, fp,
+                extra={"query_count": profile.count, "db_ms": round(db_ms, 1)},
+            )
+        return response
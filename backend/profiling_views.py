@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.utils.decorators import method_decorator
+from django.views.generic import TemplateView
+
+from backend.query_profiler import endpoint_stats
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class StaffQueryProfilePageView(TemplateView):
+    template_name = 'staff/profiling/endpoints_page.html'
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['profiling_enabled'] = getattr(settings, 'QUERY_PROFILING_ENABLED', False)
+        ctx['endpoints'] = endpoint_stats.snapshot()
+        ctx['window'] = endpoint_stats.window
+        ctx['n_plus_one_threshold'] = getattr(settings, 'QUERY_PROFILING_N_PLUS_ONE_THRESHOLD', 5)
+        return ctx
@@ -0,0 +1,159 @@
+"""
+Cache for public (anonymous, user-independent) JSON endpoints.
+
+Pre-rendered response bodies are stored in the default cache (Redis in
+production) per endpoint namespace and parameter set, together with an ETag.
+Responses carry ETag / Cache-Control headers and conditional GETs with a
+matching If-None-Match get a 304 without rendering anything.
+
+Invalidation is per namespace: bump_namespace() swaps the namespace's
+generation token, so every cached parameter set for it is skipped at once
+(no key scans). Model signals in home, marketing and blog call it.
+
+Usage in a view:
+
+    return cached_public_response(request, LANDING_NAMESPACE, {}, build_payload)
+"""
+import hashlib
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+LANDING_NAMESPACE = 'landing'
+TESTIMONIALS_NAMESPACE = 'testimonials'
+PROGRAM_NAMESPACE = 'marketing-program'
+BLOG_LIST_NAMESPACE = 'blog-list'
+BLOG_DETAIL_NAMESPACE = 'blog-detail'
+
+_KEY_PREFIX = 'public-cache'
+
+
+def _ttl():
+    return int(getattr(settings, 'PUBLIC_CACHE_TTL_SECONDS', 3600))
+
+
+def _max_age():
+    return int(getattr(settings, 'PUBLIC_CACHE_MAX_AGE_SECONDS', 60))
+
+
+def _enabled():
+    return bool(getattr(settings, 'PUBLIC_CACHE_ENABLED', True))
+
+
+def version_tokens(*keys):
+    """
+    Current token for each version key, creating missing ones. Other caches
+    (lesson payloads, class calendar, quiz answer keys) put these tokens in
+    their entry keys and invalidate with bump_versions().
+    """
+    found = cache.get_many(keys)
+    if len(found) < len(keys):
+        for key in keys:
+            if key not in found:
+                cache.add(key, uuid.uuid4().hex, None)
+        found = cache.get_many(keys)
+    return [found.get(key, '') for key in keys]
+
+
+def _bump_now(keys, label):
+    try:
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+    except Exception as e:
+        logger.warning("%s cache invalidation failed: %s", label, e)
+
+
+def bump_versions(keys, label):
+    """
+    Swap the tokens of `keys`, skipping every entry built on them.
+
+    Bumps immediately and again after commit, so a request that rendered
+    from pre-commit data in between cannot keep a stale entry alive.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    _bump_now(keys, label)
+    transaction.on_commit(lambda: _bump_now(keys, label))
+
+
+def _generation_key(namespace):
+    return f'{_KEY_PREFIX}:{namespace}:gen'
+
+
+def bump_namespace(*namespaces):
+    """Invalidate every cached response in the given namespaces."""
+    bump_versions([_generation_key(namespace) for namespace in namespaces], 'Public')
+
+
+def _entry_key(namespace, params):
+    raw = json.dumps(params or {}, sort_keys=True, default=str)
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    (generation,) = version_tokens(_generation_key(namespace))
+    return f'{_KEY_PREFIX}:{namespace}:{generation}:{digest}'
+
+
+def _render(data):
+    body = JSONRenderer().render(data)
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+    return {'body': body, 'etag': etag}
+
+
+def _finalize(request, entry):
+    cache_control = f'public, max-age={_max_age()}'
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and (entry['etag'] in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['body'], content_type='application/json')
+    response['ETag'] = entry['etag']
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def cached_public_response(request, namespace, params, build):
+    """
+    Serve build() -> (data, status) from the public cache.
+
+    Only 200 payloads are stored; anything else is rendered fresh and
+    returned as a regular DRF-style JSON response without cache headers.
+    """
+    key = None
+    if _enabled():
+        try:
+            key = _entry_key(namespace, params)
+            entry = cache.get(key)
+            if entry is not None:
+                return _finalize(request, entry)
+        except Exception as e:
+            # Cache down: fall through to a live render.
+            logger.warning("Public cache read failed for %s: %s", namespace, e)
+            key = None
+
+    data, status_code = build()
+    if status_code != 200:
+        return HttpResponse(JSONRenderer().render(data), status=status_code, content_type='application/json')
+
+    entry = _render(data)
+    if key is not None:
+        try:
+            cache.set(key, entry, _ttl())
+        except Exception as e:
+            logger.warning("Public cache write failed for %s: %s", namespace, e)
+    return _finalize(request, entry)
+
+
+def request_params(request, **extra):
+    """Cache params for a request: sorted query string plus host (absolute URLs in payloads)."""
+    params = {key: request.GET.getlist(key) for key in sorted(request.GET.keys())}
+    params['_host'] = request.get_host()
+    params.update(extra)
+    return params
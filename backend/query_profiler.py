@@ -0,0 +1,168 @@
+"""
+Per-request SQL profiling: query counts, DB time and N+1 detection.
+
+profile_queries() installs a connection execute_wrapper (works with DEBUG off)
+and records every statement with its duration. Statements are reduced to a
+fingerprint (literals and IN-lists collapsed), so the same query issued once per
+row of a loop shows up as one fingerprint with a high count.
+
+Used by backend.profiling_middleware.QueryProfilingMiddleware (opt-in via
+QUERY_PROFILING_ENABLED), which feeds endpoint_stats for the staff page, and by
+tests as a query budget:
+
+    with query_budget(max_queries=12, max_duplicates=2):
+        self.client.get(url)
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from django.db import connections
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?|\d+)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """SQL with literals, numbers and IN-lists collapsed, for grouping repeats."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class QueryProfile:
+    # (fingerprint, duration ms, sql) per executed statement, in order.
+    statements: list = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_ms(self) -> float:
+        return sum(ms for _fp, ms, _sql in self.statements)
+
+    def duplicates(self, min_count: int = 2) -> list[tuple[str, int]]:
+        """Fingerprints executed at least min_count times, most repeated first."""
+        counts = Counter(fp for fp, _ms, _sql in self.statements)
+        return [(fp, n) for fp, n in counts.most_common() if n >= min_count]
+
+    def slowest(self, limit: int = 3) -> list[tuple[str, float]]:
+        return [(fp, ms) for fp, ms, _sql in sorted(self.statements, key=lambda s: -s[1])[:limit]]
+
+    def _wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.statements.append((fingerprint(sql), (time.perf_counter() - start) * 1000, sql))
+
+
+@contextmanager
+def profile_queries(using=None):
+    """Record the statements run on this thread's connections (all aliases by default)."""
+    profile = QueryProfile()
+    aliases = [using] if using else [conn.alias for conn in connections.all()]
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(profile._wrapper))
+        yield profile
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int | None = None, max_duplicates: int | None = None, using=None):
+    """
+    Fail (QueryBudgetExceeded) when the block runs more than max_queries
+    statements, or repeats any fingerprint more than max_duplicates times.
+    """
+    with profile_queries(using=using) as profile:
+        yield profile
+    problems = []
+    if max_queries is not None and profile.count > max_queries:
+        problems.append(f"{profile.count} queries (budget {max_queries})")
+    if max_duplicates is not None:
+        repeated = [(fp, n) for fp, n in profile.duplicates() if n > max_duplicates]
+        problems += [f"{n}x (budget {max_duplicates}): {fp}" for fp, n in repeated]
+    if problems:
+        raise QueryBudgetExceeded("Query budget exceeded:\n  " + "\n  ".join(problems))
+
+
+# Rolling per-endpoint stats ---------------------------------------------------
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of values (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class EndpointStats:
+    """Last `window` samples per endpoint, kept in process memory (per worker)."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, profile: QueryProfile, total_ms: float) -> None:
+        duplicates = profile.duplicates()
+        sample = (
+            total_ms,
+            profile.db_ms,
+            profile.count,
+            duplicates[0] if duplicates else None,
+            profile.slowest(1)[0] if profile.statements else None,
+        )
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(sample)
+
+    def snapshot(self) -> list[dict]:
+        """One row per endpoint, slowest p95 first."""
+        with self._lock:
+            items = [(endpoint, list(samples)) for endpoint, samples in self._samples.items()]
+        rows = []
+        for endpoint, samples in items:
+            totals = [s[0] for s in samples]
+            queries = [s[2] for s in samples]
+            worst_repeat = max((s[3] for s in samples if s[3]), key=lambda d: d[1], default=None)
+            slowest = max((s[4] for s in samples if s[4]), key=lambda d: d[1], default=None)
+            rows.append({
+                "endpoint": endpoint,
+                "requests": len(samples),
+                "p50_ms": percentile(totals, 50),
+                "p95_ms": percentile(totals, 95),
+                "p99_ms": percentile(totals, 99),
+                "p95_db_ms": percentile([s[1] for s in samples], 95),
+                "p50_queries": percentile(queries, 50),
+                "max_queries": max(queries),
+                "worst_repeat": worst_repeat,
+                "slowest_statement": slowest,
+            })
+        rows.sort(key=lambda row: -row["p95_ms"])
+        return rows
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+endpoint_stats = EndpointStats()
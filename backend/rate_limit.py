@@ -0,0 +1,249 @@
+"""
+Rate-limit engine: sliding-window log, decided in one cache round trip.
+
+Each policy key is a sorted set of request timestamps (ms). A Lua script
+prunes entries older than the window, checks every key the request is
+subject to (e.g. the global per-IP limit and a stricter per-user AI limit)
+and records the request on all of them, or on none when any is full. The
+script takes the time from Redis, so app-server clock skew does not matter.
+Denials return the exact Retry-After (when the oldest entry leaves the window).
+
+Without django-redis (locmem in dev/tests) the same algorithm runs in Python
+under a process lock over the configured cache.
+
+Local leases (optional, RateLimitPolicy.local_lease > 1): when Redis grants a
+request it may grant up to `local_lease` slots at once; the process spends the
+spare ones in memory for LOCAL_LEASE_SECONDS before asking Redis again, so
+steady traffic from one client does not hit Redis on every request. Unspent
+slots still count against the window, so a key can be over-counted by at
+most local_lease - 1 per process; keep leases small relative to the limit.
+
+Cache errors fail open (see cache_unreachable()).
+
+Usage:
+
+    decision = hit([(f"ip:{ip}", GLOBAL), (f"user:{uid}", AI)])
+    if not decision.allowed: ... Retry-After: decision.retry_after
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from django.core.cache import cache, caches
+
+logger = logging.getLogger(__name__)
+
+try:
+    from django_redis.exceptions import ConnectionInterrupted
+except ImportError:  # pragma: no cover
+    ConnectionInterrupted = None  # type: ignore
+
+KEY_PREFIX = "rl:v2"
+LOCAL_LEASE_SECONDS = 1.0
+_MAX_LEASES = 10_000
+
+_SLIDING_WINDOW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local member = ARGV[#ARGV]
+local grants = {1}
+local retry = 0
+for i, key in ipairs(KEYS) do
+  local limit = tonumber(ARGV[i * 3 - 2])
+  local window = tonumber(ARGV[i * 3 - 1])
+  local cost = tonumber(ARGV[i * 3])
+  redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+  local free = limit - redis.call('ZCARD', key)
+  if free <= 0 then
+    local wait = window
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    if oldest[2] then wait = tonumber(oldest[2]) + window - now end
+    retry = math.max(retry, wait, 1)
+  end
+  grants[i + 1] = math.min(cost, free)
+end
+if retry > 0 then
+  return {0, retry}
+end
+for i, key in ipairs(KEYS) do
+  for n = 1, grants[i + 1] do
+    redis.call('ZADD', key, now, member .. ':' .. n)
+  end
+  redis.call('PEXPIRE', key, tonumber(ARGV[i * 3 - 1]))
+end
+return grants
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    limit: int
+    window_seconds: int
+    # "ip", or "user" (authenticated user; anonymous requests fall back to IP).
+    scope: str = "ip"
+    # Route policies apply to paths starting with a prefix or containing a segment.
+    path_prefixes: tuple[str, ...] = ()
+    path_contains: tuple[str, ...] = ()
+    local_lease: int = 0
+
+    def matches(self, path: str) -> bool:
+        return any(path.startswith(prefix) for prefix in self.path_prefixes) or any(
+            part in path for part in self.path_contains
+        )
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    # Seconds until the request would be allowed (denials only).
+    retry_after: int = 0
+
+
+ALLOW = RateLimitDecision(True)
+
+
+def cache_unreachable(exc: BaseException) -> bool:
+    """True when Redis/django-redis cannot be reached (DNS, network, down)."""
+    if ConnectionInterrupted is not None and isinstance(exc, ConnectionInterrupted):
+        return True
+    try:
+        from redis.exceptions import ConnectionError as RedisConnectionError
+        from redis.exceptions import TimeoutError as RedisTimeoutError
+    except ImportError:  # pragma: no cover
+        return False
+    return isinstance(exc, (RedisConnectionError, RedisTimeoutError))
+
+
+def policy_from_dict(data: dict) -> RateLimitPolicy:
+    return RateLimitPolicy(
+        name=data["name"],
+        limit=int(data["limit"]),
+        window_seconds=int(data["window_seconds"]),
+        scope=data.get("scope", "ip"),
+        path_prefixes=tuple(data.get("path_prefixes") or ()),
+        path_contains=tuple(data.get("path_contains") or ()),
+        local_lease=int(data.get("local_lease") or 0),
+    )
+
+
+# Local leases -----------------------------------------------------------------
+
+_leases: dict[str, list] = {}  # key -> [spare slots, expires (monotonic)]
+_leases_lock = threading.Lock()
+
+
+def _take_leased(keys) -> bool:
+    """Spend one leased slot on every key, or none if any key has no live lease."""
+    now = time.monotonic()
+    with _leases_lock:
+        leases = [_leases.get(key) for key in keys]
+        if not all(lease and lease[0] > 0 and lease[1] > now for lease in leases):
+            return False
+        for lease in leases:
+            lease[0] -= 1
+        return True
+
+
+def _store_leases(spares: dict[str, int]) -> None:
+    now = time.monotonic()
+    with _leases_lock:
+        if len(_leases) > _MAX_LEASES:
+            for key in [k for k, lease in _leases.items() if lease[1] <= now]:
+                del _leases[key]
+        for key, spare in spares.items():
+            if spare > 0:
+                _leases[key] = [spare, now + LOCAL_LEASE_SECONDS]
+
+
+# Backends ---------------------------------------------------------------------
+
+_script = None
+_python_lock = threading.Lock()
+
+
+def _redis_connection():
+    backend = caches["default"]
+    if not type(backend).__module__.startswith("django_redis"):
+        return None
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def _hit_redis(conn, checks) -> tuple[int, list[int]]:
+    global _script
+    if _script is None:
+        _script = conn.register_script(_SLIDING_WINDOW_LUA)
+    args = []
+    for _key, policy, cost in checks:
+        args += [policy.limit, policy.window_seconds * 1000, cost]
+    args.append(uuid.uuid4().hex)
+    result = _script(keys=[cache.make_key(key) for key, _policy, _cost in checks], args=args, client=conn)
+    if int(result[0]) == 0:
+        return int(result[1]), []
+    return 0, [int(n) for n in result[1:]]
+
+
+def _hit_python(checks) -> tuple[int, list[int]]:
+    now = int(time.time() * 1000)
+    with _python_lock:
+        logs = []
+        retry = 0
+        grants = []
+        for key, policy, cost in checks:
+            window = policy.window_seconds * 1000
+            log = [ts for ts in (cache.get(key) or []) if ts > now - window]
+            free = policy.limit - len(log)
+            if free <= 0:
+                retry = max(retry, (log[0] + window - now) if log else window, 1)
+            logs.append(log)
+            grants.append(min(cost, free))
+        if retry:
+            return retry, []
+        for (key, policy, _cost), log, granted in zip(checks, logs, grants):
+            cache.set(key, log + [now] * granted, timeout=policy.window_seconds)
+        return 0, grants
+
+
+# API --------------------------------------------------------------------------
+
+def hit(checks) -> RateLimitDecision:
+    """
+    Record one request against every (identity, policy) in checks, all or nothing.
+    Identities are namespaced per policy, so the same identity can appear under several policies.
+    """
+    checks = [
+        (f"{KEY_PREFIX}:{policy.name}:{identity}", policy)
+        for identity, policy in checks
+        if policy.limit > 0
+    ]
+    if not checks:
+        return ALLOW
+    keys = [key for key, _policy in checks]
+    if _take_leased(keys):
+        return ALLOW
+    costs = [(key, policy, max(1, policy.local_lease)) for key, policy in checks]
+    try:
+        conn = _redis_connection()
+        retry_ms, grants = _hit_redis(conn, costs) if conn is not None else _hit_python(costs)
+    except Exception as e:
+        if cache_unreachable(e):
+            # Unreachable Redis: fail open without log spam.
+            logger.debug("Rate limit skipped (cache unreachable, allowing request): %s", e)
+        else:
+            logger.warning("Rate limit cache error (failing open): %s", e, exc_info=True)
+        return ALLOW
+    if retry_ms:
+        return RateLimitDecision(False, max(1, math.ceil(retry_ms / 1000)))
+    _store_leases({key: granted - 1 for key, granted in zip(keys, grants)})
+    return ALLOW
+
+
+def allow(identity: str, policy: RateLimitPolicy) -> bool:
+    return hit([(identity, policy)]).allowed
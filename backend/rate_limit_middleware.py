@@ -1,8 +1,13 @@
 """
-Global HTTP rate limiting (per client IP) using Django cache.
-
-Skips exempt path prefixes (webhooks, health, static). On cache errors, fails
-open so Redis outages do not take the API offline.
+Global HTTP rate limiting using backend.rate_limit (sliding window, one Redis
+round trip per request).
+
+Every request counts against the global per-IP policy
+(RATE_LIMIT_REQUESTS_PER_WINDOW / RATE_LIMIT_WINDOW_SECONDS) and against each
+route policy in RATE_LIMIT_POLICIES whose paths match (e.g. stricter per-user
+limits on AI endpoints). Skips exempt path prefixes (webhooks, health,
+static). On cache errors, fails open so Redis outages do not take the API
+offline.
 """
 
 import logging
@@ -11,26 +16,9 @@ from django.conf import settings
 from django.core.cache import cache
 from django.http import JsonResponse
 
-logger = logging.getLogger(__name__)
-
-try:
-    from django_redis.exceptions import ConnectionInterrupted
-except ImportError:  # pragma: no cover
-    ConnectionInterrupted = None  # type: ignore
+from backend.rate_limit import RateLimitPolicy, cache_unreachable as _cache_unreachable, hit, policy_from_dict
 
-
-def _cache_unreachable(exc: BaseException) -> bool:
-    """True when Redis/django-redis cannot be reached (DNS, network, down)."""
-    if ConnectionInterrupted is not None and isinstance(
-        exc, ConnectionInterrupted
-    ):
-        return True
-    try:
-        from redis.exceptions import ConnectionError as RedisConnectionError
-        from redis.exceptions import TimeoutError as RedisTimeoutError
-    except ImportError:  # pragma: no cover
-        return False
-    return isinstance(exc, (RedisConnectionError, RedisTimeoutError))
+logger = logging.getLogger(__name__)
 
 
 def get_client_ip(request):
@@ -52,8 +40,8 @@ def fixed_window_allow(
     cache_key: str, limit: int, window_seconds: int
 ) -> bool:
     """
-    Fixed-window counter. First request creates the key; further requests
-    increment until limit is reached (same pattern as student IDE explain).
+    Simple fixed-window counter (add/get/incr; not atomic between get and
+    incr). The middleware and IDE explain limits use backend.rate_limit.hit().
     """
     if limit <= 0:
         return True
@@ -82,6 +70,35 @@ def fixed_window_allow(
         return True
 
 
+def request_identity(request, scope: str) -> str:
+    """Client identity for a policy scope: the authenticated user for "user", else the client IP."""
+    if scope == "user":
+        firebase_user = getattr(request, "firebase_user", None)
+        if firebase_user and firebase_user.get("uid"):
+            return f"uid:{firebase_user['uid']}"
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+    return f"ip:{get_client_ip(request)}"
+
+
+def request_policies(path: str) -> list[RateLimitPolicy]:
+    """The global policy plus every route policy matching path."""
+    policies = [
+        RateLimitPolicy(
+            name="global",
+            limit=int(getattr(settings, "RATE_LIMIT_REQUESTS_PER_WINDOW", 500)),
+            window_seconds=int(getattr(settings, "RATE_LIMIT_WINDOW_SECONDS", 60)),
+            local_lease=int(getattr(settings, "RATE_LIMIT_LOCAL_LEASE", 0)),
+        )
+    ]
+    for data in getattr(settings, "RATE_LIMIT_POLICIES", None) or ():
+        policy = policy_from_dict(data)
+        if policy.matches(path):
+            policies.append(policy)
+    return policies
+
+
 class RateLimitMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -94,12 +111,10 @@ class RateLimitMiddleware:
         if path_is_exempt(path):
             return self.get_response(request)
 
-        limit = int(getattr(settings, "RATE_LIMIT_REQUESTS_PER_WINDOW", 500))
-        window = int(getattr(settings, "RATE_LIMIT_WINDOW_SECONDS", 60))
-        identifier = get_client_ip(request)
-        cache_key = f"rl:mw:v1:ip:{identifier}"
-
-        if not fixed_window_allow(cache_key, limit, window):
+        decision = hit(
+            [(request_identity(request, policy.scope), policy) for policy in request_policies(path)]
+        )
+        if not decision.allowed:
             response = JsonResponse(
                 {
                     "error": "Too many requests",
@@ -107,7 +122,7 @@ class RateLimitMiddleware:
                 },
                 status=429,
             )
-            response["Retry-After"] = str(window)
+            response["Retry-After"] = str(decision.retry_after)
             return response
 
         return self.get_response(request)
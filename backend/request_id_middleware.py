@@ -0,0 +1,40 @@
+"""
+Per-request correlation id for logs (backend.structured_logging).
+
+Uses the caller's X-Request-ID when it looks sane, else the trace id from
+Cloud Run's X-Cloud-Trace-Context, else a new uuid4. The id is stored in
+request_id_var for the duration of the request, exposed as
+request.request_id and echoed in the X-Request-ID response header.
+"""
+
+import re
+import uuid
+
+from backend.structured_logging import request_id_var
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+def incoming_request_id(request) -> str:
+    request_id = request.META.get("HTTP_X_REQUEST_ID", "")
+    if _VALID_REQUEST_ID.match(request_id):
+        return request_id
+    trace = request.META.get("HTTP_X_CLOUD_TRACE_CONTEXT", "").split("/", 1)[0]
+    if _VALID_REQUEST_ID.match(trace):
+        return trace
+    return uuid.uuid4().hex
+
+
+class RequestIdMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.request_id = incoming_request_id(request)
+        token = request_id_var.set(request.request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response["X-Request-ID"] = request.request_id
+        return response
@@ -14,8 +14,6 @@ import os
 import logging
 from pathlib import Path
 from decouple import config
-import firebase_admin
-from firebase_admin import credentials
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -100,6 +98,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "backend.request_id_middleware.RequestIdMiddleware",  # Log correlation id (first, so every log line has it)
+    "backend.profiling_middleware.QueryProfilingMiddleware",  # Opt-in: QUERY_PROFILING_ENABLED
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Serve static files
@@ -110,6 +110,7 @@ MIDDLEWARE = [
     "backend.admin_calendar_timezone_middleware.AdminCalendarTimezoneMiddleware",
     "authentication.middleware.FirebaseAuthenticationMiddleware",  # Custom Firebase auth
     "backend.rate_limit_middleware.RateLimitMiddleware",
+    "backend.db_routing_middleware.ReplicaRoutingMiddleware",  # Only with DATABASE_REPLICA_URL
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "backend.debug_middleware.DebugMiddleware",  # Add debug middleware last
@@ -251,6 +252,9 @@ else:
     MEDIA_ROOT = BASE_DIR / 'media'
     MEDIA_URL = '/media/'
 
+# Concurrent GCS uploads/deletes per TutorX content or events save.
+TUTORX_MEDIA_UPLOAD_WORKERS = config('TUTORX_MEDIA_UPLOAD_WORKERS', default=6, cast=int)
+
 # Lesson video conversion: "inline" (ffmpeg in this process) or "deferred"
 # (mark processing; a Cloud Run Job / worker will convert later).
 LESSON_VIDEO_CONVERSION_BACKEND = config(
@@ -284,6 +288,11 @@ else:
         }
     }
 
+# Public JSON cache (landing, testimonials, marketing programs, blog): see backend/public_cache.py
+PUBLIC_CACHE_ENABLED = config('PUBLIC_CACHE_ENABLED', default=True, cast=bool)
+PUBLIC_CACHE_TTL_SECONDS = config('PUBLIC_CACHE_TTL_SECONDS', default=3600, cast=int)
+PUBLIC_CACHE_MAX_AGE_SECONDS = config('PUBLIC_CACHE_MAX_AGE_SECONDS', default=60, cast=int)
+
 
 def _rate_limit_exempt_prefixes():
     raw = config("RATE_LIMIT_EXEMPT_PREFIXES", default="")
@@ -305,6 +314,19 @@ RATE_LIMIT_REQUESTS_PER_WINDOW = config(
 )
 RATE_LIMIT_WINDOW_SECONDS = config("RATE_LIMIT_WINDOW_SECONDS", default=60, cast=int)
 RATE_LIMIT_EXEMPT_PATH_PREFIXES = _rate_limit_exempt_prefixes()
+# Per-process slots leased from Redis per global-policy hit (backend.rate_limit); 0/1 disables.
+RATE_LIMIT_LOCAL_LEASE = config("RATE_LIMIT_LOCAL_LEASE", default=0, cast=int)
+# Route policies checked in addition to the global per-IP limit (see backend/rate_limit.py).
+RATE_LIMIT_POLICIES = [
+    {
+        "name": "ai",
+        "path_prefixes": ["/api/ai/", "/api/student/ide/"],
+        "path_contains": ["/ai/", "/ai-grade/"],
+        "limit": config("RATE_LIMIT_AI_REQUESTS_PER_WINDOW", default=60, cast=int),
+        "window_seconds": config("RATE_LIMIT_AI_WINDOW_SECONDS", default=60, cast=int),
+        "scope": "user",
+    },
+]
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
@@ -374,79 +396,7 @@ FIREBASE_CLIENT_EMAIL = config('FIREBASE_CLIENT_EMAIL', default='')
 FIREBASE_CLIENT_ID = config('FIREBASE_CLIENT_ID', default='')
 FIREBASE_CLIENT_X509_CERT_URL = config('FIREBASE_CLIENT_X509_CERT_URL', default='')
 
-# Initialize Firebase Admin SDKk
-def initialize_firebase():
-    """Initialize Firebase Admin SDK with Google Secret Manager or environment variables"""
-    if not FIREBASE_PROJECT_ID:
-        logger.warning("Firebase project ID not configured")
-        return False
-    
-    try:
-        # Try to get credentials from Google Secret Manager first (for production)
-        if config('USE_SECRET_MANAGER', default=False, cast=bool):
-            try:
-                from .secret_manager import get_secret_manager_client
-                # Use Google Cloud project ID for Secret Manager access, not Firebase project ID
-                gcp_project_id = 'esaasolution'  # Hardcoded for now
-                logger.info(f"Using GCP Project ID for Secret Manager: {gcp_project_id}")
-                secret_client = get_secret_manager_client(gcp_project_id)
-                if secret_client:
-                    firebase_credentials = secret_client.get_firebase_credentials()
-                    if firebase_credentials:
-                        cred = credentials.Certificate(firebase_credentials)
-                        firebase_admin.initialize_app(cred, {
-                            'projectId': FIREBASE_PROJECT_ID,
-                        })
-                        logger.info(f"Firebase initialized with Secret Manager for project: {FIREBASE_PROJECT_ID}")
-                        return True
-                    else:
-                        logger.warning("Failed to retrieve Firebase credentials from Secret Manager")
-                else:
-                    logger.warning("Failed to create Secret Manager client")
-            except Exception as e:
-                logger.error(f"Secret Manager error: {e}")
-                logger.info("Falling back to environment variables...")
-        
-        # Fallback to environment variables (for local development)
-        if all([FIREBASE_PRIVATE_KEY_ID, FIREBASE_PRIVATE_KEY, FIREBASE_CLIENT_EMAIL, FIREBASE_CLIENT_ID]):
-            firebase_credentials = {
-                "type": "service_account",
-                "project_id": FIREBASE_PROJECT_ID,
-                "private_key_id": FIREBASE_PRIVATE_KEY_ID,
-                "private_key": FIREBASE_PRIVATE_KEY.replace('\\n', '\n'),  # Handle escaped newlines
-                "client_email": FIREBASE_CLIENT_EMAIL,
-                "client_id": FIREBASE_CLIENT_ID,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                "client_x509_cert_url": FIREBASE_CLIENT_X509_CERT_URL,
-                "universe_domain": "googleapis.com"
-            }
-            
-            cred = credentials.Certificate(firebase_credentials)
-            firebase_admin.initialize_app(cred, {
-                'projectId': FIREBASE_PROJECT_ID,
-            })
-            logger.info(f"Firebase initialized with environment variables for project: {FIREBASE_PROJECT_ID}")
-            return True
-        else:
-            # Try default credentials (for Google Cloud deployment)
-            firebase_admin.initialize_app(options={
-                'projectId': FIREBASE_PROJECT_ID,
-            })
-            logger.info(f"Firebase initialized with default credentials for project: {FIREBASE_PROJECT_ID}")
-            return True
-            
-    except Exception as e:
-        logger.error(f"Failed to initialize Firebase: {e}")
-        return False
-
-# Initialize Firebase on startup
-try:
-    initialize_firebase()
-except Exception as e:
-    logger.warning(f"Firebase initialization failed on startup: {e}")
-    # Continue without Firebase - it will be initialized when needed
+# Firebase Admin is initialised on first use by backend.clients.get_client('firebase').
 
 # Stripe Configuration
 def get_stripe_config():
@@ -478,6 +428,12 @@ stripe_config = get_stripe_config()
 STRIPE_SECRET_KEY = stripe_config['STRIPE_SECRET_KEY']
 STRIPE_PUBLISHABLE_KEY = stripe_config['STRIPE_PUBLISHABLE_KEY']
 STRIPE_WEBHOOK_SECRET = stripe_config['STRIPE_WEBHOOK_SECRET']
+# Webhook inbox (billings.services.webhook_inbox): events are stored on receipt and processed
+# by a background worker pool. Set PROCESS_INLINE=True where no CPU is available after the
+# response (e.g. Cloud Run with request-based billing) and no replay cron is running.
+STRIPE_WEBHOOK_PROCESS_INLINE = config('STRIPE_WEBHOOK_PROCESS_INLINE', default=False, cast=bool)
+STRIPE_WEBHOOK_INBOX_WORKERS = config('STRIPE_WEBHOOK_INBOX_WORKERS', default=4, cast=int)
+STRIPE_WEBHOOK_MAX_ATTEMPTS = config('STRIPE_WEBHOOK_MAX_ATTEMPTS', default=8, cast=int)
 
 # Twilio SMS (communication app — masked routing / outbound)
 TWILIO_ACCOUNT_SID = config('TWILIO_ACCOUNT_SID', default='')
@@ -559,6 +515,52 @@ else:
             }
         }
 
+# Connection reuse, timeouts and the optional read replica (backend.db_config, backend.db_router).
+from backend.db_config import build_databases, default_conn_max_age  # noqa: E402
+
+# Set when DATABASE_URL points at pgbouncer in transaction mode (disables server-side cursors;
+# statement timeouts then come from the database role).
+DB_PGBOUNCER = config('DB_PGBOUNCER', default=False, cast=bool)
+# Seconds to keep a connection open between requests (0 closes it after each request, None keeps it forever).
+# Defaults to 60, or 0 under Daphne/ASGI unless DB_PGBOUNCER is set (see backend.db_config).
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=default_conn_max_age(pgbouncer=DB_PGBOUNCER), cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+DB_CONNECT_TIMEOUT = config('DB_CONNECT_TIMEOUT', default=5, cast=int)
+# Statement timeouts in ms per workload; 0 = no limit. Commands cover migrate and cron jobs.
+DB_STATEMENT_TIMEOUT_MS = config('DB_STATEMENT_TIMEOUT_MS', default=30000, cast=int)
+DB_COMMAND_STATEMENT_TIMEOUT_MS = config('DB_COMMAND_STATEMENT_TIMEOUT_MS', default=0, cast=int)
+DB_REPLICA_STATEMENT_TIMEOUT_MS = config('DB_REPLICA_STATEMENT_TIMEOUT_MS', default=30000, cast=int)
+
+# Optional read replica for dashboard/catalog reads, e.g. a Cloud SQL read replica.
+_replica_url = config('DATABASE_REPLICA_URL', default='').strip()
+_replica_database = None
+if _replica_url:
+    import dj_database_url
+    _replica_database = dj_database_url.parse(_replica_url)
+DATABASES = build_databases(
+    DATABASES['default'],
+    replica=_replica_database,
+    conn_max_age=DB_CONN_MAX_AGE,
+    health_checks=DB_CONN_HEALTH_CHECKS,
+    connect_timeout=DB_CONNECT_TIMEOUT,
+    pgbouncer=DB_PGBOUNCER,
+    web_statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+    command_statement_timeout_ms=DB_COMMAND_STATEMENT_TIMEOUT_MS,
+    replica_statement_timeout_ms=DB_REPLICA_STATEMENT_TIMEOUT_MS,
+)
+DATABASE_ROUTERS = ['backend.db_router.ReplicaRouter']
+# GET requests under these prefixes read from the replica (backend.db_routing_middleware).
+DATABASE_REPLICA_PATH_PREFIXES = config(
+    'DATABASE_REPLICA_PATH_PREFIXES',
+    default=(
+        '/api/courses/public/,/api/courses/student/dashboard/,/api/courses/teacher/dashboard/,'
+        '/api/courses/teacher/students/master/,/api/student/dashboard-overview/,/api/student/parent/dashboard/'
+    ),
+    cast=lambda v: [s.strip() for s in v.split(',') if s.strip()],
+)
+# After a client writes, its reads stay on the primary this long (replication lag allowance).
+DATABASE_REPLICA_STICKY_SECONDS = config('DATABASE_REPLICA_STICKY_SECONDS', default=5, cast=int)
+
 # Channels Configuration (WebSocket support)
 def get_redis_hosts():
     """Parse REDIS_URL and return appropriate hosts configuration for channels-redis."""
@@ -646,6 +648,59 @@ SLACK_CHANNEL = config('SLACK_CHANNEL', default='#general')
 SLACK_ERROR_ALERTS = config('SLACK_ERROR_ALERTS', default='')
 ADMIN_URL = config('ADMIN_URL', default='http://localhost:8000')
 
+# Third-party clients (backend.clients): built lazily on first use. When enabled,
+# a background thread warms them once the server has received its first request.
+CLIENT_WARMUP_ON_FIRST_REQUEST = config('CLIENT_WARMUP_ON_FIRST_REQUEST', default=False, cast=bool)
+CLIENT_WARMUP_DELAY_SECONDS = config('CLIENT_WARMUP_DELAY_SECONDS', default=2, cast=float)
+# After a failed build, get_client() returns None (or re-raises) without retrying for this long,
+# doubling per consecutive failure up to the max.
+CLIENT_RETRY_BACKOFF_SECONDS = config('CLIENT_RETRY_BACKOFF_SECONDS', default=15, cast=int)
+CLIENT_RETRY_BACKOFF_MAX_SECONDS = config('CLIENT_RETRY_BACKOFF_MAX_SECONDS', default=300, cast=int)
+
+# Teacher week calendar / admin timetable rows (courses.services.class_calendar); 0 disables.
+CLASS_CALENDAR_CACHE_SECONDS = config('CLASS_CALENDAR_CACHE_SECONDS', default=300, cast=int)
+
+# Per-user course access index (courses.services.course_access); 0 disables.
+COURSE_ACCESS_CACHE_SECONDS = config('COURSE_ACCESS_CACHE_SECONDS', default=300, cast=int)
+
+# Book page delivery (courses.services.book_pages): summaries per window, next pages to prefetch.
+BOOK_PAGE_WINDOW = config('BOOK_PAGE_WINDOW', default=20, cast=int)
+BOOK_PAGE_PREFETCH = config('BOOK_PAGE_PREFETCH', default=2, cast=int)
+
+# Teacher quiz submission inbox (courses.services.quiz_inbox): attempts per page.
+QUIZ_INBOX_PAGE_SIZE = config('QUIZ_INBOX_PAGE_SIZE', default=25, cast=int)
+
+# Shared part of the student lesson payload (courses.services.lesson_delivery); 0 disables.
+LESSON_PAYLOAD_CACHE_SECONDS = config('LESSON_PAYLOAD_CACHE_SECONDS', default=600, cast=int)
+
+# Compiled quiz answer keys for auto-scoring (courses.services.quiz_scoring); 0 disables.
+QUIZ_ANSWER_KEY_CACHE_SECONDS = config('QUIZ_ANSWER_KEY_CACHE_SECONDS', default=3600, cast=int)
+
+# Per-student class event timeline (student.services.timeline); 0 disables.
+STUDENT_TIMELINE_CACHE_SECONDS = config('STUDENT_TIMELINE_CACHE_SECONDS', default=300, cast=int)
+
+# Code snippet CSS/text publishing to GCS (student.services.snippet_assets): seconds to
+# coalesce autosaves before uploading; 0 publishes right after commit.
+SNIPPET_ASSET_PUBLISH_DELAY_SECONDS = config('SNIPPET_ASSET_PUBLISH_DELAY_SECONDS', default=3, cast=float)
+
+# Request profiling (backend.profiling_middleware): Server-Timing headers and /staff/profiling/.
+QUERY_PROFILING_ENABLED = config('QUERY_PROFILING_ENABLED', default=False, cast=bool)
+QUERY_PROFILING_SAMPLE_RATE = config('QUERY_PROFILING_SAMPLE_RATE', default=1.0, cast=float)
+# Samples kept per endpoint for the rolling percentiles.
+QUERY_PROFILING_WINDOW = config('QUERY_PROFILING_WINDOW', default=200, cast=int)
+# Repeats of one statement in a request at which it is logged as a possible N+1.
+QUERY_PROFILING_N_PLUS_ONE_THRESHOLD = config('QUERY_PROFILING_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+# Non-staff requests get Server-Timing only with this value in X-Profiling-Token (empty: staff only).
+QUERY_PROFILING_HEADER_TOKEN = config('QUERY_PROFILING_HEADER_TOKEN', default='')
+
+# Notification outbox (Slack, error alerts, Brevo) - communication.services.notification_outbox
+# NOTIFICATION_TRANSPORT=stub records messages in memory instead of calling vendors.
+NOTIFICATION_TRANSPORT = config('NOTIFICATION_TRANSPORT', default='live')
+NOTIFICATION_OUTBOX_DELIVER_INLINE = config('NOTIFICATION_OUTBOX_DELIVER_INLINE', default=False, cast=bool)
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = config('NOTIFICATION_OUTBOX_MAX_ATTEMPTS', default=6, cast=int)
+NOTIFICATION_BREAKER_THRESHOLD = config('NOTIFICATION_BREAKER_THRESHOLD', default=5, cast=int)
+NOTIFICATION_BREAKER_COOLDOWN_SECONDS = config('NOTIFICATION_BREAKER_COOLDOWN_SECONDS', default=60, cast=int)
+
 # Jitsi Configuration
 JITSI_DOMAIN = config('JITSI_DOMAIN', default='meet.jit.si')
 JITSI_APP_ID = config('JITSI_APP_ID', default='')
@@ -675,6 +730,6 @@ BREVO_SENDER_NAME = config('BREVO_SENDER_NAME', default='Little Learners Tech')
 # Lead magnet – frontend guide page base URL (full guide URL = LEAD_MAGNET_GUIDE_BASE_URL/guide/<slug>/)
 LEAD_MAGNET_GUIDE_BASE_URL = config('LEAD_MAGNET_GUIDE_BASE_URL', default='https://www.sbtyacademy.com')
 
-# Logging (ai_service INFO → stdout/console + django.log)
+# Logging: queued JSON lines to stdout with request ids (see logging_config.py)
 from logging_config import LOGGING  # noqa: E402
 
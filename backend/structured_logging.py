@@ -0,0 +1,149 @@
+"""
+Non-blocking, structured logging.
+
+logging_config.LOGGING routes every logger through QueueingJsonHandler:
+
+- the request thread only copies the record (message formatted once, the
+  traceback rendered to text) and puts it on a bounded in-memory queue; a
+  QueueListener thread per process writes the records to stdout. When the
+  queue is full, records are dropped (and counted) rather than blocking;
+- records are written as one JSON object per line (Cloud Logging picks up
+  the "severity" and "message" fields);
+- every record carries the request's correlation id (request_id_var, set by
+  backend.request_id_middleware.RequestIdMiddleware) and any `extra` fields;
+- DEBUG records are sampled (LOG_DEBUG_SAMPLE_RATE, env); any call can opt
+  into sampling with extra={"sample_rate": 0.01}.
+
+Log with lazy formatting so disabled levels cost nothing:
+
+    logger.debug("Lesson %s progress %s", lesson.id, progress.pk)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came from `extra`.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request's correlation id (runs in the caller's thread, before queueing)."""
+
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep DEBUG records (or records with extra sample_rate) with the given probability."""
+
+    def __init__(self, debug_rate: float = 1.0):
+        super().__init__()
+        self.debug_rate = debug_rate
+
+    def filter(self, record):
+        rate = getattr(record, "sample_rate", None)
+        if rate is None:
+            if record.levelno > logging.DEBUG:
+                return True
+            rate = self.debug_rate
+        return rate >= 1 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        message = record.message if hasattr(record, "message") else record.getMessage()
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": message,
+            "module": record.module,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        exc_text = record.exc_text or (self.formatException(record.exc_info) if record.exc_info else None)
+        if exc_text:
+            entry["exception"] = exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "sample_rate":
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler bound to whatever sys.stdout is at emit time (survives stdout swaps)."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class QueueingJsonHandler(QueueHandler):
+    """
+    QueueHandler with its own listener thread writing JSON lines to `stream`
+    (default: the current sys.stdout).
+
+    Configured from LOGGING (dictConfig) as a regular handler:
+
+        "class": "backend.structured_logging.QueueingJsonHandler",
+    """
+
+    def __init__(self, stream=None, maxsize: int = 10000, json_output: bool = True):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        target = logging.StreamHandler(stream) if stream is not None else _StdoutHandler()
+        target.setFormatter(
+            JsonFormatter()
+            if json_output
+            else logging.Formatter("{levelname} {asctime} {name} [{request_id}] {message}", style="{")
+        )
+        self.addFilter(RequestIdFilter())
+        self.addFilter(SamplingFilter(float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "0.1"))))
+        self.listener = QueueListener(self.queue, target)
+        self.listener.start()
+        atexit.register(self._stop_listener)
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def prepare(self, record):
+        """Copy with the message and traceback rendered now; args may change after the call returns."""
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self._stop_listener()
+        super().close()
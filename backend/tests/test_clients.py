@@ -0,0 +1,89 @@
+"""Tests for the lazy third-party client registry."""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from backend import clients
+from home.management.commands.startup_profile import parse_importtime
+
+
+class ClientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+        self.addCleanup(clients._registry.pop, "test-client", None)
+
+    def _factory(self):
+        self.calls.append(1)
+        return object()
+
+    def test_built_once_on_first_use_with_timing(self):
+        clients.register("test-client", self._factory)
+        self.assertEqual(self.calls, [])
+
+        first = clients.get_client("test-client")
+        self.assertIs(clients.get_client("test-client"), first)
+        self.assertEqual(len(self.calls), 1)
+        timing = next(t for t in clients.client_timings() if t["name"] == "test-client")
+        self.assertTrue(timing["built"])
+        self.assertIsNotNone(timing["init_seconds"])
+
+        clients.reset_client("test-client")
+        self.assertIsNot(clients.get_client("test-client"), first)
+
+    @override_settings(CLIENT_RETRY_BACKOFF_SECONDS=60)
+    def test_failed_build_is_retried_after_backoff(self):
+        def flaky():
+            self.calls.append(1)
+            if len(self.calls) == 1:
+                raise RuntimeError("metadata server timeout")
+            return "client"
+
+        clients.register("test-client", flaky)
+        self.assertIsNone(clients.get_client("test-client"))
+        # Within the backoff the failure is served from memory, not rebuilt.
+        self.assertIsNone(clients.get_client("test-client"))
+        with self.assertRaises(RuntimeError):
+            clients.get_client("test-client", required=True)
+        self.assertEqual(len(self.calls), 1)
+
+        with patch("backend.clients.time.monotonic", return_value=clients._registry["test-client"].retry_at):
+            self.assertEqual(clients.get_client("test-client"), "client")
+        self.assertEqual(len(self.calls), 2)
+
+        clients.register("test-client", lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            clients.get_client("test-client", required=True)
+
+    @override_settings(FIREBASE_PROJECT_ID="")
+    def test_firebase_is_not_initialised_without_a_project(self):
+        clients.reset_client("firebase")
+        self.addCleanup(clients.reset_client, "firebase")
+        with patch("firebase_admin.initialize_app") as initialize_app:
+            self.assertIsNone(clients.get_client("firebase"))
+        initialize_app.assert_not_called()
+
+    @override_settings(SLACK_BOT_TOKEN="xoxb-test")
+    def test_slack_service_does_not_call_slack_on_construction(self):
+        from slack_notifications import SlackNotificationService
+
+        clients.reset_client("slack")
+        self.addCleanup(clients.reset_client, "slack")
+        with patch("slack_sdk.WebClient.auth_test") as auth_test:
+            service = SlackNotificationService()
+            self.assertTrue(service.is_available())
+        auth_test.assert_not_called()
+
+
+class StartupProfileParseTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+            "unrelated line\n"
+        )
+        self.assertEqual(
+            parse_importtime(stderr),
+            [(120, 120, "json.decoder"), (300, 420, "json")],
+        )
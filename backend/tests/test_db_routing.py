@@ -0,0 +1,109 @@
+"""Tests for the database config layer and read-replica routing (backend.db_config, backend.db_router)."""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from backend.db_config import (
+    REPLICA_ALIAS,
+    build_databases,
+    current_workload,
+    default_conn_max_age,
+    tune_database,
+)
+from backend.db_router import ReplicaRouter, replica_reads
+from backend.db_routing_middleware import ReplicaRoutingMiddleware
+
+POSTGRES = {'ENGINE': 'django.db.backends.postgresql', 'NAME': 'app', 'OPTIONS': {'sslmode': 'require'}}
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    def test_postgres_gets_reuse_and_timeouts(self):
+        db = tune_database(
+            POSTGRES, conn_max_age=60, health_checks=True, connect_timeout=5, statement_timeout_ms=30000
+        )
+        self.assertEqual(db['CONN_MAX_AGE'], 60)
+        self.assertTrue(db['CONN_HEALTH_CHECKS'])
+        self.assertEqual(
+            db['OPTIONS'],
+            {'sslmode': 'require', 'connect_timeout': 5, 'options': '-c statement_timeout=30000'},
+        )
+        self.assertEqual(POSTGRES['OPTIONS'], {'sslmode': 'require'})
+
+    def test_pgbouncer_mode_skips_startup_options(self):
+        db = tune_database(
+            POSTGRES, conn_max_age=0, health_checks=True, connect_timeout=5,
+            statement_timeout_ms=30000, pgbouncer=True,
+        )
+        self.assertTrue(db['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertNotIn('options', db['OPTIONS'])
+        self.assertFalse(db['CONN_HEALTH_CHECKS'])
+
+    def test_statement_timeout_per_workload_and_replica_mirror(self):
+        web = build_databases(POSTGRES, replica=POSTGRES, workload='web', replica_statement_timeout_ms=60000)
+        command = build_databases(POSTGRES, workload='command')
+        self.assertIn('statement_timeout=30000', web['default']['OPTIONS']['options'])
+        self.assertIn('statement_timeout=60000', web[REPLICA_ALIAS]['OPTIONS']['options'])
+        self.assertEqual(web[REPLICA_ALIAS]['TEST'], {'MIRROR': 'default'})
+        self.assertNotIn('options', command['default']['OPTIONS'])
+        self.assertNotIn(REPLICA_ALIAS, command)
+        self.assertEqual(current_workload(['manage.py', 'migrate']), 'command')
+        self.assertEqual(current_workload(['manage.py', 'runserver']), 'web')
+        self.assertEqual(current_workload(['/usr/bin/daphne', 'backend.asgi:application']), 'web')
+
+    def test_asgi_server_disables_reuse_unless_behind_pgbouncer(self):
+        daphne = ['/usr/local/bin/daphne', '-p', '8080', 'backend.asgi:application']
+        module = ['/usr/lib/python3/site-packages/daphne/__main__.py', 'backend.asgi:application']
+        self.assertEqual(default_conn_max_age(pgbouncer=False, argv=daphne), 0)
+        self.assertEqual(default_conn_max_age(pgbouncer=False, argv=module), 0)
+        self.assertEqual(default_conn_max_age(pgbouncer=True, argv=daphne), 60)
+        self.assertEqual(default_conn_max_age(pgbouncer=False, argv=['manage.py', 'runserver']), 60)
+
+
+@override_settings(
+    DATABASES={**settings.DATABASES, REPLICA_ALIAS: settings.DATABASES['default']},
+    DATABASE_REPLICA_PATH_PREFIXES=['/api/courses/teacher/dashboard/'],
+    DATABASE_REPLICA_STICKY_SECONDS=5,
+)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.model = get_user_model()
+
+    def test_reads_use_replica_only_inside_block_until_a_write(self):
+        self.assertIsNone(self.router.db_for_read(self.model))
+        with replica_reads() as state:
+            self.assertEqual(self.router.db_for_read(self.model), REPLICA_ALIAS)
+            self.assertEqual(self.router.db_for_write(self.model), 'default')
+            self.assertTrue(state.wrote)
+            self.assertIsNone(self.router.db_for_read(self.model))
+        self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, 'users'))
+
+    def _request(self, middleware, method, path, write=False):
+        request = getattr(RequestFactory(), method)(path, REMOTE_ADDR='10.0.0.7')
+        request.firebase_user = {'uid': 'teacher-1'}
+        seen = {}
+
+        def view(request):
+            if write:
+                self.router.db_for_write(self.model)
+            seen['read'] = self.router.db_for_read(self.model)
+            return HttpResponse()
+
+        middleware.get_response = view
+        middleware(request)
+        return seen['read']
+
+    def test_middleware_routes_dashboard_reads_and_sticks_after_write(self):
+        middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse())
+        dashboard = '/api/courses/teacher/dashboard/'
+        self.assertEqual(self._request(middleware, 'get', dashboard), REPLICA_ALIAS)
+        self.assertIsNone(self._request(middleware, 'get', '/api/courses/teacher/classes/'))
+        self.assertIsNone(self._request(middleware, 'post', '/api/courses/teacher/classes/', write=True))
+        # The client just wrote: its dashboard reads stay on the primary for the sticky window.
+        self.assertIsNone(self._request(middleware, 'get', dashboard))
+        cache.clear()
+        self.assertEqual(self._request(middleware, 'get', dashboard), REPLICA_ALIAS)
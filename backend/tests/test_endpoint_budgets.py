@@ -0,0 +1,78 @@
+"""Query-budget regression suite for the page-load endpoints (see backend/benchmarks.py)."""
+
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from backend.benchmarks import KNOWN_QUERY_GROWTH, SCALES, measure_scale, query_growth, run_benchmarks, seed_dataset
+
+
+@override_settings(RATE_LIMIT_ENABLED=False)
+class EndpointQueryBudgetTests(TestCase):
+    def _check_scale(self, scale):
+        data = seed_dataset(SCALES[scale], prefix=f'budget-{scale}')
+        for m in run_benchmarks(data, scale):
+            with self.subTest(endpoint=m.endpoint, scale=scale):
+                self.assertEqual(m.status, 200)
+                self.assertGreater(m.response_bytes, 0)
+                self.assertLessEqual(
+                    m.queries, m.budget,
+                    f'{m.endpoint} at {scale}: {m.queries} queries (budget {m.budget}); '
+                    f'most repeated: {m.top_repeat}',
+                )
+
+    def test_small(self):
+        self._check_scale('small')
+
+    def test_medium(self):
+        self._check_scale('medium')
+
+    def test_large(self):
+        self._check_scale('large')
+
+    def test_query_growth_between_scales(self):
+        results = {scale: measure_scale(scale) for scale in ('small', 'large')}
+        for g in query_growth(results):
+            with self.subTest(endpoint=g.endpoint):
+                if g.known:
+                    self.assertTrue(
+                        g.over_bound,
+                        f'{g.endpoint} no longer grows ({g.queries[0]} -> {g.queries[1]} queries); '
+                        'fixed: remove it from KNOWN_QUERY_GROWTH and lower its QUERY_BUDGETS',
+                    )
+                else:
+                    self.assertFalse(
+                        g.over_bound,
+                        f'{g.endpoint}: {g.queries[0]} -> {g.queries[1]} queries from {g.smaller} to {g.larger} '
+                        f'(bound +{g.bound})',
+                    )
+        self.assertTrue(KNOWN_QUERY_GROWTH <= {g.endpoint for g in query_growth(results)})
+
+
+@override_settings(DEBUG=True)
+class BenchmarkCommandTests(TestCase):
+    def test_json_report_leaves_no_data(self):
+        from courses.models import Course
+
+        out = StringIO()
+        call_command(
+            'benchmark_endpoints', '--scale', 'small', '--endpoint', 'public_courses_list', '--json', stdout=out
+        )
+        report = json.loads(out.getvalue())
+        [row] = report['small']
+        self.assertEqual(row['endpoint'], 'public_courses_list')
+        self.assertLessEqual(row['queries'], row['budget'])
+        self.assertFalse(Course.objects.exists())
+
+    def test_report_marks_known_query_growth(self):
+        out = StringIO()
+        call_command(
+            'benchmark_endpoints', '--scale', 'small', '--scale', 'large',
+            '--endpoint', 'teacher_dashboard', '--endpoint', 'dashboard_overview', stdout=out,
+        )
+        report = out.getvalue()
+        self.assertIn('query growth', report)
+        self.assertIn('[known N+1]', report)
+        self.assertNotIn('dashboard_overview           7 ->', report)
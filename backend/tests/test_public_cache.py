@@ -0,0 +1,99 @@
+"""Tests for the public JSON cache (landing page, ETag / 304, invalidation)."""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from courses.models import Course, CourseReview
+from student.models import EnrolledCourse
+from users.models import StudentProfile
+
+
+_TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "public_cache_tests",
+    }
+}
+
+
+@override_settings(CACHES=_TEST_CACHES, PUBLIC_CACHE_ENABLED=True, RATE_LIMIT_ENABLED=False)
+class PublicCacheTests(TestCase):
+    url = "/api/home/"
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = get_user_model().objects.create_user(
+            username="public-cache-teacher@example.com",
+            email="public-cache-teacher@example.com",
+            password="pass",
+            role="teacher",
+            firebase_uid="public-cache-teacher-uid",
+        )
+
+    def _create_featured_course(self, title):
+        return Course.objects.create(
+            title=title,
+            description="Desc",
+            teacher=self.teacher,
+            category="coding",
+            price=0,
+            is_free=True,
+            featured=True,
+            status="published",
+        )
+
+    def test_landing_is_cached_with_etag(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"])
+        self.assertIn("max-age", first["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_conditional_get_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_course_save_invalidates_landing(self):
+        before = self.client.get(self.url)
+        self.assertEqual(before.json()["featured_courses"], [])
+
+        self._create_featured_course("Featured")
+        after = self.client.get(self.url, HTTP_IF_NONE_MATCH=before["ETag"])
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after["ETag"], before["ETag"])
+        courses = after.json()["featured_courses"]
+        self.assertEqual([c["title"] for c in courses], ["Featured"])
+        self.assertEqual(courses[0]["enrolled_students_count"], 0)
+        self.assertEqual(courses[0]["rating"], 0.0)
+        self.assertEqual(after.json()["stats"]["total_courses"], 1)
+
+    def test_enrollment_invalidates_landing_count(self):
+        course = self._create_featured_course("Featured")
+        before = self.client.get(self.url)
+        self.assertEqual(before.json()["featured_courses"][0]["enrolled_students_count"], 0)
+
+        student = get_user_model().objects.create_user(
+            username="public-cache-student@example.com",
+            email="public-cache-student@example.com",
+            password="pass",
+            role="student",
+            firebase_uid="public-cache-student-uid",
+        )
+        profile = StudentProfile.objects.create(user=student)
+        EnrolledCourse.objects.create(student_profile=profile, course=course, status="active")
+        after = self.client.get(self.url)
+        self.assertEqual(after.json()["featured_courses"][0]["enrolled_students_count"], 1)
+
+    def test_stats_count_distinct_student_names(self):
+        course = self._create_featured_course("Reviewed")
+        for name in ("Ada", "Ada", "", ""):
+            CourseReview.objects.create(course=course, student_name=name, rating=5, review_text="Great")
+        # Same as values('student_name').distinct().count(): the blank name is one value.
+        self.assertEqual(self.client.get(self.url).json()["stats"]["total_students"], 2)
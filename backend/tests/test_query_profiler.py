@@ -0,0 +1,78 @@
+"""Tests for request profiling: fingerprints, query budgets, Server-Timing and the staff page."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from backend.query_profiler import (
+    QueryBudgetExceeded,
+    endpoint_stats,
+    fingerprint,
+    percentile,
+    query_budget,
+)
+
+
+class QueryProfilerTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(
+                username=f"profiler-{i}@example.com",
+                email=f"profiler-{i}@example.com",
+                password="pass",
+                firebase_uid=f"profiler-uid-{i}",
+            )
+            for i in range(3)
+        ]
+
+    def test_fingerprint_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'a''b' AND x IN (%s, %s, %s)"),
+            "SELECT * FROM t WHERE id = ? AND name = ? AND x IN (...)",
+        )
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 50), 3)
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 99), 5)
+
+    def test_query_budget_flags_repeated_statements(self):
+        User = get_user_model()
+        with self.assertRaisesMessage(QueryBudgetExceeded, "3x (budget 1)"):
+            with query_budget(max_duplicates=1):
+                for user in self.users:
+                    User.objects.get(pk=user.pk)
+        with query_budget(max_queries=1, max_duplicates=1) as profile:
+            list(User.objects.filter(pk__in=[u.pk for u in self.users]))
+        self.assertEqual(profile.count, 1)
+
+
+@override_settings(
+    QUERY_PROFILING_ENABLED=True,
+    QUERY_PROFILING_HEADER_TOKEN="profile-me",
+    RATE_LIMIT_ENABLED=False,
+    # The admin base template needs static URLs without a collectstatic manifest.
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+)
+class QueryProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        endpoint_stats.clear()
+
+    def test_server_timing_and_staff_page(self):
+        response = self.client.get("/health/")
+        self.assertNotIn("Server-Timing", response)
+        self.assertNotIn("Server-Timing", self.client.get("/health/", HTTP_X_PROFILING_TOKEN="wrong"))
+        response = self.client.get("/health/", HTTP_X_PROFILING_TOKEN="profile-me")
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertEqual([row["endpoint"] for row in endpoint_stats.snapshot()], ["GET /health/"])
+
+        staff = get_user_model().objects.create_user(
+            username="profiler-staff@example.com",
+            email="profiler-staff@example.com",
+            password="pass",
+            firebase_uid="profiler-staff-uid",
+            is_staff=True,
+        )
+        self.client.force_login(staff)
+        page = self.client.get("/staff/profiling/")
+        self.assertEqual(page.status_code, 200)
+        self.assertContains(page, "GET /health/")
+        self.assertIn("total;dur=", self.client.get("/health/")["Server-Timing"])
@@ -0,0 +1,83 @@
+"""Tests for the sliding-window rate-limit engine and route policies."""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from backend import rate_limit
+from backend.rate_limit import RateLimitPolicy, hit
+from backend.rate_limit_middleware import request_policies
+
+
+_TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "rate_limit_engine_tests",
+    }
+}
+
+_AI_POLICY = {
+    "name": "ai",
+    "path_prefixes": ["/api/ai/"],
+    "path_contains": ["/ai/"],
+    "limit": 2,
+    "window_seconds": 60,
+    "scope": "user",
+}
+
+
+@override_settings(CACHES=_TEST_CACHES)
+class RateLimitEngineTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        rate_limit._leases.clear()
+
+    def test_all_or_nothing_across_policies(self):
+        loose = RateLimitPolicy("loose", 10, 60)
+        strict = RateLimitPolicy("strict", 1, 60)
+        self.assertTrue(hit([("ip:1", loose), ("u:1", strict)]).allowed)
+        denied = hit([("ip:1", loose), ("u:1", strict)])
+        self.assertFalse(denied.allowed)
+        self.assertEqual(denied.retry_after, 60)
+        # The denied request was not recorded against the loose policy.
+        self.assertEqual(len(cache.get("rl:v2:loose:ip:1")), 1)
+
+    def test_local_lease_skips_backend(self):
+        policy = RateLimitPolicy("leased", 10, 60, local_lease=3)
+        with patch.object(rate_limit, "_hit_python", wraps=rate_limit._hit_python) as backend:
+            for _ in range(4):
+                self.assertTrue(hit([("ip:1", policy)]).allowed)
+        self.assertEqual(backend.call_count, 2)
+        # Leased slots count against the window up front.
+        self.assertEqual(len(cache.get("rl:v2:leased:ip:1")), 6)
+
+    def test_backend_error_fails_open(self):
+        with patch.object(rate_limit, "_hit_python", side_effect=OSError("connection refused")):
+            self.assertTrue(hit([("ip:1", RateLimitPolicy("p", 1, 60))]).allowed)
+
+
+@override_settings(
+    CACHES=_TEST_CACHES,
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMIT_REQUESTS_PER_WINDOW=100,
+    RATE_LIMIT_WINDOW_SECONDS=60,
+    RATE_LIMIT_POLICIES=[_AI_POLICY],
+)
+class RoutePolicyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        rate_limit._leases.clear()
+
+    def test_policies_match_routes(self):
+        self.assertEqual([p.name for p in request_policies("/api/courses/")], ["global"])
+        self.assertEqual(
+            [p.name for p in request_policies("/api/courses/lessons/x/ai/generate-quiz/")],
+            ["global", "ai"],
+        )
+
+    def test_ai_route_limited_before_global(self):
+        for _ in range(2):
+            self.assertNotEqual(self.client.get("/api/ai/prompt-templates/x/").status_code, 429)
+        self.assertEqual(self.client.get("/api/ai/prompt-templates/x/").status_code, 429)
+        self.assertEqual(self.client.get("/").status_code, 200)
@@ -0,0 +1,73 @@
+"""Tests for the queued JSON log handler and request correlation ids."""
+
+import io
+import json
+import logging
+import queue
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from backend.request_id_middleware import RequestIdMiddleware
+from backend.structured_logging import QueueingJsonHandler, request_id_var
+
+
+class QueueingJsonHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = QueueingJsonHandler(stream=self.stream)
+        self.logger = logging.getLogger("backend.tests.structured_logging")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def _lines(self):
+        self.handler.listener.stop()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_json_line_with_request_id_and_extra(self):
+        token = request_id_var.set("req-1")
+        try:
+            self.logger.info("Lesson %s done", 7, extra={"course_id": 3})
+        finally:
+            request_id_var.reset(token)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("Failed")
+        first, second = self._lines()
+        self.assertEqual(first["message"], "Lesson 7 done")
+        self.assertEqual(first["severity"], "INFO")
+        self.assertEqual(first["request_id"], "req-1")
+        self.assertEqual(first["course_id"], 3)
+        self.assertNotIn("request_id", second)
+        self.assertIn("ValueError: boom", second["exception"])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        self.handler.listener.stop()
+        self.handler.queue = queue.Queue(1)
+        self.logger.warning("kept")
+        self.logger.warning("dropped")
+        self.assertEqual(self.handler.dropped, 1)
+
+
+class RequestIdMiddlewareTests(SimpleTestCase):
+    def test_echoes_incoming_id_and_scopes_context(self):
+        seen = []
+
+        def view(request):
+            seen.append(request_id_var.get())
+            return HttpResponse()
+
+        middleware = RequestIdMiddleware(view)
+        response = middleware(RequestFactory().get("/", HTTP_X_REQUEST_ID="abc-123"))
+        self.assertEqual(response["X-Request-ID"], "abc-123")
+        self.assertEqual(seen, ["abc-123"])
+        self.assertIsNone(request_id_var.get())
+
+        response = middleware(RequestFactory().get("/", HTTP_X_REQUEST_ID="bad id\n"))
+        self.assertRegex(response["X-Request-ID"], r"^[0-9a-f]{32}$")
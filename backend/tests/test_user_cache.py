@@ -0,0 +1,34 @@
+"""Tests for the per-user cache helper (backend.user_cache)."""
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from backend.user_cache import PerUserCache
+
+
+class PerUserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.builds = []
+        self.cache = PerUserCache('test-user-cache', 'TEST_USER_CACHE_SECONDS', 300, 'Test')
+
+    def _build(self, user_id):
+        self.builds.append(user_id)
+        return {'user': user_id, 'build': len(self.builds)}
+
+    def test_entries_are_cached_per_user_until_invalidated(self):
+        self.assertEqual(self.cache.get(1, self._build), {'user': 1, 'build': 1})
+        self.assertEqual(self.cache.get(1, self._build), {'user': 1, 'build': 1})
+        self.assertEqual(self.cache.get(2, self._build)['user'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.cache.invalidate(1, None)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.cache.get(1, self._build)['build'], 3)
+        self.assertEqual(self.cache.get(2, self._build)['build'], 2)
+
+    @override_settings(TEST_USER_CACHE_SECONDS=0)
+    def test_zero_seconds_disables_caching(self):
+        self.cache.get(1, self._build)
+        self.cache.get(1, self._build)
+        self.assertEqual(self.builds, [1, 1])
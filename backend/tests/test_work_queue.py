@@ -0,0 +1,43 @@
+"""Tests for the shared work-queue helpers (backend.work_queue)."""
+
+import threading
+from datetime import timedelta
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from backend.work_queue import BackgroundDrainer, drain_groups, retry_delay
+
+
+class WorkQueueTests(SimpleTestCase):
+    def test_retry_delay_backs_off_to_the_cap(self):
+        delays = [retry_delay(n, base_seconds=30, max_seconds=100).total_seconds() for n in (1, 2, 3, 4)]
+        self.assertEqual(delays, [30, 60, 100, 100])
+
+    def test_drain_groups_sums_counts(self):
+        totals = drain_groups(
+            [[1, 2], [3]],
+            lambda group: {'done': len(group)},
+            totals={'done': 0},
+            max_workers=2,
+            thread_name_prefix='test-queue',
+        )
+        self.assertEqual(totals, {'done': 3})
+
+    def test_drainer_wakes_up_for_the_next_retry(self):
+        calls = []
+        second_drain = threading.Event()
+        due_times = [timezone.now() + timedelta(milliseconds=50)]
+
+        def drain():
+            calls.append(timezone.now())
+            if len(calls) == 2:
+                second_drain.set()
+            return {}
+
+        drainer = BackgroundDrainer(
+            'test-drainer', drain, next_due=lambda: due_times.pop() if due_times else None
+        )
+        drainer.kick()
+        self.assertTrue(second_drain.wait(5), 'drainer did not wake up for the retry')
+        self.assertGreaterEqual(calls[1] - calls[0], timedelta(milliseconds=40))
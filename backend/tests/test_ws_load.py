@@ -0,0 +1,50 @@
+"""Smoke test for the websocket load harness (backend/ws_load.py)."""
+
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+
+from backend.ws_load import LoadProfile, run_load
+
+
+class WebsocketLoadHarnessTests(TransactionTestCase):
+    def test_small_board_and_ai_run(self):
+        profile = LoadProfile(
+            classrooms=2,
+            students_per_classroom=3,
+            duration_seconds=1.5,
+            presence_hz=4,
+            board_update_hz=4,
+            ai_clients=2,
+            ai_messages_per_client=2,
+            gemini_latency_ms=20,
+            heartbeat_interval=0.5,
+            auto_save_delay=0.2,
+        )
+        report = run_load(profile, prefix='wsload-test')
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.connected, report.clients)
+        self.assertEqual(report.clients, profile.board_clients + 2)
+        # Every board/presence message fans out to the room.
+        self.assertGreater(report.fanout_ms['count'], report.messages_sent / 2)
+        self.assertGreater(report.received_by_type.get('ping', 0), 0)
+        self.assertEqual(report.ai_reply_ms['count'], 4)
+        # Auto-save writes board pages; AI messages are stored on the conversation.
+        self.assertGreater(report.db_writes, 0)
+        self.assertGreater(report.loop_lag_ms['count'], 0)
+
+    @override_settings(DEBUG=True)
+    def test_command_json_report_leaves_no_data(self):
+        from courses.models import Classroom
+
+        out = StringIO()
+        call_command(
+            'ws_load_test', '--classrooms', '1', '--students', '2', '--duration', '1',
+            '--ai-clients', '0', '--json', stdout=out,
+        )
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['connected'], 3)
+        self.assertEqual(report['errors'], [])
+        self.assertFalse(Classroom.objects.exists())
@@ -24,6 +24,7 @@ from communication.staff_messages_views import StaffMessagesInboxPageView
 from teacher.calendar_views import StaffCalendarWeekPageView
 from teacher.roster_views import StaffTeacherRosterPageView
 from billings.ledger_views import StaffPaymentLedgerPageView
+from backend.profiling_views import StaffQueryProfilePageView
 
 # Create API router
 router = DefaultRouter()
@@ -34,6 +35,7 @@ urlpatterns = [
     path("staff/teachers/", StaffTeacherRosterPageView.as_view(), name="staff-teacher-roster"),
     path("staff/messages/", StaffMessagesInboxPageView.as_view(), name="staff-messages-inbox"),
     path("staff/billing/payments/", StaffPaymentLedgerPageView.as_view(), name="staff-payment-ledger"),
+    path("staff/profiling/", StaffQueryProfilePageView.as_view(), name="staff-query-profiling"),
 
     # API endpoints
     path("api/auth/", include('authentication.urls')),
@@ -0,0 +1,73 @@
+"""
+Per-user cache entries built from the database (course access index,
+student timeline).
+
+Each entry lives under "<prefix>:<user id>" for a settings-controlled number
+of seconds (0 disables caching). Invalidation deletes the users' entries
+immediately and again after commit, so a request that read pre-commit data in
+between cannot keep a stale entry alive. A cache outage falls back to
+building the value live.
+
+Usage:
+
+    _cache = PerUserCache("course-access", "COURSE_ACCESS_CACHE_SECONDS", 300, "Course access")
+    index = _cache.get(user.pk, build_course_access)
+    _cache.invalidate(*user_ids)
+"""
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class PerUserCache:
+    def __init__(self, prefix: str, seconds_setting: str, default_seconds: int, label: str):
+        self.prefix = prefix
+        self.seconds_setting = seconds_setting
+        self.default_seconds = default_seconds
+        self.label = label
+
+    def seconds(self) -> int:
+        return int(getattr(settings, self.seconds_setting, self.default_seconds))
+
+    def key(self, user_id) -> str:
+        return f"{self.prefix}:{user_id}"
+
+    def get(self, user_id, build: Callable):
+        """The cached build(user_id), building and storing it on a miss."""
+        seconds = self.seconds()
+        if seconds <= 0:
+            return build(user_id)
+        try:
+            value = cache.get(self.key(user_id))
+        except Exception as e:
+            logger.warning("%s cache read failed: %s", self.label, e)
+            return build(user_id)
+        if value is not None:
+            return value
+        value = build(user_id)
+        try:
+            cache.set(self.key(user_id), value, seconds)
+        except Exception as e:
+            logger.warning("%s cache write failed: %s", self.label, e)
+        return value
+
+    def _delete_now(self, user_ids) -> None:
+        try:
+            cache.delete_many([self.key(user_id) for user_id in user_ids])
+        except Exception as e:
+            logger.warning("%s cache invalidation failed: %s", self.label, e)
+
+    def invalidate(self, *user_ids) -> None:
+        """Drop these users' entries; again after commit so pre-commit reads cannot linger."""
+        user_ids = [user_id for user_id in user_ids if user_id is not None]
+        if not user_ids:
+            return
+        self._delete_now(user_ids)
+        transaction.on_commit(lambda: self._delete_now(user_ids))
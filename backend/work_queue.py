@@ -0,0 +1,152 @@
+"""
+Shared pieces of the database-backed work queues (billings.services.webhook_inbox,
+communication.services.notification_outbox).
+
+Queue rows carry status, attempts, available_at and locked_at. Workers claim
+due rows with a conditional UPDATE filtered by claimable_q(), so two workers
+(or two instances) never run the same row; a worker that died mid-row leaves
+it locked, and it becomes claimable again after `stale_after`. Failures back
+off with retry_delay() until the queue's max attempts, then dead-letter.
+drain_groups() runs independent groups of rows in parallel.
+
+BackgroundDrainer runs a queue's drain function on at most one thread per
+process. It is kicked after the row commits and, when rows are waiting on a
+backoff, wakes itself up again at the earliest available_at.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Iterable
+
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int, *, base_seconds: int, max_seconds: int) -> timedelta:
+    """Exponential backoff: base, 2x base, 4x base, ... capped at max_seconds."""
+    seconds = base_seconds * (2 ** max(0, attempts - 1))
+    return timedelta(seconds=min(seconds, max_seconds))
+
+
+def claimable_q(*, ready: list[str], busy: str, stale_after: timedelta, now) -> Q:
+    """Rows in a `ready` status that are due, plus `busy` rows whose worker went away."""
+    return Q(status__in=ready, available_at__lte=now) | Q(
+        status=busy, locked_at__lt=now - stale_after
+    )
+
+
+def drain_groups(
+    groups: Iterable,
+    process: Callable[[object], dict],
+    *,
+    totals: dict,
+    max_workers: int,
+    thread_name_prefix: str,
+) -> dict:
+    """
+    Run process(group) for every group (one customer's events, one channel's
+    rows), in a thread pool when more than one worker is allowed, and add the
+    returned counts to `totals`.
+    """
+    groups = list(groups)
+
+    def _in_thread(group):
+        try:
+            return process(group)
+        finally:
+            close_old_connections()
+
+    workers = min(max_workers, len(groups))
+    if workers <= 1:
+        results = [process(group) for group in groups]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as pool:
+            results = list(pool.map(_in_thread, groups))
+    for counts in results:
+        for key, value in counts.items():
+            totals[key] += value
+    return totals
+
+
+class BackgroundDrainer:
+    """
+    One drainer thread per process for one queue.
+
+    `drain` processes one batch and returns its counts; `more(counts)` says a
+    full batch may have left rows behind, so drain again straight away.
+    `next_due()` returns the earliest future available_at of rows that will
+    be retried (or None); the drainer schedules a wake-up for it so a failed
+    row is retried in-process without waiting for the next kick.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        drain: Callable[[], dict],
+        *,
+        more: Callable[[dict], bool] | None = None,
+        next_due: Callable[[], object] | None = None,
+    ):
+        self.name = name
+        self._drain = drain
+        self._more = more
+        self._next_due = next_due
+        self._lock = threading.Lock()
+        self._requested = threading.Event()
+        self._timer_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._timer_at = None
+
+    def kick(self) -> None:
+        """Drain on a background thread; a running drainer sees the flag and loops again."""
+        self._requested.set()
+        if not self._lock.acquire(blocking=False):
+            return
+        threading.Thread(target=self._run, daemon=True, name=self.name).start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                while self._requested.is_set():
+                    self._requested.clear()
+                    counts = self._drain()
+                    if self._more is not None and self._more(counts):
+                        self._requested.set()
+                self._schedule_wake_up()
+            except Exception as exc:
+                logger.error('%s drain failed: %s', self.name, exc, exc_info=True)
+            finally:
+                close_old_connections()
+                self._lock.release()
+            # A kick that raced with our exit still needs a drainer.
+            if not self._requested.is_set() or not self._lock.acquire(blocking=False):
+                return
+
+    def _schedule_wake_up(self) -> None:
+        if self._next_due is None:
+            return
+        due = self._next_due()
+        if due is None:
+            return
+        with self._timer_lock:
+            if self._timer is not None and self._timer.is_alive() and self._timer_at <= due:
+                return  # An earlier wake-up already covers this row.
+            if self._timer is not None:
+                self._timer.cancel()
+            delay = max(0.0, (due - timezone.now()).total_seconds())
+            self._timer = threading.Timer(delay, self._wake_up)
+            self._timer.daemon = True
+            self._timer_at = due
+            self._timer.start()
+
+    def _wake_up(self) -> None:
+        with self._timer_lock:
+            self._timer = None
+            self._timer_at = None
+        self.kick()
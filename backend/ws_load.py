@@ -0,0 +1,394 @@
+"""
+In-process websocket load harness for the classroom board and AI consumers.
+
+Runs hundreds of Channels WebsocketCommunicator clients against
+courses.consumers.BoardSyncConsumer and ai.consumers.CourseGenerationConsumer
+(a BaseAIConsumer) on one event loop, with an in-memory channel layer. Firebase
+token checks are stubbed (the token is the user's firebase_uid) and so is
+Gemini (StubGeminiAgent, with a configurable blocking latency like the real SDK
+call). Users, classes, classrooms and boards are real rows, so auth lookups and
+board auto-saves hit the database.
+
+Consumer timers (heartbeat, idle check, auto-save) are shortened through a
+subclass, so a run of a few seconds exercises them. Reports:
+
+- messages sent by clients and delivered to clients, per second;
+- fan-out latency percentiles (client send -> each peer's receive) for board
+  and presence updates, and request -> reply latency for AI messages;
+- DB writes (INSERT/UPDATE/DELETE) and writes per minute;
+- event-loop lag percentiles (how late a 10 ms timer fires).
+
+Used by `python manage.py ws_load_test` and backend/tests/test_ws_load.py.
+Run it against a development database: the seeded rows are not removed unless
+the caller wraps the run in a transaction (the command does).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.layers import channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test.utils import override_settings
+from django.urls import re_path
+
+from backend.query_profiler import percentile, profile_queries
+
+User = get_user_model()
+
+_WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    classrooms: int = 10
+    students_per_classroom: int = 20
+    duration_seconds: float = 10.0
+    # Per client: cursor/presence messages per second (teacher and students).
+    presence_hz: float = 2.0
+    # Teacher board edits per second (each with full_state, so auto-save runs).
+    board_update_hz: float = 1.0
+    # AI course-generation clients and messages each sends.
+    ai_clients: int = 0
+    ai_messages_per_client: int = 3
+    gemini_latency_ms: float = 200.0
+    # Consumer timers, shortened so short runs exercise them.
+    heartbeat_interval: float = 1.0
+    idle_check_interval: float = 1.0
+    auto_save_delay: float = 0.5
+    channel_capacity: int = 10_000
+
+    @property
+    def board_clients(self) -> int:
+        return self.classrooms * (self.students_per_classroom + 1)
+
+
+@dataclass
+class LoadReport:
+    clients: int = 0
+    connected: int = 0
+    duration_seconds: float = 0.0
+    messages_sent: int = 0
+    messages_received: int = 0
+    received_by_type: dict = field(default_factory=dict)
+    fanout_ms: dict = field(default_factory=dict)
+    ai_reply_ms: dict = field(default_factory=dict)
+    db_writes: int = 0
+    db_queries: int = 0
+    loop_lag_ms: dict = field(default_factory=dict)
+    errors: list = field(default_factory=list)
+
+    @property
+    def sent_per_second(self) -> float:
+        return self.messages_sent / self.duration_seconds if self.duration_seconds else 0.0
+
+    @property
+    def received_per_second(self) -> float:
+        return self.messages_received / self.duration_seconds if self.duration_seconds else 0.0
+
+    @property
+    def db_writes_per_minute(self) -> float:
+        return self.db_writes * 60 / self.duration_seconds if self.duration_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data.update(
+            sent_per_second=self.sent_per_second,
+            received_per_second=self.received_per_second,
+            db_writes_per_minute=self.db_writes_per_minute,
+        )
+        return data
+
+
+def _summary(samples_ms) -> dict:
+    return {
+        'count': len(samples_ms),
+        'p50': percentile(samples_ms, 50),
+        'p95': percentile(samples_ms, 95),
+        'p99': percentile(samples_ms, 99),
+        'max': max(samples_ms, default=0.0),
+    }
+
+
+# Stubs ------------------------------------------------------------------------
+
+async def stub_verify_firebase_token(token):
+    """Treat the token as the firebase_uid of an existing user (no Firebase call)."""
+    user = await User.objects.filter(firebase_uid=token).values('firebase_uid', 'email').afirst()
+    if user is None:
+        raise ValueError('Invalid authentication token')
+    return {'uid': user['firebase_uid'], 'email': user['email']}
+
+
+class _StubResponse:
+    def __init__(self, text):
+        self.text = text
+        self.candidates = []
+
+
+class _StubChat:
+    def __init__(self, latency_seconds):
+        self.latency_seconds = latency_seconds
+
+    def send_message(self, content, generation_config=None, stream=False):
+        # Blocks like the real Vertex AI SDK call the consumer makes on the event loop.
+        time.sleep(self.latency_seconds)
+        return _StubResponse(f'Here is an outline for: {content[:40]}')
+
+
+class StubGeminiAgent:
+    latency_seconds = 0.2
+
+    def start_chat_session(self, system_instruction=None, temperature=0.7, enable_function_calling=False):
+        return _StubChat(self.latency_seconds), {}
+
+
+# Seeding ----------------------------------------------------------------------
+
+@dataclass
+class _Room:
+    classroom_id: str
+    page_id: str
+    teacher_uid: str
+    student_uids: list
+
+
+def seed_classrooms(profile: LoadProfile, prefix: str = 'wsload') -> list[_Room]:
+    from courses.models import Board, Class, Course
+
+    password = make_password(None)
+
+    def make_user(kind, n, role):
+        return User(
+            username=f'{prefix}-{kind}-{n}@example.com',
+            email=f'{prefix}-{kind}-{n}@example.com',
+            first_name=kind.title(),
+            last_name=str(n),
+            firebase_uid=f'{prefix}-{kind}-{n}',
+            role=role,
+            password=password,
+        )
+
+    teachers = User.objects.bulk_create([make_user('teacher', n, 'teacher') for n in range(profile.classrooms)])
+    students = User.objects.bulk_create([
+        make_user('student', n, 'student')
+        for n in range(profile.classrooms * profile.students_per_classroom)
+    ])
+    rooms = []
+    for n, teacher in enumerate(teachers):
+        course = Course.objects.create(
+            title=f'{prefix} course {n}', description='Load test', teacher=teacher,
+            category='Programming', price=0, is_free=True,
+        )
+        klass = Class.objects.create(name=f'{prefix} class {n}', course=course, teacher=teacher)
+        members = students[n * profile.students_per_classroom:(n + 1) * profile.students_per_classroom]
+        klass.students.add(*members)
+        classroom, _ = klass.get_or_create_classroom()
+        board = Board.objects.create(classroom=classroom, created_by=teacher, title=f'{klass.name} Board')
+        page = board.get_or_create_default_page()
+        rooms.append(_Room(str(classroom.id), str(page.id), teacher.firebase_uid, [s.firebase_uid for s in members]))
+    return rooms
+
+
+def seed_ai_users(profile: LoadProfile, prefix: str = 'wsload') -> list[str]:
+    password = make_password(None)
+    users = User.objects.bulk_create([
+        User(
+            username=f'{prefix}-ai-{n}@example.com', email=f'{prefix}-ai-{n}@example.com',
+            firebase_uid=f'{prefix}-ai-{n}', role='teacher', password=password,
+        )
+        for n in range(profile.ai_clients)
+    ])
+    return [user.firebase_uid for user in users]
+
+
+# Harness ----------------------------------------------------------------------
+
+def _tuned(consumer_cls, profile: LoadProfile):
+    """Consumer subclass with the profile's (short) timer intervals."""
+
+    class Tuned(consumer_cls):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.HEARTBEAT_INTERVAL = profile.heartbeat_interval
+            self.IDLE_CHECK_INTERVAL = profile.idle_check_interval
+            self.AUTO_SAVE_DELAY = profile.auto_save_delay
+
+    Tuned.__name__ = Tuned.__qualname__ = f'Tuned{consumer_cls.__name__}'
+    return Tuned
+
+
+def _application(routing_patterns, consumer_cls, profile):
+    """URLRouter using the real route regexes, pointed at the tuned consumer."""
+    pattern = next(p for p in routing_patterns if p.callback.consumer_class is consumer_cls)
+    return URLRouter([re_path(pattern.pattern.regex.pattern, _tuned(consumer_cls, profile).as_asgi())])
+
+
+class _Run:
+    def __init__(self, profile: LoadProfile):
+        self.profile = profile
+        self.report = LoadReport()
+        self.fanout = []
+        self.ai_reply = []
+        self.lag = []
+        self.received = {}
+        self.stop = None
+
+    def _count(self, message_type):
+        self.report.messages_received += 1
+        self.received[message_type] = self.received.get(message_type, 0) + 1
+
+    async def _send(self, comm, data):
+        self.report.messages_sent += 1
+        await comm.send_to(text_data=json.dumps(data))
+
+    async def _connect(self, app, path, uid):
+        comm = WebsocketCommunicator(app, path)
+        connected, _ = await comm.connect()
+        if not connected:
+            self.report.errors.append(f'{uid}: connect refused')
+            return None
+        await comm.receive_json_from()  # "connected"
+        await self._send(comm, {'type': 'auth', 'token': uid})
+        reply = await comm.receive_json_from(timeout=10)
+        if reply.get('type') != 'auth_success':
+            self.report.errors.append(f"{uid}: {reply.get('message', reply.get('type'))}")
+            return None
+        self.report.connected += 1
+        return comm
+
+    async def _reader(self, comm, pending_ai=None):
+        """Drain a client's messages: answer pings, record latencies."""
+        while True:
+            message = await comm.receive_output(timeout=3600)
+            if message['type'] != 'websocket.send':
+                return
+            now = time.perf_counter()
+            data = json.loads(message['text'])
+            message_type = data.get('type')
+            self._count(message_type)
+            if message_type == 'ping':
+                await self._send(comm, {'type': 'pong'})
+            elif message_type in ('board_update', 'presence_update'):
+                sent_at = (data.get('presence') or {}).get('sent_at')
+                if sent_at:
+                    self.fanout.append((now - sent_at) * 1000)
+            elif message_type == 'message' and pending_ai:
+                self.ai_reply.append((now - pending_ai.pop(0)) * 1000)
+
+    async def _board_client(self, comm, room, is_teacher):
+        presence_every = 1 / self.profile.presence_hz if self.profile.presence_hz else None
+        update_every = 1 / self.profile.board_update_hz if is_teacher and self.profile.board_update_hz else None
+        next_presence = next_update = time.perf_counter()
+        version = 0
+        while not self.stop.is_set():
+            now = time.perf_counter()
+            if presence_every and now >= next_presence:
+                next_presence = now + presence_every
+                await self._send(comm, {'type': 'presence_update', 'presence': {'cursor': [version, 1], 'sent_at': now}})
+            if update_every and now >= next_update:
+                next_update = now + update_every
+                version += 1
+                shape = {f'shape:{version}': {'x': version, 'y': 1}}
+                await self._send(comm, {
+                    'type': 'board_update',
+                    'changes': {'added': shape, 'updated': {}, 'removed': {}},
+                    'presence': {'sent_at': now},
+                    'page_id': room.page_id,
+                    'full_state': {'shapes': shape, 'version': version},
+                })
+            await asyncio.sleep(0.01)
+
+    async def _ai_client(self, comm, pending):
+        for n in range(self.profile.ai_messages_per_client):
+            if self.stop.is_set():
+                return
+            pending.append(time.perf_counter())
+            await self._send(comm, {'type': 'message', 'content': f'Create a course on topic {n}'})
+            while pending and not self.stop.is_set():
+                await asyncio.sleep(0.01)
+
+    async def _lag_monitor(self, interval=0.01):
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.lag.append(max(0.0, (time.perf_counter() - start - interval) * 1000))
+
+    async def run(self, rooms, ai_uids):
+        from ai.consumers import CourseGenerationConsumer
+        from ai.routing import websocket_urlpatterns as ai_patterns
+        from courses.consumers import BoardSyncConsumer
+        from courses.routing import websocket_urlpatterns as course_patterns
+
+        board_app = _application(course_patterns, BoardSyncConsumer, self.profile)
+        ai_app = _application(ai_patterns, CourseGenerationConsumer, self.profile)
+        self.stop = asyncio.Event()
+        self.report.clients = sum(1 + len(room.student_uids) for room in rooms) + len(ai_uids)
+
+        clients = []
+        for room in rooms:
+            path = f'/ws/classroom/{room.classroom_id}/board/'
+            for uid, is_teacher in [(room.teacher_uid, True)] + [(uid, False) for uid in room.student_uids]:
+                comm = await self._connect(board_app, path, uid)
+                if comm:
+                    clients.append((comm, self._board_client(comm, room, is_teacher), None))
+        for uid in ai_uids:
+            comm = await self._connect(ai_app, '/ws/ai/course-generation/', uid)
+            if comm:
+                pending = []
+                clients.append((comm, self._ai_client(comm, pending), pending))
+
+        start = time.perf_counter()
+        readers = [asyncio.create_task(self._reader(comm, pending)) for comm, _work, pending in clients]
+        workers = [asyncio.create_task(work) for _comm, work, _pending in clients]
+        monitor = asyncio.create_task(self._lag_monitor())
+        await asyncio.sleep(self.profile.duration_seconds)
+        self.stop.set()
+        await asyncio.gather(*workers, monitor, return_exceptions=True)
+        # Let pending auto-saves land before disconnecting.
+        await asyncio.sleep(self.profile.auto_save_delay * 2)
+        self.report.duration_seconds = time.perf_counter() - start
+        for task in readers:
+            task.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        for comm, _work, _pending in clients:
+            await comm.disconnect()
+
+        self.report.received_by_type = self.received
+        self.report.fanout_ms = _summary(self.fanout)
+        self.report.ai_reply_ms = _summary(self.ai_reply)
+        self.report.loop_lag_ms = _summary(self.lag)
+        return self.report
+
+
+def run_load(profile: LoadProfile, prefix: str = 'wsload') -> LoadReport:
+    """Seed users/classrooms for `profile`, drive the consumers and return the report."""
+    rooms = seed_classrooms(profile, prefix) if profile.classrooms else []
+    ai_uids = seed_ai_users(profile, prefix)
+    layers = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+            'CONFIG': {'capacity': profile.channel_capacity},
+        }
+    }
+    StubGeminiAgent.latency_seconds = profile.gemini_latency_ms / 1000
+    with ExitStack() as stack:
+        stack.enter_context(override_settings(CHANNEL_LAYERS=layers))
+        stack.enter_context(mock.patch('courses.consumers.verify_firebase_token', stub_verify_firebase_token))
+        stack.enter_context(mock.patch('ai.consumers.verify_firebase_token', stub_verify_firebase_token))
+        stack.enter_context(mock.patch('ai.consumers.GeminiAgent', StubGeminiAgent))
+        stack.callback(channel_layers.backends.clear)
+        channel_layers.backends.clear()
+        with profile_queries() as queries:
+            report = async_to_sync(_Run(profile).run)(rooms, ai_uids)
+    report.db_queries = queries.count
+    report.db_writes = sum(1 for _fp, _ms, sql in queries.statements if sql.lstrip().upper().startswith(_WRITE_PREFIXES))
+    return report
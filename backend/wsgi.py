@@ -22,6 +22,10 @@ print("🚀 DEBUG: Getting WSGI application...")
 application = get_wsgi_application()
 print("🚀 DEBUG: WSGI application loaded successfully!")
 
+from backend.clients import install_warm_up  # noqa: E402
+
+install_warm_up()
+
 # Test database connection
 try:
     from django.db import connection
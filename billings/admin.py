@@ -40,7 +40,18 @@ class SubscribersAdmin(admin.ModelAdmin):
 
 @admin.register(WebhookEvent)
 class WebhookEventAdmin(admin.ModelAdmin):
-    list_display = ("stripe_event_id", "type", "processed_at")
-    search_fields = ("stripe_event_id", "type")
+    list_display = ("stripe_event_id", "type", "status", "attempts", "stripe_customer_id", "received_at", "processed_at")
+    list_filter = ("status", "type")
+    search_fields = ("stripe_event_id", "type", "stripe_customer_id")
+    readonly_fields = ("received_at", "processed_at", "locked_at")
+    actions = ["replay_events"]
+
+    @admin.action(description="Replay selected events")
+    def replay_events(self, request, queryset):
+        from .services.webhook_inbox import kick_inbox_worker, requeue_events
+
+        count = requeue_events(queryset)
+        kick_inbox_worker()
+        self.message_user(request, f"Queued {count} event(s) for reprocessing.")
 
 # Register your models here.
@@ -0,0 +1,81 @@
+"""
+Drain or replay the Stripe webhook inbox.
+
+    # Process everything that is due (run from cron / Cloud Scheduler):
+    python manage.py replay_stripe_webhooks
+
+    # Re-queue dead-lettered events, then process them:
+    python manage.py replay_stripe_webhooks --status dead
+
+    # Reprocess specific events (even if already processed):
+    python manage.py replay_stripe_webhooks --event-id evt_123 --event-id evt_456
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from billings.models import WebhookEvent
+from billings.services.webhook_inbox import drain_inbox, requeue_events
+
+
+class Command(BaseCommand):
+    help = 'Process due Stripe webhook inbox events, optionally re-queueing stored events first.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event-id', action='append', dest='event_ids', help='Stripe event ID to replay')
+        parser.add_argument(
+            '--status',
+            action='append',
+            choices=[choice for choice, _ in WebhookEvent.STATUS_CHOICES],
+            help='Replay events in this status (e.g. dead, failed)',
+        )
+        parser.add_argument('--type', dest='event_type', help='Only events of this Stripe type')
+        parser.add_argument('--since-hours', type=int, help='Only events received in the last N hours')
+        parser.add_argument('--workers', type=int, help='Worker pool size (default: STRIPE_WEBHOOK_INBOX_WORKERS)')
+        parser.add_argument('--dry-run', action='store_true', help='List matching events without changing anything')
+
+    def handle(self, *args, **options):
+        selectors = any(
+            options.get(key) for key in ('event_ids', 'status', 'event_type', 'since_hours')
+        )
+        if selectors:
+            qs = WebhookEvent.objects.all()
+            if options.get('event_ids'):
+                qs = qs.filter(stripe_event_id__in=options['event_ids'])
+            if options.get('status'):
+                qs = qs.filter(status__in=options['status'])
+            if options.get('event_type'):
+                qs = qs.filter(type=options['event_type'])
+            if options.get('since_hours') is not None:
+                qs = qs.filter(received_at__gte=timezone.now() - timedelta(hours=options['since_hours']))
+
+            if options['dry_run']:
+                for event in qs.order_by('received_at').only('stripe_event_id', 'type', 'status', 'attempts'):
+                    self.stdout.write(f'  {event.stripe_event_id} | {event.type} | {event.status} | attempts={event.attempts}')
+                self.stdout.write(self.style.WARNING(f'DRY RUN - {qs.count()} event(s) would be replayed'))
+                return
+
+            count = requeue_events(qs)
+            self.stdout.write(f'Re-queued {count} event(s)')
+        elif options['dry_run']:
+            due = WebhookEvent.objects.filter(
+                status__in=[WebhookEvent.STATUS_PENDING, WebhookEvent.STATUS_FAILED],
+                available_at__lte=timezone.now(),
+            ).count()
+            self.stdout.write(self.style.WARNING(f'DRY RUN - {due} event(s) due'))
+            return
+
+        totals = {'processed': 0, 'failed': 0, 'waiting': 0}
+        while True:
+            counts = drain_inbox(max_workers=options.get('workers'))
+            for key, value in counts.items():
+                totals[key] += value
+            # Stop once a pass makes no progress (remaining events are waiting on retries).
+            if not counts['processed']:
+                break
+
+        self.stdout.write(
+            f"Summary: processed={totals['processed']} failed={totals['failed']} waiting={totals['waiting']}"
+        )
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:55
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billings', '0006_payment_enrolled_course'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookevent',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='available_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the next attempt may run'),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='last_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='received_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        # Rows logged before the inbox existed were written only after success.
+        migrations.AddField(
+            model_name='webhookevent',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed (will retry)'), ('dead', 'Dead letter')], default='processed', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='webhookevent',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed (will retry)'), ('dead', 'Dead letter')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='stripe_created',
+            field=models.DateTimeField(blank=True, help_text='Event creation time reported by Stripe', null=True),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='stripe_customer_id',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='webhookevent',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='webhookevent',
+            index=models.Index(fields=['status', 'available_at'], name='billing_web_status_52536d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='webhookevent',
+            index=models.Index(fields=['stripe_customer_id', 'stripe_created'], name='billing_web_stripe__a96abb_idx'),
+        ),
+    ]
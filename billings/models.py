@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class BillingProduct(models.Model):
@@ -184,14 +185,45 @@ class Subscribers(models.Model):
 
 
 class WebhookEvent(models.Model):
-    """Idempotency log of processed Stripe webhooks."""
+    """
+    Durable inbox of verified Stripe webhooks.
+
+    Rows are written as soon as the signature checks out (the unique
+    stripe_event_id makes redeliveries no-ops) and processed afterwards by
+    billings.services.webhook_inbox, which owns the status transitions.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_PROCESSED = 'processed'
+    STATUS_FAILED = 'failed'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_PROCESSED, 'Processed'),
+        (STATUS_FAILED, 'Failed (will retry)'),
+        (STATUS_DEAD, 'Dead letter'),
+    ]
+
     stripe_event_id = models.CharField(max_length=255, unique=True)
     type = models.CharField(max_length=255)
     payload = models.JSONField()
-    processed_at = models.DateTimeField(auto_now_add=True)
+    stripe_customer_id = models.CharField(max_length=255, blank=True, default='', db_index=True)
+    stripe_created = models.DateTimeField(null=True, blank=True, help_text="Event creation time reported by Stripe")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    available_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the next attempt may run")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    received_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'billing_webhook_events'
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['stripe_customer_id', 'stripe_created']),
+        ]
 
     def __str__(self) -> str:
         return self.stripe_event_id
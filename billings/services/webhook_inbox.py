@@ -0,0 +1,285 @@
+"""
+Durable inbox for Stripe webhooks.
+
+StripeWebhookView verifies the signature, stores the event here (unique on
+stripe_event_id, so concurrent redeliveries collapse to one row) and returns
+200 immediately. Events are then processed off the request path:
+
+- one background drainer thread per process (backend.work_queue), kicked
+  after the insert commits;
+- a bounded worker pool, with events grouped by Stripe customer so one
+  customer's events always run in Stripe `created` order;
+- exponential-backoff retries (the drainer wakes itself up when the
+  earliest retry is due), then dead-lettering after
+  STRIPE_WEBHOOK_MAX_ATTEMPTS.
+
+`manage.py replay_stripe_webhooks` drains due events (cron / Cloud Scheduler)
+and re-queues stored events for reprocessing.
+"""
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from backend.work_queue import BackgroundDrainer, claimable_q, drain_groups, retry_delay
+from billings.models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+# A worker that died mid-event leaves it in "processing"; reclaim after this long.
+STALE_PROCESSING_AFTER = timedelta(minutes=10)
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+DRAIN_BATCH_SIZE = 500
+
+
+def _max_attempts() -> int:
+    return max(1, int(getattr(settings, 'STRIPE_WEBHOOK_MAX_ATTEMPTS', 8)))
+
+
+def _worker_count() -> int:
+    return max(1, int(getattr(settings, 'STRIPE_WEBHOOK_INBOX_WORKERS', 4)))
+
+
+def _customer_id_for(obj) -> str:
+    """Stripe customer that owns the event object ('' when there is none)."""
+    if not obj:
+        return ''
+    if obj.get('object') == 'customer':
+        return str(obj.get('id') or '')
+    customer = obj.get('customer')
+    if isinstance(customer, dict):
+        customer = customer.get('id')
+    return str(customer or '')
+
+
+def record_event(event) -> tuple[WebhookEvent, bool]:
+    """
+    Persist a verified Stripe event. Returns (row, created).
+
+    created=False means Stripe redelivered an event we already have.
+    """
+    data = event['data']
+    created_ts = event.get('created')
+    stripe_created = (
+        datetime.fromtimestamp(created_ts, tz=dt_timezone.utc) if created_ts else None
+    )
+    try:
+        with transaction.atomic():
+            row = WebhookEvent.objects.create(
+                stripe_event_id=event['id'],
+                type=event['type'],
+                payload=data,
+                stripe_customer_id=_customer_id_for(data.get('object')),
+                stripe_created=stripe_created,
+            )
+        return row, True
+    except IntegrityError:
+        return WebhookEvent.objects.get(stripe_event_id=event['id']), False
+
+
+def dispatch_event(webhook_event: WebhookEvent) -> None:
+    """Run the StripeWebhookView handler for a stored event (raises on failure)."""
+    import stripe
+
+    from billings.views import StripeWebhookView, get_stripe_client
+
+    get_stripe_client()
+    # Rebuild Stripe objects so handlers keep attribute access (invoice.customer, ...).
+    event = stripe.Event.construct_from(
+        {
+            'id': webhook_event.stripe_event_id,
+            'object': 'event',
+            'type': webhook_event.type,
+            'data': webhook_event.payload,
+        },
+        stripe.api_key,
+    )
+    StripeWebhookView().handle_event(event['type'], event['data']['object'])
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return retry_delay(attempts, base_seconds=RETRY_BASE_SECONDS, max_seconds=RETRY_MAX_SECONDS)
+
+
+def _claimable_q(now):
+    return claimable_q(
+        ready=[WebhookEvent.STATUS_PENDING, WebhookEvent.STATUS_FAILED],
+        busy=WebhookEvent.STATUS_PROCESSING,
+        stale_after=STALE_PROCESSING_AFTER,
+        now=now,
+    )
+
+
+def process_event(webhook_event: WebhookEvent) -> bool:
+    """
+    Claim and process one event. Returns True once it is processed.
+
+    The claim is a conditional UPDATE, so two workers (or two instances)
+    never run the same event at the same time.
+    """
+    now = timezone.now()
+    claimed = (
+        WebhookEvent.objects.filter(pk=webhook_event.pk)
+        .filter(_claimable_q(now))
+        .update(
+            status=WebhookEvent.STATUS_PROCESSING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+    )
+    if not claimed:
+        return False
+    webhook_event.refresh_from_db()
+
+    try:
+        dispatch_event(webhook_event)
+    except Exception as exc:
+        attempts = webhook_event.attempts
+        dead = attempts >= _max_attempts()
+        WebhookEvent.objects.filter(pk=webhook_event.pk).update(
+            status=WebhookEvent.STATUS_DEAD if dead else WebhookEvent.STATUS_FAILED,
+            last_error=f'{type(exc).__name__}: {exc}'[:2000],
+            available_at=timezone.now() + _retry_delay(attempts),
+            locked_at=None,
+        )
+        log = logger.error if dead else logger.warning
+        log(
+            'Stripe webhook %s (%s) failed attempt %s/%s%s: %s',
+            webhook_event.stripe_event_id,
+            webhook_event.type,
+            attempts,
+            _max_attempts(),
+            ' — dead-lettered' if dead else '',
+            exc,
+            exc_info=dead,
+        )
+        return False
+
+    WebhookEvent.objects.filter(pk=webhook_event.pk).update(
+        status=WebhookEvent.STATUS_PROCESSED,
+        processed_at=timezone.now(),
+        last_error='',
+        locked_at=None,
+    )
+    logger.info('Stripe webhook %s (%s) processed', webhook_event.stripe_event_id, webhook_event.type)
+    return True
+
+
+def _process_customer_queue(events: list[WebhookEvent], now) -> dict:
+    """Process one customer's events in order; stop at the first one that cannot run yet."""
+    counts = {'processed': 0, 'failed': 0, 'waiting': 0}
+    for index, event in enumerate(events):
+        if event.status == WebhookEvent.STATUS_PROCESSING and (
+            event.locked_at and event.locked_at >= now - STALE_PROCESSING_AFTER
+        ):
+            counts['waiting'] += len(events) - index
+            break
+        if event.status != WebhookEvent.STATUS_PROCESSING and event.available_at > now:
+            counts['waiting'] += len(events) - index
+            break
+        if process_event(event):
+            counts['processed'] += 1
+        else:
+            # Later events for this customer wait for this one's retry.
+            counts['failed'] += 1
+            counts['waiting'] += len(events) - index - 1
+            break
+    return counts
+
+
+def _open_events():
+    """Events not yet processed or dead-lettered, in Stripe `created` order."""
+    return (
+        WebhookEvent.objects.filter(
+            status__in=[
+                WebhookEvent.STATUS_PENDING,
+                WebhookEvent.STATUS_FAILED,
+                WebhookEvent.STATUS_PROCESSING,
+            ]
+        )
+        .defer('payload')
+        .order_by(F('stripe_created').asc(nulls_last=True), 'received_at', 'id')
+    )
+
+
+def process_inline(webhook_event: WebhookEvent) -> dict:
+    """
+    Process a just-recorded event on the request thread (STRIPE_WEBHOOK_PROCESS_INLINE)
+    with the drainer's per-customer ordering: the customer's earlier open events
+    run first, and if one of them is running elsewhere or waiting on a retry,
+    this event waits behind it. Returns counts like drain_inbox().
+    """
+    if webhook_event.stripe_customer_id:
+        events = list(_open_events().filter(stripe_customer_id=webhook_event.stripe_customer_id))
+    else:
+        events = [webhook_event]
+    counts = _process_customer_queue(events, timezone.now())
+    if counts['failed'] or counts['waiting']:
+        kick_inbox_worker()
+    return counts
+
+
+def next_retry_at():
+    """Earliest future available_at of an event waiting on a retry (None when there is none)."""
+    return WebhookEvent.objects.filter(
+        status__in=[WebhookEvent.STATUS_PENDING, WebhookEvent.STATUS_FAILED],
+        available_at__gt=timezone.now(),
+    ).aggregate(due=Min('available_at'))['due']
+
+
+def drain_inbox(*, max_workers: int | None = None, limit: int = DRAIN_BATCH_SIZE) -> dict:
+    """
+    Process every due inbox event once. Returns counts.
+
+    Events without a customer get their own queue so they run fully in parallel.
+    """
+    now = timezone.now()
+    open_events = list(_open_events()[:limit])
+    queues: OrderedDict[str, list[WebhookEvent]] = OrderedDict()
+    for event in open_events:
+        key = event.stripe_customer_id or f'event:{event.pk}'
+        queues.setdefault(key, []).append(event)
+
+    return drain_groups(
+        queues.values(),
+        lambda events: _process_customer_queue(events, now),
+        totals={'processed': 0, 'failed': 0, 'waiting': 0},
+        max_workers=max_workers or _worker_count(),
+        thread_name_prefix='stripe-webhook',
+    )
+
+
+_drainer = BackgroundDrainer(
+    'stripe-webhook-inbox',
+    lambda: drain_inbox(),
+    next_due=lambda: next_retry_at(),
+)
+
+
+def kick_inbox_worker() -> None:
+    """Drain the inbox on a background thread; at most one drainer per process."""
+    _drainer.kick()
+
+
+def schedule_inbox_drain() -> None:
+    """Kick the drainer once the inbox row is committed."""
+    transaction.on_commit(kick_inbox_worker)
+
+
+def requeue_events(queryset) -> int:
+    """Reset stored events so the next drain reprocesses them (used by replay)."""
+    return queryset.update(
+        status=WebhookEvent.STATUS_PENDING,
+        attempts=0,
+        last_error='',
+        available_at=timezone.now(),
+        locked_at=None,
+        processed_at=None,
+    )
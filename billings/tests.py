@@ -1,3 +1,131 @@
-from django.test import TestCase
+"""
+Tests for the Stripe webhook inbox.
+"""
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from billings.models import WebhookEvent
+from billings.services.webhook_inbox import (
+    drain_inbox,
+    next_retry_at,
+    process_event,
+    process_inline,
+    record_event,
+    requeue_events,
+)
+
+
+def _event(event_id, event_type='invoice.payment_succeeded', customer='cus_1', created=1700000000):
+    return {
+        'id': event_id,
+        'type': event_type,
+        'created': created,
+        'data': {'object': {'id': f'in_{event_id}', 'object': 'invoice', 'customer': customer}},
+    }
+
+
+@override_settings(STRIPE_WEBHOOK_MAX_ATTEMPTS=2, STRIPE_WEBHOOK_INBOX_WORKERS=1)
+class WebhookInboxTests(TestCase):
+    def test_record_event_is_idempotent(self):
+        first, created = record_event(_event('evt_1'))
+        self.assertTrue(created)
+        self.assertEqual(first.status, WebhookEvent.STATUS_PENDING)
+        self.assertEqual(first.stripe_customer_id, 'cus_1')
+
+        again, created = record_event(_event('evt_1'))
+        self.assertFalse(created)
+        self.assertEqual(again.pk, first.pk)
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+    @patch('billings.services.webhook_inbox.dispatch_event')
+    def test_process_marks_processed(self, mock_dispatch):
+        row, _ = record_event(_event('evt_ok'))
+        self.assertTrue(process_event(row))
+        row.refresh_from_db()
+        self.assertEqual(row.status, WebhookEvent.STATUS_PROCESSED)
+        self.assertEqual(row.attempts, 1)
+        self.assertIsNotNone(row.processed_at)
+        # Already processed: a second claim is refused.
+        self.assertFalse(process_event(row))
+        mock_dispatch.assert_called_once()
+
+    @patch('billings.services.webhook_inbox.dispatch_event', side_effect=RuntimeError('stripe down'))
+    def test_failure_retries_then_dead_letters(self, mock_dispatch):
+        row, _ = record_event(_event('evt_bad'))
+        self.assertFalse(process_event(row))
+        row.refresh_from_db()
+        self.assertEqual(row.status, WebhookEvent.STATUS_FAILED)
+        self.assertIn('stripe down', row.last_error)
+        self.assertGreater(row.available_at, timezone.now())
+
+        # Not due yet.
+        self.assertFalse(process_event(row))
+        WebhookEvent.objects.filter(pk=row.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+        self.assertFalse(process_event(row))
+        row.refresh_from_db()
+        self.assertEqual(row.status, WebhookEvent.STATUS_DEAD)
+        self.assertEqual(mock_dispatch.call_count, 2)
+
+    def test_drain_keeps_per_customer_order(self):
+        record_event(_event('evt_b', created=1700000002))
+        record_event(_event('evt_a', created=1700000001))
+        record_event(_event('evt_other', customer='cus_2', created=1700000000))
+        seen = []
+
+        def fake_dispatch(row):
+            seen.append(row.stripe_event_id)
+            if row.stripe_event_id == 'evt_a':
+                raise RuntimeError('boom')
+
+        with patch('billings.services.webhook_inbox.dispatch_event', side_effect=fake_dispatch):
+            counts = drain_inbox()
+
+        # evt_b must wait for evt_a's retry; the other customer is unaffected.
+        self.assertEqual(seen, ['evt_other', 'evt_a'])
+        self.assertEqual(counts, {'processed': 1, 'failed': 1, 'waiting': 1})
+        self.assertEqual(
+            WebhookEvent.objects.get(stripe_event_id='evt_b').status,
+            WebhookEvent.STATUS_PENDING,
+        )
+
+    @patch('billings.services.webhook_inbox.dispatch_event')
+    def test_requeue_replays_processed_event(self, mock_dispatch):
+        row, _ = record_event(_event('evt_replay'))
+        process_event(row)
+        requeue_events(WebhookEvent.objects.filter(pk=row.pk))
+        drain_inbox()
+        row.refresh_from_db()
+        self.assertEqual(row.status, WebhookEvent.STATUS_PROCESSED)
+        self.assertEqual(mock_dispatch.call_count, 2)
+
+    def test_inline_processing_keeps_per_customer_order(self):
+        record_event(_event('evt_first', created=1700000001))
+        latest, _ = record_event(_event('evt_latest', created=1700000002))
+        seen = []
+
+        def fake_dispatch(row):
+            seen.append(row.stripe_event_id)
+
+        with patch('billings.services.webhook_inbox.dispatch_event', side_effect=fake_dispatch):
+            counts = process_inline(latest)
+        self.assertEqual(seen, ['evt_first', 'evt_latest'])
+        self.assertEqual(counts, {'processed': 2, 'failed': 0, 'waiting': 0})
+
+    @patch('billings.services.webhook_inbox.kick_inbox_worker')
+    def test_inline_event_waits_behind_customer_retry(self, mock_kick):
+        failed, _ = record_event(_event('evt_failed', created=1700000001))
+        with patch('billings.services.webhook_inbox.dispatch_event', side_effect=RuntimeError('boom')):
+            process_event(failed)
+        failed.refresh_from_db()
+        latest, _ = record_event(_event('evt_latest', created=1700000002))
+
+        with patch('billings.services.webhook_inbox.dispatch_event') as mock_dispatch:
+            counts = process_inline(latest)
+        mock_dispatch.assert_not_called()
+        self.assertEqual(counts['waiting'], 2)
+        mock_kick.assert_called_once()
+        # The drainer wakes up for the failed event's retry.
+        self.assertEqual(next_retry_at(), failed.available_at)
@@ -12,12 +12,16 @@ from django.db import transaction
 import os
 import stripe
 import json
+import logging
 
-from .models import BillingProduct, BillingPrice, CustomerAccount, Payment, WebhookEvent, Subscribers
+from .models import BillingProduct, BillingPrice, CustomerAccount, Payment, Subscribers
+from .services.webhook_inbox import process_inline, record_event, schedule_inbox_drain
 from courses.models import Course
 from student.models import EnrolledCourse
 from settings.models import CourseSettings
 
+logger = logging.getLogger(__name__)
+
 
 def get_stripe_client() -> None:
     api_key = os.environ.get('STRIPE_SECRET_KEY') or getattr(settings, 'STRIPE_SECRET_KEY', None)
@@ -62,7 +66,7 @@ def ensure_stripe_customer_in_current_environment(user):
         
         # If no customer ID exists, create one
         if not customer_account.stripe_customer_id:
-            print(f"🔄 Creating new Stripe customer for user: {user.email}")
+            logger.info("Creating new Stripe customer for user: %s", user.email)
             stripe_customer = stripe.Customer.create(
                 email=user.email,
                 name=f"{user.first_name} {user.last_name}".strip() or user.email,
@@ -72,22 +76,22 @@ def ensure_stripe_customer_in_current_environment(user):
             )
             customer_account.stripe_customer_id = stripe_customer.id
             customer_account.save(update_fields=['stripe_customer_id'])
-            print(f"✅ Created new customer {stripe_customer.id} and updated database")
+            logger.info("Created new customer %s and updated database", stripe_customer.id)
             return stripe_customer.id
         
         # Check if customer exists in current environment
         try:
             stripe.Customer.retrieve(customer_account.stripe_customer_id)
-            print(f"✅ Customer {customer_account.stripe_customer_id} exists in current environment")
+            logger.info("Customer %s exists in current environment", customer_account.stripe_customer_id)
             return customer_account.stripe_customer_id
         except stripe.error.InvalidRequestError as e:
             error_message = str(e)
             error_code = getattr(e, 'code', '')
             
             if 'No such customer' in error_message or error_code == 'resource_missing':
-                print(f"⚠️ Customer {customer_account.stripe_customer_id} not found in current environment - will migrate")
+                logger.warning("Customer %s not found in current environment - will migrate", customer_account.stripe_customer_id)
                 # Create new customer in current environment
-                print(f"🔄 Creating new Stripe customer in current environment for user: {user.email}")
+                logger.info("Creating new Stripe customer in current environment for user: %s", user.email)
                 stripe_customer = stripe.Customer.create(
                     email=user.email,
                     name=f"{user.first_name} {user.last_name}".strip() or user.email,
@@ -99,16 +103,14 @@ def ensure_stripe_customer_in_current_environment(user):
                 old_customer_id = customer_account.stripe_customer_id
                 customer_account.stripe_customer_id = stripe_customer.id
                 customer_account.save(update_fields=['stripe_customer_id'])
-                print(f"✅ Created new customer {stripe_customer.id} and updated database (migrated from {old_customer_id})")
+                logger.info("Created new customer %s and updated database (migrated from %s)", stripe_customer.id, old_customer_id)
                 return stripe_customer.id
             else:
                 # Different error, re-raise it
                 raise e
                 
     except Exception as e:
-        print(f"❌ Error ensuring Stripe customer in current environment: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error ensuring Stripe customer in current environment: %s", e)
         raise e
 
 
@@ -147,17 +149,17 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
             try:
                 stripe.Product.retrieve(stripe_product_id)
                 product_exists = True
-                print(f"✅ Product {stripe_product_id} exists in current environment")
+                logger.info("Product %s exists in current environment", stripe_product_id)
             except stripe.error.InvalidRequestError as e:
                 if 'No such product' in str(e) or getattr(e, 'code', '') == 'resource_missing':
-                    print(f"⚠️ Product {stripe_product_id} not found in current environment - will migrate")
+                    logger.warning("Product %s not found in current environment - will migrate", stripe_product_id)
                     product_exists = False
                 else:
                     raise e
         
         # Step 2: Create new Product if it doesn't exist
         if not product_exists:
-            print(f"🔄 Creating new Stripe Product in current environment for course: {course.title}")
+            logger.info("Creating new Stripe Product in current environment for course: %s", course.title)
             stripe_product = stripe.Product.create(
                 name=course.title,
                 description=course.description or course.long_description or '',
@@ -173,7 +175,7 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
             billing_product.stripe_product_id = stripe_product_id
             billing_product.is_active = True
             billing_product.save(update_fields=['stripe_product_id', 'is_active'])
-            print(f"✅ Created new product {stripe_product_id} and updated database")
+            logger.info("Created new product %s and updated database", stripe_product_id)
         else:
             stripe_product_id = billing_product.stripe_product_id
         
@@ -199,12 +201,12 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
                     # Found a valid price in current environment
                     one_time_price_id = price_obj.stripe_price_id
                     one_time_price_obj = price_obj
-                    print(f"✅ Found valid one-time price {one_time_price_id} in current environment")
+                    logger.info("Found valid one-time price %s in current environment", one_time_price_id)
                     break
                 except stripe.error.InvalidRequestError as e:
                     if 'No such price' in str(e) or getattr(e, 'code', '') == 'resource_missing':
                         # This price doesn't exist in current environment, mark as invalid
-                        print(f"⚠️ One-time price {price_obj.stripe_price_id} not found in current environment - will deactivate")
+                        logger.warning("One-time price %s not found in current environment - will deactivate", price_obj.stripe_price_id)
                         price_obj.is_active = False
                         price_obj.save(update_fields=['is_active'])
                     else:
@@ -212,7 +214,7 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
         
         # Only create new one-time price if no valid one exists
         if not one_time_price_id:
-            print(f"🔄 No valid one-time price found - creating new one in current environment")
+            logger.info("No valid one-time price found - creating new one in current environment")
             new_one_time_price = stripe.Price.create(
                 product=stripe_product_id,
                 unit_amount=int(prices['one_time_price'] * 100),  # Convert to cents
@@ -234,7 +236,7 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
                 currency='usd',
                 is_active=True
             )
-            print(f"✅ Created new one-time price {one_time_price_id} and updated database")
+            logger.info("Created new one-time price %s and updated database", one_time_price_id)
         
         # Check and migrate monthly price (if course duration > 4 weeks)
         monthly_price_id = None
@@ -251,12 +253,12 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
                         # Found a valid price in current environment
                         monthly_price_id = price_obj.stripe_price_id
                         monthly_price_obj = price_obj
-                        print(f"✅ Found valid monthly price {monthly_price_id} in current environment")
+                        logger.info("Found valid monthly price %s in current environment", monthly_price_id)
                         break
                     except stripe.error.InvalidRequestError as e:
                         if 'No such price' in str(e) or getattr(e, 'code', '') == 'resource_missing':
                             # This price doesn't exist in current environment, mark as invalid
-                            print(f"⚠️ Monthly price {price_obj.stripe_price_id} not found in current environment - will deactivate")
+                            logger.warning("Monthly price %s not found in current environment - will deactivate", price_obj.stripe_price_id)
                             price_obj.is_active = False
                             price_obj.save(update_fields=['is_active'])
                         else:
@@ -264,7 +266,7 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
             
             # Only create new monthly price if no valid one exists
             if not monthly_price_id:
-                print(f"🔄 No valid monthly price found - creating new one in current environment")
+                logger.info("No valid monthly price found - creating new one in current environment")
                 new_monthly_price = stripe.Price.create(
                     product=stripe_product_id,
                     unit_amount=int(prices['monthly_price'] * 100),  # Convert to cents
@@ -289,7 +291,7 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
                     currency='usd',
                     is_active=True
                 )
-                print(f"✅ Created new monthly price {monthly_price_id} and updated database")
+                logger.info("Created new monthly price %s and updated database", monthly_price_id)
         
         # Return the requested price ID
         if billing_period == 'monthly':
@@ -300,9 +302,7 @@ def ensure_stripe_product_and_prices_in_current_environment(course, billing_peri
             return one_time_price_id
             
     except Exception as e:
-        print(f"❌ Error ensuring Stripe product/prices in current environment: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error ensuring Stripe product/prices in current environment: %s", e)
         raise e
 
 
@@ -319,10 +319,10 @@ def update_subscription_type_from_stripe(subscription_id):
         subscriber.status = 'active'  # Also update status to active when trial ends
         subscriber.save()
         
-        print(f"✅ Updated subscriber {subscriber.id}: type=trial → {pricing_type}, status=trialing → active")
+        logger.info("Updated subscriber %s: type=trial → %s, status=trialing → active", subscriber.id, pricing_type)
         return True
     except Exception as e:
-        print(f"⚠️ Error updating subscription type: {e}")
+        logger.warning("Error updating subscription type: %s", e)
         return False
 
 
@@ -331,7 +331,7 @@ def complete_enrollment_process(subscription_id, user, course, class_id, pricing
     Complete enrollment process with row-level locking to prevent race conditions.
     This function is idempotent and can be called multiple times safely.
     """
-    print(f"🎓 ENROLLMENT PROCESS: {user.email} → {course.title} (Trial: {is_trial})")
+    logger.info("ENROLLMENT PROCESS: %s → %s (Trial: %s)", user.email, course.title, is_trial)
     
     from student.models import EnrolledCourse
     from courses.models import Class
@@ -344,13 +344,13 @@ def complete_enrollment_process(subscription_id, user, course, class_id, pricing
                 stripe_subscription_id=subscription_id
             )
         except Subscribers.DoesNotExist:
-            print(f"⚠️ Subscription {subscription_id} not found in local database")
+            logger.warning("Subscription %s not found in local database", subscription_id)
             return None
         
         # Get student profile first
         student_profile = getattr(user, 'student_profile', None)
         if not student_profile:
-            print(f"❌ Student profile not found for user {user.id}")
+            logger.error("Student profile not found for user %s", user.id)
             return None
         
         # Check if enrollment already exists first (regardless of subscription status)
@@ -360,7 +360,7 @@ def complete_enrollment_process(subscription_id, user, course, class_id, pricing
         ).first()
         
         if existing_enrollment and existing_enrollment.status in ['active', 'completed']:
-                print(f"✅ Enrollment already exists and is active: {existing_enrollment.id}")
+                logger.info("Enrollment already exists and is active: %s", existing_enrollment.id)
             # Update subscription status to match
                 subscription.status = 'active' if not is_trial else 'trialing'
                 subscription.save()
@@ -372,24 +372,24 @@ def complete_enrollment_process(subscription_id, user, course, class_id, pricing
             try:
                 selected_class = Class.objects.get(id=class_id)
             except Class.DoesNotExist:
-                print(f"❌ Class {class_id} not found")
+                logger.error("Class %s not found", class_id)
                 return None
         elif getattr(course, 'delivery_type', 'live') != 'self_paced':
-            print(f"❌ Class ID required for non-self-paced course {course.id}")
+            logger.error("Class ID required for non-self-paced course %s", course.id)
             return None
         
         # If enrollment exists but is inactive, reactivate it
         if existing_enrollment and existing_enrollment.status not in ['active', 'completed']:
                 existing_enrollment.status = 'active'
                 existing_enrollment.save()
-                print(f"✅ Reactivated existing enrollment: {existing_enrollment.id}")
+                logger.info("Reactivated existing enrollment: %s", existing_enrollment.id)
                 # Re-add the student to the selected class (they were removed on drop)
                 try:
                     if selected_class and user not in selected_class.students.all() and selected_class.student_count < selected_class.max_capacity:
                         selected_class.students.add(user)
-                        print(f"✅ Re-added student to class: {selected_class.name}")
+                        logger.info("Re-added student to class: %s", selected_class.name)
                 except Exception as e:
-                    print(f"⚠️ Failed to re-add student to class: {e}")
+                    logger.warning("Failed to re-add student to class: %s", e)
                 # Update subscription status
                 subscription.status = 'active' if not is_trial else 'trialing'
                 subscription.save()
@@ -460,7 +460,7 @@ def complete_enrollment_process(subscription_id, user, course, class_id, pricing
             if selected_class and selected_class.student_count < selected_class.max_capacity:
                 selected_class.students.add(user)
         except Exception as e:
-            print(f"⚠️ Failed to add student to class: {e}")
+            logger.warning("Failed to add student to class: %s", e)
         
         # Update subscription status
         if is_trial:
@@ -469,7 +469,7 @@ def complete_enrollment_process(subscription_id, user, course, class_id, pricing
             subscription.status = 'active'    # Update to active for paid enrollments
         subscription.save()
         
-        print(f"✅ Enrollment created: {enrollment.id}")
+        logger.info("Enrollment created: %s", enrollment.id)
         return enrollment
 
 
@@ -644,7 +644,6 @@ class StripeWebhookView(APIView):
     """
     Handle Stripe webhooks for subscription events
     """
-    print("............................................StripeWebhookView.......................................")
     permission_classes = []  # No authentication required for webhooks
 
     def post(self, request):
@@ -671,63 +670,48 @@ class StripeWebhookView(APIView):
             except stripe.error.SignatureVerificationError as e:
                 return HttpResponse(f"Invalid signature: {e}", status=400)
             
-            # Check if we've already processed this event (idempotency)
-            event_id = event['id']
-            if WebhookEvent.objects.filter(stripe_event_id=event_id).exists():
-                print(f"📋 Event {event_id} already processed, skipping")
-                return HttpResponse("Event already processed", status=200)
-            
-            print(f"🎣 Processing webhook event: {event['type']} ({event_id})")
-            
-            # Handle the event based on type
-            try:
-                if event['type'] == 'customer.subscription.updated':
-                    self._handle_subscription_updated(event['data']['object'])
-                elif event['type'] == 'customer.subscription.deleted':
-                    self._handle_subscription_deleted(event['data']['object'])
-                elif event['type'] == 'invoice.payment_succeeded':
-                    self._handle_payment_succeeded(event['data']['object'])
-                elif event['type'] == 'invoice.payment_failed':
-                    self._handle_payment_failed(event['data']['object'])
-                elif event['type'] == 'customer.subscription.trial_will_end':
-                    self._handle_trial_ending(event['data']['object'])
-                elif event['type'] == 'setup_intent.succeeded':
-                    self._handle_setup_intent_succeeded(event['data']['object'])
-                elif event['type'] == 'payment_intent.canceled':
-                    self._handle_payment_intent_canceled(event['data']['object'])
-                elif event['type'] == 'setup_intent.canceled':
-                    self._handle_setup_intent_canceled(event['data']['object'])
-                elif event['type'] == 'invoice.voided':
-                    self._handle_invoice_voided(event['data']['object'])
-                elif event['type'] == 'invoice.updated':
-                    self._handle_invoice_updated(event['data']['object'])
-                    
-                else:
-                    print(f"ℹ️ Unhandled event type: {event['type']}")
-                
-                # Log successful processing
-                WebhookEvent.objects.create(
-                    stripe_event_id=event_id,
-                    type=event['type'],
-                    payload=event['data']
-                )
-                
-                print(f"✅ Successfully processed webhook: {event['type']}")
-                
-            except Exception as handler_error:
-                print(f"❌ Error processing webhook {event['type']}: {handler_error}")
-                import traceback
-                traceback.print_exc()
-                raise handler_error
-            
-            return HttpResponse("Webhook processed successfully", status=200)
+            # Persist first: the unique stripe_event_id makes redeliveries no-ops,
+            # and handlers (which call the Stripe API) run off the request path.
+            webhook_event, created = record_event(event)
+            if not created:
+                logger.info("Event %s already received (%s), skipping", webhook_event.stripe_event_id, webhook_event.status)
+                return HttpResponse("Event already received", status=200)
+
+            if getattr(settings, 'STRIPE_WEBHOOK_PROCESS_INLINE', False):
+                process_inline(webhook_event)
+            else:
+                schedule_inbox_drain()
+
+            logger.info("Queued webhook event: %s (%s)", webhook_event.type, webhook_event.stripe_event_id)
+            return HttpResponse("Webhook received", status=200)
             
         except Exception as e:
             return HttpResponse(f"Webhook error: {str(e)}", status=500)
+
+    EVENT_HANDLERS = {
+        'customer.subscription.updated': '_handle_subscription_updated',
+        'customer.subscription.deleted': '_handle_subscription_deleted',
+        'invoice.payment_succeeded': '_handle_payment_succeeded',
+        'invoice.payment_failed': '_handle_payment_failed',
+        'customer.subscription.trial_will_end': '_handle_trial_ending',
+        'setup_intent.succeeded': '_handle_setup_intent_succeeded',
+        'payment_intent.canceled': '_handle_payment_intent_canceled',
+        'setup_intent.canceled': '_handle_setup_intent_canceled',
+        'invoice.voided': '_handle_invoice_voided',
+        'invoice.updated': '_handle_invoice_updated',
+    }
+
+    def handle_event(self, event_type, obj):
+        """Run the handler for one event object (called by the webhook inbox worker)."""
+        handler_name = self.EVENT_HANDLERS.get(event_type)
+        if not handler_name:
+            logger.info("Unhandled event type: %s", event_type)
+            return
+        logger.info("Processing webhook event: %s", event_type)
+        getattr(self, handler_name)(obj)
     
     def _handle_checkout_completed(self, session):
         """Handle successful checkout session"""
-        print("............................................_handle_checkout_completed.......................................")
 
         try:
             customer_id = session.get('customer')
@@ -768,13 +752,13 @@ class StripeWebhookView(APIView):
                         pass
                         
         except Exception as e:
-            print(f"Error handling checkout completed: {e}")
+            logger.error("Error handling checkout completed: %s", e)
     
 
 
     def _handle_setup_intent_succeeded(self, setup_intent):
         """Fired once the user entered card details and Stripe successfully attached it to the customer/subscription"""
-        print(f"✅ Webhook: Setup intent {setup_intent['id']} succeeded")
+        logger.info("Webhook: Setup intent %s succeeded", setup_intent['id'])
         try:
             # Get subscription ID from setup intent
             # Setup intents don't have subscription field, so we need to find it via customer
@@ -799,7 +783,7 @@ class StripeWebhookView(APIView):
                         if hasattr(sub, 'pending_setup_intent') and sub.pending_setup_intent:
                             if sub.pending_setup_intent.id == setup_intent_id:
                                 subscription_id = sub.id
-                                print(f"✅ Found subscription {subscription_id} with matching setup intent {setup_intent_id}")
+                                logger.info("Found subscription %s with matching setup intent %s", subscription_id, setup_intent_id)
                                 break
                     
                     # Fallback: If not found via Stripe query, try database lookup
@@ -815,15 +799,13 @@ class StripeWebhookView(APIView):
                             
                             if recent_subscriber:
                                 subscription_id = recent_subscriber.stripe_subscription_id
-                                print(f"⚠️ Fallback: Found subscription {subscription_id} from database for customer {customer_id}")
+                                logger.warning("Fallback: Found subscription %s from database for customer %s", subscription_id, customer_id)
                             else:
-                                print(f"⚠️ No incomplete subscription found for customer {customer_id}")
+                                logger.warning("No incomplete subscription found for customer %s", customer_id)
                         except CustomerAccount.DoesNotExist:
-                            print(f"⚠️ Customer account not found for {customer_id}")
+                            logger.warning("Customer account not found for %s", customer_id)
                 except Exception as e:
-                    print(f"❌ Error finding subscription for setup intent: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Error finding subscription for setup intent: %s", e)
             if subscription_id:
                 try:
                     # Get the subscription from Stripe to check if it has a trial period
@@ -841,16 +823,16 @@ class StripeWebhookView(APIView):
                         # For subscriptions WITH trial: setup_intent succeeded means trial started
                         subscriber.status = 'trialing'
                         subscriber.save()
-                        print(f"✅ Updated subscriber {subscriber.id} to trialing status (trial started)")
+                        logger.info("Updated subscriber %s to trialing status (trial started)", subscriber.id)
                         
                         # CRITICAL: Ensure enrollment is created when trial starts
-                        print(f"🎓 Webhook: Ensuring enrollment is created for trial subscription {subscription_id}")
+                        logger.info("Webhook: Ensuring enrollment is created for trial subscription %s", subscription_id)
                         try:
                             course_id = metadata.get('course_id')
                             class_id = metadata.get('class_id')
                             pricing_type = metadata.get('pricing_type', 'one_time')
                             
-                            print(f"🔍 Webhook: Processing trial subscription {subscription_id} - Course: {course_id}, Class: {class_id}")
+                            logger.info("Webhook: Processing trial subscription %s - Course: %s, Class: %s", subscription_id, course_id, class_id)
                             
                             if course_id:
                                 from courses.models import Course
@@ -868,34 +850,32 @@ class StripeWebhookView(APIView):
                                 )
                                 
                                 if enrollment:
-                                    print(f"✅ Webhook: Enrollment ensured for trial subscription {subscription_id}")
+                                    logger.info("Webhook: Enrollment ensured for trial subscription %s", subscription_id)
                                 else:
-                                    print(f"⚠️ Webhook: Failed to ensure enrollment for subscription {subscription_id}")
+                                    logger.warning("Webhook: Failed to ensure enrollment for subscription %s", subscription_id)
                             else:
-                                print(f"⚠️ Webhook: Missing metadata for subscription {subscription_id}: course_id={course_id}, class_id={class_id}")
+                                logger.warning("Webhook: Missing metadata for subscription %s: course_id=%s, class_id=%s", subscription_id, course_id, class_id)
                                 
                         except Exception as e:
-                            print(f"❌ Webhook: Error ensuring enrollment: {e}")
-                            import traceback
-                            traceback.print_exc()
+                            logger.exception("Webhook: Error ensuring enrollment: %s", e)
                     else:
                         # For subscriptions WITHOUT trial: setup_intent succeeded means payment method collected
                         # For default_incomplete subscriptions, we need to manually pay the invoice
-                        print(f"💳 Setup intent succeeded for non-trial subscription {subscription_id}")
+                        logger.info("Setup intent succeeded for non-trial subscription %s", subscription_id)
                         
                         # Update subscriber status to active (payment method collected, invoice will be paid)
                         subscriber.status = 'active'
                         subscriber.save()
-                        print(f"✅ Updated subscriber {subscriber.id} to active status (payment method collected)")
+                        logger.info("Updated subscriber %s to active status (payment method collected)", subscriber.id)
                         
                         # CRITICAL: Ensure enrollment is created when payment method is collected
-                        print(f"🎓 Webhook: Ensuring enrollment is created for non-trial subscription {subscription_id}")
+                        logger.info("Webhook: Ensuring enrollment is created for non-trial subscription %s", subscription_id)
                         try:
                             course_id = metadata.get('course_id')
                             class_id = metadata.get('class_id')
                             pricing_type = metadata.get('pricing_type', 'one_time')
                             
-                            print(f"🔍 Webhook: Processing non-trial subscription {subscription_id} - Course: {course_id}, Class: {class_id}")
+                            logger.info("Webhook: Processing non-trial subscription %s - Course: %s, Class: %s", subscription_id, course_id, class_id)
                             
                             if course_id:
                                 from courses.models import Course
@@ -914,16 +894,14 @@ class StripeWebhookView(APIView):
                                 )
                                 
                                 if enrollment:
-                                    print(f"✅ Webhook: Enrollment ensured for non-trial subscription {subscription_id}")
+                                    logger.info("Webhook: Enrollment ensured for non-trial subscription %s", subscription_id)
                                 else:
-                                    print(f"⚠️ Webhook: Failed to ensure enrollment for subscription {subscription_id}")
+                                    logger.warning("Webhook: Failed to ensure enrollment for subscription %s", subscription_id)
                             else:
-                                print(f"⚠️ Webhook: Missing metadata for subscription {subscription_id}: course_id={course_id}, class_id={class_id}")
+                                logger.warning("Webhook: Missing metadata for subscription %s: course_id=%s, class_id=%s", subscription_id, course_id, class_id)
                                 
                         except Exception as e:
-                            print(f"❌ Webhook: Error ensuring enrollment: {e}")
-                            import traceback
-                            traceback.print_exc()
+                            logger.exception("Webhook: Error ensuring enrollment: %s", e)
                         
                         try:
                             # Get the latest invoice for this subscription
@@ -933,12 +911,12 @@ class StripeWebhookView(APIView):
                                 invoice = stripe.Invoice.retrieve(latest_invoice_id, expand=['payment_intent'])
                                 
                                 if invoice.status == 'paid':
-                                    print(f"✅ Invoice {latest_invoice_id} is already paid - triggering payment succeeded handler")
+                                    logger.info("Invoice %s is already paid - triggering payment succeeded handler", latest_invoice_id)
                                     # Trigger payment succeeded handler manually
                                     self._handle_payment_succeeded(invoice)
                                 elif invoice.status in ['open', 'draft']:
                                     # For non-trial subscriptions, manually pay the invoice
-                                    print(f"💳 Attempting to pay invoice {latest_invoice_id} for non-trial subscription")
+                                    logger.info("Attempting to pay invoice %s for non-trial subscription", latest_invoice_id)
                                     try:
                                         # Add a small delay to ensure payment method is fully attached
                                         import time
@@ -946,42 +924,38 @@ class StripeWebhookView(APIView):
                                         
                                         paid_invoice = stripe.Invoice.pay(latest_invoice_id)
                                         if paid_invoice.status == 'paid':
-                                            print(f"✅ Invoice {latest_invoice_id} paid successfully")
+                                            logger.info("Invoice %s paid successfully", latest_invoice_id)
                                             # Trigger payment succeeded handler
                                             self._handle_payment_succeeded(paid_invoice)
                                         else:
-                                            print(f"⚠️ Invoice payment attempt returned status: {paid_invoice.status}")
-                                            print(f"ℹ️ Will wait for invoice.payment_succeeded webhook")
+                                            logger.warning("Invoice payment attempt returned status: %s", paid_invoice.status)
+                                            logger.info("Will wait for invoice.payment_succeeded webhook")
                                     except stripe.error.InvalidRequestError as e:
                                         error_code = getattr(e, 'code', None)
                                         error_message = str(e)
-                                        print(f"⚠️ Could not pay invoice automatically: {error_message} (code: {error_code})")
+                                        logger.warning("Could not pay invoice automatically: %s (code: %s)", error_message, error_code)
                                         
                                         # If payment method not ready, wait for Stripe to process
                                         if 'payment_method' in error_message.lower() or error_code == 'payment_intent_unexpected_state':
-                                            print(f"ℹ️ Payment method may not be ready yet - Stripe will attempt payment automatically")
-                                            print(f"ℹ️ Will wait for invoice.payment_succeeded webhook")
+                                            logger.info("Payment method may not be ready yet - Stripe will attempt payment automatically")
+                                            logger.info("Will wait for invoice.payment_succeeded webhook")
                                         else:
                                             # Other errors - log and wait
-                                            print(f"ℹ️ Will wait for invoice.payment_succeeded webhook")
+                                            logger.info("Will wait for invoice.payment_succeeded webhook")
                                 else:
-                                    print(f"ℹ️ Invoice {latest_invoice_id} status is {invoice.status} - waiting for payment")
+                                    logger.info("Invoice %s status is %s - waiting for payment", latest_invoice_id, invoice.status)
                             else:
-                                print(f"⚠️ No latest invoice found for subscription {subscription_id}")
+                                logger.warning("No latest invoice found for subscription %s", subscription_id)
                         except Exception as e:
-                            print(f"⚠️ Error attempting to pay invoice: {e}")
-                            import traceback
-                            traceback.print_exc()
-                            print(f"ℹ️ Will wait for invoice.payment_succeeded webhook")
+                            logger.warning("Error attempting to pay invoice: %s", e, exc_info=True)
+                            logger.info("Will wait for invoice.payment_succeeded webhook")
                     
                 except Subscribers.DoesNotExist:
-                    print(f"⚠️ Subscriber {subscription_id} not found for payment succeeded")
+                    logger.warning("Subscriber %s not found for payment succeeded", subscription_id)
             else:
-                print(f"❌ ..............................Subscriber {subscription_id} not found for payment succeeded")
+                logger.error("Subscriber %s not found for payment succeeded", subscription_id)
         except Exception as e:
-            print(f"❌ Error handling setup intent succeeded: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling setup intent succeeded: %s", e)
 
     def _create_payment_record_from_setup(self, subscription_id, setup_intent_id):
         """Create payment record when setup intent succeeds"""
@@ -997,7 +971,7 @@ class StripeWebhookView(APIView):
             ).first()
             
             if existing_payment:
-                print(f"✅ Payment record already exists for setup intent {setup_intent_id}")
+                logger.info("Payment record already exists for setup intent %s", setup_intent_id)
                 return
             
             # Get invoice details from Stripe subscription
@@ -1032,10 +1006,10 @@ class StripeWebhookView(APIView):
                             paid_at = None
                     
                 else:
-                    print(f"⚠️ No invoice found for subscription {subscription_id}")
+                    logger.warning("No invoice found for subscription %s", subscription_id)
                     
             except Exception as e:
-                print(f"⚠️ Error fetching invoice details: {e}")
+                logger.warning("Error fetching invoice details: %s", e)
                 # Continue with default values
             
             # Create payment record with invoice details
@@ -1050,14 +1024,12 @@ class StripeWebhookView(APIView):
                 paid_at=paid_at
             )
             
-            print(f"✅ Created payment record {payment.id} for setup intent {setup_intent_id}")
+            logger.info("Created payment record %s for setup intent %s", payment.id, setup_intent_id)
             
         except Subscribers.DoesNotExist:
-            print(f"❌ Subscriber not found for subscription {subscription_id}")
+            logger.error("Subscriber not found for subscription %s", subscription_id)
         except Exception as e:
-            print(f"❌ Error creating payment record: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error creating payment record: %s", e)
 
 
 
@@ -1065,19 +1037,18 @@ class StripeWebhookView(APIView):
     def _handle_subscription_created(self, subscription):
         """Handle subscription creation"""
         # This is handled in checkout_completed for our use case
-        print(f"🔍 Webhook: Subscription {subscription['id']} creation received")
+        logger.info("Webhook: Subscription %s creation received", subscription['id'])
         pass
     
     def _handle_subscription_updated(self, subscription):
         """Handle subscription updates"""
-        print(f"🔍 Webhook: Subscription {subscription['id']} update received")
-        print("........................................................................................................................_handle_subscription_updated.......................................")
+        logger.info("Webhook: Subscription %s update received", subscription['id'])
         try:
             subscriber = Subscribers.objects.get(stripe_subscription_id=subscription['id'])
             old_status = subscriber.status
             new_status = subscription['status']
             
-            print(f"🔍 Webhook: Subscription {subscription['id']} status change: {old_status} → {new_status}")
+            logger.info("Webhook: Subscription %s status change: %s → %s", subscription['id'], old_status, new_status)
             
             # Update status
             subscriber.status = new_status
@@ -1085,7 +1056,7 @@ class StripeWebhookView(APIView):
             
             # CRITICAL: Ensure enrollment is created when subscription becomes active/trialing
             if new_status in ['active', 'trialing'] and old_status in ['incomplete', 'incomplete_expired']:
-                print(f"🎓 Webhook: Ensuring enrollment is created for subscription {subscription['id']}")
+                logger.info("Webhook: Ensuring enrollment is created for subscription %s", subscription['id'])
                 try:
                     # Get metadata from Stripe subscription
                     metadata = subscription.get('metadata', {})
@@ -1093,11 +1064,11 @@ class StripeWebhookView(APIView):
                     class_id = metadata.get('class_id')
                     pricing_type = metadata.get('pricing_type', 'one_time')
                     
-                    print(f"🔍 Webhook: Metadata extraction for subscription {subscription['id']}:")
-                    print(f"   - Full metadata: {metadata}")
-                    print(f"   - course_id: {course_id}")
-                    print(f"   - class_id: {class_id}")
-                    print(f"   - pricing_type: {pricing_type}")
+                    logger.info(
+                        "Webhook: Metadata for subscription %s: course_id=%s, class_id=%s, pricing_type=%s",
+                        subscription['id'], course_id, class_id, pricing_type,
+                    )
+                    logger.debug("Webhook: Full metadata for subscription %s: %s", subscription['id'], metadata)
                     
                     if course_id:
                         from courses.models import Course
@@ -1116,20 +1087,18 @@ class StripeWebhookView(APIView):
                         )
                         
                         if enrollment:
-                            print(f"✅ Webhook: Enrollment ensured for subscription {subscription['id']}")
+                            logger.info("Webhook: Enrollment ensured for subscription %s", subscription['id'])
                         else:
-                            print(f"⚠️ Webhook: Failed to ensure enrollment for subscription {subscription['id']}")
+                            logger.warning("Webhook: Failed to ensure enrollment for subscription %s", subscription['id'])
                     else:
-                        print(f"⚠️ Webhook: Missing metadata for subscription {subscription['id']}: course_id={course_id}, class_id={class_id}")
+                        logger.warning("Webhook: Missing metadata for subscription %s: course_id=%s, class_id=%s", subscription['id'], course_id, class_id)
                         
                 except Exception as e:
-                    print(f"❌ Webhook: Error ensuring enrollment: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Webhook: Error ensuring enrollment: %s", e)
             
             # If subscription becomes active (trial ended), update subscription type
             if new_status == 'active' and old_status == 'trialing':
-                print(f"🔄 Trial ended, updating subscription type from trial to actual pricing type")
+                logger.info("Trial ended, updating subscription type from trial to actual pricing type")
                 update_subscription_type_from_stripe(subscription['id'])
             
             # Update next_invoice_date and next_invoice_amount from Stripe subscription
@@ -1141,7 +1110,7 @@ class StripeWebhookView(APIView):
                         subscription['current_period_end'], tz=timezone.utc
                     )
                     subscriber.next_invoice_date = next_invoice_date
-                    print(f"📅 Updated next_invoice_date to {next_invoice_date}")
+                    logger.info("Updated next_invoice_date to %s", next_invoice_date)
                 
                 # Get next invoice amount from subscription items
                 if subscription.get('items', {}).get('data', []):
@@ -1149,7 +1118,7 @@ class StripeWebhookView(APIView):
                     next_invoice_amount = item.get('price', {}).get('unit_amount', 0) / 100
                     if next_invoice_amount > 0:
                         subscriber.next_invoice_amount = next_invoice_amount
-                        print(f"💰 Updated next_invoice_amount to ${next_invoice_amount}")
+                        logger.info("Updated next_invoice_amount to $%s", next_invoice_amount)
                 
                 # Also update current_period_start and current_period_end
                 if subscription.get('current_period_start'):
@@ -1163,16 +1132,14 @@ class StripeWebhookView(APIView):
                 
                 subscriber.save()
             except Exception as e:
-                print(f"⚠️ Error updating invoice dates: {e}")
+                logger.warning("Error updating invoice dates: %s", e)
             
-            print(f"✅ Updated subscriber {subscriber.id}: {old_status} → {new_status}")
+            logger.info("Updated subscriber %s: %s → %s", subscriber.id, old_status, new_status)
             
         except Subscribers.DoesNotExist:
-            print(f"⚠️ Subscriber {subscription['id']} not found for update")
+            logger.warning("Subscriber %s not found for update", subscription['id'])
         except Exception as e:
-            print(f"❌ Error handling subscription updated: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling subscription updated: %s", e)
         
         
     
@@ -1186,7 +1153,7 @@ class StripeWebhookView(APIView):
         except Subscribers.DoesNotExist:
             pass
         except Exception as e:
-            print(f"Error handling subscription deleted: {e}")
+            logger.error("Error handling subscription deleted: %s", e)
     
     def _handle_payment_succeeded(self, invoice):
         """Handle successful invoice payment - updates subscription status and creates enrollment"""
@@ -1197,18 +1164,18 @@ class StripeWebhookView(APIView):
             amount_paid = invoice.get('amount_paid', 0) / 100  # Convert from cents
             currency = invoice.get('currency', 'usd')
             
-            print(f"💰 Invoice payment succeeded: {invoice_id} for subscription {subscription_id}")
-            print(f"💰 Amount paid: ${amount_paid} {currency}")
+            logger.info("Invoice payment succeeded: %s for subscription %s", invoice_id, subscription_id)
+            logger.info("Amount paid: $%s %s", amount_paid, currency)
             
             if not subscription_id:
-                print(f"⚠️ Invoice {invoice_id} has no subscription - skipping")
+                logger.warning("Invoice %s has no subscription - skipping", invoice_id)
                 return
             
             # Get subscriber record
             try:
                 subscriber = Subscribers.objects.get(stripe_subscription_id=subscription_id)
             except Subscribers.DoesNotExist:
-                print(f"⚠️ Subscriber {subscription_id} not found for invoice payment")
+                logger.warning("Subscriber %s not found for invoice payment", subscription_id)
                 return
             
             # Get subscription from Stripe to check metadata and status
@@ -1228,12 +1195,12 @@ class StripeWebhookView(APIView):
                 # Trial subscription - payment succeeded means trial ended, first charge happened
                 subscriber.status = 'active'
                 subscriber.subscription_type = pricing_type  # Update from 'trial' to actual type
-                print(f"✅ Trial ended - updated subscriber {subscriber.id} to active status, type: {pricing_type}")
+                logger.info("Trial ended - updated subscriber %s to active status, type: %s", subscriber.id, pricing_type)
             else:
                 # Non-trial subscription - payment succeeded means subscription is now active
                 subscriber.status = 'active'
                 subscriber.subscription_type = pricing_type
-                print(f"✅ Payment succeeded - updated subscriber {subscriber.id} to active status, type: {pricing_type}")
+                logger.info("Payment succeeded - updated subscriber %s to active status, type: %s", subscriber.id, pricing_type)
             
             # Update next_invoice_date and next_invoice_amount from Stripe subscription
             try:
@@ -1244,7 +1211,7 @@ class StripeWebhookView(APIView):
                         stripe_subscription['current_period_end'], tz=timezone.utc
                     )
                     subscriber.next_invoice_date = next_invoice_date
-                    print(f"📅 Updated next_invoice_date to {next_invoice_date}")
+                    logger.info("Updated next_invoice_date to %s", next_invoice_date)
                 
                 # Get next invoice amount from subscription items
                 if stripe_subscription.get('items', {}).get('data', []):
@@ -1252,7 +1219,7 @@ class StripeWebhookView(APIView):
                     next_invoice_amount = item.get('price', {}).get('unit_amount', 0) / 100
                     if next_invoice_amount > 0:
                         subscriber.next_invoice_amount = next_invoice_amount
-                        print(f"💰 Updated next_invoice_amount to ${next_invoice_amount}")
+                        logger.info("Updated next_invoice_amount to $%s", next_invoice_amount)
                 
                 # Also update current_period_start and current_period_end
                 if stripe_subscription.get('current_period_start'):
@@ -1264,7 +1231,7 @@ class StripeWebhookView(APIView):
                         stripe_subscription['current_period_end'], tz=timezone.utc
                     )
             except Exception as e:
-                print(f"⚠️ Error updating invoice dates from payment succeeded: {e}")
+                logger.warning("Error updating invoice dates from payment succeeded: %s", e)
             
             subscriber.save()
             
@@ -1281,12 +1248,12 @@ class StripeWebhookView(APIView):
                         'paid_at': timezone.now(),
                     }
                 )
-                print(f"✅ Payment record created/updated for invoice {invoice_id}")
+                logger.info("Payment record created/updated for invoice %s", invoice_id)
             except Exception as e:
-                print(f"⚠️ Error creating payment record: {e}")
+                logger.warning("Error creating payment record: %s", e)
             
             # CRITICAL: Ensure enrollment is created when payment succeeds
-            print(f"🎓 Webhook: Ensuring enrollment is created for subscription {subscription_id}")
+            logger.info("Webhook: Ensuring enrollment is created for subscription %s", subscription_id)
             try:
                 course_id = metadata.get('course_id')
                 class_id = metadata.get('class_id')
@@ -1311,21 +1278,17 @@ class StripeWebhookView(APIView):
                     )
                     
                     if enrollment:
-                        print(f"✅ Webhook: Enrollment ensured for subscription {subscription_id}")
+                        logger.info("Webhook: Enrollment ensured for subscription %s", subscription_id)
                     else:
-                        print(f"⚠️ Webhook: Failed to ensure enrollment for subscription {subscription_id}")
+                        logger.warning("Webhook: Failed to ensure enrollment for subscription %s", subscription_id)
                 else:
-                    print(f"⚠️ Webhook: Missing metadata for subscription {subscription_id}: course_id={course_id}, class_id={class_id}")
+                    logger.warning("Webhook: Missing metadata for subscription %s: course_id=%s, class_id=%s", subscription_id, course_id, class_id)
                     
             except Exception as e:
-                print(f"❌ Webhook: Error ensuring enrollment: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Webhook: Error ensuring enrollment: %s", e)
                 
         except Exception as e:
-            print(f"❌ Error handling payment succeeded: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling payment succeeded: %s", e)
        
     def _handle_payment_failed(self, invoice):
         """Handle failed payment"""
@@ -1336,93 +1299,87 @@ class StripeWebhookView(APIView):
                     sub = Subscribers.objects.get(stripe_subscription_id=subscription_id)
                     sub.status = 'past_due'
                     sub.save()
-                    print(f"✅ Updated subscriber {subscription_id} to past_due")
+                    logger.info("Updated subscriber %s to past_due", subscription_id)
                 except Subscribers.DoesNotExist:
-                    print(f"⚠️ Subscriber {subscription_id} not found for failed payment")
+                    logger.warning("Subscriber %s not found for failed payment", subscription_id)
         except Exception as e:
-            print(f"❌ Error handling payment failed: {e}")
+            logger.error("Error handling payment failed: %s", e)
     
     def _handle_trial_ending(self, subscription):
         """Handle trial ending notification"""
         try:
             sub = Subscribers.objects.get(stripe_subscription_id=subscription['id'])
-            print(f"⏰ Trial ending soon for subscription {subscription['id']}")
-            print(f"📧 TODO: Send trial ending email to user {sub.user.email}")
+            logger.info("Trial ending soon for subscription %s", subscription['id'])
+            logger.info("TODO: Send trial ending email to user %s", sub.user.email)
             # Here you could send an email notification to the user
         except Subscribers.DoesNotExist:
-            print(f"⚠️ Subscriber {subscription['id']} not found for trial ending")
+            logger.warning("Subscriber %s not found for trial ending", subscription['id'])
         except Exception as e:
-            print(f"❌ Error handling trial ending: {e}")
+            logger.error("Error handling trial ending: %s", e)
     
     def _handle_payment_intent_canceled(self, payment_intent):
         """Handle when user cancels payment intent without entering card details"""
         try:
             payment_intent_id = payment_intent['id']
-            print(f"🚫 Payment intent canceled: {payment_intent_id}")
+            logger.info("Payment intent canceled: %s", payment_intent_id)
             
             # Update any payment records associated with this payment intent
             payments = Payment.objects.filter(stripe_payment_intent_id=payment_intent_id)
-            print(f"🔍 Found {payments.count()} payment records for canceled payment intent")
+            logger.info("Found %s payment records for canceled payment intent", payments.count())
             
             for payment in payments:
                 if payment.status != 'canceled':
                     payment.status = 'canceled'
                     payment.save(update_fields=['status'])
-                    print(f"✅ Updated payment {payment.id} status to canceled")
+                    logger.info("Updated payment %s status to canceled", payment.id)
                 
         except Exception as e:
-            print(f"❌ Error handling payment intent canceled: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling payment intent canceled: %s", e)
     
     def _handle_setup_intent_canceled(self, setup_intent):
         """Handle when user cancels setup intent for subscription"""
         try:
             setup_intent_id = setup_intent['id']
-            print(f"🚫 Setup intent canceled: {setup_intent_id}")
+            logger.info("Setup intent canceled: %s", setup_intent_id)
             
             # Update any payment records associated with this setup intent
             payments = Payment.objects.filter(stripe_payment_intent_id=setup_intent_id)
-            print(f"🔍 Found {payments.count()} payment records for canceled setup intent")
+            logger.info("Found %s payment records for canceled setup intent", payments.count())
             
             for payment in payments:
                 if payment.status != 'canceled':
                     payment.status = 'canceled'
                     payment.save(update_fields=['status'])
-                    print(f"✅ Updated payment {payment.id} status to canceled")
+                    logger.info("Updated payment %s status to canceled", payment.id)
                 
         except Exception as e:
-            print(f"❌ Error handling setup intent canceled: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling setup intent canceled: %s", e)
     
     def _handle_invoice_voided(self, invoice):
         """Handle when invoice is voided (usually means payment was canceled)"""
         try:
             invoice_id = invoice.get('id')
-            print(f"🚫 Invoice voided: {invoice_id}")
+            logger.info("Invoice voided: %s", invoice_id)
             
             # Update any payment records associated with this invoice
             payments = Payment.objects.filter(stripe_invoice_id=invoice_id)
-            print(f"🔍 Found {payments.count()} payment records for voided invoice")
+            logger.info("Found %s payment records for voided invoice", payments.count())
             
             for payment in payments:
                 if payment.status != 'canceled':
                     payment.status = 'canceled'
                     payment.save(update_fields=['status'])
-                    print(f"✅ Updated payment {payment.id} status to canceled (invoice voided)")
+                    logger.info("Updated payment %s status to canceled (invoice voided)", payment.id)
                 
         except Exception as e:
-            print(f"❌ Error handling invoice voided: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling invoice voided: %s", e)
     
     def _handle_invoice_updated(self, invoice):
         """Handle when invoice is updated (status changes, etc.)"""
         try:
             invoice_id = invoice.get('id')
             invoice_status = invoice.get('status')
-            print(f"🔄 Invoice updated: {invoice_id} (status: {invoice_status})")
+            logger.info("Invoice updated: %s (status: %s)", invoice_id, invoice_status)
             
             # Update payment records based on invoice status
             payments = Payment.objects.filter(stripe_invoice_id=invoice_id)
@@ -1438,21 +1395,19 @@ class StripeWebhookView(APIView):
                         from django.utils import timezone
                         payment.paid_at = timezone.make_aware(datetime.fromtimestamp(paid_at_timestamp))
                     payment.save(update_fields=['status', 'paid_at'])
-                    print(f"✅ Updated payment {payment.id} status to succeeded (invoice paid)")
+                    logger.info("Updated payment %s status to succeeded (invoice paid)", payment.id)
                 elif invoice_status == 'void' and payment.status != 'canceled':
                     payment.status = 'canceled'
                     payment.save(update_fields=['status'])
-                    print(f"✅ Updated payment {payment.id} status to canceled (invoice voided)")
+                    logger.info("Updated payment %s status to canceled (invoice voided)", payment.id)
                 elif invoice_status == 'uncollectible' and payment.status != 'canceled':
                     # Mark as canceled if invoice is uncollectible (no valid status for failed in Payment model)
                     payment.status = 'canceled'
                     payment.save(update_fields=['status'])
-                    print(f"✅ Updated payment {payment.id} status to canceled (invoice uncollectible)")
+                    logger.info("Updated payment %s status to canceled (invoice uncollectible)", payment.id)
                 
         except Exception as e:
-            print(f"❌ Error handling invoice updated: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling invoice updated: %s", e)
 
 
 class CreatePaymentIntentView(APIView):
@@ -1470,9 +1425,9 @@ class CreatePaymentIntentView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, course_id: str):
-        print(f"🔍 CreatePaymentIntentView called with course_id: {course_id}")
-        print(f"🔍 Request data: {request.data}")
-        print(f"🔍 User: {request.user}")
+        logger.debug("CreatePaymentIntentView called with course_id: %s", course_id)
+        logger.debug("Request data: %s", request.data)
+        logger.debug("User: %s", request.user)
         
         # Check if user already has active subscriptions for this course
         try:
@@ -1481,18 +1436,17 @@ class CreatePaymentIntentView(APIView):
                 course_id=course_id,
                 status__in=['active', 'trialing', 'incomplete', 'incomplete_expired', 'past_due']
             )
-            print(f"🔍 Found {existing_subs.count()} existing subscribers for this user/course")
+            logger.debug("Found %s existing subscribers for this user/course", existing_subs.count())
             for sub in existing_subs:
-                print(f"  - Subscriber {sub.stripe_subscription_id}: status={sub.status}, created={sub.created_at}")
+                logger.debug("Subscriber %s: status=%s, created=%s", sub.stripe_subscription_id, sub.status, sub.created_at)
         except Exception as e:
-            print(f"⚠️ Error checking existing subscribers: {e}")
+            logger.warning("Error checking existing subscribers: %s", e)
         
         try:
             stripe_client = get_stripe_client()
-            print(f"🔑 Stripe client configured with key: {stripe.api_key[:12]}...")
             # Check if we're in test or live mode
             is_test_mode = stripe.api_key.startswith('sk_test_')
-            print(f"🔑 Stripe mode: {'TEST' if is_test_mode else 'LIVE'}")
+            logger.info("Stripe mode: %s", 'TEST' if is_test_mode else 'LIVE')
             
             # Get course
             course = get_object_or_404(Course, id=course_id, status='published')
@@ -1515,9 +1469,9 @@ class CreatePaymentIntentView(APIView):
                     'one_time': {'amount': float(one_time_price.unit_amount) if one_time_price else float(course.price)},
                     'monthly': {'amount': float(monthly_price.unit_amount) if monthly_price else float(course.price) * 1.15}
                 }
-                print(f"💰 Course pricing options: {pricing_options}")
+                logger.info("Course pricing options: %s", pricing_options)
             except BillingProduct.DoesNotExist:
-                print(f"⚠️ No billing product found for course {course.id}, using base price")
+                logger.warning("No billing product found for course %s, using base price", course.id)
                 pricing_options = {
                     'one_time': {'amount': float(course.price)},
                     'monthly': {'amount': float(course.price) * 1.15}  # 15% more for installments
@@ -1530,12 +1484,12 @@ class CreatePaymentIntentView(APIView):
             # Calculate amount based on pricing type
             if pricing_type == 'monthly':
                 amount = int(pricing_options['monthly']['amount'] * 100)
-                print(f"💳 Creating subscription for monthly payment: ${pricing_options['monthly']['amount']}")
+                logger.info("Creating subscription for monthly payment: $%s", pricing_options['monthly']['amount'])
                 
                 # Calculate total months for the course duration
                 import math
                 total_months = math.ceil(course.duration_weeks / 4)
-                print(f"📅 Course duration: {course.duration_weeks} weeks = {total_months} months")
+                logger.info("Course duration: %s weeks = %s months", course.duration_weeks, total_months)
                 
                 # Ensure product and prices exist in current environment (auto-migrate if needed)
                 try:
@@ -1543,9 +1497,9 @@ class CreatePaymentIntentView(APIView):
                         course, 
                         billing_period='monthly'
                     )
-                    print(f"✅ Using price ID: {stripe_price_id} (verified in current environment)")
+                    logger.info("Using price ID: %s (verified in current environment)", stripe_price_id)
                 except Exception as e:
-                    print(f"❌ Failed to ensure product/prices in current environment: {e}")
+                    logger.error("Failed to ensure product/prices in current environment: %s", e)
                     # Fallback: Try to create price on the fly (legacy behavior)
                     try:
                         billing_product = BillingProduct.objects.get(course=course)
@@ -1575,8 +1529,6 @@ class CreatePaymentIntentView(APIView):
                         stripe_price_id = stripe_price.id
                 
                 # Create subscription
-                #print(f"🚀 About to create Stripe subscription with price_id: {stripe_price_id}")
-                #print(f"🚀 Customer: {customer_account.stripe_customer_id}")
                 # Get trial period settings
                 trial_settings = get_trial_period_settings()
                 # Only use trial if explicitly requested AND enabled AND days > 0
@@ -1584,7 +1536,7 @@ class CreatePaymentIntentView(APIView):
                             trial_settings['enabled'] and 
                             trial_settings['days'] > 0)
                 trial_days = trial_settings['days'] if has_trial else 0
-                print(f"🚀 Trial period: {trial_days} days (has_trial: {has_trial})")
+                logger.info("Trial period: %s days (has_trial: %s)", trial_days, has_trial)
                 
                 try:
                     # Calculate when to cancel the subscription after all monthly payments
@@ -1594,7 +1546,7 @@ class CreatePaymentIntentView(APIView):
                     cancel_at = datetime.datetime.now(dt_timezone.utc) + datetime.timedelta(
                         days=trial_days + (total_months * 30)
                     )
-                    print(f"🗓️ Monthly subscription will cancel: {cancel_at.strftime('%Y-%m-%d %H:%M:%S UTC')} (after {total_months} payments)")
+                    logger.info("Monthly subscription will cancel: %s (after %s payments)", cancel_at.strftime('%Y-%m-%d %H:%M:%S UTC'), total_months)
                     
                     # Try to create subscription - if it fails due to invalid price, migrate and retry
                     max_retries = 1
@@ -1633,14 +1585,14 @@ class CreatePaymentIntentView(APIView):
                             # Only add trial_period_days if we have a valid trial (days > 0)
                             if has_trial and trial_days > 0:
                                 subscription_params['trial_period_days'] = trial_days
-                                print(f"✅ Adding trial period: {trial_days} days")
+                                logger.info("Adding trial period: %s days", trial_days)
                             else:
-                                print(f"ℹ️ No trial period (trial_days={trial_days}, has_trial={has_trial})")
+                                logger.info("No trial period (trial_days=%s, has_trial=%s)", trial_days, has_trial)
                                 # When no trial, ensure we get a setup intent for payment method collection
                                 # Stripe should create this automatically with default_incomplete, but we'll verify in retry logic
                             
                             subscription = stripe.Subscription.create(**subscription_params)
-                            print(f"✅ Subscription created successfully with price {stripe_price_id}")
+                            logger.info("Subscription created successfully with price %s", stripe_price_id)
                         except stripe.error.InvalidRequestError as e:
                             error_code = getattr(e, 'code', '')
                             error_message = str(e)
@@ -1650,32 +1602,24 @@ class CreatePaymentIntentView(APIView):
                                 error_code == 'resource_missing' or
                                 'price' in error_message.lower()):
                                 if retry_count < max_retries:
-                                    print(f"⚠️ Subscription creation failed due to invalid price ID: {e}")
-                                    print(f"🔄 Retrying with migrated product/prices...")
+                                    logger.warning("Subscription creation failed due to invalid price ID: %s", e)
+                                    logger.info("Retrying with migrated product/prices...")
                                     # Migrate product and prices, then retry
                                     stripe_price_id = ensure_stripe_product_and_prices_in_current_environment(
                                         course, 
                                         billing_period='monthly'
                                     )
-                                    print(f"✅ Migrated to new price ID: {stripe_price_id}, retrying subscription creation...")
+                                    logger.info("Migrated to new price ID: %s, retrying subscription creation...", stripe_price_id)
                                     retry_count += 1
                                 else:
                                     # Max retries reached, raise the error
-                                    print(f"❌ Max retries reached, price migration failed")
+                                    logger.error("Max retries reached, price migration failed")
                                     raise e
                             else:
                                 # Different error, don't retry
                                 raise e
-                    #print(f"✅ Stripe subscription created: {subscription.id}")
-                   # print(f"✅ Subscription status: {subscription.status}")
-                   # print(f"🔍 Metadata sent to Stripe: {subscription.metadata}")
-                   # print(f"🔍 DEBUG: class_id from request: {request.data.get('class_id')}")
-                   # print(f"🔍 DEBUG: class_id in metadata: {subscription.metadata.get('class_id')}")
-                   # print(f"✅ Has latest_invoice: {bool(getattr(subscription, 'latest_invoice', None))}")
-                   # print(f"✅ Has pending_setup_intent: {bool(getattr(subscription, 'pending_setup_intent', None))}")
                     
                     # Create local subscription record immediately with incomplete status
-                    #print(f"🔄 Creating local subscription record for: {subscription.id}")
                     try:
                         # Get the price ID from the subscription
                         stripe_price_id = subscription['items']['data'][0]['price']['id']
@@ -1785,29 +1729,27 @@ class CreatePaymentIntentView(APIView):
                             amount=subscription_amount,
                         )
                         
-                        print(f"✅ Local subscriber record created: {local_subscriber.id} with status: incomplete")
+                        logger.info("Local subscriber record created: %s with status: incomplete", local_subscriber.id)
                         
                     except Exception as e:
-                        print(f"⚠️ Could not save local subscription: {e}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.warning("Could not save local subscription: %s", e, exc_info=True)
                         # Don't raise - we still want to return the Stripe subscription
                     
                     # Double-check by retrieving the subscription from Stripe
                     try:
                         verified_sub = stripe.Subscription.retrieve(subscription.id)
-                        print(f"🔍 Verified subscription exists in Stripe: {verified_sub.id} (status: {verified_sub.status})")
+                        logger.debug("Verified subscription exists in Stripe: %s (status: %s)", verified_sub.id, verified_sub.status)
                     except Exception as verify_error:
-                        print(f"❌ Failed to verify subscription in Stripe: {verify_error}")
+                        logger.error("Failed to verify subscription in Stripe: %s", verify_error)
                 
                 except stripe.error.StripeError as e:
-                    print(f"❌ Stripe error creating subscription: {e}")
-                    print(f"❌ Error type: {type(e).__name__}")
-                    print(f"❌ Error code: {getattr(e, 'code', 'N/A')}")
+                    logger.error("Stripe error creating subscription: %s", e)
+                    logger.error("Error type: %s", type(e).__name__)
+                    logger.error("Error code: %s", getattr(e, 'code', 'N/A'))
                     raise e
                 except Exception as e:
-                    print(f"❌ Unexpected error creating subscription: {e}")
-                    print(f"❌ Error type: {type(e).__name__}")
+                    logger.error("Unexpected error creating subscription: %s", e)
+                    logger.error("Error type: %s", type(e).__name__)
                     raise e
                 
                 # For incomplete subscriptions, Stripe provides a pending_setup_intent for PM collection
@@ -1828,11 +1770,11 @@ class CreatePaymentIntentView(APIView):
                     if attempt > 0:
                         # Wait before retrying (except first attempt)
                         delay = retry_delays[attempt - 1]
-                        print(f"⏳ Waiting {delay}s before retry {attempt} to get payment/setup intent...")
+                        logger.info("Waiting %ss before retry %s to get payment/setup intent...", delay, attempt)
                         time.sleep(delay)
                         
                         # Re-retrieve subscription with expanded fields to get latest state
-                        print(f"🔄 Re-retrieving subscription {subscription.id} with expanded fields...")
+                        logger.info("Re-retrieving subscription %s with expanded fields...", subscription.id)
                         subscription = stripe.Subscription.retrieve(
                             subscription.id,
                             expand=['latest_invoice.payment_intent', 'pending_setup_intent']
@@ -1846,7 +1788,7 @@ class CreatePaymentIntentView(APIView):
                             client_secret = payment_intent.client_secret
                             payment_intent_id = payment_intent.id
                             intent_type = 'payment'
-                            print(f"💳 Using payment intent from latest_invoice: {payment_intent_id}")
+                            logger.info("Using payment intent from latest_invoice: %s", payment_intent_id)
                             break  # Found intent, exit retry loop
                     
                     # Check for setup intent (for trials or future payments)
@@ -1855,7 +1797,7 @@ class CreatePaymentIntentView(APIView):
                         client_secret = setup_intent.client_secret
                         setup_intent_id = setup_intent.id
                         intent_type = 'setup'
-                        print(f"🔧 Using setup intent: {setup_intent_id}")
+                        logger.info("Using setup intent: %s", setup_intent_id)
                         break  # Found intent, exit retry loop
                     
                     # If still no intent, try to retrieve from invoice directly
@@ -1870,10 +1812,10 @@ class CreatePaymentIntentView(APIView):
                                 client_secret = payment_intent.client_secret
                                 payment_intent_id = payment_intent.id
                                 intent_type = 'payment'
-                                print(f"💳 Retrieved payment intent from invoice: {payment_intent_id}")
+                                logger.info("Retrieved payment intent from invoice: %s", payment_intent_id)
                                 break  # Found intent, exit retry loop
                         except Exception as e:
-                            print(f"⚠️ Could not retrieve payment intent from invoice: {e}")
+                            logger.warning("Could not retrieve payment intent from invoice: %s", e)
                     
                     # If we found an intent, break out of retry loop
                     if client_secret:
@@ -1881,19 +1823,19 @@ class CreatePaymentIntentView(APIView):
                     
                     # Log attempt if not last one
                     if attempt < max_retries - 1:
-                        print(f"⚠️ Attempt {attempt + 1}: No payment or setup intent found yet, will retry...")
-                        print(f"⚠️ Subscription status: {subscription.status}, latest_invoice: {subscription.get('latest_invoice')}")
+                        logger.warning("Attempt %s: No payment or setup intent found yet, will retry...", attempt + 1)
+                        logger.warning("Subscription status: %s, latest_invoice: %s", subscription.status, subscription.get('latest_invoice'))
                 
                 # Final check: if still no intent after all retries, try to update subscription to get intent
                 if not client_secret:
-                    print(f"⚠️ No payment or setup intent found after {max_retries} attempts")
-                    print(f"⚠️ Subscription ID: {subscription.id}, Status: {subscription.status}")
-                    print(f"⚠️ Latest invoice: {subscription.get('latest_invoice')}")
-                    print(f"⚠️ Pending setup intent: {subscription.get('pending_setup_intent')}")
+                    logger.warning("No payment or setup intent found after %s attempts", max_retries)
+                    logger.warning("Subscription ID: %s, Status: %s", subscription.id, subscription.status)
+                    logger.warning("Latest invoice: %s", subscription.get('latest_invoice'))
+                    logger.warning("Pending setup intent: %s", subscription.get('pending_setup_intent'))
                     
                     # Try one more time: update subscription to ensure setup intent is created
                     if not has_trial and subscription.status == 'incomplete':
-                        print(f"🔄 No trial and subscription is incomplete - attempting to update subscription to get setup intent...")
+                        logger.info("No trial and subscription is incomplete - attempting to update subscription to get setup intent...")
                         try:
                             # Update subscription to ensure payment method collection
                             updated_subscription = stripe.Subscription.modify(
@@ -1912,7 +1854,7 @@ class CreatePaymentIntentView(APIView):
                                 client_secret = setup_intent.client_secret
                                 setup_intent_id = setup_intent.id
                                 intent_type = 'setup'
-                                print(f"✅ Got setup intent after subscription update: {setup_intent_id}")
+                                logger.info("Got setup intent after subscription update: %s", setup_intent_id)
                             elif getattr(updated_subscription, 'latest_invoice', None):
                                 latest_invoice = updated_subscription.latest_invoice
                                 if hasattr(latest_invoice, 'payment_intent') and latest_invoice.payment_intent:
@@ -1920,19 +1862,19 @@ class CreatePaymentIntentView(APIView):
                                     client_secret = payment_intent.client_secret
                                     payment_intent_id = payment_intent.id
                                     intent_type = 'payment'
-                                    print(f"✅ Got payment intent after subscription update: {payment_intent_id}")
+                                    logger.info("Got payment intent after subscription update: %s", payment_intent_id)
                         except Exception as e:
-                            print(f"⚠️ Failed to update subscription to get intent: {e}")
+                            logger.warning("Failed to update subscription to get intent: %s", e)
                     
                     # If still no intent, raise error
                     if not client_secret:
-                        print(f"❌ No payment or setup intent available after all attempts")
-                        print(f"❌ Subscription ID: {subscription.id}, Status: {subscription.status}")
+                        logger.error("No payment or setup intent available after all attempts")
+                        logger.error("Subscription ID: %s, Status: %s", subscription.id, subscription.status)
                         raise Exception('No payment or setup intent available for subscription')
                 
             else:
                 amount = int(pricing_options['one_time']['amount'] * 100)
-                print(f"💳 Creating one-time payment: ${pricing_options['one_time']['amount']}")
+                logger.info("Creating one-time payment: $%s", pricing_options['one_time']['amount'])
                 
                 # Check if trial is requested and valid (days > 0)
                 trial_settings = get_trial_period_settings()
@@ -1943,17 +1885,17 @@ class CreatePaymentIntentView(APIView):
                 if has_trial_one_time:
                     # For one-time payments with trial, create a subscription that will charge once and then cancel
                     trial_days = trial_settings['days']
-                    print(f"🔄 Creating one-time subscription with trial ({trial_days} days) for: ${pricing_options['one_time']['amount']}")
+                    logger.info("Creating one-time subscription with trial (%s days) for: $%s", trial_days, pricing_options['one_time']['amount'])
                     
                     # Ensure product exists before creating price (reuse existing product, don't create new one)
                     if not billing_product:
-                        print(f"⚠️ No billing product found, ensuring product exists in current environment...")
+                        logger.warning("No billing product found, ensuring product exists in current environment...")
                         try:
                             ensure_stripe_product_and_prices_in_current_environment(course, billing_period='one_time')
                             billing_product = BillingProduct.objects.get(course=course)
-                            print(f"✅ Product ensured: {billing_product.stripe_product_id}")
+                            logger.info("Product ensured: %s", billing_product.stripe_product_id)
                         except Exception as e:
-                            print(f"❌ Failed to ensure product: {e}")
+                            logger.error("Failed to ensure product: %s", e)
                             raise Exception(f"Cannot create subscription: Product does not exist for course {course.id}")
                     
                     # For subscriptions, we need a recurring price, not a one-time price
@@ -1970,7 +1912,7 @@ class CreatePaymentIntentView(APIView):
                         }
                     )
                     stripe_price_id = stripe_price.id
-                    print(f"✅ Created recurring price for one-time trial: {stripe_price_id} (using existing product: {billing_product.stripe_product_id})")
+                    logger.info("Created recurring price for one-time trial: %s (using existing product: %s)", stripe_price_id, billing_product.stripe_product_id)
                     
                     # Create a subscription with trial that will cancel after first payment
                     try:
@@ -1980,8 +1922,8 @@ class CreatePaymentIntentView(APIView):
                         # Calculate when to cancel: trial end + 1 billing cycle (1 month)
                         trial_end = datetime.datetime.now(dt_timezone.utc) + datetime.timedelta(days=trial_days)
                         cancel_at = trial_end + datetime.timedelta(days=30)  # 1 month after trial ends
-                        print(f"🗓️ Trial ends: {trial_end.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-                        print(f"🗓️ Subscription will cancel: {cancel_at.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+                        logger.info("Trial ends: %s", trial_end.strftime('%Y-%m-%d %H:%M:%S UTC'))
+                        logger.info("Subscription will cancel: %s", cancel_at.strftime('%Y-%m-%d %H:%M:%S UTC'))
                         
                         subscription = stripe.Subscription.create(
                             customer=stripe_customer_id,
@@ -2002,13 +1944,13 @@ class CreatePaymentIntentView(APIView):
                                 'student_profile_id': str(getattr(request.user, 'student_profile', {}).id if hasattr(request.user, 'student_profile') and request.user.student_profile else '')
                             }
                         )
-                        print(f"✅ One-time trial subscription created: {subscription.id}")
-                        print(f"✅ Subscription status: {subscription.status}")
-                        print(f"🔍 Metadata sent to Stripe: {subscription.metadata}")
-                        print(f"⏰ Stripe subscription created at: {timezone.now()}")
+                        logger.info("One-time trial subscription created: %s", subscription.id)
+                        logger.info("Subscription status: %s", subscription.status)
+                        logger.debug("Metadata sent to Stripe: %s", subscription.metadata)
+                        logger.info("Stripe subscription created at: %s", timezone.now())
                         
                         # Create local subscription record immediately with incomplete status
-                        print(f"🔄 Creating local subscription record for one-time trial: {subscription.id}")
+                        logger.info("Creating local subscription record for one-time trial: %s", subscription.id)
                         try:
                             # Get the price ID from the subscription
                             stripe_price_id = subscription['items']['data'][0]['price']['id']
@@ -2119,12 +2061,10 @@ class CreatePaymentIntentView(APIView):
                                     amount=subscription_amount,
                                 )
                                 
-                                print(f"✅ Local one-time trial subscriber record created: {local_subscriber.id} with status: incomplete")
+                                logger.info("Local one-time trial subscriber record created: %s with status: incomplete", local_subscriber.id)
                             
                             except Exception as e:
-                                print(f"⚠️ Could not save local one-time trial subscription: {e}")
-                                import traceback
-                                traceback.print_exc()
+                                logger.warning("Could not save local one-time trial subscription: %s", e, exc_info=True)
                                 # Don't raise - we still want to return the Stripe subscription
                         
                             # Handle the intents like monthly subscriptions
@@ -2143,11 +2083,11 @@ class CreatePaymentIntentView(APIView):
                                 if attempt > 0:
                                     # Wait before retrying (except first attempt)
                                     delay = retry_delays[attempt - 1]
-                                    print(f"⏳ Waiting {delay}s before retry {attempt} to get payment/setup intent (one-time)...")
+                                    logger.info("Waiting %ss before retry %s to get payment/setup intent (one-time)...", delay, attempt)
                                     time.sleep(delay)
                                     
                                     # Re-retrieve subscription with expanded fields to get latest state
-                                    print(f"🔄 Re-retrieving subscription {subscription.id} with expanded fields...")
+                                    logger.info("Re-retrieving subscription %s with expanded fields...", subscription.id)
                                     subscription = stripe.Subscription.retrieve(
                                         subscription.id,
                                         expand=['latest_invoice.payment_intent', 'pending_setup_intent']
@@ -2161,7 +2101,7 @@ class CreatePaymentIntentView(APIView):
                                         client_secret = payment_intent.client_secret
                                         payment_intent_id = payment_intent.id
                                         intent_type = 'payment'
-                                        print(f"💳 Using payment intent from latest_invoice: {payment_intent_id}")
+                                        logger.info("Using payment intent from latest_invoice: %s", payment_intent_id)
                                         break  # Found intent, exit retry loop
                                 
                                 # Check for setup intent (for trials or future payments)
@@ -2170,7 +2110,7 @@ class CreatePaymentIntentView(APIView):
                                     client_secret = setup_intent.client_secret
                                     setup_intent_id = setup_intent.id
                                     intent_type = 'setup'
-                                    print(f"🔧 Using setup intent: {setup_intent_id}")
+                                    logger.info("Using setup intent: %s", setup_intent_id)
                                     break  # Found intent, exit retry loop
                                 
                                 # If still no intent, try to retrieve from invoice directly
@@ -2185,10 +2125,10 @@ class CreatePaymentIntentView(APIView):
                                             client_secret = payment_intent.client_secret
                                             payment_intent_id = payment_intent.id
                                             intent_type = 'payment'
-                                            print(f"💳 Retrieved payment intent from invoice: {payment_intent_id}")
+                                            logger.info("Retrieved payment intent from invoice: %s", payment_intent_id)
                                             break  # Found intent, exit retry loop
                                     except Exception as e:
-                                        print(f"⚠️ Could not retrieve payment intent from invoice: {e}")
+                                        logger.warning("Could not retrieve payment intent from invoice: %s", e)
                                 
                                 # If we found an intent, break out of retry loop
                                 if client_secret:
@@ -2196,19 +2136,19 @@ class CreatePaymentIntentView(APIView):
                                 
                                 # Log attempt if not last one
                                 if attempt < max_retries - 1:
-                                    print(f"⚠️ Attempt {attempt + 1}: No payment or setup intent found yet (one-time), will retry...")
-                                    print(f"⚠️ Subscription status: {subscription.status}, latest_invoice: {subscription.get('latest_invoice')}")
+                                    logger.warning("Attempt %s: No payment or setup intent found yet (one-time), will retry...", attempt + 1)
+                                    logger.warning("Subscription status: %s, latest_invoice: %s", subscription.status, subscription.get('latest_invoice'))
                             
                             # Final check: if still no intent after all retries, try to update subscription
                             if not client_secret:
-                                print(f"⚠️ No payment or setup intent found after {max_retries} attempts (one-time)")
-                                print(f"⚠️ Subscription ID: {subscription.id}, Status: {subscription.status}")
-                                print(f"⚠️ Latest invoice: {subscription.get('latest_invoice')}")
-                                print(f"⚠️ Pending setup intent: {subscription.get('pending_setup_intent')}")
+                                logger.warning("No payment or setup intent found after %s attempts (one-time)", max_retries)
+                                logger.warning("Subscription ID: %s, Status: %s", subscription.id, subscription.status)
+                                logger.warning("Latest invoice: %s", subscription.get('latest_invoice'))
+                                logger.warning("Pending setup intent: %s", subscription.get('pending_setup_intent'))
                                 
                                 # Try to update subscription to get intent (same as monthly)
                                 if not has_trial_one_time and subscription.status == 'incomplete':
-                                    print(f"🔄 No trial and subscription is incomplete - attempting to update subscription...")
+                                    logger.info("No trial and subscription is incomplete - attempting to update subscription...")
                                     try:
                                         updated_subscription = stripe.Subscription.modify(
                                             subscription.id,
@@ -2225,7 +2165,7 @@ class CreatePaymentIntentView(APIView):
                                             client_secret = setup_intent.client_secret
                                             setup_intent_id = setup_intent.id
                                             intent_type = 'setup'
-                                            print(f"✅ Got setup intent after subscription update: {setup_intent_id}")
+                                            logger.info("Got setup intent after subscription update: %s", setup_intent_id)
                                         elif getattr(updated_subscription, 'latest_invoice', None):
                                             latest_invoice = updated_subscription.latest_invoice
                                             if hasattr(latest_invoice, 'payment_intent') and latest_invoice.payment_intent:
@@ -2233,27 +2173,25 @@ class CreatePaymentIntentView(APIView):
                                                 client_secret = payment_intent.client_secret
                                                 payment_intent_id = payment_intent.id
                                                 intent_type = 'payment'
-                                                print(f"✅ Got payment intent after subscription update: {payment_intent_id}")
+                                                logger.info("Got payment intent after subscription update: %s", payment_intent_id)
                                     except Exception as e:
-                                        print(f"⚠️ Failed to update subscription to get intent: {e}")
+                                        logger.warning("Failed to update subscription to get intent: %s", e)
                                 
                                 if not client_secret:
-                                    print(f"❌ No payment or setup intent available after all attempts (one-time)")
+                                    logger.error("No payment or setup intent available after all attempts (one-time)")
                                     raise Exception('No payment or setup intent available for subscription')
                         except Exception as e:
-                            print(f"⚠️ Could not save local one-time trial subscription: {e}")
-                            import traceback
-                            traceback.print_exc()
+                            logger.warning("Could not save local one-time trial subscription: %s", e, exc_info=True)
                             # Don't raise - we still want to return the Stripe subscription
                             
                     except stripe.error.StripeError as e:
-                        print(f"❌ Stripe error creating one-time trial subscription: {e}")
-                        print(f"❌ Error type: {type(e).__name__}")
-                        print(f"❌ Error code: {getattr(e, 'code', 'N/A')}")
+                        logger.error("Stripe error creating one-time trial subscription: %s", e)
+                        logger.error("Error type: %s", type(e).__name__)
+                        logger.error("Error code: %s", getattr(e, 'code', 'N/A'))
                         raise e
                     except Exception as e:
-                        print(f"❌ Unexpected error creating one-time trial subscription: {e}")
-                        print(f"❌ Error type: {type(e).__name__}")
+                        logger.error("Unexpected error creating one-time trial subscription: %s", e)
+                        logger.error("Error type: %s", type(e).__name__)
                         raise e
                         
                 else:
@@ -2294,7 +2232,7 @@ class CreatePaymentIntentView(APIView):
                 'course_title': course.title,
             }
             
-            print(f"🎯 Final response data: {response_data}")
+            logger.debug("Final response data: %s", response_data)
             
             # Add a delayed check to see if status changes after request completes
             import threading
@@ -2304,18 +2242,18 @@ class CreatePaymentIntentView(APIView):
                 time.sleep(delay)
                 try:
                     sub = Subscribers.objects.get(id=subscription_id)
-                    print(f"🔍 DELAYED CHECK ({delay}s later): Subscription {subscription_id} status = {sub.status}")
+                    logger.debug("DELAYED CHECK (%ss later): Subscription %s status = %s", delay, subscription_id, sub.status)
                     if sub.status != 'incomplete':
-                        print(f"🚨 STATUS CHANGED AFTER REQUEST! Now: {sub.status}")
+                        logger.info("STATUS CHANGED AFTER REQUEST! Now: %s", sub.status)
                 except Exception as e:
-                    print(f"⚠️ Delayed check failed: {e}")
+                    logger.warning("Delayed check failed: %s", e)
             
             # Start delayed check in background
             if subscription_id and 'local_subscriber' in locals():
                 thread = threading.Thread(target=delayed_status_check, args=(local_subscriber.id, 5))
                 thread.daemon = True
                 thread.start()
-                print(f"🔍 Started delayed status check for subscription {local_subscriber.id}")
+                logger.debug("Started delayed status check for subscription %s", local_subscriber.id)
             
             return Response({
                 'client_secret': client_secret,
@@ -2334,7 +2272,7 @@ class CreatePaymentIntentView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            print(f"Error creating payment intent: {e}")
+            logger.error("Error creating payment intent: %s", e)
             return Response(
                 {'error': 'Failed to create payment intent', 'details': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2348,7 +2286,7 @@ class ConfirmEnrollmentView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, course_id: str):
-        print(f"🎓 CONFIRM ENROLLMENT: {course_id}")
+        logger.info("CONFIRM ENROLLMENT: %s", course_id)
         
         try:
             # Get course and class
@@ -2392,7 +2330,7 @@ class ConfirmEnrollmentView(APIView):
             poll_interval = 0.5  # seconds
             start_time = time.time()
             
-            print(f"🔄 Polling for webhook completion...")
+            logger.info("Polling for webhook completion...")
             
             while time.time() - start_time < max_wait_time:
                 try:
@@ -2407,7 +2345,7 @@ class ConfirmEnrollmentView(APIView):
                         ).first()
                         
                         if enrollment:
-                            print(f"✅ Enrollment completed by webhook: {enrollment.id}")
+                            logger.info("Enrollment completed by webhook: %s", enrollment.id)
                             
                             # Check if it's a trial enrollment
                             trial_end_date = None
@@ -2426,25 +2364,25 @@ class ConfirmEnrollmentView(APIView):
                 except Subscribers.DoesNotExist:
                     time.sleep(poll_interval)
                 except Exception as e:
-                    print(f"❌ Error during polling: {e}")
+                    logger.error("Error during polling: %s", e)
                     time.sleep(poll_interval)
             
             # Timeout reached - webhook didn't arrive, query Stripe directly
-            print(f"⏰ Timeout: Webhook did not complete enrollment within {max_wait_time} seconds")
-            print(f"🔍 Querying Stripe directly to verify payment status...")
+            logger.info("Timeout: Webhook did not complete enrollment within %s seconds", max_wait_time)
+            logger.debug("Querying Stripe directly to verify payment status...")
             
             try:
                 # Query Stripe to check subscription and payment status
                 get_stripe_client()
-                print(f"🔍 Attempting to retrieve subscription from Stripe: {subscription_id}")
+                logger.debug("Attempting to retrieve subscription from Stripe: %s", subscription_id)
                 stripe_subscription = stripe.Subscription.retrieve(
                     subscription_id,
                     expand=['latest_invoice.payment_intent', 'pending_setup_intent']
                 )
-                print(f"✅ Successfully retrieved subscription from Stripe: {stripe_subscription.id}")
+                logger.info("Successfully retrieved subscription from Stripe: %s", stripe_subscription.id)
                 
                 subscription_status = stripe_subscription.get('status')
-                print(f"📊 Stripe subscription status: {subscription_status}")
+                logger.info("Stripe subscription status: %s", subscription_status)
                 
                 # Also check setup intent status if subscription is incomplete
                 setup_intent_status = None
@@ -2456,9 +2394,9 @@ class ConfirmEnrollmentView(APIView):
                         try:
                             setup_intent = stripe.SetupIntent.retrieve(setup_intent_id)
                             setup_intent_status = setup_intent.status
-                            print(f"📊 Setup intent status: {setup_intent_status} (ID: {setup_intent_id})")
+                            logger.info("Setup intent status: %s (ID: %s)", setup_intent_status, setup_intent_id)
                         except Exception as e:
-                            print(f"⚠️ Could not retrieve setup intent: {e}")
+                            logger.warning("Could not retrieve setup intent: %s", e)
                 
                 # Check if payment was successful based on subscription status
                 # 'trialing' = trial started (payment method collected, no charge yet)
@@ -2485,11 +2423,11 @@ class ConfirmEnrollmentView(APIView):
                         try:
                             invoice = stripe.Invoice.retrieve(latest_invoice_id)
                             invoice_status = invoice.get('status')
-                            print(f"🔍 Invoice status: {invoice_status} for invoice {latest_invoice_id}")
+                            logger.debug("Invoice status: %s for invoice %s", invoice_status, latest_invoice_id)
                             
                             if invoice_status == 'paid':
                                 # Invoice is paid - payment was successful
-                                print(f"✅ Invoice is paid - payment successful")
+                                logger.info("Invoice is paid - payment successful")
                                 payment_successful = True
                             elif invoice_status in ['open', 'draft']:
                                 # Invoice is open - check if payment was attempted and failed
@@ -2497,46 +2435,46 @@ class ConfirmEnrollmentView(APIView):
                                 if last_payment_error:
                                     # Payment was attempted but failed
                                     error_message = last_payment_error.get('message', 'Payment failed')
-                                    print(f"❌ Invoice payment failed: {error_message}")
+                                    logger.error("Invoice payment failed: %s", error_message)
                                     return Response(
                                         {'error': f'Payment failed: {error_message}. Please check your payment method and try again.'}, 
                                         status=status.HTTP_402_PAYMENT_REQUIRED
                                     )
                                 # Invoice is open - payment method collected, waiting for payment
                                 # This can happen when trial_days=0 and subscription is waiting for first charge
-                                print(f"✅ Setup intent succeeded - payment method collected successfully")
-                                print(f"ℹ️ Invoice is {invoice_status} - payment method is ready, waiting for charge")
+                                logger.info("Setup intent succeeded - payment method collected successfully")
+                                logger.info("Invoice is %s - payment method is ready, waiting for charge", invoice_status)
                                 payment_successful = True
                             elif invoice_status in ['void', 'uncollectible']:
                                 # Invoice payment failed - return error immediately
-                                print(f"❌ Invoice payment failed (status: {invoice_status})")
+                                logger.error("Invoice payment failed (status: %s)", invoice_status)
                                 return Response(
                                     {'error': 'Payment failed. Your payment method was collected but the charge was declined. Please check your payment method and try again.'}, 
                                     status=status.HTTP_402_PAYMENT_REQUIRED
                                 )
                             else:
                                 # Unknown invoice status - be cautious
-                                print(f"⚠️ Unknown invoice status: {invoice_status}")
+                                logger.warning("Unknown invoice status: %s", invoice_status)
                                 payment_successful = False
                         except Exception as e:
-                            print(f"⚠️ Error checking invoice status: {e}")
+                            logger.warning("Error checking invoice status: %s", e)
                             # If we can't check invoice, assume payment method is ready
-                            print(f"ℹ️ Assuming payment method is ready (setup intent succeeded)")
+                            logger.info("Assuming payment method is ready (setup intent succeeded)")
                             payment_successful = True
                     else:
                         # No invoice yet - payment method is ready
-                        print(f"✅ Setup intent succeeded - payment method collected successfully")
-                        print(f"ℹ️ No invoice yet - payment method is ready")
+                        logger.info("Setup intent succeeded - payment method collected successfully")
+                        logger.info("No invoice yet - payment method is ready")
                         payment_successful = True
                 
                 if payment_successful:
                     # Payment was successful - create enrollment directly
                     if subscription_status == 'incomplete' and setup_intent_status == 'succeeded':
-                        print(f"✅ Stripe confirms payment method collected (setup intent succeeded, subscription incomplete)")
-                        print(f"ℹ️ Subscription is incomplete but setup intent succeeded - payment method is ready")
+                        logger.info("Stripe confirms payment method collected (setup intent succeeded, subscription incomplete)")
+                        logger.info("Subscription is incomplete but setup intent succeeded - payment method is ready")
                     else:
-                        print(f"✅ Stripe confirms payment successful (status: {subscription_status})")
-                    print(f"🔄 Creating enrollment directly since webhook didn't arrive...")
+                        logger.info("Stripe confirms payment successful (status: %s)", subscription_status)
+                    logger.info("Creating enrollment directly since webhook didn't arrive...")
                     
                     # Get subscription metadata
                     metadata = stripe_subscription.get('metadata', {})
@@ -2581,11 +2519,11 @@ class ConfirmEnrollmentView(APIView):
                         if updated_fields:
                             updated_fields.append('updated_at')
                             subscriber.save(update_fields=updated_fields)
-                            print(f"✅ Updated existing subscriber {subscriber.id} with fields: {updated_fields}")
+                            logger.info("Updated existing subscriber %s with fields: %s", subscriber.id, updated_fields)
                         else:
-                            print(f"✅ Subscriber {subscriber.id} already exists and is up to date")
+                            logger.info("Subscriber %s already exists and is up to date", subscriber.id)
                     else:
-                        print(f"✅ Created new subscriber record: {subscriber.id}")
+                        logger.info("Created new subscriber record: %s", subscriber.id)
                     
                     # Create enrollment using complete_enrollment_process
                     enrollment = complete_enrollment_process(
@@ -2598,7 +2536,7 @@ class ConfirmEnrollmentView(APIView):
                     )
                     
                     if enrollment:
-                        print(f"✅ Enrollment created directly after Stripe verification: {enrollment.id}")
+                        logger.info("Enrollment created directly after Stripe verification: %s", enrollment.id)
                         
                         # Get trial end date if applicable
                         trial_end_date = None
@@ -2618,7 +2556,7 @@ class ConfirmEnrollmentView(APIView):
                             'verified_via': 'stripe_direct_query'
                         }, status=status.HTTP_201_CREATED)
                     else:
-                        print(f"❌ Failed to create enrollment after Stripe verification")
+                        logger.error("Failed to create enrollment after Stripe verification")
                         return Response(
                             {'error': 'Payment verified but enrollment creation failed. Please contact support.'}, 
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2627,7 +2565,7 @@ class ConfirmEnrollmentView(APIView):
                 elif subscription_status in ['incomplete', 'incomplete_expired']:
                     # Payment method not collected or expired
                     # (If setup intent succeeded, we already handled it above)
-                    print(f"⚠️ Stripe subscription is {subscription_status} - payment method not collected")
+                    logger.warning("Stripe subscription is %s - payment method not collected", subscription_status)
                     return Response(
                         {'error': 'Payment method was not collected. Please try again.'}, 
                         status=status.HTTP_402_PAYMENT_REQUIRED
@@ -2635,7 +2573,7 @@ class ConfirmEnrollmentView(APIView):
                 
                 elif subscription_status in ['past_due', 'unpaid', 'canceled']:
                     # Payment failed or subscription canceled
-                    print(f"⚠️ Stripe subscription is {subscription_status} - payment failed")
+                    logger.warning("Stripe subscription is %s - payment failed", subscription_status)
                     return Response(
                         {'error': 'Payment failed. Please check your payment method and try again.'}, 
                         status=status.HTTP_402_PAYMENT_REQUIRED
@@ -2643,7 +2581,7 @@ class ConfirmEnrollmentView(APIView):
                 
                 else:
                     # Unknown status
-                    print(f"⚠️ Unknown subscription status: {subscription_status}")
+                    logger.warning("Unknown subscription status: %s", subscription_status)
                     return Response(
                         {'error': f'Payment status unclear (status: {subscription_status}). Please contact support.'}, 
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2652,9 +2590,9 @@ class ConfirmEnrollmentView(APIView):
             except stripe.error.InvalidRequestError as e:
                 error_message = str(e)
                 error_code = getattr(e, 'code', None)
-                print(f"❌ Stripe error querying subscription: {error_message}")
-                print(f"❌ Error code: {error_code}")
-                print(f"❌ Subscription ID attempted: {subscription_id}")
+                logger.error("Stripe error querying subscription: %s", error_message)
+                logger.error("Error code: %s", error_code)
+                logger.error("Subscription ID attempted: %s", subscription_id)
                 
                 # Check if subscription doesn't exist
                 if 'No such subscription' in error_message or error_code == 'resource_missing':
@@ -2676,9 +2614,7 @@ class ConfirmEnrollmentView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             except Exception as e:
-                print(f"❌ Error querying Stripe: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error querying Stripe: %s", e)
                 return Response(
                     {'error': 'Failed to verify payment status. Please contact support.'}, 
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2695,9 +2631,7 @@ class ConfirmEnrollmentView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            print(f"❌ Error confirming enrollment: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error confirming enrollment: %s", e)
             return Response(
                 {'error': 'Failed to confirm enrollment', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2724,7 +2658,7 @@ class ConfirmEnrollmentView(APIView):
             poll_interval = 0.5
             start_time = time.time()
             
-            print(f"🔄 Polling for payment intent completion: {payment_intent_id}")
+            logger.info("Polling for payment intent completion: %s", payment_intent_id)
             
             while time.time() - start_time < max_wait_time:
                 try:
@@ -2747,7 +2681,7 @@ class ConfirmEnrollmentView(APIView):
                         ).first()
                         
                         if enrollment:
-                            print(f"✅ Enrollment completed: {enrollment.id}")
+                            logger.info("Enrollment completed: %s", enrollment.id)
                             return Response({
                                 'message': 'Payment successful and enrollment completed',
                                 'enrollment_id': str(enrollment.id),
@@ -2756,7 +2690,7 @@ class ConfirmEnrollmentView(APIView):
                             }, status=status.HTTP_201_CREATED)
                         else:
                             # Payment succeeded but enrollment not created - create it now
-                            print(f"🔄 Payment succeeded but enrollment not found - creating enrollment...")
+                            logger.info("Payment succeeded but enrollment not found - creating enrollment...")
                             enrollment = self._create_one_time_enrollment(
                                 request.user, course, class_id, payment_intent_id, pricing_type
                             )
@@ -2778,14 +2712,14 @@ class ConfirmEnrollmentView(APIView):
                     time.sleep(poll_interval)
                     
                 except stripe.error.InvalidRequestError as e:
-                    print(f"⚠️ Payment intent not found or error: {e}")
+                    logger.warning("Payment intent not found or error: %s", e)
                     time.sleep(poll_interval)
                 except Exception as e:
-                    print(f"❌ Error during polling: {e}")
+                    logger.error("Error during polling: %s", e)
                     time.sleep(poll_interval)
             
             # Timeout - query Stripe directly
-            print(f"⏰ Timeout: Checking payment intent status directly...")
+            logger.info("Timeout: Checking payment intent status directly...")
             try:
                 get_stripe_client()
                 payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
@@ -2815,16 +2749,14 @@ class ConfirmEnrollmentView(APIView):
                         status=status.HTTP_402_PAYMENT_REQUIRED
                     )
             except Exception as e:
-                print(f"❌ Error verifying payment: {e}")
+                logger.error("Error verifying payment: %s", e)
                 return Response(
                     {'error': 'Could not verify payment status. Please contact support.'}, 
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
                 
         except Exception as e:
-            print(f"❌ Error handling one-time payment enrollment: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling one-time payment enrollment: %s", e)
             return Response(
                 {'error': 'Failed to confirm enrollment', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2841,7 +2773,7 @@ class ConfirmEnrollmentView(APIView):
                 # Get student profile
                 student_profile = getattr(user, 'student_profile', None)
                 if not student_profile:
-                    print(f"❌ Student profile not found for user {user.id}")
+                    logger.error("Student profile not found for user %s", user.id)
                     return None
                 
                 # Check if enrollment already exists
@@ -2851,7 +2783,7 @@ class ConfirmEnrollmentView(APIView):
                 ).first()
                 
                 if existing_enrollment and existing_enrollment.status in ['active', 'completed']:
-                    print(f"✅ Enrollment already exists: {existing_enrollment.id}")
+                    logger.info("Enrollment already exists: %s", existing_enrollment.id)
                     return existing_enrollment
                 
                 # Get the selected class (optional for self-paced)
@@ -2860,10 +2792,10 @@ class ConfirmEnrollmentView(APIView):
                     try:
                         selected_class = Class.objects.get(id=class_id)
                     except Class.DoesNotExist:
-                        print(f"❌ Class {class_id} not found")
+                        logger.error("Class %s not found", class_id)
                         return None
                 elif getattr(course, 'delivery_type', 'live') != 'self_paced':
-                    print(f"❌ Class ID required for non-self-paced course {course.id}")
+                    logger.error("Class ID required for non-self-paced course %s", course.id)
                     return None
                 
                 # Get payment amount from Stripe
@@ -2882,7 +2814,7 @@ class ConfirmEnrollmentView(APIView):
                     existing_enrollment.payment_due_date = None
                     existing_enrollment.save()
                     enrollment = existing_enrollment
-                    print(f"✅ Reactivated existing enrollment: {enrollment.id}")
+                    logger.info("Reactivated existing enrollment: %s", enrollment.id)
                 else:
                     # Create enrollment
                     enrollment = EnrolledCourse.objects.create(
@@ -2921,7 +2853,7 @@ class ConfirmEnrollmentView(APIView):
                     if selected_class and selected_class.student_count < selected_class.max_capacity:
                         selected_class.students.add(user)
                 except Exception as e:
-                    print(f"⚠️ Failed to add student to class: {e}")
+                    logger.warning("Failed to add student to class: %s", e)
                 
                 # Create Payment record
                 try:
@@ -2935,15 +2867,13 @@ class ConfirmEnrollmentView(APIView):
                         paid_at=timezone.now()
                     )
                 except Exception as e:
-                    print(f"⚠️ Failed to create payment record: {e}")
+                    logger.warning("Failed to create payment record: %s", e)
                 
-                print(f"✅ One-time enrollment created: {enrollment.id}")
+                logger.info("One-time enrollment created: %s", enrollment.id)
                 return enrollment
                 
         except Exception as e:
-            print(f"❌ Error creating one-time enrollment: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error creating one-time enrollment: %s", e)
             return None
 
 
@@ -2954,8 +2884,8 @@ class CancelIncompleteSubscriptionView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, course_id: str):
-        print(f"🗑️ Canceling incomplete subscription for course: {course_id}")
-        print(f"🗑️ Request data: {request.data}")
+        logger.info("Canceling incomplete subscription for course: %s", course_id)
+        logger.debug("Request data: %s", request.data)
         
         try:
             get_stripe_client()
@@ -2964,23 +2894,23 @@ class CancelIncompleteSubscriptionView(APIView):
             if not subscription_id:
                 return Response({'error': 'subscription_id is required'}, status=status.HTTP_400_BAD_REQUEST)
             
-            print(f"🗑️ Attempting to cancel subscription: {subscription_id}")
+            logger.info("Attempting to cancel subscription: %s", subscription_id)
             
             # Cancel the subscription in Stripe
             try:
                 canceled_subscription = stripe.Subscription.cancel(subscription_id)
-                print(f"✅ Successfully canceled subscription: {canceled_subscription.id}")
-                print(f"✅ Subscription status: {canceled_subscription.status}")
+                logger.info("Successfully canceled subscription: %s", canceled_subscription.id)
+                logger.info("Subscription status: %s", canceled_subscription.status)
                 
                 # Delete the local subscriber record since it was incomplete
                 try:
                     local_subscriber = Subscribers.objects.get(stripe_subscription_id=subscription_id)
                     local_subscriber.delete()
-                    print(f"✅ Deleted local subscriber record: {local_subscriber.id}")
+                    logger.info("Deleted local subscriber record: %s", local_subscriber.id)
                 except Subscribers.DoesNotExist:
-                    print(f"ℹ️ No local subscriber record found for: {subscription_id}")
+                    logger.info("No local subscriber record found for: %s", subscription_id)
                 except Exception as e:
-                    print(f"⚠️ Could not delete local subscriber record: {e}")
+                    logger.warning("Could not delete local subscriber record: %s", e)
                 
                 return Response({
                     'message': 'Subscription canceled successfully',
@@ -2989,7 +2919,7 @@ class CancelIncompleteSubscriptionView(APIView):
                 }, status=status.HTTP_200_OK)
                 
             except stripe.error.InvalidRequestError as e:
-                print(f"⚠️ Subscription not found or already canceled: {e}")
+                logger.warning("Subscription not found or already canceled: %s", e)
                 # If subscription doesn't exist or is already canceled, that's fine
                 return Response({
                     'message': 'Subscription was already canceled or does not exist',
@@ -2997,14 +2927,14 @@ class CancelIncompleteSubscriptionView(APIView):
                 }, status=status.HTTP_200_OK)
                 
             except stripe.error.StripeError as e:
-                print(f"❌ Stripe error canceling subscription: {e}")
+                logger.error("Stripe error canceling subscription: %s", e)
                 return Response({
                     'error': 'Failed to cancel subscription in Stripe',
                     'details': str(e)
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
         except Exception as e:
-            print(f"❌ Error canceling subscription: {e}")
+            logger.error("Error canceling subscription: %s", e)
             return Response({
                 'error': 'Failed to cancel subscription',
                 'details': str(e)
@@ -3031,9 +2961,9 @@ class BillingDashboardView(APIView):
             # Format subscriptions data
             subscriptions_data = []
             for sub in subscriptions:
-                print(f"🔍 BillingDashboard: Subscriber {sub.id} status: {sub.status}")
-                print(f"🔍 BillingDashboard: Subscriber {sub.id} stripe_id: {sub.stripe_subscription_id}")
-                print(f"🔍 BillingDashboard: Subscriber {sub.id} created_at: {sub.created_at}")
+                logger.debug("BillingDashboard: Subscriber %s status: %s", sub.id, sub.status)
+                logger.debug("BillingDashboard: Subscriber %s stripe_id: %s", sub.id, sub.stripe_subscription_id)
+                logger.debug("BillingDashboard: Subscriber %s created_at: %s", sub.id, sub.created_at)
                 # Calculate display information
                 is_trial = sub.status == 'trialing'
                 is_monthly = sub.subscription_type == 'monthly'
@@ -3120,9 +3050,7 @@ class BillingDashboardView(APIView):
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            print(f"Error fetching billing dashboard: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error fetching billing dashboard: %s", e)
             return Response(
                 {'error': 'Failed to fetch billing data', 'details': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -3164,7 +3092,7 @@ class DownloadInvoiceView(APIView):
             pdf_response = requests.get(invoice_pdf_url, stream=True)
             
             if pdf_response.status_code != 200:
-                print(f"❌ Failed to fetch PDF from Stripe: {pdf_response.status_code}")
+                logger.error("Failed to fetch PDF from Stripe: %s", pdf_response.status_code)
                 return Response(
                     {'error': 'Failed to fetch PDF from Stripe'}, 
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -3181,15 +3109,13 @@ class DownloadInvoiceView(APIView):
             return response
             
         except Payment.DoesNotExist:
-            print(f"❌ Payment {payment_id} not found for user {request.user.id}")
+            logger.error("Payment %s not found for user %s", payment_id, request.user.id)
             return Response(
                 {'error': 'Payment not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            print(f"❌ Error downloading invoice: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error downloading invoice: %s", e)
             return Response(
                 {'error': 'Failed to download invoice'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -3204,7 +3130,7 @@ class CancelCourseView(APIView):
 
     def post(self, request, subscription_id: int):
         try:
-            print(f"🔍 CancelCourseView: Received subscription_id: {subscription_id} (type: {type(subscription_id)})")
+            logger.debug("CancelCourseView: Received subscription_id: %s (type: %s)", subscription_id, type(subscription_id))
             
             # Get subscription and validate ownership
             subscriber = Subscribers.objects.get(
@@ -3218,9 +3144,9 @@ class CancelCourseView(APIView):
             # Cancel Stripe subscription
             try:
                 stripe.Subscription.cancel(subscriber.stripe_subscription_id)
-                print(f"✅ Stripe subscription {subscriber.stripe_subscription_id} cancelled successfully")
+                logger.info("Stripe subscription %s cancelled successfully", subscriber.stripe_subscription_id)
             except Exception as e:
-                print(f"❌ Failed to cancel Stripe subscription: {e}")
+                logger.error("Failed to cancel Stripe subscription: %s", e)
                 # If Stripe fails, we still cancel locally to maintain consistency
                 # User will be removed from course regardless of Stripe status
             
@@ -3236,9 +3162,9 @@ class CancelCourseView(APIView):
                     course=subscriber.course
                 )
                 enrolled_course.delete()
-                print(f"✅ Removed user {request.user.id} from course {subscriber.course.id}")
+                logger.info("Removed user %s from course %s", request.user.id, subscriber.course.id)
             except EnrolledCourse.DoesNotExist:
-                print(f"⚠️ No enrolled course found for user {request.user.id} and course {subscriber.course.id}")
+                logger.warning("No enrolled course found for user %s and course %s", request.user.id, subscriber.course.id)
             
             return Response({
                 'message': 'Course cancelled successfully',
@@ -3247,15 +3173,13 @@ class CancelCourseView(APIView):
             })
             
         except Subscribers.DoesNotExist:
-            print(f"❌ Subscription {subscription_id} not found for user {request.user.id}")
+            logger.error("Subscription %s not found for user %s", subscription_id, request.user.id)
             return Response(
                 {'error': 'Subscription not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            print(f"❌ Error cancelling course: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error cancelling course: %s", e)
             return Response(
                 {'error': 'Failed to cancel course'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,22 @@
+"""
+Blog signals: invalidate cached public post list/detail payloads
+(see backend/public_cache.py) when posts or categories change.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from backend.public_cache import BLOG_DETAIL_NAMESPACE, BLOG_LIST_NAMESPACE, bump_namespace
+
+from .models import BlogCategory, Post
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=BlogCategory)
+def invalidate_blog_cache(sender, instance, **kwargs):
+    bump_namespace(BLOG_LIST_NAMESPACE, BLOG_DETAIL_NAMESPACE)
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def invalidate_blog_cache_on_categories_change(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_namespace(BLOG_LIST_NAMESPACE, BLOG_DETAIL_NAMESPACE)
@@ -3,6 +3,12 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from backend.public_cache import (
+    BLOG_DETAIL_NAMESPACE,
+    BLOG_LIST_NAMESPACE,
+    cached_public_response,
+    request_params,
+)
 from .models import BlogCategory, Post
 from .serializers import (
     BlogCategorySerializer,
@@ -23,10 +29,18 @@ class PostListView(ListAPIView):
     """
     List published blog posts.
     GET /api/blog/?category=<slug>
+    Served from the public cache (ETag / 304); invalidated by blog/signals.py.
     """
     permission_classes = [AllowAny]
     serializer_class = PostListSerializer
 
+    def list(self, request, *args, **kwargs):
+        def build():
+            response = super(PostListView, self).list(request, *args, **kwargs)
+            return response.data, response.status_code
+
+        return cached_public_response(request, BLOG_LIST_NAMESPACE, request_params(request), build)
+
     def get_queryset(self):
         queryset = _posts_with_categories().filter(
             status=Post.Status.PUBLISHED,
@@ -41,12 +55,25 @@ class PostDetailView(RetrieveAPIView):
     """
     Retrieve a single published post by slug.
     GET /api/blog/<slug>/
+    Served from the public cache (ETag / 304); invalidated by blog/signals.py.
     """
     permission_classes = [AllowAny]
     serializer_class = PostDetailSerializer
     lookup_url_kwarg = 'slug'
     lookup_field = 'slug'
 
+    def retrieve(self, request, *args, **kwargs):
+        def build():
+            response = super(PostDetailView, self).retrieve(request, *args, **kwargs)
+            return response.data, response.status_code
+
+        return cached_public_response(
+            request,
+            BLOG_DETAIL_NAMESPACE,
+            request_params(request, slug=kwargs.get('slug')),
+            build,
+        )
+
     def get_queryset(self):
         return _posts_with_categories().filter(status=Post.Status.PUBLISHED)
 
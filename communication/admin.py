@@ -4,7 +4,7 @@ from django.contrib import admin
 from django import forms
 from django.utils.html import format_html
 
-from communication.models import MessageTemplate, SmsRoutingLog
+from communication.models import MessageTemplate, NotificationOutbox, SmsRoutingLog
 from communication.services.inbound_processing import process_inbound_sms_routing
 from communication.services.staff_sms_ui import mark_admin_queue_inbound_read
 
@@ -105,3 +105,20 @@ class SmsRoutingLogAdmin(admin.ModelAdmin):
         if object_id is not None and request.method == "GET":
             mark_admin_queue_inbound_read(unquote(object_id))
         return super().changeform_view(request, object_id, form_url, extra_context)
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "channel", "kind", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("channel", "status", "kind")
+    search_fields = ("kind", "last_error")
+    readonly_fields = ("created_at", "sent_at", "locked_at", "claim_token")
+    actions = ["requeue_notifications"]
+
+    @admin.action(description="Re-send selected notifications")
+    def requeue_notifications(self, request, queryset):
+        from communication.services.notification_outbox import kick_outbox_worker, requeue_notifications
+
+        count = requeue_notifications(queryset)
+        kick_outbox_worker()
+        self.message_user(request, f"Queued {count} notification(s) for delivery.")
@@ -0,0 +1,65 @@
+"""
+Drain or replay the notification outbox (Slack, error alerts, Brevo).
+
+    # Deliver everything that is due (run from cron / Cloud Scheduler):
+    python manage.py drain_notification_outbox
+
+    # Re-queue dead-lettered Brevo messages, then deliver them:
+    python manage.py drain_notification_outbox --status dead --channel brevo
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from communication.models import NotificationOutbox
+from communication.services.notification_outbox import drain_outbox, requeue_notifications
+
+
+class Command(BaseCommand):
+    help = 'Deliver due notification outbox rows, optionally re-queueing stored ones first.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status',
+            action='append',
+            choices=[NotificationOutbox.Status.DEAD, NotificationOutbox.Status.FAILED, NotificationOutbox.Status.SKIPPED],
+            help='Re-queue rows in this status (e.g. dead)',
+        )
+        parser.add_argument('--channel', choices=NotificationOutbox.Channel.values, help='Only this channel')
+        parser.add_argument('--since-hours', type=int, help='Only rows created in the last N hours')
+        parser.add_argument('--dry-run', action='store_true', help='Count matching rows without changing anything')
+
+    def handle(self, *args, **options):
+        if options.get('status'):
+            qs = NotificationOutbox.objects.filter(status__in=options['status'])
+            if options.get('channel'):
+                qs = qs.filter(channel=options['channel'])
+            if options.get('since_hours') is not None:
+                qs = qs.filter(created_at__gte=timezone.now() - timedelta(hours=options['since_hours']))
+            if options['dry_run']:
+                self.stdout.write(self.style.WARNING(f'DRY RUN - {qs.count()} notification(s) would be re-queued'))
+                return
+            self.stdout.write(f'Re-queued {requeue_notifications(qs)} notification(s)')
+        elif options['dry_run']:
+            due = NotificationOutbox.objects.filter(
+                status__in=[NotificationOutbox.Status.PENDING, NotificationOutbox.Status.FAILED],
+                available_at__lte=timezone.now(),
+            ).count()
+            self.stdout.write(self.style.WARNING(f'DRY RUN - {due} notification(s) due'))
+            return
+
+        totals = {'sent': 0, 'failed': 0, 'skipped': 0, 'deferred': 0}
+        while True:
+            counts = drain_outbox()
+            for key, value in counts.items():
+                totals[key] += value
+            # Stop once a pass makes no progress (the rest waits on retries or a paused channel).
+            if not counts['sent'] and not counts['skipped']:
+                break
+
+        self.stdout.write(
+            f"Summary: sent={totals['sent']} failed={totals['failed']} "
+            f"skipped={totals['skipped']} deferred={totals['deferred']}"
+        )
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:24
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0009_smsroutinglog_delivery_string_defaults'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('slack', 'Slack'), ('error_alert', 'Slack error alert'), ('brevo', 'Brevo')], max_length=20)),
+                ('kind', models.CharField(help_text='What the message is, e.g. enrollment, contact_form, welcome_email.', max_length=50)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed (will retry)'), ('dead', 'Dead letter'), ('skipped', 'Skipped (transport not configured)')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the next attempt may run.')),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('claim_token', models.CharField(blank=True, db_index=True, default='', max_length=32)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'notification_outbox',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['channel', 'status', 'available_at'], name='notificatio_channel_e49bcb_idx')],
+            },
+        ),
+    ]
@@ -4,6 +4,7 @@ from string import Formatter
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 
 
@@ -243,3 +244,52 @@ class MessageTemplate(models.Model):
             self.slug = candidate
         self.full_clean()
         return super().save(*args, **kwargs)
+
+
+class NotificationOutbox(models.Model):
+    """
+    Outbound notifications (Slack, error alerts, Brevo) waiting for delivery.
+
+    Rows are written next to the business change that triggers them and are
+    delivered after commit by communication.services.notification_outbox,
+    which owns the status transitions. Payloads are pre-rendered and JSON
+    only, so delivery never needs the originating objects.
+    """
+
+    class Channel(models.TextChoices):
+        SLACK = "slack", "Slack"
+        ERROR_ALERT = "error_alert", "Slack error alert"
+        BREVO = "brevo", "Brevo"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed (will retry)"
+        DEAD = "dead", "Dead letter"
+        SKIPPED = "skipped", "Skipped (transport not configured)"
+
+    channel = models.CharField(max_length=20, choices=Channel.choices)
+    kind = models.CharField(
+        max_length=50,
+        help_text="What the message is, e.g. enrollment, contact_form, welcome_email.",
+    )
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    available_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the next attempt may run.")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    claim_token = models.CharField(max_length=32, blank=True, default="", db_index=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "notification_outbox"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["channel", "status", "available_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.channel}:{self.kind} ({self.status})"
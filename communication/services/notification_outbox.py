@@ -0,0 +1,383 @@
+"""
+Outbox for outbound notifications (Slack, Slack error alerts, Brevo).
+
+Callers enqueue a small, pre-rendered JSON record with enqueue_notification()
+instead of calling the vendor inline. The row is written in the caller's
+transaction, so a rolled-back enrollment never announces itself, and
+delivery happens off the request path:
+
+- one background drainer thread per process (backend.work_queue), kicked
+  after the row commits and woken again when the earliest retry is due;
+- rows are claimed per channel in batches (one conditional UPDATE tagged
+  with a claim token), channels are drained in parallel;
+- each channel has a token-bucket rate limit (NOTIFICATION_RATE_LIMITS,
+  messages per second, per process) and a circuit breaker kept in the cache
+  so every process sees it: after NOTIFICATION_BREAKER_THRESHOLD consecutive
+  failures the channel pauses for NOTIFICATION_BREAKER_COOLDOWN_SECONDS;
+  a vendor 429 pauses it for the Retry-After time without using up attempts;
+- failed sends retry with exponential backoff and are dead-lettered after
+  NOTIFICATION_OUTBOX_MAX_ATTEMPTS.
+
+`manage.py drain_notification_outbox` drains due rows (cron / Cloud
+Scheduler) and re-queues dead or failed ones.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from backend.work_queue import BackgroundDrainer, claimable_q, drain_groups, retry_delay
+from communication.models import NotificationOutbox
+from communication.services.notification_transports import (
+    DeliveryDeferred,
+    NotificationSkipped,
+    get_transport,
+)
+
+logger = logging.getLogger(__name__)
+
+# A drainer that died mid-send leaves rows in "sending"; reclaim after this long.
+STALE_SENDING_AFTER = timedelta(minutes=5)
+RETRY_BASE_SECONDS = 15
+RETRY_MAX_SECONDS = 30 * 60
+DRAIN_BATCH_SIZE = 100
+DEFAULT_RATE_LIMITS = {
+    NotificationOutbox.Channel.SLACK: 1.0,
+    NotificationOutbox.Channel.ERROR_ALERT: 1.0,
+    NotificationOutbox.Channel.BREVO: 5.0,
+}
+
+# Rows written by the drainer on its own connection (survive_rollback inside a transaction).
+_pending_inserts: deque[tuple[str, str, dict]] = deque()
+_buckets: dict[str, "_TokenBucket"] = {}
+_buckets_lock = threading.Lock()
+
+
+def _max_attempts() -> int:
+    return max(1, int(getattr(settings, "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", 6)))
+
+
+def _breaker_threshold() -> int:
+    return max(1, int(getattr(settings, "NOTIFICATION_BREAKER_THRESHOLD", 5)))
+
+
+def _breaker_cooldown() -> int:
+    return max(1, int(getattr(settings, "NOTIFICATION_BREAKER_COOLDOWN_SECONDS", 60)))
+
+
+def _rate_limit(channel: str) -> float:
+    limits = {**DEFAULT_RATE_LIMITS, **(getattr(settings, "NOTIFICATION_RATE_LIMITS", None) or {})}
+    return float(limits.get(channel) or 0)
+
+
+class _TokenBucket:
+    """Blocking token bucket: rate tokens per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _throttle(channel: str) -> None:
+    rate = _rate_limit(channel)
+    if rate <= 0:
+        return
+    with _buckets_lock:
+        bucket = _buckets.get(channel)
+        if bucket is None or bucket.rate != rate:
+            bucket = _buckets[channel] = _TokenBucket(rate)
+    bucket.acquire()
+
+
+# Circuit breaker (cache-backed, shared between processes) -----------------
+
+def _breaker_key(channel: str) -> str:
+    return f"notification_outbox:breaker:{channel}"
+
+
+def _breaker_state(channel: str) -> dict:
+    try:
+        return cache.get(_breaker_key(channel)) or {}
+    except Exception:
+        return {}
+
+
+def channel_paused_until(channel: str) -> float:
+    """Unix time until which the channel's breaker is open (0 when closed)."""
+    open_until = float(_breaker_state(channel).get("open_until") or 0)
+    return open_until if open_until > time.time() else 0
+
+
+def _set_breaker(channel: str, state: dict) -> None:
+    try:
+        cache.set(_breaker_key(channel), state, _breaker_cooldown() * 10)
+    except Exception as e:
+        logger.warning("Notification breaker state not saved for %s: %s", channel, e)
+
+
+def _pause_channel(channel: str, seconds: float) -> None:
+    state = _breaker_state(channel)
+    state["open_until"] = max(float(state.get("open_until") or 0), time.time() + seconds)
+    _set_breaker(channel, state)
+
+
+def _record_failure(channel: str) -> None:
+    state = _breaker_state(channel)
+    failures = int(state.get("failures") or 0) + 1
+    state["failures"] = failures
+    if failures >= _breaker_threshold():
+        # Half-open after the cooldown: the next failure re-opens it straight away.
+        state["open_until"] = time.time() + _breaker_cooldown()
+        logger.warning(
+            "Notification channel %s paused for %ss after %s consecutive failures",
+            channel,
+            _breaker_cooldown(),
+            failures,
+        )
+    _set_breaker(channel, state)
+
+
+def _record_success(channel: str) -> None:
+    if _breaker_state(channel):
+        try:
+            cache.delete(_breaker_key(channel))
+        except Exception:
+            pass
+
+
+# Enqueue ---------------------------------------------------------------------
+
+def _kick_after_commit() -> None:
+    if getattr(settings, "NOTIFICATION_OUTBOX_DELIVER_INLINE", False):
+        transaction.on_commit(drain_outbox)
+    else:
+        transaction.on_commit(kick_outbox_worker)
+
+
+def _insert_pending() -> None:
+    """Write rows queued by survive_rollback enqueues (runs on the drainer thread)."""
+    while _pending_inserts:
+        channel, kind, payload = _pending_inserts.popleft()
+        try:
+            NotificationOutbox.objects.create(channel=channel, kind=kind, payload=payload)
+        except Exception as exc:
+            logger.error("Failed to queue %s notification %s: %s", channel, kind, exc, exc_info=True)
+
+
+def enqueue_notification(channel: str, kind: str, payload: dict, *, survive_rollback: bool = False):
+    """
+    Queue a notification for background delivery. Returns the row (None when
+    the drainer writes it).
+
+    By default the row belongs to the caller's transaction. survive_rollback=True
+    (error alerts) hands the row to the drainer thread when called inside an
+    atomic block; it is written there on the drainer's own connection, so the
+    alert is kept even if the failing request rolls back.
+    """
+    if survive_rollback and transaction.get_connection().in_atomic_block:
+        _pending_inserts.append((channel, kind, payload))
+        kick_outbox_worker()
+        return None
+    # Savepoint: a failed insert must not break the caller's transaction.
+    with transaction.atomic():
+        row = NotificationOutbox.objects.create(channel=channel, kind=kind, payload=payload)
+    _kick_after_commit()
+    return row
+
+
+# Delivery --------------------------------------------------------------------
+
+def _retry_delay(attempts: int) -> timedelta:
+    return retry_delay(attempts, base_seconds=RETRY_BASE_SECONDS, max_seconds=RETRY_MAX_SECONDS)
+
+
+def _claimable_q(now):
+    return claimable_q(
+        ready=[NotificationOutbox.Status.PENDING, NotificationOutbox.Status.FAILED],
+        busy=NotificationOutbox.Status.SENDING,
+        stale_after=STALE_SENDING_AFTER,
+        now=now,
+    )
+
+
+def _claim_batch(channel: str, now, limit: int) -> list[NotificationOutbox]:
+    """Claim up to `limit` due rows of one channel, oldest first."""
+    ids = list(
+        NotificationOutbox.objects.filter(channel=channel)
+        .filter(_claimable_q(now))
+        .order_by("available_at", "id")
+        .values_list("id", flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    NotificationOutbox.objects.filter(id__in=ids).filter(_claimable_q(now)).update(
+        status=NotificationOutbox.Status.SENDING,
+        locked_at=now,
+        claim_token=token,
+        attempts=F("attempts") + 1,
+    )
+    return list(NotificationOutbox.objects.filter(claim_token=token).order_by("created_at", "id"))
+
+
+def _release(rows: list[NotificationOutbox], available_at) -> None:
+    """Hand claimed rows back untouched (channel paused); the attempt does not count."""
+    NotificationOutbox.objects.filter(id__in=[row.pk for row in rows]).update(
+        status=NotificationOutbox.Status.PENDING,
+        attempts=F("attempts") - 1,
+        available_at=available_at,
+        locked_at=None,
+        claim_token="",
+    )
+
+
+def _mark(row: NotificationOutbox, status: str, **fields) -> None:
+    NotificationOutbox.objects.filter(pk=row.pk).update(
+        status=status, locked_at=None, claim_token="", **fields
+    )
+
+
+def _deliver(row: NotificationOutbox) -> str:
+    """Send one claimed row. Returns sent / skipped / failed / deferred."""
+    try:
+        get_transport(row.channel).send(row)
+    except NotificationSkipped as exc:
+        _mark(row, NotificationOutbox.Status.SKIPPED, last_error=str(exc)[:2000])
+        logger.info("Notification %s:%s skipped: %s", row.channel, row.kind, exc)
+        return "skipped"
+    except DeliveryDeferred as exc:
+        _pause_channel(row.channel, exc.retry_after)
+        return "deferred"
+    except Exception as exc:
+        _record_failure(row.channel)
+        dead = row.attempts >= _max_attempts()
+        _mark(
+            row,
+            NotificationOutbox.Status.DEAD if dead else NotificationOutbox.Status.FAILED,
+            last_error=f"{type(exc).__name__}: {exc}"[:2000],
+            available_at=timezone.now() + _retry_delay(row.attempts),
+        )
+        log = logger.error if dead else logger.warning
+        log(
+            "Notification %s:%s (id=%s) failed attempt %s/%s%s: %s",
+            row.channel,
+            row.kind,
+            row.pk,
+            row.attempts,
+            _max_attempts(),
+            " — dead-lettered" if dead else "",
+            exc,
+        )
+        return "failed"
+
+    _record_success(row.channel)
+    _mark(row, NotificationOutbox.Status.SENT, sent_at=timezone.now(), last_error="")
+    return "sent"
+
+
+def _drain_channel(channel: str, limit: int) -> dict:
+    counts = {"sent": 0, "failed": 0, "skipped": 0, "deferred": 0}
+    if channel_paused_until(channel):
+        return counts
+    rows = _claim_batch(channel, timezone.now(), limit)
+    for index, row in enumerate(rows):
+        outcome = "deferred"
+        if not channel_paused_until(channel):
+            _throttle(channel)
+            outcome = _deliver(row)
+        if outcome == "deferred":
+            # Breaker opened or vendor 429: the rest of the batch waits for the pause.
+            resume_in = max(0.0, channel_paused_until(channel) - time.time())
+            _release(rows[index:], timezone.now() + timedelta(seconds=resume_in))
+            counts["deferred"] += len(rows) - index
+            break
+        counts[outcome] += 1
+    return counts
+
+
+def drain_outbox(*, limit: int = DRAIN_BATCH_SIZE) -> dict:
+    """Deliver one batch of due rows per channel, channels in parallel. Returns counts."""
+    channels = list(
+        NotificationOutbox.objects.filter(_claimable_q(timezone.now()))
+        .order_by()
+        .values_list("channel", flat=True)
+        .distinct()
+    )
+    return drain_groups(
+        channels,
+        lambda channel: _drain_channel(channel, limit),
+        totals={"sent": 0, "failed": 0, "skipped": 0, "deferred": 0},
+        max_workers=len(channels),
+        thread_name_prefix="notification-outbox",
+    )
+
+
+def next_retry_at():
+    """Earliest future time a row waiting on a retry or a paused channel can be sent."""
+    due = NotificationOutbox.objects.filter(
+        status__in=[NotificationOutbox.Status.PENDING, NotificationOutbox.Status.FAILED],
+        available_at__gt=timezone.now(),
+    ).aggregate(due=Min("available_at"))["due"]
+    for channel in NotificationOutbox.Channel.values:
+        paused_until = channel_paused_until(channel)
+        if paused_until:
+            resume_at = datetime.fromtimestamp(paused_until, tz=dt_timezone.utc)
+            due = min(due, resume_at) if due else resume_at
+    return due
+
+
+def _drain_in_background() -> dict:
+    _insert_pending()
+    return drain_outbox()
+
+
+# A full batch may have left more rows behind.
+_drainer = BackgroundDrainer(
+    "notification-outbox",
+    lambda: _drain_in_background(),
+    more=lambda counts: bool(counts["sent"] or counts["skipped"]),
+    next_due=lambda: next_retry_at(),
+)
+
+
+def kick_outbox_worker() -> None:
+    """Drain the outbox on a background thread; at most one drainer per process."""
+    _drainer.kick()
+
+
+def requeue_notifications(queryset) -> int:
+    """Reset rows so the next drain sends them again (dead letters, manual replays)."""
+    return queryset.update(
+        status=NotificationOutbox.Status.PENDING,
+        attempts=0,
+        last_error="",
+        available_at=timezone.now(),
+        locked_at=None,
+        claim_token="",
+        sent_at=None,
+    )
@@ -0,0 +1,141 @@
+"""
+Transports used by the notification outbox to talk to vendors.
+
+A transport has one method, send(message), taking a NotificationOutbox row.
+It returns on success and raises:
+
+- NotificationSkipped when the transport is not configured (no token / API
+  key) — the row is marked skipped instead of retried forever;
+- DeliveryDeferred when the vendor asks us to slow down (HTTP 429) — the
+  whole channel pauses for retry_after seconds without using up attempts;
+- anything else for a failed attempt (retried with backoff).
+
+NOTIFICATION_TRANSPORT = "stub" swaps every channel for stub_transport,
+which records messages in memory (tests, local development).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+
+from django.conf import settings
+
+from backend.clients import get_client
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationSkipped(Exception):
+    """The transport is not configured; nothing was sent."""
+
+
+class DeliveryDeferred(Exception):
+    """The vendor rate-limited us; retry the channel after retry_after seconds."""
+
+    def __init__(self, retry_after: float, message: str = ""):
+        super().__init__(message or f"rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class DeliveryFailed(Exception):
+    """The vendor call completed but reported failure."""
+
+
+class SlackTransport:
+    """chat.postMessage through the shared WebClient from backend.clients."""
+
+    def _get_client(self):
+        client = get_client("slack")
+        if client is None:
+            raise NotificationSkipped("SLACK_BOT_TOKEN not set")
+        return client
+
+    def send(self, message) -> None:
+        from slack_sdk.errors import SlackApiError
+
+        payload = message.payload or {}
+        channel = (payload.get("channel") or "").strip()
+        if not channel:
+            raise NotificationSkipped("Slack channel not configured")
+        client = self._get_client()
+        try:
+            client.chat_postMessage(
+                channel=channel,
+                text=payload.get("text") or "",
+                blocks=payload.get("blocks") or None,
+            )
+        except SlackApiError as e:
+            response = e.response
+            if getattr(response, "status_code", None) == 429:
+                retry_after = float((response.headers or {}).get("Retry-After", 30))
+                raise DeliveryDeferred(retry_after) from e
+            raise DeliveryFailed(f"Slack error: {response.get('error') if response else e}") from e
+
+
+class BrevoTransport:
+    """Lead magnet list sign-ups and welcome emails through lead_magnet.brevo_client."""
+
+    def send(self, message) -> None:
+        from lead_magnet import brevo_client
+
+        if not brevo_client.get_api_key():
+            raise NotificationSkipped("BREVO_API_KEY not set")
+        payload = message.payload or {}
+        if message.kind == "contact":
+            ok = brevo_client.add_contact_to_list(
+                email=payload["email"],
+                first_name=payload.get("first_name") or "",
+                list_id=int(payload["list_id"]),
+            )
+        elif message.kind == "welcome_email":
+            if not getattr(settings, "BREVO_SENDER_EMAIL", ""):
+                raise NotificationSkipped("BREVO_SENDER_EMAIL not set")
+            ok = brevo_client.send_welcome_email(
+                to_email=payload["email"],
+                first_name=payload.get("first_name") or "",
+                pdf_url=payload["pdf_url"],
+                guide_title=payload.get("guide_title") or "",
+                template_id=payload.get("template_id"),
+            )
+        else:
+            raise DeliveryFailed(f"Unknown Brevo message kind {message.kind!r}")
+        if not ok:
+            raise DeliveryFailed(f"Brevo {message.kind} failed")
+
+
+class StubTransport:
+    """
+    In-memory transport. sent holds (channel, kind, payload) tuples.
+
+    Set fail_with to an exception instance to make every send raise it.
+    """
+
+    def __init__(self):
+        self.sent = []
+        self.fail_with = None
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.sent = []
+            self.fail_with = None
+
+    def send(self, message) -> None:
+        if self.fail_with is not None:
+            raise self.fail_with
+        with self._lock:
+            self.sent.append((message.channel, message.kind, message.payload))
+
+
+stub_transport = StubTransport()
+_slack_transport = SlackTransport()
+_brevo_transport = BrevoTransport()
+
+
+def get_transport(channel: str):
+    """Transport for an outbox channel, honouring NOTIFICATION_TRANSPORT."""
+    if getattr(settings, "NOTIFICATION_TRANSPORT", "live") == "stub":
+        return stub_transport
+    if channel == "brevo":
+        return _brevo_transport
+    return _slack_transport
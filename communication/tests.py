@@ -6,11 +6,19 @@ from unittest.mock import patch
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
-from communication.models import SmsRoutingLog
+from communication.models import NotificationOutbox, SmsRoutingLog
+from communication.services.notification_outbox import (
+    channel_paused_until,
+    drain_outbox,
+    enqueue_notification,
+)
+from communication.services.notification_transports import DeliveryDeferred, stub_transport
 from communication.services.inbound_processing import process_inbound_sms_routing
 from communication.services.teacher_roster_sms import sms_unread_fields_for_enrollment
 from communication.services.staff_sms_ui import mark_inbound_read_for_staff_inbox
@@ -691,3 +699,114 @@ class TeacherRosterSmsFieldTests(TestCase):
         profile = SimpleNamespace(child_phone="+15550001111", parent_phone="+15550001111")
         fields = sms_unread_fields_for_enrollment(pair, course_id=cid, profile=profile)
         self.assertEqual(fields, {"sms_unread_count": 1})
+
+
+@override_settings(
+    NOTIFICATION_TRANSPORT="stub",
+    NOTIFICATION_OUTBOX_DELIVER_INLINE=True,
+    NOTIFICATION_RATE_LIMITS={"slack": 0, "error_alert": 0, "brevo": 0},
+    NOTIFICATION_BREAKER_THRESHOLD=2,
+    NOTIFICATION_OUTBOX_MAX_ATTEMPTS=3,
+)
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        stub_transport.reset()
+        self.addCleanup(stub_transport.reset)
+
+    def _enqueue(self, text="hello"):
+        return enqueue_notification("slack", "system", {"channel": "#ops", "text": text, "blocks": []})
+
+    def test_delivered_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            row = self._enqueue()
+            self.assertEqual(stub_transport.sent, [])
+
+        self.assertEqual(len(stub_transport.sent), 1)
+        row.refresh_from_db()
+        self.assertEqual(row.status, NotificationOutbox.Status.SENT)
+        self.assertEqual(row.attempts, 1)
+
+    def test_rolled_back_notification_is_never_sent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._enqueue()
+                    raise RuntimeError("enrollment failed")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(stub_transport.sent, [])
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    def test_failures_open_breaker_and_defer_the_rest(self):
+        rows = [self._enqueue(f"m{index}") for index in range(3)]
+        stub_transport.fail_with = RuntimeError("slack down")
+
+        counts = drain_outbox()
+        self.assertEqual((counts["failed"], counts["deferred"]), (2, 1))
+        self.assertTrue(channel_paused_until("slack"))
+        statuses = [NotificationOutbox.objects.get(pk=row.pk) for row in rows]
+        self.assertEqual([row.status for row in statuses], ["failed", "failed", "pending"])
+        self.assertEqual(statuses[2].attempts, 0)
+
+        # Breaker open: nothing is claimed until the cooldown ends.
+        self.assertEqual(drain_outbox()["deferred"], 0)
+        self.assertEqual(NotificationOutbox.objects.get(pk=rows[2].pk).attempts, 0)
+
+    def test_rate_limited_send_does_not_use_an_attempt(self):
+        row = self._enqueue()
+        stub_transport.fail_with = DeliveryDeferred(30)
+
+        self.assertEqual(drain_outbox()["deferred"], 1)
+        row.refresh_from_db()
+        self.assertEqual(row.status, NotificationOutbox.Status.PENDING)
+        self.assertEqual(row.attempts, 0)
+        self.assertGreater(row.available_at, timezone.now() + timedelta(seconds=20))
+
+    @override_settings(NOTIFICATION_OUTBOX_MAX_ATTEMPTS=1)
+    def test_dead_letter_after_max_attempts(self):
+        row = self._enqueue()
+        stub_transport.fail_with = RuntimeError("boom")
+
+        drain_outbox()
+        row.refresh_from_db()
+        self.assertEqual(row.status, NotificationOutbox.Status.DEAD)
+        self.assertIn("boom", row.last_error)
+
+    def test_survive_rollback_row_is_written_by_the_drainer(self):
+        from communication.services import notification_outbox
+
+        with patch.object(notification_outbox, "kick_outbox_worker") as mock_kick:
+            try:
+                with transaction.atomic():
+                    row = enqueue_notification(
+                        "error_alert", "E500", {"channel": "#alerts", "text": "boom", "blocks": []},
+                        survive_rollback=True,
+                    )
+                    raise RuntimeError("request failed")
+            except RuntimeError:
+                pass
+        self.assertIsNone(row)
+        mock_kick.assert_called_once()
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+        notification_outbox._insert_pending()
+        self.assertEqual(
+            list(NotificationOutbox.objects.values_list("channel", "kind")), [("error_alert", "E500")]
+        )
+
+    def test_lead_magnet_submit_only_queues_brevo_calls(self):
+        from lead_magnet.brevo_client import on_lead_magnet_submit
+
+        guide = SimpleNamespace(
+            slug="guide", title="Guide", pdf_url="https://example.com/guide.pdf",
+            brevo_list_id=7, brevo_template_id=None,
+        )
+        with patch("lead_magnet.brevo_client.requests.post") as mock_post:
+            on_lead_magnet_submit(guide, email="lead@example.com", first_name="Lee")
+        mock_post.assert_not_called()
+        self.assertEqual(
+            sorted(NotificationOutbox.objects.filter(channel="brevo").values_list("kind", flat=True)),
+            ["contact", "welcome_email"],
+        )
@@ -11,7 +11,7 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from firebase_admin import auth
-import firebase_admin
+from backend.clients import get_client
 from .models import Classroom, Board, BoardPage
 from courses.permissions import (
     user_is_course_member,
@@ -28,14 +28,7 @@ User = get_user_model()
 
 def ensure_firebase_initialized():
     """Ensure Firebase is initialized before use"""
-    if not firebase_admin._apps:
-        try:
-            from backend.settings import initialize_firebase
-            initialize_firebase()
-        except Exception as e:
-            logger.error(f"Failed to initialize Firebase: {e}")
-            return False
-    return True
+    return get_client('firebase') is not None
 
 
 @database_sync_to_async
@@ -190,6 +183,7 @@ class BoardSyncConsumer(AsyncWebsocketConsumer):
         self.IDLE_TIMEOUT = 180  # 3 minutes of inactivity (frontend cleans up after 2 min, backend closes after 3 min as fallback)
         self.HEARTBEAT_INTERVAL = 30  # Send ping every 30 seconds
         self.AUTO_SAVE_DELAY = 5  # Auto-save after 5 seconds of inactivity
+        self.IDLE_CHECK_INTERVAL = 60  # How often the idle loop checks last_activity
     
     async def connect(self):
         """Handle WebSocket connection"""
@@ -580,7 +574,7 @@ class BoardSyncConsumer(AsyncWebsocketConsumer):
         """Close connection if idle for too long"""
         try:
             while True:
-                await asyncio.sleep(60)  # Check every minute
+                await asyncio.sleep(self.IDLE_CHECK_INTERVAL)
                 
                 if not self.authenticated:
                     break
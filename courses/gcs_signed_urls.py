@@ -12,6 +12,8 @@ from typing import Any
 
 from django.conf import settings
 
+from backend.clients import get_client
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -28,24 +30,10 @@ class SignedUrlError(Exception):
 
 
 def _get_gcs_client():
+    """Shared process-wide client (backend.clients), or None when GCS is not configured."""
     if not GCS_CLIENT_AVAILABLE:
         return None
-    if not getattr(settings, 'GS_BUCKET_NAME', None):
-        return None
-    try:
-        if getattr(settings, 'GS_CREDENTIALS', None):
-            creds = settings.GS_CREDENTIALS
-            if isinstance(creds, str):
-                return storage.Client.from_service_account_json(
-                    creds, project=getattr(settings, 'GS_PROJECT_ID', None)
-                )
-            return storage.Client(
-                credentials=creds, project=getattr(settings, 'GS_PROJECT_ID', None)
-            )
-        return storage.Client(project=getattr(settings, 'GS_PROJECT_ID', None))
-    except Exception as e:
-        logger.warning('Could not create GCS client for signed URLs: %s', e)
-        return None
+    return get_client('gcs')
 
 
 def _sign_blob_put(blob, content_type: str, expires_seconds: int) -> str:
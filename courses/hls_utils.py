@@ -15,6 +15,8 @@ from typing import Optional, Union
 
 from django.conf import settings
 
+from backend.clients import get_client
+
 logger = logging.getLogger(__name__)
 
 # Content types for HLS files (for correct playback and CDN behavior)
@@ -44,28 +46,10 @@ class HLSUploadError(Exception):
 
 
 def _get_gcs_client():
-    """Return a configured google.cloud.storage Client, or None if not available."""
+    """Return the shared google.cloud.storage Client (backend.clients), or None if not available."""
     if not GCS_CLIENT_AVAILABLE:
         return None
-    if not getattr(settings, "GS_BUCKET_NAME", None):
-        return None
-    try:
-        if getattr(settings, "GS_CREDENTIALS", None):
-            creds = settings.GS_CREDENTIALS
-            if isinstance(creds, str):
-                client = storage.Client.from_service_account_json(
-                    creds, project=getattr(settings, "GS_PROJECT_ID", None)
-                )
-            else:
-                client = storage.Client(
-                    credentials=creds, project=getattr(settings, "GS_PROJECT_ID", None)
-                )
-        else:
-            client = storage.Client(project=getattr(settings, "GS_PROJECT_ID", None))
-        return client
-    except Exception as e:
-        logger.warning("Could not create GCS client for HLS: %s", e)
-        return None
+    return get_client("gcs")
 
 
 def convert_to_hls(
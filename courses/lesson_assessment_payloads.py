@@ -46,17 +46,23 @@ def teacher_lesson_quiz_with_questions(quiz, lesson):
     return quiz_data
 
 
-def student_lesson_quiz_detail(quiz, user):
-    """Quiz block for student lesson detail API (questions + attempts)."""
-    questions = quiz.questions.all().order_by('order')
-    attempts = []
-    if user.is_authenticated:
-        attempts = list(
-            QuizAttempt.objects.filter(
-                student=user,
-                quiz=quiz,
-            ).order_by('-started_at')
-        )
+def _student_question_list(questions):
+    return [
+        {
+            'id': str(q.id),
+            'question_text': q.question_text,
+            'type': q.type,
+            'content': q.content,
+            'points': q.points,
+            'explanation': q.explanation or '',
+            'order': q.order,
+        }
+        for q in questions
+    ]
+
+
+def student_quiz_definition(quiz):
+    """The part of the student quiz block that is the same for every student."""
     return {
         'id': str(quiz.id),
         'title': quiz.title,
@@ -68,18 +74,14 @@ def student_lesson_quiz_detail(quiz, user):
         'randomize_questions': quiz.randomize_questions,
         'total_points': quiz.total_points,
         'question_count': quiz.question_count,
-        'questions': [
-            {
-                'id': str(q.id),
-                'question_text': q.question_text,
-                'type': q.type,
-                'content': q.content,
-                'points': q.points,
-                'explanation': q.explanation or '',
-                'order': q.order,
-            }
-            for q in questions
-        ],
+        'questions': _student_question_list(quiz.questions.all().order_by('order')),
+    }
+
+
+def student_quiz_with_attempts(definition, attempts):
+    """student_quiz_definition() plus the student's attempts (newest first)."""
+    return {
+        **definition,
         'user_attempts_count': len(attempts),
         'user_attempts': [
             {
@@ -96,41 +98,29 @@ def student_lesson_quiz_detail(quiz, user):
             }
             for attempt in attempts
         ],
-        'can_retake': len(attempts) < quiz.max_attempts if attempts else True,
+        'can_retake': len(attempts) < definition['max_attempts'] if attempts else True,
         'has_passed': any(attempt.passed for attempt in attempts),
         'last_attempt': attempts[0].score if attempts else None,
         'last_attempt_passed': attempts[0].passed if attempts else None,
     }
 
 
-def student_lesson_assignment_detail(assignment, user):
-    """Assignment block for student lesson detail API."""
-    questions = assignment.questions.all().order_by('order')
-    submissions = []
-    submission_data = None
+def student_lesson_quiz_detail(quiz, user):
+    """Quiz block for student lesson detail API (questions + attempts)."""
+    attempts = []
     if user.is_authenticated:
-        submissions = list(
-            AssignmentSubmission.objects.filter(
-                assignment=assignment,
-                enrollment__student_profile__user=user,
-            ).order_by('-submitted_at')
+        attempts = list(
+            QuizAttempt.objects.filter(
+                student=user,
+                quiz=quiz,
+            ).order_by('-started_at')
         )
-        if submissions:
-            latest_submission = submissions[0]
-            submission_data = {
-                'id': str(latest_submission.id),
-                'attempt_number': latest_submission.attempt_number,
-                'status': latest_submission.status,
-                'submitted_at': latest_submission.submitted_at.isoformat(),
-                'answers': latest_submission.answers,
-                'is_graded': latest_submission.is_graded,
-                'points_earned': latest_submission.points_earned,
-                'points_possible': latest_submission.points_possible,
-                'percentage': latest_submission.percentage,
-                'passed': latest_submission.passed,
-                'return_for_revision_count': getattr(latest_submission, 'return_for_revision_count', 0),
-            }
-    assignment_data = {
+    return student_quiz_with_attempts(student_quiz_definition(quiz), attempts)
+
+
+def student_assignment_definition(assignment):
+    """The part of the student assignment block that is the same for every student."""
+    return {
         'id': str(assignment.id),
         'title': assignment.title,
         'description': assignment.description or '',
@@ -141,26 +131,39 @@ def student_lesson_assignment_detail(assignment, user):
         'show_correct_answers': assignment.show_correct_answers,
         'randomize_questions': assignment.randomize_questions,
         'question_count': assignment.question_count,
-        'submission_count': assignment.submissions.count(),
-        'questions': [
-            {
-                'id': str(q.id),
-                'question_text': q.question_text,
-                'type': q.type,
-                'content': q.content,
-                'points': q.points,
-                'explanation': q.explanation or '',
-                'order': q.order,
-            }
-            for q in questions
-        ],
+        'questions': _student_question_list(assignment.questions.all().order_by('order')),
+    }
+
+
+def student_assignment_with_submissions(definition, submissions, submission_count):
+    """student_assignment_definition() plus the student's submissions (newest first)."""
+    submission_data = None
+    if submissions:
+        latest_submission = submissions[0]
+        submission_data = {
+            'id': str(latest_submission.id),
+            'attempt_number': latest_submission.attempt_number,
+            'status': latest_submission.status,
+            'submitted_at': latest_submission.submitted_at.isoformat(),
+            'answers': latest_submission.answers,
+            'is_graded': latest_submission.is_graded,
+            'points_earned': latest_submission.points_earned,
+            'points_possible': latest_submission.points_possible,
+            'percentage': latest_submission.percentage,
+            'passed': latest_submission.passed,
+            'return_for_revision_count': getattr(latest_submission, 'return_for_revision_count', 0),
+        }
+    assignment_data = {key: value for key, value in definition.items() if key != 'questions'}
+    assignment_data.update({
+        'submission_count': submission_count,
+        'questions': definition['questions'],
         'user_submissions_count': len(submissions),
-        'can_submit': len(submissions) < assignment.max_attempts if submissions else True,
+        'can_submit': len(submissions) < definition['max_attempts'] if submissions else True,
         'has_passed': any(submission.passed for submission in submissions),
         'last_submission': submissions[0].submitted_at.isoformat() if submissions else None,
         'last_submission_passed': submissions[0].passed if submissions else None,
         'submission': submission_data,
-    }
+    })
     if submissions:
         from student.views import _submission_has_return_feedback, _attach_return_feedback_to_questions
 
@@ -170,3 +173,20 @@ def student_lesson_assignment_detail(assignment, user):
                 assignment_data['questions'], latest.return_feedback
             )
     return assignment_data
+
+
+def student_lesson_assignment_detail(assignment, user):
+    """Assignment block for student lesson detail API."""
+    submissions = []
+    if user.is_authenticated:
+        submissions = list(
+            AssignmentSubmission.objects.filter(
+                assignment=assignment,
+                enrollment__student_profile__user=user,
+            ).order_by('-submitted_at')
+        )
+    return student_assignment_with_submissions(
+        student_assignment_definition(assignment),
+        submissions,
+        assignment.submissions.count(),
+    )
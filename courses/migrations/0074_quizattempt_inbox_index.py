@@ -0,0 +1,28 @@
+# Generated manually for the teacher quiz submission inbox
+
+from django.db import migrations, models
+
+
+def backfill_graded(apps, schema_editor):
+    QuizAttempt = apps.get_model('courses', 'QuizAttempt')
+    QuizAttempt.objects.filter(score__isnull=False).update(graded=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0073_lessonvideoupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='graded',
+            field=models.BooleanField(default=False, editable=False, help_text='score is set; kept in sync by save() for the teacher inbox index'),
+        ),
+        migrations.RunPython(backfill_graded, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['quiz', 'graded', '-completed_at', '-id'], name='quizattempt_inbox_idx'),
+        ),
+    ]
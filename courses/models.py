@@ -1467,6 +1467,11 @@ class QuizAttempt(models.Model):
     )
     points_earned = models.IntegerField(default=0)
     passed = models.BooleanField(default=False)
+    graded = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="score is set; kept in sync by save() for the teacher inbox index"
+    )
     
     # Attempt Data
     answers = models.JSONField(
@@ -1495,10 +1500,19 @@ class QuizAttempt(models.Model):
             models.Index(fields=['student', 'quiz']),
             models.Index(fields=['enrollment', 'completed_at']),
             models.Index(fields=['is_teacher_graded']),
+            # Teacher submission inbox (courses.services.quiz_inbox): ungraded first, newest first.
+            models.Index(fields=['quiz', 'graded', '-completed_at', '-id'], name='quizattempt_inbox_idx'),
         ]
     
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.quiz.title} (Attempt {self.attempt_number})"
+
+    def save(self, *args, **kwargs):
+        self.graded = self.score is not None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'score' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'graded'}
+        super().save(*args, **kwargs)
     
     # NEW: Computed properties for consistent data access
     @property
@@ -0,0 +1,136 @@
+"""
+Windowed delivery of BookPage rows for book materials.
+
+Large books are read one page at a time, so the API never needs every
+page's content at once:
+
+- page_window() lists page summaries with keyset pagination on
+  page_number (`page_number > after LIMIT n`), projecting only summary
+  columns plus a 200-character preview computed in SQL. The book's page
+  count comes from a subquery in the same statement, so no separate
+  COUNT(*) runs; has_more comes from fetching extra rows.
+- page_navigation() gets total/previous/next for one page in a single
+  aggregate query, plus the next few page numbers to prefetch.
+- page_etag() is derived from the book's and the page's updated_at and the
+  navigation rendered with the page (prefetch ids included), so readers
+  revalidating a page they already have get a 304 without the content
+  column ever being read. Summaries carry the ETag the page endpoint sends
+  with the default prefetch, so a reader can revalidate straight from a
+  window.
+"""
+from __future__ import annotations
+
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, IntegerField, Max, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Length, Substr
+from django.utils.http import parse_etags
+
+from courses.models import BookPage
+
+PREVIEW_CHARS = 200
+MAX_WINDOW = 100
+MAX_PREFETCH = 10
+
+SUMMARY_FIELDS = ('id', 'page_number', 'title', 'image_url', 'audio_url', 'is_required', 'created_at', 'updated_at')
+
+
+def default_window() -> int:
+    return int(getattr(settings, 'BOOK_PAGE_WINDOW', 20))
+
+
+def default_prefetch() -> int:
+    return int(getattr(settings, 'BOOK_PAGE_PREFETCH', 2))
+
+
+def page_window(book_material, *, after: int = 0, limit: int | None = None) -> dict:
+    """Summaries of the pages after page `after` (exclusive), at most `limit` of them."""
+    limit = max(1, min(limit or default_window(), MAX_WINDOW))
+    prefetch = max(0, min(default_prefetch(), MAX_PREFETCH))
+    pages = BookPage.objects.filter(book_material=book_material)
+    total_pages = pages.order_by().values('book_material').annotate(n=Count('id')).values('n')
+    previous_page = pages.filter(page_number__lt=OuterRef('page_number')).order_by('-page_number')
+    # Rows past the window give the last summaries their next page and prefetch ids.
+    rows = list(
+        pages.filter(page_number__gt=after)
+        .only(*SUMMARY_FIELDS)
+        .annotate(
+            preview=Substr('content', 1, PREVIEW_CHARS),
+            content_length=Length('content'),
+            total_pages=Subquery(total_pages, output_field=IntegerField()),
+            previous_page=Subquery(previous_page.values('page_number')[:1]),
+        )
+        .order_by('page_number')[:limit + max(1, prefetch)]
+    )
+    numbers = [page.page_number for page in rows]
+    summaries = []
+    for i, page in enumerate(rows[:limit]):
+        navigation = {
+            'total_pages': page.total_pages,
+            'previous_page': page.previous_page,
+            'next_page': numbers[i + 1] if i + 1 < len(numbers) else None,
+            'prefetch_pages': numbers[i + 1:i + 1 + prefetch],
+        }
+        summaries.append(page_summary(page, book_material, navigation))
+    has_more = len(rows) > limit
+    return {
+        'pages': summaries,
+        'has_more': has_more,
+        'next_after': rows[limit - 1].page_number if has_more else None,
+        'limit': limit,
+        # Unknown only for an empty window past the first page.
+        'total_pages': rows[0].total_pages if rows else (0 if after <= 0 else None),
+    }
+
+
+def page_summary(page, book_material, navigation: dict) -> dict:
+    """Summary dict for a page loaded by page_window() (preview instead of content)."""
+    preview = page.preview
+    if page.content_length > PREVIEW_CHARS:
+        preview += '...'
+    return {
+        'id': str(page.id),
+        'page_number': page.page_number,
+        'title': page.title,
+        'content': preview,
+        'image_url': page.image_url,
+        'audio_url': page.audio_url,
+        'is_required': page.is_required,
+        'created_at': page.created_at.isoformat(),
+        'etag': page_etag(page, book_material, navigation),
+    }
+
+
+def page_navigation(book_material, page_number: int, prefetch: int | None = None) -> dict:
+    """Total pages and neighbours of page_number (one aggregate), plus pages to prefetch."""
+    nav = BookPage.objects.filter(book_material=book_material).aggregate(
+        total_pages=Count('id'),
+        previous_page=Max('page_number', filter=Q(page_number__lt=page_number)),
+        next_page=Min('page_number', filter=Q(page_number__gt=page_number)),
+    )
+    prefetch = max(0, min(default_prefetch() if prefetch is None else prefetch, MAX_PREFETCH))
+    if prefetch and nav['next_page'] is not None:
+        nav['prefetch_pages'] = list(
+            BookPage.objects.filter(book_material=book_material, page_number__gt=page_number)
+            .order_by('page_number')
+            .values_list('page_number', flat=True)[:prefetch]
+        )
+    else:
+        nav['prefetch_pages'] = []
+    return nav
+
+
+def page_etag(page, book_material, navigation: dict) -> str:
+    """Strong ETag for a page as rendered with its book and navigation."""
+    parts = [str(page.id), page.updated_at.isoformat(), book_material.updated_at.isoformat()]
+    parts += [str(navigation.get(key)) for key in ('total_pages', 'previous_page', 'next_page')]
+    parts.append(','.join(str(number) for number in navigation.get('prefetch_pages', ())))
+    return '"%s"' % hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def etag_matches(request, etag: str) -> bool:
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or etag in parse_etags(if_none_match)
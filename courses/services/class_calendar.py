@@ -0,0 +1,200 @@
+"""
+Date-range calendar engine for live classes.
+
+The weekly timetable (ClassSession: weekday + wall-clock time) and dated
+ClassEvent rows are loaded for a whole date range in two queries, indexed in
+memory by (class, local date, start time) and matched day by day:
+
+- a session with an event at the same local start time is "scheduled";
+- a session without one is a timetable-only slot;
+- events on that day that match no session are orphans.
+
+Only classes that have a session on a given weekday take part in that day's
+matching, the same rule the per-day builders used. The teacher week calendar
+and the admin dashboard timetable both render from build_day_schedules().
+
+cached_calendar() stores rendered rows per (kind, range, timezone) behind a
+generation token, bumped when sessions, classes or courses change (which
+classes take part). Each entry also records a per-class token for every
+class in its rows: an event change, or a rename of the class's teacher,
+bumps only that class's token, so calendars without the class stay cached.
+No key scans are needed.
+"""
+from __future__ import annotations
+
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.cache import cache
+
+from backend.public_cache import bump_versions, version_tokens
+from courses.models import ClassEvent, ClassSession
+
+logger = logging.getLogger(__name__)
+
+SCHEDULABLE_EVENT_TYPES = frozenset({"lesson", "meeting", "break", "test", "exam"})
+
+_CACHE_PREFIX = "class-calendar"
+
+
+@dataclass
+class DaySchedule:
+    day: date
+    # (session, matching event or None) in timetable display order.
+    slots: list[tuple[ClassSession, ClassEvent | None]] = field(default_factory=list)
+    orphan_events: list[ClassEvent] = field(default_factory=list)
+    # Active sessions per class on this weekday.
+    session_counts: Counter = field(default_factory=Counter)
+
+
+def live_sessions_queryset():
+    """Active sessions of active live/hybrid classes (archived and self-paced courses excluded)."""
+    return ClassSession.objects.filter(
+        is_active=True,
+        class_instance__is_active=True,
+        class_instance__course__status__in=["draft", "published"],
+        class_instance__course__delivery_type__in=["live", "hybrid"],
+    ).select_related(
+        "class_instance",
+        "class_instance__course",
+        "class_instance__teacher",
+    )
+
+
+def _time_key(t: time, match_seconds: bool) -> tuple[int, ...]:
+    if match_seconds:
+        return (t.hour, t.minute, t.second)
+    return (t.hour, t.minute)
+
+
+def build_day_schedules(
+    start_day: date,
+    end_day: date,
+    tz: ZoneInfo,
+    *,
+    match_seconds: bool = False,
+) -> list[DaySchedule]:
+    """Match sessions and events for every day in [start_day, end_day] (two queries)."""
+    days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+    if not days:
+        return []
+
+    sessions_by_weekday: dict[int, list[ClassSession]] = defaultdict(list)
+    for session in live_sessions_queryset().filter(
+        day_of_week__in={day.weekday() for day in days}
+    ).order_by(
+        "class_instance__course__title",
+        "class_instance__name",
+        "session_number",
+        "start_time",
+    ):
+        sessions_by_weekday[session.day_of_week].append(session)
+
+    class_ids = {s.class_instance_id for sessions in sessions_by_weekday.values() for s in sessions}
+    events_by_day: dict[date, list[tuple[ClassEvent, datetime]]] = defaultdict(list)
+    if class_ids:
+        range_start = datetime.combine(start_day, time.min).replace(tzinfo=tz)
+        range_end = datetime.combine(end_day + timedelta(days=1), time.min).replace(tzinfo=tz)
+        events = (
+            ClassEvent.objects.filter(
+                class_instance_id__in=class_ids,
+                event_type__in=SCHEDULABLE_EVENT_TYPES,
+                start_time__gte=range_start,
+                start_time__lt=range_end,
+            )
+            .select_related("class_instance", "class_instance__course", "class_instance__teacher")
+            .order_by("start_time", "created_at", "id")
+        )
+        for event in events:
+            local_start = event.start_time.astimezone(tz)
+            events_by_day[local_start.date()].append((event, local_start))
+
+    schedules = []
+    for day in days:
+        sessions = sessions_by_weekday.get(day.weekday(), [])
+        schedule = DaySchedule(day=day, session_counts=Counter(s.class_instance_id for s in sessions))
+        index: dict[tuple, ClassEvent] = {}
+        day_events = [
+            (event, local_start)
+            for event, local_start in events_by_day.get(day, [])
+            if event.class_instance_id in schedule.session_counts
+        ]
+        for event, local_start in day_events:
+            key = (event.class_instance_id, day, _time_key(local_start.time().replace(microsecond=0), match_seconds))
+            # Events are in (start_time, created_at) order; the latest created at a slot wins.
+            index[key] = event
+
+        matched_ids = set()
+        for session in sessions:
+            key = (session.class_instance_id, day, _time_key(session.start_time.replace(microsecond=0), match_seconds))
+            event = index.get(key)
+            if event is not None:
+                matched_ids.add(event.pk)
+            schedule.slots.append((session, event))
+        schedule.orphan_events = [event for event, _local in day_events if event.pk not in matched_ids]
+        schedules.append(schedule)
+    return schedules
+
+
+# Cache -----------------------------------------------------------------------
+
+def _cache_seconds() -> int:
+    return int(getattr(settings, "CLASS_CALENDAR_CACHE_SECONDS", 300))
+
+
+def _generation_key() -> str:
+    return f"{_CACHE_PREFIX}:gen"
+
+
+def _class_key(class_id) -> str:
+    return f"{_CACHE_PREFIX}:class:{class_id}:gen"
+
+
+def invalidate_calendar_cache() -> None:
+    """Drop every cached calendar range; again after commit so pre-commit reads cannot linger."""
+    bump_versions([_generation_key()], "Class calendar")
+
+
+def invalidate_class_calendars(*class_ids) -> None:
+    """Drop the cached calendar ranges that show any of these classes."""
+    bump_versions([_class_key(class_id) for class_id in class_ids if class_id is not None], "Class calendar")
+
+
+def _class_tokens(class_ids) -> dict[str, str]:
+    class_ids = sorted(class_ids)
+    return dict(zip(class_ids, version_tokens(*[_class_key(class_id) for class_id in class_ids])))
+
+
+def cached_calendar(kind: str, start_day: date, end_day: date, tz_name: str, build, *, class_key: str = "class_id"):
+    """
+    Return build() for (kind, range, timezone), cached until the next
+    invalidation. `class_key` names the row field holding the class id.
+    """
+    seconds = _cache_seconds()
+    if seconds <= 0:
+        return build()
+    tokens = None
+    try:
+        (generation,) = version_tokens(_generation_key())
+        key = f"{_CACHE_PREFIX}:{generation}:{kind}:{start_day.isoformat()}:{end_day.isoformat()}:{tz_name}"
+        cached = cache.get(key)
+        if cached is not None:
+            # Same generation, so the same classes: tokens read now predate the rebuild.
+            tokens = _class_tokens(cached["classes"])
+            if tokens == cached["classes"]:
+                return cached["rows"]
+    except Exception as e:
+        logger.warning("Class calendar cache read failed: %s", e)
+        return build()
+    rows = build()
+    try:
+        if tokens is None:
+            tokens = _class_tokens({str(row[class_key]) for row in rows})
+        cache.set(key, {"classes": tokens, "rows": rows}, seconds)
+    except Exception as e:
+        logger.warning("Class calendar cache write failed: %s", e)
+    return rows
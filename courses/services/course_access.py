@@ -0,0 +1,95 @@
+"""
+Per-user course access index for lesson and material authorization.
+
+get_course_access(user) returns the course ids a user can edit (owner or
+co-teacher), study (active/completed enrollment) or attends through a class
+roster. The index is built in three queries and cached per user for
+COURSE_ACCESS_CACHE_SECONDS (0 disables caching).
+
+Signals drop a user's entry when their enrollments, course memberships or
+class rosters change (courses/signals.py, student/signals.py). Queryset
+.update() calls skip signals; code that changes enrollment status or
+membership in bulk must call invalidate_course_access() itself.
+
+Usage:
+
+    access = get_course_access(request.user)
+    if lesson.course_id in access.readable:
+        ...
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.db.models import Q
+
+from backend.user_cache import PerUserCache
+
+_CACHE_PREFIX = "course-access"
+
+STUDY_STATUSES = ("active", "completed")
+
+
+@dataclass(frozen=True)
+class CourseAccessIndex:
+    # Course.teacher or a CourseMembership row.
+    editable: frozenset = frozenset()
+    # EnrolledCourse in an active/completed status.
+    enrolled: frozenset = frozenset()
+    # Student on an active class roster. Not an access grant on its own.
+    rostered: frozenset = frozenset()
+
+    @property
+    def readable(self) -> frozenset:
+        return self.editable | self.enrolled
+
+
+EMPTY_ACCESS = CourseAccessIndex()
+
+
+_cache = PerUserCache(_CACHE_PREFIX, "COURSE_ACCESS_CACHE_SECONDS", 300, "Course access")
+
+
+def build_course_access(user_id) -> CourseAccessIndex:
+    """Query the index for one user (no caching)."""
+    from courses.models import Class, Course
+    from student.models import EnrolledCourse
+
+    editable = Course.objects.filter(
+        Q(teacher_id=user_id) | Q(memberships__user_id=user_id)
+    ).values_list("id", flat=True)
+    enrolled = EnrolledCourse.objects.filter(
+        student_profile__user_id=user_id,
+        status__in=STUDY_STATUSES,
+    ).values_list("course_id", flat=True)
+    rostered = Class.objects.filter(
+        students__id=user_id,
+        is_active=True,
+    ).values_list("course_id", flat=True)
+    return CourseAccessIndex(
+        editable=frozenset(editable),
+        enrolled=frozenset(enrolled),
+        rostered=frozenset(rostered),
+    )
+
+
+def get_course_access(user) -> CourseAccessIndex:
+    """The access index for user; empty for anonymous users."""
+    if not user or not getattr(user, "is_authenticated", False):
+        return EMPTY_ACCESS
+    return _cache.get(user.pk, build_course_access)
+
+
+def user_can_view_lesson(user, lesson) -> bool:
+    """Teachers who own or co-teach the course, students enrolled in it (active/completed)."""
+    role = getattr(user, "role", None)
+    if role == "teacher":
+        return lesson.course_id in get_course_access(user).editable
+    if role == "student":
+        return lesson.course_id in get_course_access(user).enrolled
+    return False
+
+
+def invalidate_course_access(*user_ids) -> None:
+    """Drop cached indexes for these users; again after commit so pre-commit reads cannot linger."""
+    _cache.invalidate(*user_ids)
@@ -0,0 +1,328 @@
+"""
+Student lesson payload = cached static part + per-student overlay.
+
+Everything in the student lesson detail response that is the same for every
+student (serialized lesson, materials, transcript filtering, quiz and
+assignment definitions with questions, the live class event, teacher name,
+prerequisites) is built once by build_static_payload() and cached under
+
+    lesson-payload:<lesson_id>:<lesson version>:<course version>
+
+Signals in courses/signals.py bump the lesson version when the lesson or
+anything rendered from it changes (materials, book pages, video transcripts,
+quizzes, assignments, questions, class events) and the course version when
+the course or its modules change. Entries also expire after
+LESSON_PAYLOAD_CACHE_SECONDS (0 disables caching).
+
+apply_student_overlay() then adds what depends on the viewer and the clock
+in a fixed number of queries: quiz attempts, assignment submissions and
+counts, visibility of hidden quizzes/assignments, class event status and
+playback progress.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from backend.public_cache import bump_versions, version_tokens
+from courses.lesson_assessment_payloads import (
+    student_assignment_definition,
+    student_assignment_with_submissions,
+    student_quiz_definition,
+    student_quiz_with_attempts,
+)
+from courses.models import AssignmentSubmission, ClassEvent, QuizAttempt, VideoMaterial
+
+logger = logging.getLogger(__name__)
+
+_CACHE_PREFIX = "lesson-payload"
+
+
+# Versions ---------------------------------------------------------------------
+
+def _version_key(kind: str, object_id) -> str:
+    return f"{_CACHE_PREFIX}:{kind}-ver:{object_id}"
+
+
+def _versions(lesson) -> list[str]:
+    return version_tokens(_version_key("lesson", lesson.pk), _version_key("course", lesson.course_id))
+
+
+def _bump(keys) -> None:
+    bump_versions(keys, "Lesson payload")
+
+
+def invalidate_lesson_payloads(*lesson_ids) -> None:
+    _bump([_version_key("lesson", lesson_id) for lesson_id in set(lesson_ids) if lesson_id is not None])
+
+
+def invalidate_course_lesson_payloads(*course_ids) -> None:
+    _bump([_version_key("course", course_id) for course_id in set(course_ids) if course_id is not None])
+
+
+def _cache_seconds() -> int:
+    return int(getattr(settings, "LESSON_PAYLOAD_CACHE_SECONDS", 600))
+
+
+def get_static_payload(lesson) -> dict:
+    """build_static_payload(lesson), cached until the lesson or course version changes."""
+    seconds = _cache_seconds()
+    if seconds <= 0:
+        return build_static_payload(lesson)
+    try:
+        lesson_ver, course_ver = _versions(lesson)
+        key = f"{_CACHE_PREFIX}:{lesson.pk}:{lesson_ver}:{course_ver}"
+        payload = cache.get(key)
+    except Exception as e:
+        logger.warning("Lesson payload cache read failed: %s", e)
+        return build_static_payload(lesson)
+    if payload is not None:
+        return payload
+    payload = build_static_payload(lesson)
+    try:
+        cache.set(key, payload, seconds)
+    except Exception as e:
+        logger.warning("Lesson payload cache write failed: %s", e)
+    return payload
+
+
+# Static part ------------------------------------------------------------------
+
+def _materials(lesson) -> tuple[list, bool]:
+    """Material dicts (videos hidden when their transcript is not released) and is_material_available."""
+    materials = list(lesson.lesson_materials.all())
+    if not materials:
+        return [], False
+    video_by_material = {}
+    for video in VideoMaterial.objects.filter(
+        lesson_material__in=[m for m in materials if m.material_type == 'video']
+    ).order_by('pk'):
+        video_by_material.setdefault(video.lesson_material_id, video)
+
+    materials_data = []
+    for m in materials:
+        material_data = {
+            'id': str(m.id),
+            'title': m.title,
+            'description': m.description,
+            'material_type': m.material_type,
+            'file_url': m.file_url,
+            'file_size': m.file_size,
+            'file_size_mb': m.file_size_mb,
+            'file_extension': m.file_extension,
+            'order': m.order,
+            'created_at': m.created_at,
+            # Book-specific fields
+            'total_pages': m.book_pages.count() if m.material_type == 'book' else None,
+        }
+        if m.material_type == 'video':
+            video_material = video_by_material.get(m.id)
+            if video_material:
+                # Skip this material if transcript is not available to students
+                if not video_material.transcript_available_to_students:
+                    continue
+                if video_material.transcript:
+                    material_data['transcript'] = video_material.transcript
+                    material_data['transcript_available_to_students'] = True
+                    material_data['word_count'] = video_material.word_count
+        materials_data.append(material_data)
+    return materials_data, lesson.type == 'live_class'
+
+
+def _transcript_available(lesson) -> bool:
+    """A video lesson's inline transcript is shown only when its VideoMaterial releases it."""
+    for lm in lesson.lesson_materials.filter(material_type='video'):
+        vm = VideoMaterial.objects.filter(lesson_material=lm).first()
+        if vm and vm.video_url == lesson.video_url:
+            if vm.transcript_available_to_students:
+                return True
+            break
+    return VideoMaterial.objects.filter(
+        video_url=lesson.video_url, transcript_available_to_students=True
+    ).exists()
+
+
+def _class_event(lesson):
+    if lesson.type != 'live_class':
+        return None
+    class_event = ClassEvent.objects.filter(lesson=lesson).first()
+    if class_event is None:
+        return None
+    return {
+        'id': str(class_event.id),
+        'title': class_event.title,
+        'description': class_event.description or '',
+        'start_time': class_event.start_time,
+        'end_time': class_event.end_time,
+        'platform': class_event.meeting_platform,
+        'meeting_url': class_event.meeting_link,
+    }
+
+
+def build_static_payload(lesson) -> dict:
+    """Everything in the student lesson response that does not depend on the viewer."""
+    from courses.serializers import LessonDetailSerializer
+
+    try:
+        materials_data, is_material_available = _materials(lesson)
+    except Exception:
+        materials_data, is_material_available = [], False
+
+    try:
+        teacher_name = lesson.course.teacher.get_full_name() if lesson.course.teacher else 'Unknown'
+    except Exception:
+        teacher_name = None
+
+    try:
+        prerequisites_data = list(lesson.prerequisites.values_list('id', flat=True))
+    except Exception:
+        prerequisites_data = []
+
+    context = {
+        'materials_data': materials_data,
+        'is_material_available': is_material_available,
+        'teacher_name': teacher_name,
+        'prerequisites_data': prerequisites_data,
+    }
+    lesson_data = dict(LessonDetailSerializer(lesson, context=context).data)
+
+    if lesson.type == 'video_audio' and lesson_data.get('content'):
+        content = lesson_data['content']
+        if 'transcript' in content:
+            try:
+                keep = _transcript_available(lesson)
+            except Exception:
+                keep = False
+            if not keep:
+                content = content.copy()
+                content.pop('transcript', None)
+                lesson_data['content'] = content
+
+    try:
+        quizzes = [
+            {'visible': getattr(quiz, 'visible_to_students', True), 'definition': student_quiz_definition(quiz)}
+            for quiz in lesson.quizzes.all().order_by('title', 'created_at')
+        ]
+    except Exception:
+        quizzes = []
+    try:
+        assignments = [
+            {
+                'visible': getattr(assignment, 'visible_to_students', True),
+                'definition': student_assignment_definition(assignment),
+            }
+            for assignment in lesson.assignments.all().order_by('title', 'created_at')
+        ]
+    except Exception:
+        assignments = []
+    try:
+        class_event = _class_event(lesson)
+    except Exception:
+        class_event = None
+    return {
+        'lesson': lesson_data,
+        'quizzes': quizzes,
+        'assignments': assignments,
+        'class_event': class_event,
+    }
+
+
+# Per-student overlay ------------------------------------------------------------
+
+def _class_event_status(event):
+    if event is None:
+        return None
+    now = timezone.now()
+    try:
+        if event['start_time'] <= now <= event['end_time']:
+            event_status = 'ongoing'
+        elif event['start_time'] > now:
+            event_status = 'upcoming'
+        else:
+            event_status = 'completed'
+        return {
+            **event,
+            'status': event_status,
+            'can_join_early': event['start_time'] - timedelta(minutes=5) <= now,
+        }
+    except Exception:
+        return None
+
+
+def _quizzes_for(quizzes, user, authenticated) -> list:
+    quiz_ids = [q['definition']['id'] for q in quizzes]
+    attempts_by_quiz = defaultdict(list)
+    if authenticated and quiz_ids:
+        for attempt in QuizAttempt.objects.filter(student=user, quiz_id__in=quiz_ids).order_by('-started_at'):
+            attempts_by_quiz[str(attempt.quiz_id)].append(attempt)
+    return [
+        student_quiz_with_attempts(q['definition'], attempts_by_quiz.get(q['definition']['id'], []))
+        for q in quizzes
+        if q['visible'] or attempts_by_quiz.get(q['definition']['id'])
+    ]
+
+
+def _assignments_for(assignments, user, authenticated) -> list:
+    assignment_ids = [a['definition']['id'] for a in assignments]
+    if not assignment_ids:
+        return []
+    submission_counts = {
+        str(row['assignment_id']): row['total']
+        for row in AssignmentSubmission.objects.filter(assignment_id__in=assignment_ids)
+        .values('assignment_id')
+        .annotate(total=Count('id'))
+        .order_by()
+    }
+    submissions_by_assignment = defaultdict(list)
+    if authenticated:
+        for submission in AssignmentSubmission.objects.filter(
+            assignment_id__in=assignment_ids,
+            enrollment__student_profile__user=user,
+        ).order_by('-submitted_at'):
+            submissions_by_assignment[str(submission.assignment_id)].append(submission)
+    return [
+        student_assignment_with_submissions(
+            a['definition'],
+            submissions_by_assignment.get(a['definition']['id'], []),
+            submission_counts.get(a['definition']['id'], 0),
+        )
+        for a in assignments
+        if a['visible'] or submissions_by_assignment.get(a['definition']['id'])
+    ]
+
+
+def apply_student_overlay(static: dict, user, progress=None) -> dict:
+    """Response body for `user`: the static payload plus attempts, submissions, visibility and progress."""
+    data = dict(static['lesson'])
+    authenticated = bool(user is not None and getattr(user, 'is_authenticated', False))
+    try:
+        quizzes_data = _quizzes_for(static['quizzes'], user, authenticated)
+    except Exception:
+        quizzes_data = []
+    try:
+        assignments_data = _assignments_for(static['assignments'], user, authenticated)
+    except Exception:
+        assignments_data = []
+    data['quiz'] = quizzes_data[0] if quizzes_data else None
+    data['quizzes'] = quizzes_data
+    data['assignment'] = assignments_data[0] if assignments_data else None
+    data['assignments'] = assignments_data
+    data['has_assignment'] = len(assignments_data) > 0
+    data['class_event'] = _class_event_status(static['class_event'])
+
+    data['position_seconds'] = None
+    data['duration_seconds'] = None
+    data['completed_interactive_event_ids'] = []
+    if progress is not None and isinstance(progress.progress_data, dict):
+        data['position_seconds'] = progress.progress_data.get('position_seconds')
+        data['duration_seconds'] = progress.progress_data.get('duration_seconds')
+        raw_ids = progress.progress_data.get('completed_interactive_event_ids')
+        if isinstance(raw_ids, list):
+            data['completed_interactive_event_ids'] = [str(item) for item in raw_ids if item]
+    return data
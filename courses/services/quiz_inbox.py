@@ -0,0 +1,169 @@
+"""
+Teacher quiz-submission inbox: completed QuizAttempts on the teacher's quizzes,
+ungraded first, newest first within each group.
+
+- inbox_page() reads one window with keyset pagination over
+  (graded, completed_at, id); the cursor is opaque to clients. Rows are
+  values() projections: the answers and teacher_grade_data JSON columns are
+  never loaded (the teacher percentage is extracted in SQL). Full attempts
+  come from quiz_attempt_details.
+- inbox_counts() returns total/ungraded/graded in one aggregate.
+- parse_filters() validates the id filters from the query string.
+
+"Graded" matches teacher_quiz_submissions: the attempt has a score. It is
+stored as QuizAttempt.graded (kept in sync by save()) so the page is read
+in order from the (quiz, graded, -completed_at, -id) index.
+"""
+from __future__ import annotations
+
+import base64
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.db.models.fields.json import KT
+
+from courses.models import Quiz, QuizAttempt
+from courses.permissions import courses_for_teacher
+
+MAX_PAGE_SIZE = 100
+STATUSES = ('ungraded', 'graded')
+UUID_FILTERS = ('course_id', 'lesson_id', 'quiz_id')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def parse_filters(params) -> dict:
+    """inbox_queryset() filters from query params; raises InvalidFilter for a malformed id."""
+    filters = {}
+    for name in UUID_FILTERS:
+        value = params.get(name)
+        if value:
+            try:
+                filters[name] = uuid.UUID(value)
+            except ValueError as e:
+                raise InvalidFilter(f'{name} must be a UUID') from e
+    student_id = params.get('student_id')
+    if student_id:
+        try:
+            filters['student_id'] = int(student_id)
+        except ValueError as e:
+            raise InvalidFilter('student_id must be an integer') from e
+    return filters
+
+
+def default_page_size() -> int:
+    return int(getattr(settings, 'QUIZ_INBOX_PAGE_SIZE', 25))
+
+
+def inbox_queryset(teacher, *, student_id=None, course_id=None, lesson_id=None, quiz_id=None):
+    """Completed attempts on quizzes linked to the teacher's lessons, with optional filters."""
+    quizzes = Quiz.objects.filter(lessons__course__in=courses_for_teacher(teacher))
+    if course_id:
+        quizzes = quizzes.filter(lessons__course_id=course_id)
+    if lesson_id:
+        quizzes = quizzes.filter(lessons__id=lesson_id)
+    attempts = QuizAttempt.objects.filter(
+        quiz_id__in=quizzes.values('id'),
+        completed_at__isnull=False,
+    )
+    if quiz_id:
+        attempts = attempts.filter(quiz_id=quiz_id)
+    if student_id:
+        attempts = attempts.filter(student_id=student_id)
+    return attempts
+
+
+def inbox_counts(attempts) -> dict:
+    return attempts.aggregate(
+        total=Count('id'),
+        ungraded=Count('id', filter=Q(graded=False)),
+        graded=Count('id', filter=Q(graded=True)),
+    )
+
+
+def encode_cursor(graded: bool, completed_at: datetime, attempt_id) -> str:
+    raw = f"{int(graded)}|{completed_at.isoformat()}|{attempt_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[bool, datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        graded, completed_at, attempt_id = raw.split('|')
+        if graded not in ('0', '1'):
+            raise ValueError(graded)
+        return graded == '1', datetime.fromisoformat(completed_at), uuid.UUID(attempt_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def _summary(row: dict) -> dict:
+    teacher_percentage = row['teacher_percentage']
+    score = row['score']
+    if row['is_teacher_graded'] and teacher_percentage:
+        score = float(teacher_percentage)
+    time_spent = None
+    if row['started_at'] and row['completed_at']:
+        time_spent = int((row['completed_at'] - row['started_at']).total_seconds() / 60)
+    name = f"{row['student_first_name']} {row['student_last_name']}".strip()
+    return {
+        'id': str(row['id']),
+        'quiz_id': str(row['quiz_id']),
+        'quiz_title': row['quiz_title'],
+        'student_id': row['student_id'],
+        'student_name': name,
+        'student_email': row['student_email'],
+        'submitted_at': row['completed_at'],
+        'time_spent': time_spent,
+        'attempt_number': row['attempt_number'],
+        'score': score,
+        'points_earned': row['points_earned'],
+        'passed': row['passed'],
+        'is_graded': row['graded'],
+        'is_teacher_enhanced': row['is_teacher_graded'],
+    }
+
+
+def inbox_page(attempts, *, status: str | None = None, cursor: str | None = None, limit: int | None = None) -> dict:
+    """One page of attempt summaries (ungraded first); raises InvalidCursor for a bad cursor."""
+    limit = max(1, min(limit or default_page_size(), MAX_PAGE_SIZE))
+    qs = attempts
+    if status == 'ungraded':
+        qs = qs.filter(graded=False)
+    elif status == 'graded':
+        qs = qs.filter(graded=True)
+    if cursor:
+        graded, completed_at, attempt_id = decode_cursor(cursor)
+        qs = qs.filter(
+            Q(graded__gt=graded)
+            | Q(graded=graded, completed_at__lt=completed_at)
+            | Q(graded=graded, completed_at=completed_at, id__lt=attempt_id)
+        )
+    rows = list(
+        qs.order_by('graded', '-completed_at', '-id').values(
+            'id', 'quiz_id', 'student_id', 'attempt_number', 'started_at', 'completed_at',
+            'score', 'points_earned', 'passed', 'is_teacher_graded', 'graded',
+            quiz_title=F('quiz__title'),
+            student_first_name=F('student__first_name'),
+            student_last_name=F('student__last_name'),
+            student_email=F('student__email'),
+            teacher_percentage=KT('teacher_grade_data__percentage'),
+        )[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last = rows[-1] if rows else None
+    return {
+        'results': [_summary(row) for row in rows],
+        'has_more': has_more,
+        'next_cursor': encode_cursor(last['graded'], last['completed_at'], last['id']) if has_more else None,
+        'limit': limit,
+    }
@@ -0,0 +1,163 @@
+"""
+Quiz auto-scoring from a compiled answer key.
+
+compile_answer_key() reads a quiz's questions once and keeps only what scoring
+needs: per question the normalized correct answer (trimmed, lower-cased) and
+its points, plus the question count. get_answer_key() caches it under
+
+    quiz-answer-key:<quiz_id>:<questions version>
+
+so a class submitting the same quiz at once shares one compiled key instead of
+reloading every question per submission. Question saves/deletes bump the
+version (courses/signals.py); entries also expire after
+QUIZ_ANSWER_KEY_CACHE_SECONDS (0 disables caching).
+
+score_answers() is pure: no queries, same results as the previous inline loop
+in submit_quiz_attempt.
+
+create_quiz_attempt() numbers attempts inside a transaction and relies on the
+(student, quiz, attempt_number) unique constraint: concurrent submissions that
+pick the same number retry with the next one instead of failing.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+
+from backend.public_cache import bump_versions, version_tokens
+from courses.models import Question, QuizAttempt
+
+logger = logging.getLogger(__name__)
+
+_CACHE_PREFIX = "quiz-answer-key"
+_CREATE_RETRIES = 3
+
+
+class MaxAttemptsReached(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    quiz_id: str
+    # (question id, normalized correct answer, points), in question order.
+    entries: tuple[tuple[str, str, int], ...]
+
+    @property
+    def question_count(self) -> int:
+        return len(self.entries)
+
+
+@dataclass(frozen=True)
+class QuizScore:
+    correct_answers: int
+    points_earned: int
+    score_percentage: int
+    total_questions: int
+
+
+def normalize_answer(value) -> str:
+    return str(value).strip().lower()
+
+
+def compile_answer_key(quiz_id) -> AnswerKey:
+    rows = Question.objects.filter(quiz_id=quiz_id).order_by("order").values_list("id", "content", "points")
+    return AnswerKey(
+        quiz_id=str(quiz_id),
+        entries=tuple(
+            (str(question_id), normalize_answer((content or {}).get("correct_answer", "")), points)
+            for question_id, content, points in rows
+        ),
+    )
+
+
+# Cache ------------------------------------------------------------------------
+
+def _version_key(quiz_id) -> str:
+    return f"{_CACHE_PREFIX}:ver:{quiz_id}"
+
+
+def invalidate_answer_keys(*quiz_ids) -> None:
+    """Bump now and again after commit, so pre-commit reads cannot linger."""
+    bump_versions([_version_key(quiz_id) for quiz_id in set(quiz_ids) if quiz_id is not None], "Quiz answer key")
+
+
+def _cache_seconds() -> int:
+    return int(getattr(settings, "QUIZ_ANSWER_KEY_CACHE_SECONDS", 3600))
+
+
+def get_answer_key(quiz_id) -> AnswerKey:
+    """compile_answer_key(quiz_id), cached until the quiz's questions change."""
+    seconds = _cache_seconds()
+    if seconds <= 0:
+        return compile_answer_key(quiz_id)
+    try:
+        (version,) = version_tokens(_version_key(quiz_id))
+        key = f"{_CACHE_PREFIX}:{quiz_id}:{version}"
+        answer_key = cache.get(key)
+    except Exception as e:
+        logger.warning("Quiz answer key cache read failed: %s", e)
+        return compile_answer_key(quiz_id)
+    if answer_key is not None:
+        return answer_key
+    answer_key = compile_answer_key(quiz_id)
+    try:
+        cache.set(key, answer_key, seconds)
+    except Exception as e:
+        logger.warning("Quiz answer key cache write failed: %s", e)
+    return answer_key
+
+
+# Scoring ----------------------------------------------------------------------
+
+def score_answers(answer_key: AnswerKey, answers: dict) -> QuizScore:
+    """Exact match after normalization; unanswered (empty) questions score nothing."""
+    correct = 0
+    points = 0
+    for question_id, correct_answer, question_points in answer_key.entries:
+        user_answer = answers.get(question_id)
+        if user_answer and normalize_answer(user_answer) == correct_answer:
+            correct += 1
+            points += question_points
+    total = answer_key.question_count
+    return QuizScore(
+        correct_answers=correct,
+        points_earned=points,
+        score_percentage=round((correct / total) * 100) if total > 0 else 0,
+        total_questions=total,
+    )
+
+
+# Attempts ---------------------------------------------------------------------
+
+def create_quiz_attempt(*, student, quiz, **fields) -> QuizAttempt:
+    """
+    Create the student's next QuizAttempt (attempt_number = highest + 1).
+
+    Raises MaxAttemptsReached when the student already has quiz.max_attempts
+    attempts. A concurrent submission taking the same number trips the unique
+    constraint; the number is then recomputed and the insert retried.
+    """
+    for retry in range(_CREATE_RETRIES):
+        try:
+            with transaction.atomic():
+                existing = QuizAttempt.objects.filter(student=student, quiz=quiz).aggregate(
+                    n=Count("id"), last=Max("attempt_number")
+                )
+                if existing["n"] >= quiz.max_attempts:
+                    raise MaxAttemptsReached(quiz.max_attempts)
+                return QuizAttempt.objects.create(
+                    student=student,
+                    quiz=quiz,
+                    attempt_number=(existing["last"] or 0) + 1,
+                    **fields,
+                )
+        except IntegrityError:
+            if retry == _CREATE_RETRIES - 1:
+                raise
+            logger.info("Quiz attempt number collision for quiz %s, retrying", quiz.pk)
@@ -0,0 +1,88 @@
+"""
+Per-(student, course) counters for teacher roster pages.
+
+build_roster_counters(teacher, pairs) returns, for each (student user id,
+course id) pair of a roster, the pending assignment/test/exam/project
+counts (courses.teacher_pending_counts semantics, latest attempt only for
+assessments) and the teacher's unread parent/student message counts. Each
+counter is one GROUP BY query, so the cost does not grow with the roster.
+
+Usage:
+
+    counters = build_roster_counters(request.user, [(user_id, course_id), ...])
+    row = counters[(user_id, course_id)]
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+
+from django.db.models import Count, F
+
+from courses.teacher_pending_counts import (
+    pending_assessment_counts_by_student_course,
+    pending_assignment_counts_by_student_course,
+    pending_project_counts_by_student_course,
+)
+
+
+@dataclass(frozen=True)
+class RosterCounters:
+    pending_assignment_count: int = 0
+    pending_test_submission_count: int = 0
+    pending_exam_submission_count: int = 0
+    pending_project_submission_count: int = 0
+    # Course conversations plus general (no course) conversations with the teacher.
+    parent_unread_count: int = 0
+    student_unread_count: int = 0
+
+
+def unread_message_counts(teacher) -> dict[str, Counter]:
+    """
+    Messages to `teacher` not yet read, per recipient type ('parent'/'student'), keyed by
+    (student_user_id, course_id); course_id is None for general conversations.
+    """
+    from student.models import Message
+
+    rows = (
+        Message.objects.filter(conversation__teacher=teacher, read_at__isnull=True)
+        .exclude(sender=teacher)
+        .values(
+            "conversation__recipient_type",
+            student_id=F("conversation__student_profile__user_id"),
+            course=F("conversation__course_id"),
+        )
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    counts = {"parent": Counter(), "student": Counter()}
+    for row in rows:
+        bucket = counts.get(row["conversation__recipient_type"])
+        if bucket is not None:
+            bucket[(row["student_id"], row["course"])] += row["n"]
+    return counts
+
+
+def build_roster_counters(teacher, pairs) -> dict[tuple, RosterCounters]:
+    """Counters for each (student_user_id, course_id) in pairs, e.g. a teacher's enrollments (5 queries)."""
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    course_ids = {course_id for _, course_id in pairs}
+    assignments = pending_assignment_counts_by_student_course(course_ids)
+    assessments = pending_assessment_counts_by_student_course(course_ids)
+    projects = pending_project_counts_by_student_course(course_ids)
+    unread = unread_message_counts(teacher)
+
+    counters = {}
+    for key in pairs:
+        general = (key[0], None)
+        counters[key] = RosterCounters(
+            pending_assignment_count=assignments[key],
+            pending_test_submission_count=assessments["test"][key],
+            pending_exam_submission_count=assessments["exam"][key],
+            pending_project_submission_count=projects[key],
+            parent_unread_count=unread["parent"][key] + unread["parent"][general],
+            student_unread_count=unread["student"][key] + unread["student"][general],
+        )
+    return counters
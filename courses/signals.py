@@ -1,7 +1,16 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import Course
+from .models import (
+    Assignment, AssignmentQuestion, BookPage, Class, ClassEvent, ClassSession, Course, CourseMembership,
+    Lesson, LessonMaterial, Module, Question, Quiz, VideoMaterial,
+)
 from .permissions import ensure_owner_membership
+from .services.class_calendar import invalidate_calendar_cache, invalidate_class_calendars
+from .services.course_access import invalidate_course_access
+from .services.lesson_delivery import invalidate_course_lesson_payloads, invalidate_lesson_payloads
+from .services.quiz_scoring import invalidate_answer_keys
+from student.services.timeline import invalidate_student_timelines
 
 
 @receiver(post_save, sender=Course)
@@ -13,6 +22,150 @@ def ensure_course_owner_membership(sender, instance, created, **kwargs):
         print(f"⚠️ Signal: Failed to ensure owner membership for {instance.title}: {e}")
 
 
+@receiver([post_save, post_delete], sender=ClassSession, dispatch_uid="class_calendar_session")
+@receiver([post_save, post_delete], sender=Class, dispatch_uid="class_calendar_class")
+@receiver([post_save, post_delete], sender=Course, dispatch_uid="class_calendar_course")
+def invalidate_class_calendar(sender, **kwargs):
+    """Sessions, classes and courses decide which classes a timetable shows."""
+    invalidate_calendar_cache()
+
+
+@receiver([post_save, post_delete], sender=ClassEvent, dispatch_uid="class_calendar_event")
+def invalidate_class_calendar_for_event(sender, instance, **kwargs):
+    """An event only changes the calendars showing its class."""
+    invalidate_class_calendars(instance.class_instance_id)
+
+
+# Name fields shown as the teacher label on calendar rows.
+TEACHER_LABEL_FIELDS = frozenset({"first_name", "last_name", "email"})
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid="class_calendar_teacher")
+def invalidate_class_calendar_for_teacher(sender, instance, created, update_fields=None, **kwargs):
+    """A teacher rename changes the rows of their classes; logins (last_login only) do not."""
+    if created or (update_fields is not None and not TEACHER_LABEL_FIELDS & set(update_fields)):
+        return
+    invalidate_class_calendars(*Class.objects.filter(teacher_id=instance.pk).values_list("id", flat=True))
+
+
+@receiver(pre_save, sender=Course, dispatch_uid="course_access_previous_owner")
+def remember_previous_course_owner(sender, instance, update_fields=None, raw=False, **kwargs):
+    """The owner before this save, so a teacher change also drops the old owner's cached access."""
+    instance._previous_teacher_id = None
+    if raw or instance._state.adding or (update_fields is not None and "teacher" not in update_fields):
+        return
+    instance._previous_teacher_id = (
+        Course.objects.filter(pk=instance.pk).values_list("teacher_id", flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=Course, dispatch_uid="course_access_course")
+def invalidate_course_access_for_owner(sender, instance, **kwargs):
+    invalidate_course_access(instance.teacher_id, getattr(instance, "_previous_teacher_id", None))
+
+
+@receiver([post_save, post_delete], sender=CourseMembership, dispatch_uid="course_access_membership")
+def invalidate_course_access_for_member(sender, instance, **kwargs):
+    invalidate_course_access(instance.user_id)
+
+
+def _roster_changed(*user_ids):
+    """Rosters decide course access and which class events show on a student's timeline."""
+    invalidate_course_access(*user_ids)
+    invalidate_student_timelines(*user_ids)
+
+
+@receiver(m2m_changed, sender=Class.students.through, dispatch_uid="class_roster_changed")
+def invalidate_for_roster(sender, instance, action, reverse, pk_set, **kwargs):
+    """Roster adds/removes in either direction; clear runs before the rows go."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        _roster_changed(instance.pk)
+    elif action == "pre_clear":
+        _roster_changed(*instance.students.values_list("id", flat=True))
+    else:
+        _roster_changed(*(pk_set or ()))
+
+
+@receiver(post_save, sender=Class, dispatch_uid="class_roster_class_save")
+@receiver(pre_delete, sender=Class, dispatch_uid="class_roster_class_delete")
+def invalidate_for_class(sender, instance, created=False, **kwargs):
+    """Activation, name and course changes affect the whole roster (new classes have none yet)."""
+    if created:
+        return
+    _roster_changed(*instance.students.values_list("id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=Course, dispatch_uid="lesson_payload_course")
+@receiver([post_save, post_delete], sender=Module, dispatch_uid="lesson_payload_module")
+def invalidate_lesson_payloads_for_course(sender, instance, **kwargs):
+    """Lesson payloads carry the course title, teacher name and module title."""
+    invalidate_course_lesson_payloads(instance.pk if sender is Course else instance.course_id)
+
+
+@receiver([post_save, post_delete], sender=Lesson, dispatch_uid="lesson_payload_lesson")
+def invalidate_lesson_payload(sender, instance, **kwargs):
+    invalidate_lesson_payloads(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ClassEvent, dispatch_uid="lesson_payload_class_event")
+def invalidate_lesson_payload_for_event(sender, instance, **kwargs):
+    invalidate_lesson_payloads(instance.lesson_id)
+
+
+@receiver(post_save, sender=LessonMaterial, dispatch_uid="lesson_payload_material_save")
+@receiver(pre_delete, sender=LessonMaterial, dispatch_uid="lesson_payload_material_delete")
+@receiver(post_save, sender=Quiz, dispatch_uid="lesson_payload_quiz_save")
+@receiver(pre_delete, sender=Quiz, dispatch_uid="lesson_payload_quiz_delete")
+@receiver(post_save, sender=Assignment, dispatch_uid="lesson_payload_assignment_save")
+@receiver(pre_delete, sender=Assignment, dispatch_uid="lesson_payload_assignment_delete")
+def invalidate_lesson_payloads_for_linked(sender, instance, **kwargs):
+    """Materials, quizzes and assignments are linked to lessons many-to-many; delete runs before the links go."""
+    invalidate_lesson_payloads(*instance.lessons.values_list("id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=BookPage, dispatch_uid="lesson_payload_book_page")
+@receiver([post_save, post_delete], sender=Question, dispatch_uid="lesson_payload_question")
+@receiver([post_save, post_delete], sender=AssignmentQuestion, dispatch_uid="lesson_payload_assignment_question")
+def invalidate_lesson_payloads_for_child(sender, instance, **kwargs):
+    """Book page counts and question lists are rendered into the lesson payload."""
+    if sender is BookPage:
+        lessons = Lesson.objects.filter(lesson_materials=instance.book_material_id)
+    elif sender is Question:
+        lessons = Lesson.objects.filter(quizzes=instance.quiz_id)
+    else:
+        lessons = Lesson.objects.filter(assignments=instance.assignment_id)
+    invalidate_lesson_payloads(*lessons.values_list("id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=VideoMaterial, dispatch_uid="lesson_payload_video")
+def invalidate_lesson_payloads_for_video(sender, instance, **kwargs):
+    """Transcript release hides/shows the material and the lesson's inline transcript (matched by URL)."""
+    lessons = Lesson.objects.filter(video_url=instance.video_url)
+    if instance.lesson_material_id:
+        lessons = lessons | Lesson.objects.filter(lesson_materials=instance.lesson_material_id)
+    invalidate_lesson_payloads(*lessons.values_list("id", flat=True))
+
+
+@receiver(m2m_changed, sender=Lesson.prerequisites.through, dispatch_uid="lesson_payload_prerequisites")
+@receiver(m2m_changed, sender=LessonMaterial.lessons.through, dispatch_uid="lesson_payload_material_links")
+@receiver(m2m_changed, sender=Quiz.lessons.through, dispatch_uid="lesson_payload_quiz_links")
+@receiver(m2m_changed, sender=Assignment.lessons.through, dispatch_uid="lesson_payload_assignment_links")
+def invalidate_lesson_payloads_for_links(sender, instance, action, reverse, pk_set, **kwargs):
+    """Lesson links in either direction; prerequisites link lessons on both sides."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if sender is Lesson.prerequisites.through:
+        invalidate_lesson_payloads(instance.pk, *(pk_set or ()))
+    elif reverse:
+        invalidate_lesson_payloads(instance.pk)
+    elif action == "pre_clear":
+        invalidate_lesson_payloads(*instance.lessons.values_list("id", flat=True))
+    else:
+        invalidate_lesson_payloads(*(pk_set or ()))
+
+
 # Legacy CourseIntroduction sync — model may no longer exist; keep guarded.
 try:
     from .models import CourseIntroduction
@@ -66,3 +219,8 @@ if CourseIntroduction is not None:
 
             except Exception as e:
                 print(f"⚠️ Signal: Failed to sync introduction to course: {e}")
+
+
+@receiver([post_save, post_delete], sender=Question, dispatch_uid="quiz_answer_key_question")
+def invalidate_quiz_answer_key(sender, instance, **kwargs):
+    invalidate_answer_keys(instance.quiz_id)
@@ -9,10 +9,15 @@ students retake; the teacher list API also shows only the latest attempt per ass
 must match that scope (avoids inflated counts from superseded attempts).
 
 Projects: status='SUBMITTED' only (exclude RETURNED waiting on student; exclude GRADED).
+
+The *_counts_by_student_course() variants compute the same counts for every (student, course)
+pair in a set of courses with one GROUP BY query each, for roster pages.
 """
 from __future__ import annotations
 
-from django.db.models import Max, Q
+from collections import Counter
+
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
 
 from courses.permissions import courses_for_teacher, owned_or_member_q, user_is_course_member
 
@@ -123,3 +128,74 @@ def pending_project_submission_count_for_enrollment(student_user, course):
         project__course=course,
         status="SUBMITTED",
     ).count()
+
+
+def _pair_counts(rows, course_field: str) -> Counter:
+    return Counter({(row["student_id"], row[course_field]): row["n"] for row in rows})
+
+
+def pending_assignment_counts_by_student_course(course_ids) -> Counter:
+    """pending_assignment_count_for_enrollment() for every (student_id, course_id) in course_ids."""
+    from courses.models import AssignmentSubmission
+
+    rows = (
+        AssignmentSubmission.objects.filter(
+            assignment__lessons__course__in=course_ids,
+            status="submitted",
+            is_graded=False,
+        )
+        .values("student_id", course=F("assignment__lessons__course_id"))
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    return _pair_counts(rows, "course")
+
+
+def pending_assessment_counts_by_student_course(course_ids) -> dict[str, Counter]:
+    """
+    Test and exam counts ({'test': Counter, 'exam': Counter}) for every (student_id, course_id),
+    latest attempt per (student, assessment) only.
+    """
+    from courses.models import CourseAssessmentSubmission
+
+    latest_attempt = (
+        CourseAssessmentSubmission.objects.filter(
+            student=OuterRef("student"),
+            assessment=OuterRef("assessment"),
+        )
+        .values("student", "assessment")
+        .annotate(max_att=Max("attempt_number"))
+        .values("max_att")
+    )
+    rows = (
+        CourseAssessmentSubmission.objects.filter(
+            assessment__course__in=course_ids,
+            assessment__assessment_type__in=("test", "exam"),
+            status__in=["submitted", "auto_submitted"],
+            is_graded=False,
+        )
+        .filter(attempt_number=Subquery(latest_attempt))
+        .values("student_id", "assessment__assessment_type", course=F("assessment__course_id"))
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    counts = {"test": Counter(), "exam": Counter()}
+    for row in rows:
+        counts[row["assessment__assessment_type"]][(row["student_id"], row["course"])] = row["n"]
+    return counts
+
+
+def pending_project_counts_by_student_course(course_ids) -> Counter:
+    """pending_project_submission_count_for_enrollment() for every (student_id, course_id)."""
+    from courses.models import ProjectSubmission
+
+    rows = (
+        ProjectSubmission.objects.filter(
+            project__course__in=course_ids,
+            status="SUBMITTED",
+        )
+        .values("student_id", course=F("project__course_id"))
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    return _pair_counts(rows, "course")
@@ -0,0 +1,123 @@
+"""
+Tests for windowed book page delivery (keyset windows, page ETags, prefetch hints).
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from courses.models import BookPage, Course, Lesson, LessonMaterial
+from student.models import EnrolledCourse
+from users.models import StudentProfile
+
+User = get_user_model()
+
+
+class BookPageDeliveryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(
+            username='book-teacher@example.com',
+            email='book-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='book-teacher-uid',
+        )
+        course = Course.objects.create(
+            title='Book Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        lesson = Lesson.objects.create(course=course, title='Lesson 1', order=1, duration=30)
+        self.book = LessonMaterial.objects.create(title='Big Book', material_type='book')
+        self.book.lessons.add(lesson)
+        for number in range(1, 8):
+            BookPage.objects.create(
+                book_material=self.book,
+                page_number=number,
+                title=f'Page {number}',
+                content='x' * 500 if number == 1 else f'content {number}',
+            )
+
+        student = User.objects.create_user(
+            username='book-student@example.com',
+            email='book-student@example.com',
+            password='pass',
+            role='student',
+            firebase_uid='book-student-uid',
+        )
+        profile = StudentProfile.objects.create(user=student)
+        EnrolledCourse.objects.create(student_profile=profile, course=course, status='active')
+        self.client = APIClient()
+        self.client.force_authenticate(student)
+
+    def _pages_url(self, number=None):
+        base = f'/api/courses/books/{self.book.id}/pages/'
+        return f'{base}{number}/' if number else base
+
+    def test_keyset_window_walks_the_book(self):
+        first = self.client.get(self._pages_url(), {'limit': 3}).json()
+        self.assertEqual([p['page_number'] for p in first['pages']], [1, 2, 3])
+        self.assertTrue(first['pagination']['has_more'])
+        self.assertEqual(len(first['pages'][0]['content']), 203)  # 200-char preview + '...'
+
+        after = first['pagination']['next_after']
+        second = self.client.get(self._pages_url(), {'after': after, 'limit': 5}).json()
+        self.assertEqual([p['page_number'] for p in second['pages']], [4, 5, 6, 7])
+        self.assertFalse(second['pagination']['has_more'])
+        self.assertIsNone(second['pagination']['next_after'])
+
+    def test_page_etag_and_prefetch_hints(self):
+        response = self.client.get(self._pages_url(3), {'prefetch': 2})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['page']['content'], 'content 3')
+        self.assertEqual(body['navigation']['prefetch_pages'], [4, 5])
+        self.assertEqual((body['navigation']['previous_page'], body['navigation']['next_page']), (2, 4))
+        self.assertIn(f'/books/{self.book.id}/pages/4/>; rel=prefetch', response['Link'])
+
+        etag = response['ETag']
+        cached = self.client.get(self._pages_url(3), {'prefetch': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        page = BookPage.objects.get(book_material=self.book, page_number=3)
+        page.content = 'edited'
+        page.save()
+        fresh = self.client.get(self._pages_url(3), {'prefetch': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], etag)
+
+    def test_material_content_summary_mode(self):
+        body = self.client.get(
+            f'/api/courses/materials/{self.book.id}/content/', {'book_pages': 'summary'}
+        ).json()
+        self.assertEqual(body['total_pages'], 7)
+        self.assertEqual(len(body['pages']), 7)
+        self.assertFalse(body['pages_has_more'])
+        self.assertTrue(body['pages'][0]['content'].endswith('...'))
+
+    def test_summary_etag_revalidates_the_page(self):
+        window = self.client.get(self._pages_url(), {'limit': 3}).json()
+        for summary in window['pages']:
+            response = self.client.get(self._pages_url(summary['page_number']))
+            self.assertEqual(response['ETag'], summary['etag'])
+        etag = window['pages'][-1]['etag']
+        self.assertEqual(self.client.get(self._pages_url(3), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # The page response also renders the book and the prefetch hints.
+        self.assertNotEqual(self.client.get(self._pages_url(3), {'prefetch': 1})['ETag'], etag)
+        self.book.title = 'Bigger Book'
+        self.book.save()
+        self.assertEqual(self.client.get(self._pages_url(3), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_summary_mode_runs_no_separate_count(self):
+        url = f'/api/courses/materials/{self.book.id}/content/'
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, {'book_pages': 'summary'})
+        page_queries = [q['sql'] for q in ctx.captured_queries if 'courses_bookpage' in q['sql']]
+        self.assertEqual(len(page_queries), 1)
@@ -1,10 +1,15 @@
 """
 Tests for course membership permission helpers.
 """
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
-from courses.models import Course, CourseMembership
+from courses.models import Class, Course, CourseMembership, Lesson
 from courses.permissions import (
     user_is_course_owner,
     user_is_course_member,
@@ -12,6 +17,9 @@ from courses.permissions import (
     courses_for_teacher,
     ensure_owner_membership,
 )
+from courses.services.course_access import get_course_access, user_can_view_lesson
+from student.models import EnrolledCourse
+from users.models import StudentProfile
 
 User = get_user_model()
 
@@ -91,3 +99,74 @@ class CourseMembershipPermissionsTests(TestCase):
         self.assertIn(self.course.id, owned_ids)
         self.assertIn(self.course.id, co_ids)
         self.assertNotIn(self.course.id, other_ids)
+
+
+@override_settings(COURSE_ACCESS_CACHE_SECONDS=300)
+class CourseAccessIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = self._user('access-owner', 'teacher')
+        self.co_teacher = self._user('access-co', 'teacher')
+        self.student = self._user('access-student', 'student')
+        self.profile = StudentProfile.objects.create(user=self.student)
+        self.course = Course.objects.create(
+            title='Access Course',
+            description='Desc',
+            teacher=self.owner,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        self.lesson = Lesson.objects.create(course=self.course, title='Lesson 1', order=1, duration=30)
+
+    def _user(self, name, role):
+        return User.objects.create_user(
+            username=f'{name}@example.com',
+            email=f'{name}@example.com',
+            password='pass',
+            role=role,
+            firebase_uid=f'{name}-uid',
+        )
+
+    def test_owner_and_co_teacher_can_edit(self):
+        self.assertIn(self.course.id, get_course_access(self.owner).editable)
+        self.assertNotIn(self.course.id, get_course_access(self.co_teacher).editable)
+
+        CourseMembership.objects.create(course=self.course, user=self.co_teacher)
+        self.assertIn(self.course.id, get_course_access(self.co_teacher).editable)
+        self.assertTrue(user_can_view_lesson(self.co_teacher, self.lesson))
+
+    def test_teacher_change_invalidates_both_owners(self):
+        self.course.teacher = self.co_teacher
+        with patch('courses.signals.invalidate_course_access') as invalidate:
+            self.course.save()
+        invalidate.assert_any_call(self.co_teacher.id, self.owner.id)
+
+    def test_enrollment_changes_invalidate_cached_index(self):
+        self.assertFalse(user_can_view_lesson(self.student, self.lesson))
+
+        enrollment = EnrolledCourse.objects.create(
+            student_profile=self.profile, course=self.course, status='active'
+        )
+        self.assertTrue(user_can_view_lesson(self.student, self.lesson))
+
+        enrollment.status = 'dropped'
+        enrollment.save()
+        self.assertFalse(user_can_view_lesson(self.student, self.lesson))
+
+    def test_roster_changes_invalidate_cached_index(self):
+        klass = Class.objects.create(name='Roster', course=self.course, teacher=self.owner)
+        self.assertEqual(get_course_access(self.student).rostered, frozenset())
+
+        klass.students.add(self.student)
+        self.assertEqual(get_course_access(self.student).rostered, {self.course.id})
+
+        klass.students.clear()
+        self.assertEqual(get_course_access(self.student).rostered, frozenset())
+
+    def test_repeated_checks_hit_the_cache(self):
+        get_course_access(self.student)
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(3):
+                user_can_view_lesson(self.student, self.lesson)
+        self.assertEqual(len(ctx.captured_queries), 0)
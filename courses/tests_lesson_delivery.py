@@ -0,0 +1,114 @@
+"""
+Tests for the student lesson payload (cached static part + per-student overlay).
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course, Lesson, Question, Quiz, QuizAttempt
+from student.models import EnrolledCourse
+from users.models import StudentProfile
+
+User = get_user_model()
+
+
+class StudentLessonPayloadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(
+            username='payload-teacher@example.com',
+            email='payload-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='payload-teacher-uid',
+        )
+        course = Course.objects.create(
+            title='Payload Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        self.lesson = Lesson.objects.create(course=course, title='Lesson 1', order=1, duration=30)
+        self.quiz = Quiz.objects.create(title='Check-in')
+        self.quiz.lessons.add(self.lesson)
+        Question.objects.create(quiz=self.quiz, question_text='2+2?', order=1, type='short_answer', content={})
+        self.hidden = Quiz.objects.create(title='Hidden', visible_to_students=False)
+        self.hidden.lessons.add(self.lesson)
+
+        self.clients = {}
+        self.enrollments = {}
+        for name in ('ada', 'bob'):
+            user = User.objects.create_user(
+                username=f'{name}@example.com',
+                email=f'{name}@example.com',
+                password='pass',
+                role='student',
+                firebase_uid=f'payload-{name}-uid',
+            )
+            profile = StudentProfile.objects.create(user=user)
+            self.enrollments[name] = EnrolledCourse.objects.create(
+                student_profile=profile, course=course, status='active'
+            )
+            client = APIClient()
+            client.force_authenticate(user)
+            self.clients[name] = client
+        self.url = f'/api/courses/student/lessons/{self.lesson.id}/cbv/'
+
+    def _attempt(self, name, quiz):
+        enrollment = self.enrollments[name]
+        QuizAttempt.objects.create(
+            student=enrollment.student_profile.user,
+            quiz=quiz,
+            enrollment=enrollment,
+            attempt_number=1,
+            started_at=timezone.now(),
+            passed=True,
+        )
+
+    def test_overlay_is_per_student(self):
+        self._attempt('ada', self.hidden)
+
+        ada = self.clients['ada'].get(self.url).json()
+        bob = self.clients['bob'].get(self.url).json()
+
+        self.assertEqual([q['title'] for q in ada['quizzes']], ['Check-in', 'Hidden'])
+        self.assertEqual([q['title'] for q in bob['quizzes']], ['Check-in'])
+        self.assertTrue(ada['quizzes'][1]['has_passed'])
+        self.assertEqual(ada['quizzes'][1]['user_attempts_count'], 1)
+        self.assertEqual(bob['quiz']['user_attempts_count'], 0)
+        self.assertEqual(len(bob['quiz']['questions']), 1)
+
+    def test_static_part_is_cached_and_invalidated_on_edit(self):
+        self.clients['ada'].get(self.url)
+        with CaptureQueriesContext(connection) as cold:
+            cache.clear()
+            self.clients['bob'].get(self.url)
+        with CaptureQueriesContext(connection) as warm:
+            self.clients['bob'].get(self.url)
+        self.assertLess(len(warm), len(cold))
+
+        Question.objects.create(quiz=self.quiz, question_text='3+3?', order=2, type='short_answer', content={})
+        self.quiz.title = 'Renamed'
+        self.quiz.save()
+        body = self.clients['bob'].get(self.url).json()
+        self.assertEqual(body['quiz']['title'], 'Renamed')
+        self.assertEqual(len(body['quiz']['questions']), 2)
+
+    def test_reorder_invalidates_cached_payload(self):
+        self.assertEqual(self.clients['ada'].get(self.url).json()['order'], 1)
+        second = Lesson.objects.create(course=self.lesson.course, title='Lesson 2', order=2, duration=30)
+        teacher = APIClient()
+        teacher.force_authenticate(self.lesson.course.teacher)
+        response = teacher.put(
+            f'/api/courses/{self.lesson.course_id}/lessons/reorder/',
+            {'lessons': [{'id': str(self.lesson.id), 'order': '2'}, {'id': str(second.id), 'order': '1'}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.clients['ada'].get(self.url).json()['order'], 2)
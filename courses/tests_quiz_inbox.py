@@ -0,0 +1,115 @@
+"""
+Tests for the paginated teacher quiz submission inbox.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course, Lesson, Quiz, QuizAttempt
+from courses.services import quiz_inbox
+from student.models import EnrolledCourse
+from users.models import StudentProfile
+
+User = get_user_model()
+
+
+class QuizSubmissionInboxTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user(
+            username='inbox-teacher@example.com',
+            email='inbox-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='inbox-teacher-uid',
+        )
+        course = Course.objects.create(
+            title='Inbox Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        lesson = Lesson.objects.create(course=course, title='Lesson 1', order=1, duration=30)
+        quiz = Quiz.objects.create(title='Quiz 1')
+        quiz.lessons.add(lesson)
+
+        student = User.objects.create_user(
+            username='inbox-student@example.com',
+            email='inbox-student@example.com',
+            password='pass',
+            role='student',
+            firebase_uid='inbox-student-uid',
+            first_name='Ada',
+            last_name='Lovelace',
+        )
+        profile = StudentProfile.objects.create(user=student)
+        enrollment = EnrolledCourse.objects.create(student_profile=profile, course=course, status='active')
+
+        now = timezone.now()
+        self.graded = []
+        self.ungraded = []
+        for n in range(5):
+            graded = n % 2 == 0
+            attempt = QuizAttempt.objects.create(
+                student=student,
+                quiz=quiz,
+                enrollment=enrollment,
+                attempt_number=n + 1,
+                started_at=now - timedelta(hours=n, minutes=10),
+                completed_at=now - timedelta(hours=n),
+                score=80 if graded else None,
+                answers={'q': 'x' * 1000},
+            )
+            (self.graded if graded else self.ungraded).append(str(attempt.id))
+        # Still in progress: never listed.
+        QuizAttempt.objects.create(
+            student=student, quiz=quiz, enrollment=enrollment, attempt_number=6, started_at=now
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(teacher)
+        self.url = '/api/courses/teacher/quiz-submissions/inbox/'
+
+    def test_keyset_pages_ungraded_first_without_answers(self):
+        first = self.client.get(self.url, {'limit': 3}).json()
+        self.assertEqual(first['counts'], {'total': 5, 'ungraded': 2, 'graded': 3})
+        self.assertTrue(first['has_more'])
+        self.assertNotIn('answers', first['results'][0])
+        self.assertEqual(first['results'][0]['student_name'], 'Ada Lovelace')
+        self.assertEqual(first['results'][0]['time_spent'], 10)
+        self.assertIn(first['results'][0]['id'], first['results'][0]['detail_url'])
+
+        second = self.client.get(self.url, {'limit': 3, 'cursor': first['next_cursor']}).json()
+        self.assertFalse(second['has_more'])
+        ids = [row['id'] for row in first['results'] + second['results']]
+        # Newest first within each group; ungraded group before graded.
+        self.assertEqual(ids, self.ungraded + self.graded)
+
+    def test_status_filter_and_bad_cursor(self):
+        body = self.client.get(self.url, {'status': 'graded'}).json()
+        self.assertEqual([row['id'] for row in body['results']], self.graded)
+        self.assertTrue(all(row['is_graded'] for row in body['results']))
+
+        self.assertEqual(self.client.get(self.url, {'cursor': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'status': 'maybe'}).status_code, 400)
+
+    def test_malformed_ids_are_rejected(self):
+        for params in ({'quiz_id': 'not-a-uuid'}, {'course_id': '1'}, {'lesson_id': 'x'}, {'student_id': 'abc'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+        tampered = quiz_inbox.encode_cursor(False, timezone.now(), 'not-a-uuid')
+        self.assertEqual(self.client.get(self.url, {'cursor': tampered}).status_code, 400)
+
+    def test_graded_column_follows_score(self):
+        attempt = QuizAttempt.objects.get(pk=self.ungraded[0])
+        self.assertFalse(attempt.graded)
+        attempt.score = 90
+        attempt.save(update_fields=['score'])
+        attempt.refresh_from_db()
+        self.assertTrue(attempt.graded)
+        body = self.client.get(self.url, {'status': 'graded'}).json()
+        self.assertIn(self.ungraded[0], [row['id'] for row in body['results']])
@@ -0,0 +1,100 @@
+"""
+Tests for compiled quiz answer keys and atomic attempt numbering.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course, Lesson, Question, Quiz, QuizAttempt
+from courses.services import quiz_scoring
+from student.models import EnrolledCourse
+from users.models import StudentProfile
+
+User = get_user_model()
+
+
+class QuizScoringTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user(
+            username='scoring-teacher@example.com',
+            email='scoring-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='scoring-teacher-uid',
+        )
+        course = Course.objects.create(
+            title='Scoring Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        self.lesson = Lesson.objects.create(course=course, title='Lesson 1', order=1, duration=30)
+        self.quiz = Quiz.objects.create(title='Quiz 1', max_attempts=2, passing_score=50)
+        self.quiz.lessons.add(self.lesson)
+        self.q1 = Question.objects.create(
+            quiz=self.quiz, question_text='1?', order=1, type='short_answer', points=2,
+            content={'correct_answer': ' Paris '},
+        )
+        self.q2 = Question.objects.create(
+            quiz=self.quiz, question_text='2?', order=2, type='short_answer', points=3,
+            content={'correct_answer': '4'},
+        )
+
+        self.student = User.objects.create_user(
+            username='scoring-student@example.com',
+            email='scoring-student@example.com',
+            password='pass',
+            role='student',
+            firebase_uid='scoring-student-uid',
+        )
+        profile = StudentProfile.objects.create(user=self.student)
+        self.enrollment = EnrolledCourse.objects.create(student_profile=profile, course=course, status='active')
+
+    def test_score_is_pure_and_key_follows_question_edits(self):
+        key = quiz_scoring.get_answer_key(self.quiz.id)
+        answers = {str(self.q1.id): 'paris', str(self.q2.id): '5'}
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(quiz_scoring.get_answer_key(self.quiz.id), key)
+            result = quiz_scoring.score_answers(key, answers)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual((result.correct_answers, result.points_earned, result.score_percentage), (1, 2, 50))
+
+        self.q2.content = {'correct_answer': '5'}
+        self.q2.save()
+        result = quiz_scoring.score_answers(quiz_scoring.get_answer_key(self.quiz.id), answers)
+        self.assertEqual((result.correct_answers, result.points_earned), (2, 5))
+
+    def test_attempt_numbering_skips_taken_numbers_and_enforces_max(self):
+        # An attempt number already taken (e.g. after a deleted earlier attempt) is not reused.
+        QuizAttempt.objects.create(
+            student=self.student, quiz=self.quiz, enrollment=self.enrollment,
+            attempt_number=2, started_at=timezone.now(),
+        )
+        attempt = quiz_scoring.create_quiz_attempt(
+            student=self.student, quiz=self.quiz, enrollment=self.enrollment, started_at=timezone.now(),
+        )
+        self.assertEqual(attempt.attempt_number, 3)
+        with self.assertRaises(quiz_scoring.MaxAttemptsReached):
+            quiz_scoring.create_quiz_attempt(
+                student=self.student, quiz=self.quiz, enrollment=self.enrollment, started_at=timezone.now(),
+            )
+
+    def test_submit_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        url = f'/api/courses/student/lessons/{self.lesson.id}/quiz/submit/'
+        answers = {str(self.q1.id): 'PARIS', str(self.q2.id): '4'}
+
+        body = client.post(url, {'answers': answers}, format='json').json()
+        self.assertEqual(
+            (body['score'], body['correct_answers'], body['total_questions'], body['points_earned']),
+            (100, 2, 2, 5),
+        )
+        self.assertEqual(body['attempt_number'], 1)
+        self.assertEqual(client.post(url, {'answers': {}}, format='json').json()['attempt_number'], 2)
+        self.assertEqual(client.post(url, {'answers': answers}, format='json').status_code, 400)
@@ -0,0 +1,120 @@
+"""
+Tests for batched per-enrollment roster counters (teacher students master panel).
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseAssessment, CourseAssessmentSubmission
+from courses.services.roster_counters import build_roster_counters
+from courses.teacher_pending_counts import (
+    pending_exam_submission_count_for_enrollment,
+    pending_test_submission_count_for_enrollment,
+)
+from student.models import Conversation, EnrolledCourse, Message
+from users.models import StudentProfile
+
+User = get_user_model()
+
+
+class RosterCountersTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username='roster-teacher@example.com',
+            email='roster-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='roster-teacher-uid',
+        )
+        self.course = Course.objects.create(
+            title='Roster Course',
+            description='Desc',
+            teacher=self.teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        self.test = CourseAssessment.objects.create(course=self.course, assessment_type='test', title='Test 1')
+        self.exam = CourseAssessment.objects.create(course=self.course, assessment_type='exam', title='Exam 1')
+        self.enrollments = [self._enroll(n) for n in range(3)]
+
+    def _enroll(self, n):
+        user = User.objects.create_user(
+            username=f'roster-student-{n}@example.com',
+            email=f'roster-student-{n}@example.com',
+            password='pass',
+            role='student',
+            firebase_uid=f'roster-student-{n}-uid',
+        )
+        profile = StudentProfile.objects.create(user=user)
+        return EnrolledCourse.objects.create(student_profile=profile, course=self.course, status='active')
+
+    def _submit(self, enrollment, assessment, attempt, status='submitted', graded=False):
+        CourseAssessmentSubmission.objects.create(
+            student=enrollment.student_profile.user,
+            assessment=assessment,
+            enrollment=enrollment,
+            attempt_number=attempt,
+            status=status,
+            is_graded=graded,
+        )
+
+    def _pairs(self):
+        return [(e.student_profile.user_id, e.course_id) for e in self.enrollments]
+
+    def test_matches_per_enrollment_latest_attempt_semantics(self):
+        first, second, third = self.enrollments
+        # Superseded pending attempt does not count once a graded retake exists.
+        self._submit(first, self.test, 1)
+        self._submit(first, self.test, 2, graded=True)
+        self._submit(second, self.test, 1)
+        self._submit(second, self.exam, 1, status='auto_submitted')
+        self._submit(third, self.exam, 1, graded=True)
+        self._submit(third, self.exam, 2)
+
+        counters = build_roster_counters(self.teacher, self._pairs())
+        for enrollment in self.enrollments:
+            user = enrollment.student_profile.user
+            row = counters[(user.id, self.course.id)]
+            self.assertEqual(
+                row.pending_test_submission_count,
+                pending_test_submission_count_for_enrollment(user, self.course),
+            )
+            self.assertEqual(
+                row.pending_exam_submission_count,
+                pending_exam_submission_count_for_enrollment(user, self.course),
+            )
+        self.assertEqual(counters[self._pairs()[0]].pending_test_submission_count, 0)
+        self.assertEqual(counters[self._pairs()[2]].pending_exam_submission_count, 1)
+
+    def test_unread_counts_include_general_conversations(self):
+        enrollment = self.enrollments[0]
+        for course, recipient in ((self.course, 'parent'), (None, 'parent'), (None, 'student')):
+            conversation = Conversation.objects.create(
+                student_profile=enrollment.student_profile,
+                teacher=self.teacher,
+                recipient_type=recipient,
+                course=course,
+            )
+            Message.objects.create(
+                conversation=conversation, sender=enrollment.student_profile.user, content='hi'
+            )
+            Message.objects.create(conversation=conversation, sender=self.teacher, content='own')
+
+        row = build_roster_counters(self.teacher, self._pairs())[self._pairs()[0]]
+        self.assertEqual((row.parent_unread_count, row.student_unread_count), (2, 1))
+
+    def test_master_endpoint_queries_do_not_grow_with_roster(self):
+        client = APIClient()
+        client.force_authenticate(self.teacher)
+        with CaptureQueriesContext(connection) as small:
+            response = client.get('/api/courses/teacher/students/master/')
+        self.assertEqual(len(response.json()['students']), 3)
+
+        self.enrollments += [self._enroll(n) for n in range(3, 8)]
+        with CaptureQueriesContext(connection) as large:
+            response = client.get('/api/courses/teacher/students/master/')
+        self.assertEqual(len(response.json()['students']), 8)
+        self.assertEqual(len(large), len(small))
@@ -81,6 +81,7 @@ urlpatterns = [
     
     # Quiz grading endpoints
     path('teacher/quiz-submissions/', views.teacher_quiz_submissions, name='teacher_quiz_submissions'),
+    path('teacher/quiz-submissions/inbox/', views.teacher_quiz_submission_inbox, name='teacher_quiz_submission_inbox'),
     path('teacher/quiz-attempts/<uuid:attempt_id>/', views.quiz_attempt_details, name='quiz_attempt_details'),
     path('teacher/quiz-attempts/<uuid:attempt_id>/grade/', views.save_quiz_grade, name='save_quiz_grade'),
     
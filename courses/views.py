@@ -1,5 +1,7 @@
 from multiprocessing import parent_process
 from django.shortcuts import get_object_or_404
+from django.http import HttpResponseNotModified
+from django.urls import reverse
 from django.db import models, transaction
 from rest_framework import status, permissions
 from rest_framework.permissions import IsAuthenticated
@@ -22,9 +24,19 @@ from .permissions import (
     user_can_access_class,
     classes_for_teacher,
 )
+from .services.book_pages import etag_matches, page_etag, page_navigation, page_window
+from .services.course_access import get_course_access, user_can_view_lesson
+from .services.class_calendar import invalidate_calendar_cache
+from .services.lesson_delivery import (
+    apply_student_overlay,
+    get_static_payload,
+    invalidate_course_lesson_payloads,
+)
+from .services import quiz_inbox, quiz_scoring
 
 logger = logging.getLogger(__name__)
 from student.models import EnrolledCourse, StudentAttendance, StudentLessonProgress
+from studycoach.services.card_pool import schedule_pool_refresh
 from django.db.models import F, Sum, Max
 from courses.models import ClassEvent
 from .serializers import (
@@ -50,15 +62,7 @@ from .assessment_timing import (
     expire_submission_if_needed,
     is_submission_expired,
 )
-from .lesson_assessment_payloads import (
-    teacher_lesson_quiz_with_questions,
-    student_lesson_quiz_detail,
-    student_lesson_assignment_detail,
-)
-from .assessment_visibility import (
-    quiz_visible_for_student_payload,
-    assignment_visible_for_student_payload,
-)
+from .lesson_assessment_payloads import teacher_lesson_quiz_with_questions
 
 
 def delete_course_with_cleanup(course, skip_enrollment_check=False):
@@ -1373,13 +1377,9 @@ def _resync_course_enrollments_after_lesson_change(course):
     """
     Keep enrollment progression stable after lesson structure changes.
     """
-    enrollments = EnrolledCourse.objects.filter(
-        course=course,
-        status__in=list(LESSON_STRUCTURE_LOCKED_STATUSES),
-    ).select_related('current_lesson')
+    from student.services.lesson_structure_resync import resync_course_enrollments
 
-    for enrollment in enrollments:
-        enrollment.resync_after_lesson_structure_change()
+    resync_course_enrollments(course, LESSON_STRUCTURE_LOCKED_STATUSES)
 
 
 @api_view(['GET', 'POST'])
@@ -1542,29 +1542,39 @@ def reorder_lessons(request, course_id):
         serializer = LessonReorderSerializer(data=request.data)
         if serializer.is_valid():
             lessons_data = serializer.validated_data['lessons']
-            
-            # Step 1: Set all lessons to temporary negative orders to avoid constraint violations
-            lessons_to_update = []
-            for lesson_data in lessons_data:
-                lesson_id = lesson_data['id']
-                try:
-                    lesson = course.lessons.get(id=lesson_id)
-                    lessons_to_update.append((lesson, lesson_data['order']))
-                    # Set temporary negative order to avoid constraint violations
-                    lesson.order = -(lesson.id.int % 1000000)  # Use negative ID-based temp order
-                    lesson.save()
-                except Lesson.DoesNotExist:
+            new_orders = {str(lesson_data['id']): int(lesson_data['order']) for lesson_data in lessons_data}
+            lessons_to_update = list(
+                course.lessons.filter(id__in=list(new_orders)).only('id', 'order')
+            )
+            found_ids = {str(lesson.id) for lesson in lessons_to_update}
+            for lesson_id in new_orders:
+                if lesson_id not in found_ids:
                     return Response(
                         {'error': f'Lesson with id {lesson_id} not found in this course'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
-            
-            # Step 2: Now set the actual desired orders
-            for lesson, new_order in lessons_to_update:
-                lesson.order = new_order
-                lesson.save()
 
-            _resync_course_enrollments_after_lesson_change(course)
+            with transaction.atomic():
+                # Step 1: move the lessons out of the way in one UPDATE (unique course+order
+                # is checked per row, so a direct swap would collide).
+                max_order = course.lessons.aggregate(m=Max('order'))['m'] or 0
+                offset = max(max_order, max(new_orders.values())) + 1
+                course.lessons.filter(id__in=list(new_orders)).update(order=F('order') + offset)
+
+                # Step 2: set the desired orders in one bulk statement.
+                now = timezone.now()
+                for lesson in lessons_to_update:
+                    lesson.order = new_orders[str(lesson.id)]
+                    lesson.updated_at = now
+                Lesson.objects.bulk_update(lessons_to_update, ['order', 'updated_at'])
+
+                # bulk_update sends no post_save: run the Lesson receivers' invalidations here.
+                invalidate_course_lesson_payloads(course.id)
+                invalidate_calendar_cache()
+                for lesson in lessons_to_update:
+                    schedule_pool_refresh(lesson.id)
+
+                _resync_course_enrollments_after_lesson_change(course)
             
             # Return updated lessons (include module for master side)
             lessons = course.lessons.select_related('module').order_by('order')
@@ -2849,6 +2859,7 @@ def teacher_students_master(request):
         
         # Get all courses taught by the teacher
         courses = courses_for_teacher(request.user).annotate(
+            lessons_total=models.Count('lessons', distinct=True),
             enrolled_count=models.Count('student_enrollments', distinct=True),
             active_count=models.Count(
                 'student_enrollments',
@@ -2878,92 +2889,30 @@ def teacher_students_master(request):
                 'created_at': course.created_at.isoformat() if course.created_at else None,
                 'enrolled_count': course.enrolled_count,
                 'active_count': course.active_count,
-                'total_lessons': course.lessons.count()
+                'total_lessons': course.lessons_total
             }
             courses_data.append(course_data)
         
         # Prepare students data (summary view for master panel)
-        from student.models import Conversation, Message
         from communication.services.teacher_roster_sms import (
             build_teacher_sms_unread_pair_counts,
             sms_unread_fields_for_enrollment,
         )
+        from courses.services.roster_counters import build_roster_counters
 
+        enrollments = list(enrollments)
         sms_pair_counts = build_teacher_sms_unread_pair_counts(request.user)
+        # Pending work and unread messages for every enrollment in a few grouped queries
+        # (same semantics as dashboard counts).
+        roster_counters = build_roster_counters(
+            request.user,
+            [(enrollment.student_profile.user_id, enrollment.course_id) for enrollment in enrollments],
+        )
 
         students_data = []
         for enrollment in enrollments:
             student_user = enrollment.student_profile.user
-            
-            # Pending work per type for this enrollment (same semantics as dashboard counts)
-            from courses.teacher_pending_counts import (
-                pending_assignment_count_for_enrollment,
-                pending_exam_submission_count_for_enrollment,
-                pending_project_submission_count_for_enrollment,
-                pending_test_submission_count_for_enrollment,
-            )
-
-            assignment_count = pending_assignment_count_for_enrollment(
-                student_user, enrollment.course
-            )
-            pending_test_submission_count = pending_test_submission_count_for_enrollment(
-                student_user, enrollment.course
-            )
-            pending_exam_submission_count = pending_exam_submission_count_for_enrollment(
-                student_user, enrollment.course
-            )
-            pending_project_submission_count = pending_project_submission_count_for_enrollment(
-                student_user, enrollment.course
-            )
-            
-            # Get unread message counts for this student/course combination
-            # Prioritize course-specific conversations, but also include general conversations
-            parent_unread_count = 0
-            student_unread_count = 0
-            
-            try:
-                # Get course-specific conversations for this teacher, student, and course
-                course_conversations = Conversation.objects.filter(
-                    teacher=request.user,
-                    student_profile=enrollment.student_profile,
-                    course=enrollment.course
-                )
-                
-                # Count unread messages in course-specific conversations
-                parent_convs = course_conversations.filter(recipient_type='parent')
-                parent_unread_count = Message.objects.filter(
-                    conversation__in=parent_convs
-                ).exclude(sender=request.user).filter(read_at__isnull=True).count()
-                
-                student_convs = course_conversations.filter(recipient_type='student')
-                student_unread_count = Message.objects.filter(
-                    conversation__in=student_convs
-                ).exclude(sender=request.user).filter(read_at__isnull=True).count()
-                
-                # Also check general conversations (no course) for this student
-                # This ensures we catch messages from general conversations too
-                general_conversations = Conversation.objects.filter(
-                    teacher=request.user,
-                    student_profile=enrollment.student_profile,
-                    course__isnull=True
-                )
-                
-                general_parent_convs = general_conversations.filter(recipient_type='parent')
-                general_student_convs = general_conversations.filter(recipient_type='student')
-                
-                parent_unread_count += Message.objects.filter(
-                    conversation__in=general_parent_convs
-                ).exclude(sender=request.user).filter(read_at__isnull=True).count()
-                
-                student_unread_count += Message.objects.filter(
-                    conversation__in=general_student_convs
-                ).exclude(sender=request.user).filter(read_at__isnull=True).count()
-            except Exception as e:
-                # If there's an error (e.g., Message model not available), set to 0
-                import traceback
-                traceback.print_exc()
-                parent_unread_count = 0
-                student_unread_count = 0
+            counters = roster_counters[(student_user.id, enrollment.course_id)]
 
             try:
                 sms_unread_fields = sms_unread_fields_for_enrollment(
@@ -2998,22 +2947,22 @@ def teacher_students_master(request):
                 'completed_lessons_count': enrollment.completed_lessons_count,
                 'total_lessons_count': enrollment.total_lessons_count,
                 'last_accessed': enrollment.last_accessed.isoformat() if enrollment.last_accessed else None,
-                'pending_assignment_count': assignment_count,
-                'pending_test_submission_count': pending_test_submission_count,
-                'pending_exam_submission_count': pending_exam_submission_count,
-                'pending_project_submission_count': pending_project_submission_count,
-                'parent_unread_count': parent_unread_count,  # Add parent unread count
-                'student_unread_count': student_unread_count,  # Add student unread count
+                'pending_assignment_count': counters.pending_assignment_count,
+                'pending_test_submission_count': counters.pending_test_submission_count,
+                'pending_exam_submission_count': counters.pending_exam_submission_count,
+                'pending_project_submission_count': counters.pending_project_submission_count,
+                'parent_unread_count': counters.parent_unread_count,
+                'student_unread_count': counters.student_unread_count,
                 **sms_unread_fields,
             }
             students_data.append(student_data)
         
         # Get summary statistics
-        total_enrollments = enrollments.count()
-        active_students = enrollments.filter(status='active').count()
-        completed_students = enrollments.filter(status='completed').count()
+        total_enrollments = len(enrollments)
+        active_students = sum(1 for e in enrollments if e.status == 'active')
+        completed_students = sum(1 for e in enrollments if e.status == 'completed')
         at_risk_count = sum(1 for e in enrollments if e.is_at_risk)
-        unique_students = enrollments.values('student_profile__user').distinct().count()
+        unique_students = len({e.student_profile.user_id for e in enrollments})
         
         response_data = {
             'courses': courses_data,
@@ -3350,6 +3299,51 @@ def teacher_quiz_submissions(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def teacher_quiz_submission_inbox(request):
+    """
+    Paginated quiz submission inbox for the teacher's courses (ungraded first).
+    Rows are summaries without answers; open one via quiz_attempt_details.
+
+    Query params: cursor, limit, status (ungraded|graded), student_id, course_id, lesson_id, quiz_id
+    """
+    if request.user.role != 'teacher':
+        return Response(
+            {'error': 'Only teachers can access quiz submissions'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    status_filter = request.GET.get('status') or None
+    if status_filter and status_filter not in quiz_inbox.STATUSES:
+        return Response(
+            {'error': f"status must be one of: {', '.join(quiz_inbox.STATUSES)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        filters = quiz_inbox.parse_filters(request.GET)
+    except quiz_inbox.InvalidFilter as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    attempts = quiz_inbox.inbox_queryset(request.user, **filters)
+    try:
+        page = quiz_inbox.inbox_page(
+            attempts, status=status_filter, cursor=request.GET.get('cursor') or None, limit=limit
+        )
+    except quiz_inbox.InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    for row in page['results']:
+        row['detail_url'] = reverse('courses:quiz_attempt_details', args=[row['id']])
+    page['counts'] = quiz_inbox.inbox_counts(attempts)
+    return Response(page, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def quiz_attempt_details(request, attempt_id):
@@ -4101,7 +4095,7 @@ def student_course_lessons(request, course_id):
             lesson_id = str(progress.lesson.id)
             lesson_status_map[lesson_id] = progress.status
             
-            # Use is_completed property for consistency with _recalculate_from_progress_records
+            # Use is_completed property for consistency with the lesson-structure resync
             if progress.is_completed:
                 completed_lesson_ids.add(progress.lesson.id)
                 print(f"✅ Completed lesson: {progress.lesson.title} (Order: {progress.lesson.order}, Status: {progress.status})")
@@ -5062,236 +5056,18 @@ class StudentLessonDetailView(APIView):
         Returns comprehensive lesson data including materials, quiz, and class events
         """
         try:
-            
-            # Get the lesson
-            lesson = get_object_or_404(Lesson, id=lesson_id)
-           
-            
-            # Check if lesson has class event
-            try:
-                from courses.models import ClassEvent
-                class_events = ClassEvent.objects.filter(lesson=lesson)
-                print(f"🔍 Class events found: {class_events.count()}")
-                for event in class_events:
-                    print(f"🔍 Class event: {event.title} - {event.meeting_platform} - {event.meeting_link}")
-            except Exception as e:
-                print(f"❌ Error checking class events: {e}")
-            
-            # Check if lesson has materials
-            try:
-                from courses.models import LessonMaterial
-                materials = lesson.lesson_materials.all()
-                print(f"🔍 Materials found: {materials.count()}")
-                for material in materials:
-                    print(f"🔍 Material: {material.title} - {material.material_type}")
-            except Exception as e:
-                print(f"❌ Error checking materials: {e}")
-            
-            # Check teacher info
-            try:
-                teacher_name = lesson.course.teacher.get_full_name() if lesson.course.teacher else 'Unknown'
-                print(f"🔍 Teacher name: {teacher_name}")
-            except Exception as e:
-                print(f"❌ Error getting teacher name: {e}")
-            
-            # Serialize the lesson
-            print(f"🔍 About to serialize lesson with LessonDetailSerializer")
-            
-            # Pre-compute quiz / assignment payloads (supports multiple per lesson)
-            quizzes_data = []
-            try:
-                for quiz in lesson.quizzes.all().order_by('title', 'created_at'):
-                    if quiz_visible_for_student_payload(quiz, request.user):
-                        quizzes_data.append(student_lesson_quiz_detail(quiz, request.user))
-            except Exception:
-                quizzes_data = []
-            quiz_data = quizzes_data[0] if quizzes_data else None
+            lesson = get_object_or_404(Lesson.objects.select_related('course__teacher', 'module'), id=lesson_id)
 
-            assignments_data = []
-            try:
-                for assignment in lesson.assignments.all().order_by('title', 'created_at'):
-                    if assignment_visible_for_student_payload(assignment, request.user):
-                        assignments_data.append(student_lesson_assignment_detail(assignment, request.user))
-            except Exception:
-                assignments_data = []
-            assignment_data = assignments_data[0] if assignments_data else None
-            
-            # Pre-compute class event data (moved from serializer)
-            class_event_data = None
-            if lesson.type == 'live_class':
-                try:
-                    from courses.models import ClassEvent
-                    class_events = ClassEvent.objects.filter(lesson=lesson)
-                    
-                    if class_events.exists():
-                        class_event = class_events.first()
-                        now = timezone.now()
-                        
-                        # Calculate event status
-                        if class_event.start_time <= now <= class_event.end_time:
-                            event_status = 'ongoing'
-                        elif class_event.start_time > now:
-                            event_status = 'upcoming'
-                        else:
-                            event_status = 'completed'
-                        
-                        class_event_data = {
-                            'id': str(class_event.id),
-                            'title': class_event.title,
-                            'description': class_event.description or '',
-                            'start_time': class_event.start_time,
-                            'end_time': class_event.end_time,
-                            'platform': class_event.meeting_platform,
-                            'meeting_url': class_event.meeting_link,
-                            'status': event_status,
-                            'can_join_early': class_event.start_time - timedelta(minutes=5) <= now,
-                        }
-                except Exception as e:
-                    pass
-            
-            # Pre-compute materials data (moved from serializer)
-            materials_data = []
-            is_material_available = False
-            try:
-                from courses.models import LessonMaterial, VideoMaterial
-                # Use the many-to-many relationship properly
-                materials = lesson.lesson_materials.all()
-                
-                # Include materials for all lesson types if they exist
-                if materials.exists():
-                    # For live classes, set is_material_available flag
-                    if lesson.type == 'live_class':
-                        is_material_available = True
-                    
-                    materials_data = []
-                    for m in materials:
-                        material_data = {
-                            'id': str(m.id),
-                            'title': m.title,
-                            'description': m.description,
-                            'material_type': m.material_type,
-                            'file_url': m.file_url,
-                            'file_size': m.file_size,
-                            'file_size_mb': m.file_size_mb,
-                            'file_extension': m.file_extension,
-                            'order': m.order,
-                            'created_at': m.created_at,
-                            # Book-specific fields
-                            'total_pages': m.book_pages.count() if m.material_type == 'book' else None,
-                        }
-                        
-                        # For video materials, check if transcript is available to students
-                        # If transcript_available_to_students is False, skip adding this material to the list
-                        if m.material_type == 'video':
-                            try:
-                                video_material = VideoMaterial.objects.filter(lesson_material=m).first()
-                                if video_material:
-                                    # Skip this material if transcript is not available to students
-                                    if not video_material.transcript_available_to_students:
-                                        continue  # Skip adding this material to the list
-                                    
-                                    # Only include transcript if available to students
-                                    if video_material.transcript:
-                                        material_data['transcript'] = video_material.transcript
-                                        material_data['transcript_available_to_students'] = True
-                                        material_data['word_count'] = video_material.word_count
-                                # If no video_material found, still include the material (it might be a regular video without transcript)
-                            except Exception:
-                                # If there's an error checking video material, skip it to be safe
-                                continue
-                        
-                        materials_data.append(material_data)
-            except Exception as e:
-                pass
-            
-            # Get teacher info
-            teacher_name = None
-            try:
-                teacher_name = lesson.course.teacher.get_full_name() if lesson.course.teacher else 'Unknown'
-            except Exception:
-                pass
-            
-            # Get prerequisites
-            prerequisites_data = []
-            try:
-                prerequisites_data = list(lesson.prerequisites.values_list('id', flat=True))
-            except Exception:
-                pass
-            
-            # Pass all pre-computed data to serializer context
-            context = {
-                'request': request,
-                'quiz_data': quiz_data,
-                'quizzes_data': quizzes_data,
-                'assignment_data': assignment_data,
-                'assignments_data': assignments_data,
-                'class_event_data': class_event_data,
-                'materials_data': materials_data,
-                'is_material_available': is_material_available,
-                'teacher_name': teacher_name,
-                'prerequisites_data': prerequisites_data,
-            }
-            
-            serializer = LessonDetailSerializer(lesson, context=context)
-            serialized_data = serializer.data
-            
-            # Filter transcript from content if transcript_available_to_students is False
-            # Only include transcript if we can confirm it's available to students
-            if lesson.type == 'video_audio' and serialized_data.get('content'):
-                content = serialized_data.get('content', {})
-                if 'transcript' in content:
-                    # Check if transcript should be available
-                    # Find VideoMaterial linked to this lesson's materials
-                    transcript_available = False
-                    try:
-                        from courses.models import VideoMaterial
-                        # First, try to find VideoMaterial through lesson materials
-                        lesson_materials = lesson.lesson_materials.filter(material_type='video')
-                        
-                        for lm in lesson_materials:
-                            vm = VideoMaterial.objects.filter(lesson_material=lm).first()
-                            if vm and vm.video_url == lesson.video_url:
-                                # Only allow transcript if explicitly available to students
-                                if vm.transcript_available_to_students:
-                                    transcript_available = True
-                                break
-                        
-                        # If not found through materials, try direct video_url match
-                        if not transcript_available:
-                            video_materials = VideoMaterial.objects.filter(video_url=lesson.video_url)
-                            # Check all VideoMaterials - only allow if at least one has it available
-                            for vm in video_materials:
-                                if vm.transcript_available_to_students:
-                                    transcript_available = True
-                                    break
-                        
-                        # Remove transcript if not available to students
-                        if not transcript_available:
-                            content_copy = content.copy()
-                            content_copy.pop('transcript', None)
-                            serialized_data['content'] = content_copy
-                    except Exception:
-                        # If there's any error, remove transcript to be safe
-                        if 'transcript' in content:
-                            content_copy = content.copy()
-                            content_copy.pop('transcript', None)
-                            serialized_data['content'] = content_copy
-            
-            serialized_data['position_seconds'] = None
-            serialized_data['duration_seconds'] = None
-            serialized_data['completed_interactive_event_ids'] = []
+            # Shared per-lesson part is cached; attempts, submissions, hidden
+            # assessment visibility, class event status and playback progress
+            # are layered on per request.
+            static_payload = get_static_payload(lesson)
+            progress = None
             try:
                 progress = _student_lesson_progress_for_request(request, lesson)
-                if progress and isinstance(progress.progress_data, dict):
-                    serialized_data['position_seconds'] = progress.progress_data.get('position_seconds')
-                    serialized_data['duration_seconds'] = progress.progress_data.get('duration_seconds')
-                    raw_ids = progress.progress_data.get('completed_interactive_event_ids')
-                    if isinstance(raw_ids, list):
-                        serialized_data['completed_interactive_event_ids'] = [
-                            str(item) for item in raw_ids if item
-                        ]
             except Exception:
                 pass
+            serialized_data = apply_student_overlay(static_payload, request.user, progress)
 
             return Response(serialized_data)
             
@@ -5316,14 +5092,14 @@ class StudentLessonDetailView(APIView):
             
             # Get the lesson
             lesson = get_object_or_404(Lesson, id=lesson_id)
-            print(f"✅ Lesson found: {lesson.title} (ID: {lesson.id})")
+            logger.debug("Lesson found: %s (ID: %s)", lesson.title, lesson.id)
             
             # Get student profile and enrollment
             try:
                 student_profile = request.user.student_profile
-                print(f"✅ Student profile found: {student_profile}")
+                logger.debug("Student profile found: %s", student_profile)
             except Exception as e:
-                print(f"❌ Error getting student profile: {e}")
+                logger.error("Error getting student profile: %s", e)
                 return Response(
                     {'error': 'Student profile not found'},
                     status=status.HTTP_404_NOT_FOUND
@@ -5337,21 +5113,21 @@ class StudentLessonDetailView(APIView):
             ).first()
             
             if not enrollment:
-                print(f"❌ Student not enrolled in course: {lesson.course.title}")
+                logger.error("Student not enrolled in course: %s", lesson.course.title)
                 return Response(
                     {'error': 'You are not enrolled in this course'},
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            print(f"✅ Enrollment found: {enrollment}")
-            print(f"✅ Current lesson: {enrollment.current_lesson}")
-            print(f"✅ Completed lessons count: {enrollment.completed_lessons_count}")
+            logger.debug("Enrollment found: %s", enrollment)
+            logger.debug("Current lesson: %s", enrollment.current_lesson)
+            logger.debug("Completed lessons count: %s", enrollment.completed_lessons_count)
             
             # Mark lesson as complete using the model method
             success, message = enrollment.mark_lesson_complete(lesson)
             
             if success:
-                print(f"✅ Lesson marked as complete successfully: {message}")
+                logger.debug("Lesson marked as complete successfully: %s", message)
                 # Refresh enrollment from database to get recalculated values
                 enrollment.refresh_from_db()
                 
@@ -5368,16 +5144,14 @@ class StudentLessonDetailView(APIView):
                     'ready_for_next': True,
                 }, status=status.HTTP_200_OK)
             else:
-                print(f"❌ Failed to mark lesson as complete: {message}")
+                logger.error("Failed to mark lesson as complete: %s", message)
                 return Response(
                     {'error': message},
                     status=status.HTTP_400_BAD_REQUEST
                 )
                 
         except Exception as e:
-            print(f"❌ ERROR in StudentLessonDetailView.post: {str(e)}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
+            logger.exception("ERROR in StudentLessonDetailView.post: %s", e)
             return Response(
                 {'error': f'Failed to mark lesson complete: {str(e)}'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -5557,25 +5331,10 @@ class MaterialContentView(APIView):
             # Get the material
             material = get_object_or_404(LessonMaterialModel, id=material_id)
             
-            # Check if user has access to this material
-            # 1. Check if user is a teacher who owns the course containing this material
-            # 2. Check if user is enrolled as a student in a course that uses this material
-            has_access = False
-            
-            # Check teacher access - if user is teacher of any course that has lessons using this material
-            if material.lessons.filter(owned_or_member_q(request.user, 'course__')).exists():
-                has_access = True
-            
-            # Check student access - if user is enrolled in any course that has lessons using this material
-            if not has_access:
-                user_enrollments = EnrolledCourse.objects.filter(
-                    student_profile__user=request.user,
-                    status__in=['active', 'completed']
-                )
-                for enrollment in user_enrollments:
-                    if material.lessons.filter(course=enrollment.course).exists():
-                        has_access = True
-                        break
+            # Access: the user teaches (owner/co-teacher) or is enrolled (active/completed)
+            # in any course that has a lesson using this material.
+            material_course_ids = set(material.lessons.values_list('course_id', flat=True))
+            has_access = bool(material_course_ids & get_course_access(request.user).readable)
             
             if not has_access:
                 return Response(
@@ -5599,19 +5358,28 @@ class MaterialContentView(APIView):
             
             # Add type-specific content
             if material.material_type == 'book':
-                # Get all pages for the book
-                pages = BookPage.objects.filter(book_material=material).order_by('page_number')
-                response_data['total_pages'] = pages.count()
-                response_data['pages'] = [
-                    {
-                        'id': str(page.id),
-                        'page_number': page.page_number,
-                        'title': page.title,
-                        'content': page.content,
-                        'is_required': page.is_required,
-                        'created_at': page.created_at.isoformat()
-                    } for page in pages
-                ]
+                # ?book_pages=summary returns the first window of page summaries; readers then
+                # fetch pages individually from books/<id>/pages/<n>/ (ETag, prefetch hints).
+                if request.GET.get('book_pages') == 'summary':
+                    window = page_window(material)
+                    response_data['total_pages'] = window['total_pages']
+                    response_data['pages'] = window['pages']
+                    response_data['pages_has_more'] = window['has_more']
+                    response_data['pages_next_after'] = window['next_after']
+                else:
+                    # Get all pages for the book
+                    pages = list(BookPage.objects.filter(book_material=material).order_by('page_number'))
+                    response_data['total_pages'] = len(pages)
+                    response_data['pages'] = [
+                        {
+                            'id': str(page.id),
+                            'page_number': page.page_number,
+                            'title': page.title,
+                            'content': page.content,
+                            'is_required': page.is_required,
+                            'created_at': page.created_at.isoformat()
+                        } for page in pages
+                    ]
                 
             elif material.material_type == 'note':
                 # For notes, use description as content
@@ -5742,41 +5510,10 @@ def submit_quiz_attempt(request, lesson_id):
         
 
         
-        # Calculate next attempt number
-        existing_attempts = QuizAttempt.objects.filter(
-            student=request.user,
-            quiz=quiz
-        ).count()
-        next_attempt_number = existing_attempts + 1
-        
-        # Check if max attempts reached
-        if next_attempt_number > quiz.max_attempts:
-            return Response(
-                {'error': f'Maximum attempts ({quiz.max_attempts}) reached for this quiz'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Calculate score
-        questions = quiz.questions.all().order_by('order')
-        correct_answers = 0
-        total_points = 0
-        
-        for question in questions:
-            user_answer = answers.get(str(question.id))
-            if user_answer:
-                # 🔧 FIX: Normalize both answers by trimming whitespace and converting to lowercase
-                normalized_user_answer = str(user_answer).strip().lower()
-                normalized_correct_answer = str(question.content.get('correct_answer', '')).strip().lower()
-                
-                # Compare normalized answers
-                is_correct = normalized_user_answer == normalized_correct_answer
-                
-                if is_correct:
-                    correct_answers += 1
-                    total_points += question.points
-        
-        # Calculate percentage score
-        score_percentage = round((correct_answers / questions.count()) * 100) if questions.count() > 0 else 0
+        # Score against the compiled (cached) answer key
+        result = quiz_scoring.score_answers(quiz_scoring.get_answer_key(quiz.id), answers)
+        score_percentage = result.score_percentage
+        total_points = result.points_earned
         passed = score_percentage >= quiz.passing_score
         
         # Ensure time_taken is a valid number
@@ -5790,54 +5527,58 @@ def submit_quiz_attempt(request, lesson_id):
         # Calculate started_at based on time_taken
         started_at = timezone.now() - timezone.timedelta(seconds=time_taken)
         
-        # Create quiz attempt
-        quiz_attempt = QuizAttempt.objects.create(
-            student=request.user,
-            quiz=quiz,
-            enrollment=enrollment,
-            attempt_number=next_attempt_number,
-            started_at=started_at,
-            completed_at=timezone.now(),
-            score=score_percentage,
-            points_earned=total_points,
-            passed=passed,
-            answers=answers,
-            # Initialize teacher grading fields
-            is_teacher_graded=False,
-            teacher_grade_data={
-                'auto_calculated_score': score_percentage,
-                'auto_calculated_points': total_points,
-                'auto_calculated_passed': passed,
-                'teacher_comments': '',
-                'graded_questions': []
-            },
-            grading_history=[{
-                'date': timezone.now().isoformat(),
-                'action': 'auto_graded',
-                'score': score_percentage,
-                'points_earned': total_points,
-                'passed': passed
-            }]
-        )
+        # Create quiz attempt (numbered atomically; enforces max_attempts)
+        try:
+            quiz_attempt = quiz_scoring.create_quiz_attempt(
+                student=request.user,
+                quiz=quiz,
+                enrollment=enrollment,
+                started_at=started_at,
+                completed_at=timezone.now(),
+                score=score_percentage,
+                points_earned=total_points,
+                passed=passed,
+                answers=answers,
+                # Initialize teacher grading fields
+                is_teacher_graded=False,
+                teacher_grade_data={
+                    'auto_calculated_score': score_percentage,
+                    'auto_calculated_points': total_points,
+                    'auto_calculated_passed': passed,
+                    'teacher_comments': '',
+                    'graded_questions': []
+                },
+                grading_history=[{
+                    'date': timezone.now().isoformat(),
+                    'action': 'auto_graded',
+                    'score': score_percentage,
+                    'points_earned': total_points,
+                    'passed': passed
+                }]
+            )
+        except quiz_scoring.MaxAttemptsReached:
+            return Response(
+                {'error': f'Maximum attempts ({quiz.max_attempts}) reached for this quiz'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        next_attempt_number = quiz_attempt.attempt_number
         
         # Update enrollment quiz metrics
-        print(f"🔍 DEBUG: Updating enrollment quiz metrics for {enrollment.student_profile.user.email}")
-        print(f"🔍 DEBUG: Quiz score: {score_percentage}%, Passed: {passed}")
-        
         try:
             # Update the enrollment's quiz performance metrics
             success = enrollment.update_quiz_performance(quiz_score=score_percentage, passed=passed)
             if success:
-                print(f"✅ Successfully updated enrollment quiz metrics")
-                print(f"🔍 DEBUG: New average quiz score: {enrollment.average_quiz_score}")
-                print(f"🔍 DEBUG: Total quizzes taken: {enrollment.total_quizzes_taken}")
-                print(f"🔍 DEBUG: Total quizzes passed: {enrollment.total_quizzes_passed}")
+                logger.debug(
+                    "Enrollment %s quiz metrics: average %s, taken %s, passed %s",
+                    enrollment.pk,
+                    enrollment.average_quiz_score,
+                    enrollment.total_quizzes_taken,
+                    enrollment.total_quizzes_passed,
+                )
             else:
-                print(f"❌ Failed to update enrollment quiz metrics")
-        except Exception as e:
-            print(f"❌ Error updating enrollment quiz metrics: {e}")
-            import traceback
-            traceback.print_exc()
+                logger.warning("Failed to update quiz metrics for enrollment %s", enrollment.pk)
+        except Exception:
+            logger.exception("Error updating quiz metrics for enrollment %s", enrollment.pk)
         
         # Update lesson progress quiz performance
         try:
@@ -5848,19 +5589,16 @@ def submit_quiz_attempt(request, lesson_id):
                 defaults={'status': 'not_started'}
             )
             lesson_progress.update_quiz_performance(score_percentage, passed)
-            print(f"✅ Successfully updated lesson progress quiz performance")
-        except Exception as e:
-            print(f"❌ Error updating lesson progress quiz performance: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error updating lesson %s quiz performance for enrollment %s", lesson.pk, enrollment.pk)
         
         # Prepare response data
         response_data = {
             'attempt_id': str(quiz_attempt.id),
             'quiz_id': str(quiz.id),
             'score': score_percentage,
-            'correct_answers': correct_answers,
-            'total_questions': questions.count(),
+            'correct_answers': result.correct_answers,
+            'total_questions': result.total_questions,
             'points_earned': total_points,
             'passed': passed,
             'attempt_number': next_attempt_number,
@@ -5869,11 +5607,11 @@ def submit_quiz_attempt(request, lesson_id):
             'message': 'Quiz submitted successfully'
         }
         
-        print(f"Quiz attempt created: {response_data}")
+        logger.debug("Quiz attempt %s created: score %s, passed %s", quiz_attempt.id, score_percentage, passed)
         return Response(response_data, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        print(f"Error in submit_quiz_attempt: {e}")
+        logger.exception("Error in submit_quiz_attempt for lesson %s", lesson_id)
         return Response(
             {'error': 'Failed to submit quiz attempt', 'details': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -5954,15 +5692,14 @@ class TeacherDashboardAPIView(APIView):
 
     def get_monthly_revenue(self, teacher):
         """Calculate revenue for current month from course enrollments"""
-        from datetime import datetime
         from django.db.models import Sum
         
-        current_month = datetime.now().replace(day=1)
+        current_month = timezone.localdate().replace(day=1)
         
         # Get all enrollments for this month (assuming all enrollments are paid)
         monthly_enrollments = EnrolledCourse.objects.filter(
             course__in=courses_for_teacher(teacher),
-            enrollment_date__gte=current_month.date(),
+            enrollment_date__gte=current_month,
             status='active'  # Only count active enrollments
         )
         
@@ -6004,7 +5741,7 @@ class TeacherDashboardAPIView(APIView):
         from datetime import datetime, timedelta
         from django.db.models import Q
         
-        today = datetime.now().date()
+        today = timezone.localdate()
         end_of_week = today + timedelta(days=7)
         current_time = timezone.now()
         
@@ -6071,7 +5808,7 @@ class TeacherDashboardAPIView(APIView):
         # Student enrollments
         enrollments = EnrolledCourse.objects.filter(
             course__in=courses_for_teacher(teacher),
-            enrollment_date__gte=datetime.now().date() - timedelta(days=7)
+            enrollment_date__gte=timezone.localdate() - timedelta(days=7)
         ).select_related('student_profile__user', 'course')[:5]
         
         for enrollment in enrollments:
@@ -6096,7 +5833,7 @@ class TeacherDashboardAPIView(APIView):
         # Course reviews
         reviews = CourseReview.objects.filter(
             course__in=courses_for_teacher(teacher),
-            created_at__gte=datetime.now() - timedelta(days=7)
+            created_at__gte=timezone.now() - timedelta(days=7)
         ).select_related('course')[:5]
         
         for review in reviews:
@@ -6230,41 +5967,40 @@ class StudentCourseDashboardView(APIView):
         Get comprehensive student dashboard data
         """
         try:
-            print("=== Student Course Dashboard API ===")
             
             # Get student profile
             student_profile = getattr(request.user, 'student_profile', None)
-            print(f"Student profile: {student_profile}")
+            logger.debug("Student profile: %s", student_profile)
             
             # Initialize response data
             response_data = {}
             
             # 1. GET ENROLLED COURSES (exclude archived)
-            print("Step 1: Getting enrolled courses...")
+            logger.debug("Step 1: Getting enrolled courses...")
             enrolled_courses_data = self.get_enrolled_courses_data(student_profile)
             response_data['enrolled_courses'] = enrolled_courses_data['courses']
             response_data['total_enrolled'] = enrolled_courses_data['total']
             
             # 2. GET RECOMMENDED COURSES (with comprehensive data)
-            print("Step 2: Getting recommended courses with billing and classes...")
+            logger.debug("Step 2: Getting recommended courses with billing and classes...")
             recommended_courses_data = self.get_recommended_courses_data(student_profile, request.user)
             response_data['recommended_courses'] = recommended_courses_data['courses']
             response_data['total_recommendations'] = recommended_courses_data['total']
             
             # 3. GET ARCHIVED COURSES (enrolled courses where course is archived)
-            print("Step 3: Getting archived courses...")
+            logger.debug("Step 3: Getting archived courses...")
             archived_courses_data = self.get_archived_courses_data(student_profile)
             response_data['archived_courses'] = archived_courses_data['courses']
             response_data['total_archived'] = archived_courses_data['total']
             
             # 4. GET COMPLETED COURSES (completed enrollments where course is not archived)
-            print("Step 4: Getting completed courses...")
+            logger.debug("Step 4: Getting completed courses...")
             completed_courses_data = self.get_completed_courses_data(student_profile)
             response_data['completed_courses'] = completed_courses_data['courses']
             response_data['total_completed'] = completed_courses_data['total']
 
             # 5. GET DROPPED COURSES (dropped enrollments where course is not archived)
-            print("Step 5: Getting dropped courses...")
+            logger.debug("Step 5: Getting dropped courses...")
             dropped_courses_data = self.get_dropped_courses_data(student_profile)
             response_data['dropped_courses'] = dropped_courses_data['courses']
             response_data['total_dropped'] = dropped_courses_data['total']
@@ -6277,13 +6013,11 @@ class StudentCourseDashboardView(APIView):
                 'api_version': '2.0'
             }
             
-            print(f"Dashboard response complete: {len(response_data['enrolled_courses'])} enrolled, {len(response_data['recommended_courses'])} recommended, {len(response_data['archived_courses'])} archived, {len(response_data['completed_courses'])} completed, {len(response_data['dropped_courses'])} dropped")
+            logger.debug("Dashboard response complete: %s enrolled, %s recommended, %s archived, %s completed, %s dropped", len(response_data['enrolled_courses']), len(response_data['recommended_courses']), len(response_data['archived_courses']), len(response_data['completed_courses']), len(response_data['dropped_courses']))
             return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            print(f"CRITICAL ERROR in StudentCourseDashboardView: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("CRITICAL ERROR in StudentCourseDashboardView: %s", e)
             return Response(
                 {'error': 'Failed to fetch student dashboard data', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -6363,13 +6097,13 @@ class StudentCourseDashboardView(APIView):
                     courses_data.append(course_data)
                     
                 except Exception as course_error:
-                    print(f"ERROR processing enrolled course {course.title}: {course_error}")
+                    logger.error("ERROR processing enrolled course %s: %s", course.title, course_error)
                     continue
             
             return {'courses': courses_data, 'total': len(courses_data)}
             
         except Exception as e:
-            print(f"Error getting enrolled courses: {e}")
+            logger.error("Error getting enrolled courses: %s", e)
             return {'courses': [], 'total': 0}
     
     def get_recommended_courses_data(self, student_profile, user):
@@ -6448,13 +6182,13 @@ class StudentCourseDashboardView(APIView):
                     courses_data.append(course_data)
                     
                 except Exception as course_error:
-                    print(f"ERROR processing recommended course {course.title}: {course_error}")
+                    logger.error("ERROR processing recommended course %s: %s", course.title, course_error)
                     continue
             
             return {'courses': courses_data, 'total': len(courses_data)}
             
         except Exception as e:
-            print(f"Error getting recommended courses: {e}")
+            logger.error("Error getting recommended courses: %s", e)
             return {'courses': [], 'total': 0}
     
     def get_archived_courses_data(self, student_profile):
@@ -6518,13 +6252,13 @@ class StudentCourseDashboardView(APIView):
                     courses_data.append(course_data)
                     
                 except Exception as course_error:
-                    print(f"ERROR processing archived course {course.title}: {course_error}")
+                    logger.error("ERROR processing archived course %s: %s", course.title, course_error)
                     continue
             
             return {'courses': courses_data, 'total': len(courses_data)}
             
         except Exception as e:
-            print(f"Error getting archived courses: {e}")
+            logger.error("Error getting archived courses: %s", e)
             return {'courses': [], 'total': 0}
     
     def get_completed_courses_data(self, student_profile):
@@ -6591,13 +6325,13 @@ class StudentCourseDashboardView(APIView):
                     courses_data.append(course_data)
                     
                 except Exception as course_error:
-                    print(f"ERROR processing completed course {course.title}: {course_error}")
+                    logger.error("ERROR processing completed course %s: %s", course.title, course_error)
                     continue
             
             return {'courses': courses_data, 'total': len(courses_data)}
             
         except Exception as e:
-            print(f"Error getting completed courses: {e}")
+            logger.error("Error getting completed courses: %s", e)
             return {'courses': [], 'total': 0}
     
     def get_dropped_courses_data(self, student_profile):
@@ -6682,13 +6416,13 @@ class StudentCourseDashboardView(APIView):
                     courses_data.append(course_data)
 
                 except Exception as course_error:
-                    print(f"ERROR processing dropped course {course.title}: {course_error}")
+                    logger.error("ERROR processing dropped course %s: %s", course.title, course_error)
                     continue
 
             return {'courses': courses_data, 'total': len(courses_data)}
 
         except Exception as e:
-            print(f"Error getting dropped courses: {e}")
+            logger.error("Error getting dropped courses: %s", e)
             return {'courses': [], 'total': 0}
     
     def get_course_billing_data(self, course):
@@ -6735,7 +6469,7 @@ class StudentCourseDashboardView(APIView):
             }
             
         except Exception as e:
-            print(f"Error getting enrollment status: {e}")
+            logger.error("Error getting enrollment status: %s", e)
             return {
                 "is_enrolled": False,
                 "can_enroll": True,
@@ -7206,24 +6940,11 @@ class LessonMaterial(APIView):
     
     def _user_has_access(self, user, lesson):
         """Check if user has access to view this lesson"""
-        # Teachers can access lessons they created
-        if user.role == 'teacher' and user_is_course_member(user, lesson.course):
-            return True
-        
-        # Students can access lessons in courses they're enrolled in
-        if user.role == 'student':
-            from student.models import EnrolledCourse, StudentAttendance
-            return EnrolledCourse.objects.filter(
-                student_profile__user=user,
-                course=lesson.course,
-                status__in=['active', 'completed']
-            ).exists()
-        
-        return False
+        return user_can_view_lesson(user, lesson)
     
     def _user_can_modify(self, user, lesson):
         """Check if user can modify this lesson"""
-        return user.role == 'teacher' and user_is_course_member(user, lesson.course)
+        return user.role == 'teacher' and lesson.course_id in get_course_access(user).editable
 
 
 class BookPageView(APIView):
@@ -7240,8 +6961,9 @@ class BookPageView(APIView):
     def get(self, request, material_id, page_number=None):
         """
         GET: Retrieve book page(s)
-        - If page_number provided: Get specific page
-        - If no page_number: Get all pages at once
+        - If page_number provided: Get specific page (ETag / 304, ?prefetch=N next pages)
+        - If ?after= or ?limit= provided: Keyset window of page summaries
+        - Otherwise: Get all pages at once
         """
         try:
             # Get book material
@@ -7257,7 +6979,7 @@ class BookPageView(APIView):
                 )
             
             # Check access permissions (check if user has access to any lesson this material belongs to)
-            has_access = any(self._user_has_access(request.user, lesson) for lesson in book_material.lessons.all())
+            has_access = any(self._user_has_access(request.user, lesson) for lesson in book_material.lessons.only('id', 'course_id'))
             if not has_access:
                 return Response(
                     {'error': 'You do not have permission to access this book'},
@@ -7266,7 +6988,9 @@ class BookPageView(APIView):
             
             if page_number:
                 # Get specific page
-                return self._get_specific_page(book_material, page_number)
+                return self._get_specific_page(request, book_material, page_number)
+            elif 'after' in request.GET or 'limit' in request.GET:
+                return self._get_page_window(request, book_material)
             else:
                 # Get all pages at once - using direct query to avoid related_name issues
                 try:
@@ -7321,7 +7045,7 @@ class BookPageView(APIView):
                 )
             
             # Check if user can modify
-            can_modify = any(self._user_can_modify(request.user, lesson) for lesson in book_material.lessons.all())
+            can_modify = any(self._user_can_modify(request.user, lesson) for lesson in book_material.lessons.only('id', 'course_id'))
             if not can_modify:
                 return Response(
                     {'error': 'You do not have permission to modify this book'},
@@ -7392,7 +7116,7 @@ class BookPageView(APIView):
                 )
             
             # Check if user can modify
-            can_modify = any(self._user_can_modify(request.user, lesson) for lesson in book_material.lessons.all())
+            can_modify = any(self._user_can_modify(request.user, lesson) for lesson in book_material.lessons.only('id', 'course_id'))
             if not can_modify:
                 return Response(
                     {'error': 'You do not have permission to modify this page'},
@@ -7427,26 +7151,31 @@ class BookPageView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def _get_specific_page(self, book_material, page_number):
+    def _get_specific_page(self, request, book_material, page_number):
         """Get specific page with navigation info"""
         try:
-            page = BookPage.objects.get(
+            # Content is loaded only when the client's copy is stale.
+            page = BookPage.objects.defer('content').get(
                 book_material=book_material,
                 page_number=page_number
             )
-            
-            # Get navigation info
-            total_pages = BookPage.objects.filter(book_material=book_material).count()
-            has_next = BookPage.objects.filter(
-                book_material=book_material,
-                page_number=page_number + 1
-            ).exists()
-            has_previous = BookPage.objects.filter(
-                book_material=book_material,
-                page_number=page_number - 1
-            ).exists()
-            
-            return Response({
+        except BookPage.DoesNotExist:
+            return Response(
+                {'error': f'Page {page_number} not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            prefetch = int(request.GET['prefetch']) if 'prefetch' in request.GET else None
+        except ValueError:
+            prefetch = None
+        navigation = page_navigation(book_material, page_number, prefetch=prefetch)
+        etag = page_etag(page, book_material, navigation)
+        if etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            total_pages = navigation['total_pages']
+            response = Response({
                 'book': {
                     'id': str(book_material.id),
                     'title': book_material.title,
@@ -7466,80 +7195,56 @@ class BookPageView(APIView):
                 'navigation': {
                     'current_page': page_number,
                     'total_pages': total_pages,
-                    'has_next': has_next,
-                    'has_previous': has_previous,
-                    'next_page': page_number + 1 if has_next else None,
-                    'previous_page': page_number - 1 if has_previous else None
+                    'has_next': navigation['next_page'] is not None,
+                    'has_previous': navigation['previous_page'] is not None,
+                    'next_page': navigation['next_page'],
+                    'previous_page': navigation['previous_page'],
+                    'prefetch_pages': navigation['prefetch_pages'],
                 }
             }, status=status.HTTP_200_OK)
-            
-        except BookPage.DoesNotExist:
-            return Response(
-                {'error': f'Page {page_number} not found'},
-                status=status.HTTP_404_NOT_FOUND
+        
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        if navigation['prefetch_pages']:
+            response['Link'] = ', '.join(
+                '<%s>; rel=prefetch' % reverse(
+                    'courses:book_page_detail',
+                    kwargs={'material_id': book_material.id, 'page_number': number},
+                )
+                for number in navigation['prefetch_pages']
             )
+        return response
     
-    def _get_paginated_pages(self, request, book_material):
-        """Get paginated list of pages"""
-        from django.core.paginator import Paginator
-        
-        page_number = int(request.GET.get('page', 1))
-        per_page = int(request.GET.get('per_page', 10))
-        
+    def _get_page_window(self, request, book_material):
+        """Keyset window of page summaries: ?after=<page_number>&limit=<n>"""
         try:
-            # Get pages for this book material
-            pages = BookPage.objects.filter(book_material=book_material).order_by('page_number')
-            paginator = Paginator(pages, per_page)
-            page_obj = paginator.get_page(page_number)
-        except Exception as e:
+            after = int(request.GET.get('after', 0))
+            limit = int(request.GET['limit']) if 'limit' in request.GET else None
+        except ValueError:
             return Response(
-                {'error': f'Failed to paginate pages: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'after and limit must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
             )
         
-        pages_data = [{
-            'id': str(page.id),
-            'page_number': page.page_number,
-            'title': page.title,
-            'content': page.content[:200] + '...' if len(page.content) > 200 else page.content,
-            'image_url': page.image_url,
-            'audio_url': page.audio_url,
-            'is_required': page.is_required,
-            'created_at': page.created_at.isoformat()
-        } for page in page_obj]
-        
+        window = page_window(book_material, after=after, limit=limit)
         return Response({
             'book': {
                 'id': str(book_material.id),
                 'title': book_material.title,
                 'description': book_material.description
             },
-            'pages': pages_data,
+            'pages': window['pages'],
             'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
-                'per_page': per_page
+                'after': after,
+                'limit': window['limit'],
+                'has_more': window['has_more'],
+                'next_after': window['next_after'],
             }
         }, status=status.HTTP_200_OK)
     
     def _user_has_access(self, user, lesson):
         """Check if user has access to view this lesson"""
-        if user.role == 'teacher' and user_is_course_member(user, lesson.course):
-            return True
-        
-        if user.role == 'student':
-            from student.models import EnrolledCourse, StudentAttendance
-            enrolled = EnrolledCourse.objects.filter(
-                student_profile__user=user,
-                course=lesson.course,
-                status__in=['active', 'completed']
-            ).exists()
-            return enrolled
-        
-        return False
+        return user_can_view_lesson(user, lesson)
     
     def delete(self, request, material_id, page_number):
         """
@@ -7569,7 +7274,7 @@ class BookPageView(APIView):
                 )
             
             # Check if user can modify
-            can_modify = any(self._user_can_modify(request.user, lesson) for lesson in book_material.lessons.all())
+            can_modify = any(self._user_can_modify(request.user, lesson) for lesson in book_material.lessons.only('id', 'course_id'))
             if not can_modify:
                 return Response(
                     {'error': 'You do not have permission to delete this page'},
@@ -7591,7 +7296,7 @@ class BookPageView(APIView):
     
     def _user_can_modify(self, user, lesson):
         """Check if user can modify this lesson"""
-        return user.role == 'teacher' and user_is_course_member(user, lesson.course)
+        return user.role == 'teacher' and lesson.course_id in get_course_access(user).editable
 
 
 # ===== CLASSROOM API VIEWS =====
@@ -93,16 +93,20 @@ def notify_error_alert(
     )
 
     try:
-        from slack_notifications import send_system_notification
+        from slack_notifications import queue_slack_message, slack_service
 
-        send_system_notification(
-            title=f"{source} Error: {error_code}",
-            message=slack_body,
-            color="#e01e5a",
-            channel=alerts_channel,
+        title = f"{source} Error: {error_code}"
+        # Own connection when inside a transaction: the failing request may roll back.
+        queue_slack_message(
+            error_code,
+            alerts_channel,
+            title,
+            slack_service.format_system_message(title, slack_body),
+            outbox_channel="error_alert",
+            survive_rollback=True,
         )
     except Exception as slack_exc:
-        logger.warning("Failed to send error Slack alert: %s", slack_exc, exc_info=True)
+        logger.warning("Failed to queue error Slack alert: %s", slack_exc, exc_info=True)
 
 
 def notify_ai_failure(
@@ -0,0 +1,94 @@
+"""
+Query count, wall time and response size of the page-load endpoints on a
+synthetic dataset (backend.benchmarks), checked against QUERY_BUDGETS.
+
+    # Small and medium datasets, every endpoint:
+    python manage.py benchmark_endpoints
+
+    # One endpoint at every scale, JSON for comparing runs:
+    python manage.py benchmark_endpoints --scale small --scale medium --scale large \
+        --endpoint teacher_dashboard --json
+
+Each scale is seeded and measured inside a transaction that is rolled back, so
+the database is left as it was. Exits with an error when any endpoint exceeds
+its query budget or, with two or more scales, needs more extra queries at the
+largest scale than QUERY_GROWTH_BOUNDS allows; endpoints in KNOWN_QUERY_GROWTH
+are reported but do not fail (use --no-fail to only report). Refuses to run
+with DEBUG off unless --force is given.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.benchmarks import ENDPOINTS, SCALES, measure_scale, measurements_json, query_growth
+
+
+class Command(BaseCommand):
+    help = 'Benchmark dashboard and catalog endpoints on a seeded dataset and check query budgets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            action='append',
+            choices=sorted(SCALES),
+            help='Dataset size; repeat for several (default: small and medium)',
+        )
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            choices=[endpoint.name for endpoint in ENDPOINTS],
+            help='Only these endpoints (repeatable; default: all)',
+        )
+        parser.add_argument('--json', action='store_true', help='Print one JSON document instead of tables')
+        parser.add_argument('--no-fail', action='store_true', help='Report budget overruns without failing')
+        parser.add_argument('--force', action='store_true', help='Run even when DEBUG is off')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Seeds and rolls back data in the configured database; use --force with DEBUG off.')
+
+        results = {}
+        for scale in options['scale'] or ['small', 'medium']:
+            results[scale] = self._run_scale(scale, options['endpoint'], announce=not options['json'])
+
+        if options['json']:
+            self.stdout.write(measurements_json(results))
+        else:
+            self._print_report(results)
+
+        over = [m for measurements in results.values() for m in measurements if m.over_budget]
+        grown = [g for g in query_growth(results) if g.over_bound and not g.known]
+        if (over or grown) and not options['no_fail']:
+            problems = [f'{m.endpoint}@{m.scale} {m.queries}>{m.budget}' for m in over]
+            problems += [f'{g.endpoint} +{g.extra} queries {g.smaller}->{g.larger} (bound +{g.bound})' for g in grown]
+            raise CommandError('Query budget exceeded: ' + ', '.join(problems))
+
+    def _run_scale(self, scale: str, names, announce: bool):
+        def on_seeded(data):
+            if announce:
+                counts = ', '.join(f'{n} {name}' for name, n in data.counts.items())
+                self.stdout.write(f'Seeded {scale}: {counts}')
+
+        return measure_scale(scale, names, on_seeded=on_seeded)
+
+    def _print_report(self, results: dict):
+        for scale, measurements in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{scale}'))
+            self.stdout.write(f"  {'endpoint':<28} {'status':>6} {'queries':>8} {'budget':>7} {'wall ms':>9} {'db ms':>8} {'bytes':>9}")
+            for m in measurements:
+                line = (
+                    f'  {m.endpoint:<28} {m.status:>6} {m.queries:>8} {m.budget if m.budget is not None else "-":>7}'
+                    f' {m.wall_ms:>9.1f} {m.db_ms:>8.1f} {m.response_bytes:>9}'
+                )
+                self.stdout.write(self.style.ERROR(line) if m.over_budget else line)
+                if m.top_repeat and m.top_repeat[1] > 2:
+                    fp, repeats = m.top_repeat
+                    self.stdout.write(f'      {repeats}x {fp[:110]}')
+        growth = [g for g in query_growth(results) if g.over_bound]
+        if growth:
+            self.stdout.write(self.style.MIGRATE_HEADING('\nquery growth'))
+            for g in growth:
+                line = (
+                    f'  {g.endpoint:<28} {g.queries[0]} -> {g.queries[1]} queries'
+                    f' ({g.smaller} -> {g.larger}, bound +{g.bound}){" [known N+1]" if g.known else ""}'
+                )
+                self.stdout.write(self.style.WARNING(line) if g.known else self.style.ERROR(line))
@@ -0,0 +1,154 @@
+"""
+Measure cold-start cost: module import time and third-party client init time.
+
+    # Import profile of a fresh process (django.setup + URLconf), top 25 entries:
+    python manage.py startup_profile
+
+    # Also build the lazy clients (GCS, Slack, Vertex AI) and time each one:
+    python manage.py startup_profile --clients
+
+    # Profile the ASGI entry point instead of the URLconf, show 40 rows:
+    python manage.py startup_profile --target asgi --top 40
+
+Imports are measured in a child interpreter started with `-X importtime`, so
+modules already loaded by this command do not hide their cost.
+"""
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.clients import client_timings, warm_up_clients
+
+PHASE_MARKER = 'STARTUP_PROFILE_PHASES='
+
+CHILD_SCRIPT = r'''
+import json, os, sys, time
+from importlib import import_module
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", {settings_module!r})
+phases = {{}}
+t = time.perf_counter()
+import django
+django.setup()
+phases["django.setup"] = time.perf_counter() - t
+t = time.perf_counter()
+if {target!r} == "asgi":
+    import_module("backend.asgi")
+elif {target!r} == "wsgi":
+    import_module("backend.wsgi")
+else:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+phases[{target!r}] = time.perf_counter() - t
+print({marker!r} + json.dumps(phases))
+'''
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """(self_us, cumulative_us, module) rows from `python -X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header row
+        rows.append((self_us, cumulative_us, parts[2].strip()))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Report import time per module/package and init time per third-party client.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            choices=['urls', 'asgi', 'wsgi'],
+            default='urls',
+            help='What the child process loads after django.setup() (default: URLconf)',
+        )
+        parser.add_argument('--top', type=int, default=25, help='Rows per table (default 25)')
+        parser.add_argument('--clients', action='store_true', help='Also build and time the lazy clients')
+        parser.add_argument('--json', action='store_true', help='Print one JSON document instead of tables')
+
+    def handle(self, *args, **options):
+        report = self._profile_imports(options['target'])
+        if options['clients']:
+            report['clients'] = warm_up_clients()
+        else:
+            report['clients'] = client_timings()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, default=str))
+            return
+        self._print_report(report, options['top'])
+
+    def _profile_imports(self, target: str) -> dict:
+        script = CHILD_SCRIPT.format(
+            settings_module=os.environ.get('DJANGO_SETTINGS_MODULE', 'backend.settings'),
+            target=target,
+            marker=PHASE_MARKER,
+        )
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=str(settings.BASE_DIR),
+            capture_output=True,
+            text=True,
+        )
+        phases_line = next(
+            (line for line in result.stdout.splitlines() if line.startswith(PHASE_MARKER)), None
+        )
+        if result.returncode != 0 or phases_line is None:
+            tail = '\n'.join(
+                line for line in result.stderr.splitlines() if not line.startswith('import time:')
+            )[-2000:]
+            raise CommandError(f'Profiling process failed (exit {result.returncode}):\n{tail}')
+
+        rows = parse_importtime(result.stderr)
+        by_package = defaultdict(int)
+        for self_us, _cumulative_us, module in rows:
+            by_package[module.split('.')[0]] += self_us
+        return {
+            'phases': json.loads(phases_line[len(PHASE_MARKER):]),
+            'total_import_seconds': sum(row[0] for row in rows) / 1e6,
+            'packages': sorted(by_package.items(), key=lambda item: item[1], reverse=True),
+            'modules': sorted(
+                ((module, cumulative_us) for _self, cumulative_us, module in rows),
+                key=lambda item: item[1],
+                reverse=True,
+            ),
+        }
+
+    def _print_report(self, report: dict, top: int):
+        self.stdout.write(self.style.MIGRATE_HEADING('Startup phases (fresh process)'))
+        for phase, seconds in report['phases'].items():
+            self.stdout.write(f'  {phase:<30} {seconds * 1000:9.1f} ms')
+        self.stdout.write(f"  {'all imports (self time)':<30} {report['total_import_seconds'] * 1000:9.1f} ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nTop {top} packages by import time (self, summed)'))
+        for package, self_us in report['packages'][:top]:
+            self.stdout.write(f'  {package:<40} {self_us / 1000:9.1f} ms')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nTop {top} modules by cumulative import time'))
+        for module, cumulative_us in report['modules'][:top]:
+            self.stdout.write(f'  {module:<60} {cumulative_us / 1000:9.1f} ms')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nThird-party clients (backend.clients)'))
+        for entry in report['clients']:
+            if not entry['built']:
+                state = 'not built (lazy; use --clients)' if not entry['error'] else f"error: {entry['error']}"
+            elif not entry['configured']:
+                state = 'not configured'
+            else:
+                state = 'ready'
+            seconds = entry['init_seconds']
+            timing = f'{seconds * 1000:9.1f} ms' if seconds is not None else ' ' * 12
+            self.stdout.write(f"  {entry['name']:<12} {timing}  {state}")
@@ -56,11 +56,11 @@ class Command(BaseCommand):
         
         if success:
             self.stdout.write(
-                self.style.SUCCESS("✅ Contact notification sent successfully!")
+                self.style.SUCCESS("✅ Contact notification queued; the notification outbox delivers it in the background.")
             )
         else:
             self.stdout.write(
-                self.style.ERROR("❌ Failed to send contact notification")
+                self.style.ERROR("❌ Failed to queue contact notification")
             )
         
         # Clean up the test submission
@@ -78,11 +78,11 @@ class Command(BaseCommand):
         
         if success:
             self.stdout.write(
-                self.style.SUCCESS("✅ System notification sent successfully!")
+                self.style.SUCCESS("✅ System notification queued; the notification outbox delivers it in the background.")
             )
         else:
             self.stdout.write(
-                self.style.ERROR("❌ Failed to send system notification")
+                self.style.ERROR("❌ Failed to queue system notification")
             )
 
     def test_error_alerts_notification(self):
@@ -110,11 +110,11 @@ class Command(BaseCommand):
 
         if success:
             self.stdout.write(
-                self.style.SUCCESS("✅ Error alerts notification sent successfully!")
+                self.style.SUCCESS("✅ Error alerts notification queued; the notification outbox delivers it in the background.")
             )
         else:
             self.stdout.write(
-                self.style.ERROR("❌ Failed to send error alerts notification")
+                self.style.ERROR("❌ Failed to queue error alerts notification")
             )
 
     def test_enrollment_notification(self):
@@ -144,9 +144,9 @@ class Command(BaseCommand):
 
         if success:
             self.stdout.write(
-                self.style.SUCCESS("✅ Enrollment notification sent successfully!")
+                self.style.SUCCESS("✅ Enrollment notification queued; the notification outbox delivers it in the background.")
             )
         else:
             self.stdout.write(
-                self.style.ERROR("❌ Failed to send enrollment notification")
+                self.style.ERROR("❌ Failed to queue enrollment notification")
             )
@@ -0,0 +1,97 @@
+"""
+Drive the board and AI websocket consumers with simulated classroom clients
+(backend.ws_load) and report throughput, latency, DB writes and event-loop lag.
+
+    # 10 classrooms x (1 teacher + 20 students) for 10 seconds:
+    python manage.py ws_load_test
+
+    # 300 board clients plus 20 AI chat clients with 500 ms Gemini calls, as JSON:
+    python manage.py ws_load_test --classrooms 10 --students 29 --ai-clients 20 \
+        --gemini-latency-ms 500 --json
+
+Runs in-process with an in-memory channel layer and stubbed Firebase/Gemini.
+Seeded rows are rolled back afterwards. Refuses to run with DEBUG off unless
+--force is given.
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from backend.ws_load import LoadProfile, run_load
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Load-test the classroom board and AI websocket consumers in-process.'
+
+    def add_arguments(self, parser):
+        defaults = LoadProfile()
+        parser.add_argument('--classrooms', type=int, default=defaults.classrooms)
+        parser.add_argument('--students', type=int, default=defaults.students_per_classroom, help='Students per classroom')
+        parser.add_argument('--duration', type=float, default=defaults.duration_seconds, help='Seconds of traffic')
+        parser.add_argument('--presence-hz', type=float, default=defaults.presence_hz, help='Presence messages per client per second')
+        parser.add_argument('--board-hz', type=float, default=defaults.board_update_hz, help='Teacher board edits per second')
+        parser.add_argument('--ai-clients', type=int, default=defaults.ai_clients)
+        parser.add_argument('--ai-messages', type=int, default=defaults.ai_messages_per_client, help='Messages per AI client')
+        parser.add_argument('--gemini-latency-ms', type=float, default=defaults.gemini_latency_ms)
+        parser.add_argument('--json', action='store_true', help='Print one JSON document instead of a summary')
+        parser.add_argument('--force', action='store_true', help='Run even when DEBUG is off')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Seeds and rolls back data in the configured database; use --force with DEBUG off.')
+
+        profile = LoadProfile(
+            classrooms=options['classrooms'],
+            students_per_classroom=options['students'],
+            duration_seconds=options['duration'],
+            presence_hz=options['presence_hz'],
+            board_update_hz=options['board_hz'],
+            ai_clients=options['ai_clients'],
+            ai_messages_per_client=options['ai_messages'],
+            gemini_latency_ms=options['gemini_latency_ms'],
+        )
+        report = None
+        try:
+            with transaction.atomic():
+                report = run_load(profile)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if options['json']:
+            self.stdout.write(json.dumps(report.as_dict(), indent=2, default=str))
+            return
+        self._print_report(report)
+
+    def _print_report(self, report):
+        self.stdout.write(self.style.MIGRATE_HEADING('Websocket load test'))
+        self.stdout.write(f'  clients connected   {report.connected}/{report.clients}')
+        self.stdout.write(f'  duration            {report.duration_seconds:.1f} s')
+        self.stdout.write(
+            f'  messages            {report.messages_sent} sent ({report.sent_per_second:.0f}/s), '
+            f'{report.messages_received} delivered ({report.received_per_second:.0f}/s)'
+        )
+        for label, stats in (
+            ('fan-out latency', report.fanout_ms),
+            ('AI reply latency', report.ai_reply_ms),
+            ('event-loop lag', report.loop_lag_ms),
+        ):
+            if stats.get('count'):
+                self.stdout.write(
+                    f"  {label:<19} p50 {stats['p50']:.1f} ms, p95 {stats['p95']:.1f} ms, "
+                    f"p99 {stats['p99']:.1f} ms, max {stats['max']:.1f} ms ({stats['count']} samples)"
+                )
+        self.stdout.write(
+            f'  DB writes           {report.db_writes} ({report.db_writes_per_minute:.0f}/min), '
+            f'{report.db_queries} queries'
+        )
+        by_type = ', '.join(f'{name} {n}' for name, n in sorted(report.received_by_type.items()))
+        self.stdout.write(f'  delivered by type   {by_type}')
+        for error in report.errors[:10]:
+            self.stdout.write(self.style.ERROR(f'  {error}'))
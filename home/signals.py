@@ -0,0 +1,41 @@
+"""
+Home signals.
+
+- CourseReview / Course / EnrolledCourse changes invalidate the cached public landing payloads
+  (see backend/public_cache.py).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.public_cache import (
+    LANDING_NAMESPACE,
+    PROGRAM_NAMESPACE,
+    TESTIMONIALS_NAMESPACE,
+    bump_namespace,
+)
+from courses.models import Course, CourseReview
+from student.models import EnrolledCourse
+
+
+@receiver([post_save, post_delete], sender=CourseReview)
+def invalidate_public_cache_on_review_change(sender, instance, **kwargs):
+    """Testimonials and landing stats are built from reviews."""
+    bump_namespace(LANDING_NAMESPACE, TESTIMONIALS_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_public_cache_on_course_change(sender, instance, **kwargs):
+    """Featured courses, course counts and program course cards."""
+    bump_namespace(LANDING_NAMESPACE, TESTIMONIALS_NAMESPACE, PROGRAM_NAMESPACE)
+
+
+@receiver(post_save, sender=EnrolledCourse)
+def invalidate_landing_cache_on_enrollment(sender, instance, created, **kwargs):
+    """Featured course cards show enrollment counts; progress saves do not change them."""
+    if created:
+        bump_namespace(LANDING_NAMESPACE)
+
+
+@receiver(post_delete, sender=EnrolledCourse)
+def invalidate_landing_cache_on_unenrollment(sender, instance, **kwargs):
+    bump_namespace(LANDING_NAMESPACE)
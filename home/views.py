@@ -2,7 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Q, Avg
+from django.db.models import Q, Avg, Count, OuterRef, Subquery, IntegerField, FloatField
 from django.db import models
 from django.conf import settings
 from .models import ContactMethod, SupportTeamMember, FAQ, SupportHours, ContactSubmission, AssessmentSubmission, NewsletterSubscriber
@@ -16,6 +16,11 @@ from courses.models import CourseReview, Course
 from courses.serializers import FrontendCourseSerializer
 from courses.views import get_course_available_classes_data_helper, get_course_billing_data_helper
 from .course_recommendations import recommend_courses
+from backend.public_cache import (
+    LANDING_NAMESPACE,
+    TESTIMONIALS_NAMESPACE,
+    cached_public_response,
+)
 
 
 class ContactView(APIView):
@@ -295,6 +300,7 @@ class LandingPageView(APIView):
     """
     Landing Page CBV - Handles all landing page data
     GET: Retrieve comprehensive landing page data including testimonials, featured courses, etc.
+    Served from the public cache (ETag / 304); invalidated by home/signals.py.
     """
     permission_classes = [permissions.AllowAny]  # Public endpoint
     
@@ -303,6 +309,9 @@ class LandingPageView(APIView):
         GET: Retrieve complete landing page data
         Returns testimonials, featured courses, and other landing page sections
         """
+        return cached_public_response(request, LANDING_NAMESPACE, {}, self._build_landing_data)
+
+    def _build_landing_data(self):
         try:
             # Build comprehensive landing page data using separate methods
             landing_data = {
@@ -312,12 +321,12 @@ class LandingPageView(APIView):
                 'hero_section': self._get_hero_section_data(),
             }
             
-            return Response(landing_data, status=status.HTTP_200_OK)
+            return landing_data, status.HTTP_200_OK
             
         except Exception as e:
-            return Response(
+            return (
                 {'error': f'Error retrieving landing page data: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
     def _get_testimonials_data(self, limit=None):
@@ -369,9 +378,21 @@ class LandingPageView(APIView):
         """
         Get featured courses data for landing page
         """
+        from student.models import EnrolledCourse
+
+        # Rating and enrollment count as subqueries: one query for all featured courses.
+        avg_rating = CourseReview.objects.filter(
+            course=OuterRef('pk'), is_verified=True
+        ).order_by().values('course').annotate(avg=Avg('rating')).values('avg')
+        enrolled_count = EnrolledCourse.objects.filter(
+            course=OuterRef('pk')
+        ).order_by().values('course').annotate(n=Count('pk')).values('n')
         featured_courses = Course.objects.filter(
             featured=True,
             status='published'
+        ).annotate(
+            landing_avg_rating=Subquery(avg_rating, output_field=FloatField()),
+            landing_enrolled_count=Subquery(enrolled_count, output_field=IntegerField()),
         ).order_by('-created_at')[:6]
         
         courses = []
@@ -386,8 +407,8 @@ class LandingPageView(APIView):
                 'price': float(course.price),
                 'is_free': course.is_free,
                 'duration_weeks': course.duration_weeks,
-                'enrolled_students_count': course.enrolled_students_count,
-                'rating': self._get_course_average_rating(course),
+                'enrolled_students_count': course.landing_enrolled_count or 0,
+                'rating': round(float(course.landing_avg_rating), 1) if course.landing_avg_rating else 0.0,
                 'image_url': course.image_url,
                 'color': course.color,
                 'icon': course.icon,
@@ -400,17 +421,19 @@ class LandingPageView(APIView):
         """
         Get landing page statistics
         """
-        total_students = CourseReview.objects.values('student_name').distinct().count()
+        verified = Q(is_verified=True)
+        review_stats = CourseReview.objects.aggregate(
+            total_students=Count('student_name', distinct=True),
+            total_reviews=Count('id', filter=verified),
+            avg_rating=Avg('rating', filter=verified),
+        )
         total_courses = Course.objects.filter(status='published').count()
-        total_reviews = CourseReview.objects.filter(is_verified=True).count()
-        average_rating = CourseReview.objects.filter(is_verified=True).aggregate(
-            avg_rating=Avg('rating')
-        )['avg_rating'] or 0
+        average_rating = review_stats['avg_rating'] or 0
         
         return {
-            'total_students': total_students,
+            'total_students': review_stats['total_students'],
             'total_courses': total_courses,
-            'total_reviews': total_reviews,
+            'total_reviews': review_stats['total_reviews'],
             'average_rating': round(float(average_rating), 1),
             'satisfaction_rate': 98,  # Could be calculated from ratings
         }
@@ -439,18 +462,6 @@ class LandingPageView(APIView):
         else:
             return f"{words[0][0]}".upper()
     
-    def _get_course_average_rating(self, course):
-        """
-        Get average rating for a course
-        """
-        from django.db.models import Avg
-        avg_rating = CourseReview.objects.filter(
-            course=course,
-            is_verified=True
-        ).aggregate(avg_rating=Avg('rating'))['avg_rating']
-        
-        return round(float(avg_rating), 1) if avg_rating else 0.0
-
 
 class TestimonialsView(APIView):
     """
@@ -470,13 +481,27 @@ class TestimonialsView(APIView):
             # Get query parameters
             offset = int(request.query_params.get('offset', 0))
             limit = int(request.query_params.get('limit', 6))
-            
-            # Validate parameters
-            if offset < 0:
-                offset = 0
-            if limit < 1 or limit > 50:  # Max limit of 50
-                limit = 6
-            
+        except ValueError as e:
+            return Response(
+                {'error': 'Invalid offset or limit parameter', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Validate parameters
+        if offset < 0:
+            offset = 0
+        if limit < 1 or limit > 50:  # Max limit of 50
+            limit = 6
+        return cached_public_response(
+            request,
+            TESTIMONIALS_NAMESPACE,
+            {'offset': offset, 'limit': limit},
+            lambda: self._build_testimonials_page(offset, limit),
+        )
+
+    def _build_testimonials_page(self, offset, limit):
+        try:
+
             # Get featured reviews, ordered by display preference
             reviews = CourseReview.objects.filter(
                 is_featured=True,
@@ -526,24 +551,19 @@ class TestimonialsView(APIView):
                 }
                 testimonials.append(testimonial)
             
-            return Response({
+            return {
                 'testimonials': testimonials,
                 'count': len(testimonials),
                 'offset': offset,
                 'limit': limit,
                 'total': total_count,
                 'has_more': (offset + limit) < total_count
-            }, status=status.HTTP_200_OK)
+            }, status.HTTP_200_OK
             
-        except ValueError as e:
-            return Response(
-                {'error': 'Invalid offset or limit parameter', 'details': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
         except Exception as e:
-            return Response(
+            return (
                 {'error': 'Failed to retrieve testimonials', 'details': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
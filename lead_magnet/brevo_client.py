@@ -2,9 +2,13 @@
 Brevo (Sendinblue) client for lead magnet: add contact to list and send welcome email.
 Uses the official Brevo Python SDK (brevo-python) when available; falls back to requests.
 """
+import logging
+
 import requests
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 BREVO_API_BASE = "https://api.brevo.com/v3"
 
 # Optional: use Brevo SDK (pip install brevo-python)
@@ -18,7 +22,7 @@ except ImportError:
     BREVO_SDK_AVAILABLE = False
 
 
-def _get_api_key():
+def get_api_key():
     return getattr(settings, "BREVO_API_KEY", None) or ""
 
 
@@ -26,7 +30,7 @@ def _get_client():
     """Return a Brevo client instance if API key and SDK are available."""
     if not BREVO_SDK_AVAILABLE or not Brevo:
         return None
-    api_key = _get_api_key()
+    api_key = get_api_key()
     if not api_key:
         return None
     return Brevo(api_key=api_key, timeout=15.0)
@@ -38,13 +42,13 @@ def add_contact_to_list(email: str, first_name: str, list_id: int) -> bool:
     Uses Brevo SDK when available; otherwise uses requests.
     Returns True on success, False otherwise.
     """
-    api_key = _get_api_key()
+    api_key = get_api_key()
     if not api_key:
-        print("[Brevo] BREVO_API_KEY not set; skipping add to list")
+        logger.info("Brevo: BREVO_API_KEY not set; skipping add to list")
         return False
 
     client = _get_client()
-    print(f"[Brevo] add_contact_to_list: email={email} list_id={list_id} api_key_set={bool(api_key)} sdk={client is not None}")
+    logger.debug("Brevo: add_contact_to_list email=%s list_id=%s sdk=%s", email, list_id, client is not None)
     if client and hasattr(client, "contacts"):
         try:
             # Brevo SDK v4: create_contact(email=, attributes=, list_ids=, update_enabled=)
@@ -54,23 +58,23 @@ def add_contact_to_list(email: str, first_name: str, list_id: int) -> bool:
                 list_ids=[list_id],
                 update_enabled=True,
             )
-            print(f"[Brevo] Contact {email} added/updated and added to list {list_id}")
+            logger.info("Brevo: contact %s added/updated and added to list %s", email, list_id)
             return True
         except Exception as e:
             err_str = str(e).lower()
-            print(f"[Brevo] create_contact exception: {e}")
+            logger.warning("Brevo: create_contact failed: %s", e)
             if "400" in err_str or "already" in err_str or "duplicate" in err_str:
                 try:
                     # Brevo SDK v4: add_contact_to_list(list_id, request=...)
                     client.contacts.add_contact_to_list(list_id, request={"emails": [email]})
-                    print(f"[Brevo] Contact {email} added to list {list_id} (fallback)")
+                    logger.info("Brevo: contact %s added to list %s (fallback)", email, list_id)
                     return True
                 except Exception as add_e:
-                    print(f"[Brevo] add_contact_to_list failed: {add_e}")
+                    logger.warning("Brevo: add_contact_to_list failed: %s", add_e)
             return False
 
     # Fallback: requests
-    print("[Brevo] Using requests fallback for add_contact_to_list")
+    logger.debug("Brevo: using requests fallback for add_contact_to_list")
     try:
         create_url = f"{BREVO_API_BASE}/contacts"
         create_payload = {
@@ -82,18 +86,18 @@ def add_contact_to_list(email: str, first_name: str, list_id: int) -> bool:
         headers = {"api-key": api_key, "Content-Type": "application/json"}
         r = requests.post(create_url, json=create_payload, headers=headers, timeout=15)
         if r.status_code in (201, 204):
-            print(f"[Brevo] Contact {email} added/updated and added to list {list_id} (requests)")
+            logger.info("Brevo: contact %s added/updated and added to list %s (requests)", email, list_id)
             return True
         if r.status_code == 400:
             add_url = f"{BREVO_API_BASE}/contacts/lists/{list_id}/contacts/add"
             add_r = requests.post(add_url, json={"emails": [email]}, headers=headers, timeout=15)
             if add_r.status_code in (201, 204):
-                print(f"[Brevo] Contact {email} added to list {list_id} (requests fallback)")
+                logger.info("Brevo: contact %s added to list %s (requests fallback)", email, list_id)
                 return True
-        print(f"[Brevo] add contact/list failed: {r.status_code} {r.text}")
+        logger.warning("Brevo: add contact/list failed: %s %s", r.status_code, r.text)
         return False
     except Exception as e:
-        print(f"[Brevo] add_contact_to_list request failed: {e}")
+        logger.warning("Brevo: add_contact_to_list request failed: %s", e)
         return False
 
 
@@ -110,18 +114,18 @@ def send_welcome_email(
     Uses Brevo SDK when available; otherwise uses requests.
     Returns True on success, False otherwise.
     """
-    api_key = _get_api_key()
+    api_key = get_api_key()
     if not api_key:
-        print("[Brevo] BREVO_API_KEY not set; skipping welcome email")
+        logger.info("Brevo: BREVO_API_KEY not set; skipping welcome email")
         return False
 
     sender_email = getattr(settings, "BREVO_SENDER_EMAIL", None) or ""
     sender_name = getattr(settings, "BREVO_SENDER_NAME", "") or "Little Learners Tech"
     if not sender_email:
-        print("[Brevo] BREVO_SENDER_EMAIL not set; skipping welcome email")
+        logger.info("Brevo: BREVO_SENDER_EMAIL not set; skipping welcome email")
         return False
 
-    print(f"[Brevo] send_welcome_email: to={to_email} sender={sender_email} api_key_set={bool(api_key)}")
+    logger.debug("Brevo: send_welcome_email to=%s sender=%s", to_email, sender_email)
 
     html_content = (
         f"<p>Hi {first_name},</p>\n"
@@ -137,7 +141,7 @@ def send_welcome_email(
         try:
             # When using a template: only template_id + params (and sender, to). No subject/html_content — template controls those.
             if template_id:
-                print(f"[Brevo] Sending welcome email using Brevo template_id={template_id} (params: FIRSTNAME, PDF_URL, GUIDE_TITLE)")
+                logger.debug("Brevo: sending welcome email with template_id=%s", template_id)
                 client.transactional_emails.send_transac_email(
                     sender={"name": sender_name, "email": sender_email},
                     to=[{"email": to_email, "name": first_name}],
@@ -151,14 +155,14 @@ def send_welcome_email(
                     subject=f"Your guide: {guide_title}",
                     html_content=html_content,
                 )
-            print(f"[Brevo] Welcome email sent to {to_email} for guide {guide_title}")
+            logger.info("Brevo: welcome email sent to %s for guide %s", to_email, guide_title)
             return True
         except Exception as e:
-            print(f"[Brevo] send email (SDK) failed: {e}")
+            logger.warning("Brevo: send email (SDK) failed: %s", e)
             return False
 
     # Fallback: requests
-    print("[Brevo] Using requests fallback for send_welcome_email")
+    logger.debug("Brevo: using requests fallback for send_welcome_email")
     try:
         payload = {
             "sender": {"name": sender_name, "email": sender_email},
@@ -181,36 +185,52 @@ def send_welcome_email(
             timeout=15,
         )
         if r.status_code in (201, 200):
-            print(f"[Brevo] Welcome email sent to {to_email} for guide {guide_title} (requests)")
+            logger.info("Brevo: welcome email sent to %s for guide %s (requests)", to_email, guide_title)
             return True
-        print(f"[Brevo] send email failed: {r.status_code} {r.text}")
+        logger.warning("Brevo: send email failed: %s %s", r.status_code, r.text)
         return False
     except Exception as e:
-        print(f"[Brevo] send_welcome_email request failed: {e}")
+        logger.warning("Brevo: send_welcome_email request failed: %s", e)
         return False
 
 
 def on_lead_magnet_submit(guide, email: str, first_name: str) -> None:
     """
     Helper to run when a user submits the lead magnet form (name + email to download).
-    Adds the contact to the Brevo list (if configured) and sends the welcome email with PDF link.
+    Queues adding the contact to the Brevo list (if configured) and the welcome email
+    with PDF link on the notification outbox; both are sent by the background worker.
     Call this from your download/submit view after saving the submission.
     """
+    from communication.services.notification_outbox import enqueue_notification
+
     list_id = getattr(guide, "brevo_list_id", None) or getattr(settings, "BREVO_LIST_ID", None)
     pdf_url = getattr(guide, "pdf_url", None) or ""
-    print(f"[Brevo] on_lead_magnet_submit: guide={getattr(guide, 'slug', '?')} list_id={list_id} pdf_url={'set' if pdf_url else '(empty)'}")
+    logger.debug(
+        "Brevo: on_lead_magnet_submit guide=%s list_id=%s pdf_url=%s",
+        getattr(guide, "slug", "?"),
+        list_id,
+        "set" if pdf_url else "(empty)",
+    )
     if list_id:
-        add_contact_to_list(email=email, first_name=first_name, list_id=list_id)
+        enqueue_notification(
+            "brevo",
+            "contact",
+            {"email": email, "first_name": first_name, "list_id": int(list_id)},
+        )
     else:
-        print("[Brevo] No list_id (brevo_list_id or BREVO_LIST_ID); skipping add to list")
+        logger.info("Brevo: no list_id (brevo_list_id or BREVO_LIST_ID); skipping add to list")
     if pdf_url:
         template_id = getattr(guide, "brevo_template_id", None) or getattr(settings, "BREVO_WELCOME_TEMPLATE_ID", None)
-        send_welcome_email(
-            to_email=email,
-            first_name=first_name,
-            pdf_url=pdf_url,
-            guide_title=guide.title,
-            template_id=template_id,
+        enqueue_notification(
+            "brevo",
+            "welcome_email",
+            {
+                "email": email,
+                "first_name": first_name,
+                "pdf_url": pdf_url,
+                "guide_title": guide.title,
+                "template_id": template_id,
+            },
         )
     else:
-        print("[Brevo] No pdf_url on guide; skipping welcome email")
\ No newline at end of file
+        logger.info("Brevo: no pdf_url on guide; skipping welcome email")
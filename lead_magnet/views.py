@@ -1,6 +1,8 @@
 """
 API views for lead magnet: public guide by slug and submit (Brevo + welcome email).
 """
+import logging
+
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -11,6 +13,8 @@ from .models import LeadMagnet, LeadMagnetSubmission
 from .serializers import LeadMagnetPublicSerializer, LeadMagnetSubmitSerializer
 from .brevo_client import on_lead_magnet_submit
 
+logger = logging.getLogger(__name__)
+
 
 class LeadMagnetDetailView(APIView):
     """
@@ -35,16 +39,16 @@ class LeadMagnetSubmitView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request, slug):
-        print(f"[LeadMagnet] Submit request: slug={slug} body={request.data}")
+        logger.debug("Lead magnet: Submit request: slug=%s body=%s", slug, request.data)
 
         guide = get_object_or_404(LeadMagnet.objects.filter(is_active=True), slug=slug)
-        print(f"[LeadMagnet] Guide found: id={guide.pk} title={guide.title} pdf_url={getattr(guide, 'pdf_url', '') or '(empty)'} brevo_list_id={getattr(guide, 'brevo_list_id', None)}")
+        logger.debug("Lead magnet: Guide found: id=%s title=%s pdf_url=%s brevo_list_id=%s", guide.pk, guide.title, getattr(guide, 'pdf_url', '') or '(empty)', getattr(guide, 'brevo_list_id', None))
 
         serializer = LeadMagnetSubmitSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         first_name = serializer.validated_data["first_name"]
         email = serializer.validated_data["email"]
-        print(f"[LeadMagnet] Validated: email={email} first_name={first_name}")
+        logger.debug("Lead magnet: Validated: email=%s first_name=%s", email, first_name)
 
         submission, created = LeadMagnetSubmission.objects.get_or_create(
             lead_magnet=guide,
@@ -54,19 +58,19 @@ class LeadMagnetSubmitView(APIView):
         if not created:
             submission.first_name = first_name
             submission.save(update_fields=["first_name"])
-        print(f"[LeadMagnet] Submission {'created' if created else 'updated'}: id={submission.pk}")
+        logger.debug("Lead magnet: Submission %s: id=%s", 'created' if created else 'updated', submission.pk)
 
-        # Brevo: add to list + send welcome email with PDF link
-        print(f"[LeadMagnet] Calling on_lead_magnet_submit(guide={guide.slug}, email={email}, first_name={first_name})")
+        # Brevo: queue add to list + welcome email with PDF link (notification outbox)
+        logger.debug("Lead magnet: Calling on_lead_magnet_submit(guide=%s, email=%s, first_name=%s)", guide.slug, email, first_name)
         on_lead_magnet_submit(guide, email=email, first_name=first_name)
-        print("[LeadMagnet] on_lead_magnet_submit returned")
+        logger.debug("Lead magnet: on_lead_magnet_submit returned")
 
         pdf_url = guide.pdf_url or ""
 
         if getattr(guide, "email_only_delivery", False):
             pdf_url = ""  # Do not expose PDF URL so frontend does not offer instant download
 
-        print(f"[LeadMagnet] Returning success: pdf_url={pdf_url or '(empty)'}")
+        logger.debug("Lead magnet: Returning success: pdf_url=%s", pdf_url or '(empty)')
         return Response(
             {
                 "success": True,
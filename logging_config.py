@@ -3,13 +3,30 @@ Production-ready logging configuration for Django.
 
 Import as: ``from logging_config import LOGGING`` at the end of ``settings.py``.
 Uses project root (this file's parent) so it does not depend on django.conf.settings.
+
+All loggers propagate to the root logger, whose QueueingJsonHandler
+(backend/structured_logging.py) hands records to a background thread that
+writes JSON lines to stdout, so request threads never wait on log I/O.
+
+Environment:
+- LOG_LEVEL: root level (default INFO).
+- LOG_JSON: "false" for plain text lines (local development).
+- LOG_DEBUG_SAMPLE_RATE: fraction of DEBUG records kept (default 0.1).
+- LOG_TO_FILES: "true" to also write logs/django.log, logs/errors.log and
+  logs/assignment_submissions.log (synchronous; local debugging only).
 """
 import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
-os.makedirs(LOGS_DIR, exist_ok=True)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+LOG_TO_FILES = _env_flag("LOG_TO_FILES", False)
 
 LOGGING = {
     "version": 1,
@@ -24,60 +41,63 @@ LOGGING = {
             "style": "{",
         },
         "json": {
-            "format": '{"level": "%(levelname)s", "time": "%(asctime)s", "module": "%(module)s", "message": "%(message)s", "extra": %(extra)s}',
+            "()": "backend.structured_logging.JsonFormatter",
         },
     },
     "handlers": {
-        "file": {
-            "level": "INFO",
-            "class": "logging.FileHandler",
-            "filename": os.path.join(LOGS_DIR, "django.log"),
-            "formatter": "verbose",
-        },
-        "assignment_file": {
-            "level": "INFO",
-            "class": "logging.FileHandler",
-            "filename": os.path.join(LOGS_DIR, "assignment_submissions.log"),
-            "formatter": "json",
-        },
-        "console": {
+        "queue": {
             "level": "DEBUG",
-            "class": "logging.StreamHandler",
-            "formatter": "simple",
-        },
-        "error_file": {
-            "level": "ERROR",
-            "class": "logging.FileHandler",
-            "filename": os.path.join(LOGS_DIR, "errors.log"),
-            "formatter": "verbose",
+            "class": "backend.structured_logging.QueueingJsonHandler",
+            "json_output": _env_flag("LOG_JSON", True),
         },
     },
+    "root": {
+        "handlers": ["queue"],
+        "level": os.environ.get("LOG_LEVEL", "INFO").upper(),
+    },
     "loggers": {
         "django": {
-            "handlers": ["file", "console"],
             "level": "INFO",
-            "propagate": True,
         },
         "assignment_submission": {
-            "handlers": ["assignment_file", "console"],
             "level": "INFO",
-            "propagate": False,
         },
         # Keep SQL quiet unless you temporarily raise this to DEBUG for query debugging.
         "django.db.backends": {
-            "handlers": ["console"],
             "level": "WARNING",
-            "propagate": False,
         },
         "django.request": {
-            "handlers": ["error_file", "console"],
             "level": "ERROR",
-            "propagate": False,
         },
         "ai_service": {
-            "handlers": ["file", "console"],
             "level": "INFO",
-            "propagate": False,
         },
     },
 }
+
+if LOG_TO_FILES:
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    LOGGING["handlers"].update(
+        {
+            "file": {
+                "level": "INFO",
+                "class": "logging.FileHandler",
+                "filename": os.path.join(LOGS_DIR, "django.log"),
+                "formatter": "verbose",
+            },
+            "assignment_file": {
+                "level": "INFO",
+                "class": "logging.FileHandler",
+                "filename": os.path.join(LOGS_DIR, "assignment_submissions.log"),
+                "formatter": "json",
+            },
+            "error_file": {
+                "level": "ERROR",
+                "class": "logging.FileHandler",
+                "filename": os.path.join(LOGS_DIR, "errors.log"),
+                "formatter": "verbose",
+            },
+        }
+    )
+    LOGGING["root"]["handlers"] += ["file", "error_file"]
+    LOGGING["loggers"]["assignment_submission"]["handlers"] = ["assignment_file"]
@@ -1,10 +1,13 @@
 """
-Signals for marketing app to handle file cleanup.
+Signals for marketing app to handle file cleanup and public cache invalidation.
 """
-from django.db.models.signals import pre_delete
+from django.db.models.signals import m2m_changed, pre_delete, post_save, post_delete
 from django.dispatch import receiver
 from django.core.files.storage import default_storage
 import logging
+from backend.public_cache import PROGRAM_NAMESPACE, bump_namespace
+from billings.models import BillingPrice, BillingProduct
+from courses.models import Class
 from .models import Program
 
 logger = logging.getLogger(__name__)
@@ -24,8 +27,27 @@ def delete_program_hero_media(sender, instance, **kwargs):
             logger.error(f"Error deleting hero_media from GCS: {e}")
 
 
+@receiver([post_save, post_delete], sender=Program)
+def invalidate_program_cache(sender, instance, **kwargs):
+    """Drop cached ProgramBySlugView payloads when a program changes."""
+    bump_namespace(PROGRAM_NAMESPACE)
 
 
+@receiver([post_save, post_delete], sender=Class)
+def invalidate_program_cache_on_class_change(sender, instance, **kwargs):
+    """Program pages embed each course's available classes."""
+    bump_namespace(PROGRAM_NAMESPACE)
 
 
+@receiver(m2m_changed, sender=Class.students.through)
+def invalidate_program_cache_on_roster_change(sender, action, **kwargs):
+    """Available classes show each class's student count and open spots."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_namespace(PROGRAM_NAMESPACE)
 
+
+@receiver([post_save, post_delete], sender=BillingProduct)
+@receiver([post_save, post_delete], sender=BillingPrice)
+def invalidate_program_cache_on_billing_change(sender, instance, **kwargs):
+    """Program course cards embed the course's active Stripe prices."""
+    bump_namespace(PROGRAM_NAMESPACE)
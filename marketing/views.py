@@ -1,11 +1,11 @@
 from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404
 from django.http import Http404
 from .models import Program
 from .serializers import ProgramSerializer
+from backend.public_cache import PROGRAM_NAMESPACE, cached_public_response, request_params
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +20,7 @@ class ProgramBySlugView(APIView):
     URL: /api/marketing/programs/<slug>/
     Method: GET
     Authentication: None (public endpoint)
+    Served from the public cache (ETag / 304); invalidated by marketing/signals.py.
     """
     permission_classes = [AllowAny]
     
@@ -32,6 +33,14 @@ class ProgramBySlugView(APIView):
         - 404: Program not found or inactive
         - 500: Server error
         """
+        return cached_public_response(
+            request,
+            PROGRAM_NAMESPACE,
+            request_params(request, slug=slug),
+            lambda: self._build_program_data(request, slug),
+        )
+
+    def _build_program_data(self, request, slug):
         try:
             # Get program by slug (must be active)
             program = get_object_or_404(Program, slug=slug, is_active=True)
@@ -42,24 +51,24 @@ class ProgramBySlugView(APIView):
             # 2. Enrich each course with full details, billing, and classes
             serializer = ProgramSerializer(program, context={'request': request})
             
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return serializer.data, status.HTTP_200_OK
             
         except Http404:
             # get_object_or_404 raises Http404 if not found
-            return Response(
+            return (
                 {
                     'error': 'Program not found',
                     'details': f"No active program found with slug '{slug}'"
                 },
-                status=status.HTTP_404_NOT_FOUND
+                status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
             logger.error(f"Error fetching program by slug '{slug}': {e}", exc_info=True)
-            return Response(
+            return (
                 {
                     'error': 'Failed to fetch program',
                     'details': str(e)
                 },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
@@ -1,81 +1,38 @@
 """
 Slack notification system for contact form submissions and other events
+
+The module-level send_* helpers render the message blocks and queue them on
+the notification outbox (communication.services.notification_outbox); the
+Slack call itself runs on a background worker, never in the request.
 """
 import os
 import json
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
 from django.conf import settings
 from django.utils import timezone
 from decouple import config
 
+from backend.clients import get_client
+
 
 class SlackNotificationService:
     """
-    Service for sending Slack notifications
+    Renders Slack message blocks; sending goes through queue_slack_message.
     """
     
     def __init__(self):
-        self.client = None
-        self.channel = None
-        self._initialize_client()
-    
-    def _initialize_client(self):
-        """Initialize Slack client with bot token"""
-        try:
-            slack_token = config('SLACK_BOT_TOKEN', default='')
-            if not slack_token:
-                print("Warning: SLACK_BOT_TOKEN not found in environment variables")
-                return
-            
-            self.client = WebClient(token=slack_token)
-            self.channel = config('SLACK_CHANNEL', default='#general')
-            
-            # Test the connection
-            self.client.auth_test()
-            print(f"Slack client initialized successfully. Channel: {self.channel}")
-            
-        except SlackApiError as e:
-            print(f"Error initializing Slack client: {e.response['error']}")
-            self.client = None
-        except Exception as e:
-            print(f"Unexpected error initializing Slack client: {str(e)}")
-            self.client = None
-    
+        # Resolved lazily: building the service must not touch the Slack API.
+        self.channel = config('SLACK_CHANNEL', default='#general')
+
+    @property
+    def client(self):
+        """Shared WebClient from the backend.clients registry (None without SLACK_BOT_TOKEN)."""
+        return get_client('slack')
+
     def is_available(self):
         """Check if Slack notifications are available"""
         return self.client is not None
     
-    def send_contact_form_notification(self, contact_submission):
-        """
-        Send notification for new contact form submission
-        """
-        if not self.is_available():
-            print("Slack notifications not available")
-            return False
-        
-        try:
-            # Create the message
-            message = self._format_contact_message(contact_submission)
-            
-            # Send to Slack
-            response = self.client.chat_postMessage(
-                channel=self.channel,
-                text="New Contact Form Submission",
-                blocks=message
-            )
-            
-            print(f"Contact form notification sent successfully: {response['ts']}")
-            return True
-            
-        except SlackApiError as e:
-            print(f"Error sending Slack notification: {e.response['error']}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending Slack notification: {str(e)}")
-            return False
-    
-    def _format_contact_message(self, submission):
+    def format_contact_message(self, submission):
         """
         Format contact submission into Slack message blocks
         """
@@ -179,36 +136,7 @@ class SlackNotificationService:
         
         return blocks
     
-    def send_assessment_form_notification(self, assessment_submission):
-        """
-        Send notification for new assessment form submission
-        """
-        if not self.is_available():
-            print("Slack notifications not available")
-            return False
-        
-        try:
-            # Create the message
-            message = self._format_assessment_message(assessment_submission)
-            
-            # Send to Slack
-            response = self.client.chat_postMessage(
-                channel=self.channel,
-                text="New STEM Assessment Submission",
-                blocks=message
-            )
-            
-            print(f"Assessment form notification sent successfully: {response['ts']}")
-            return True
-            
-        except SlackApiError as e:
-            print(f"Error sending Slack notification: {e.response['error']}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending Slack notification: {str(e)}")
-            return False
-    
-    def _format_assessment_message(self, submission):
+    def format_assessment_message(self, submission):
         """
         Format assessment submission into Slack message blocks
         """
@@ -354,40 +282,7 @@ class SlackNotificationService:
         
         return blocks
     
-    def send_enrollment_form_notification(self, enrollment):
-        """
-        Send notification for a new course enrollment.
-        Routes to SLACK_ENROLLMENT (falls back to the default channel).
-        """
-        if not self.is_available():
-            print("Slack notifications not available")
-            return False
-
-        enrollment_channel = config('SLACK_ENROLLMENT', default=self.channel)
-        if not enrollment_channel:
-            print("Slack enrollment channel not configured")
-            return False
-
-        try:
-            blocks = self._format_enrollment_message(enrollment)
-
-            response = self.client.chat_postMessage(
-                channel=enrollment_channel,
-                text="New Course Enrollment",
-                blocks=blocks
-            )
-
-            print(f"Enrollment notification sent successfully: {response['ts']}")
-            return True
-
-        except SlackApiError as e:
-            print(f"Error sending enrollment notification: {e.response['error']}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending enrollment notification: {str(e)}")
-            return False
-
-    def _format_enrollment_message(self, enrollment):
+    def format_enrollment_message(self, enrollment):
         """
         Format an EnrolledCourse into Slack message blocks
         """
@@ -489,92 +384,111 @@ class SlackNotificationService:
 
         return blocks
 
-    def send_system_notification(self, title, message, color="#36a64f", channel=None):
+    def format_system_message(self, title, message):
         """
-        Send a general system notification.
-        channel: optional override (e.g. SLACK_ERROR_ALERTS); defaults to SLACK_CHANNEL.
+        Format a general system notification into Slack message blocks
         """
-        if not self.is_available():
-            print("Slack notifications not available")
-            return False
-
-        target_channel = (channel or self.channel or "").strip()
-        if not target_channel:
-            print("Slack channel not configured")
-            return False
-        
-        try:
-            blocks = [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": title
-                    }
-                },
-                {
-                    "type": "section",
-                    "text": {
+        return [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": title
+                }
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": message
+                }
+            },
+            {
+                "type": "context",
+                "elements": [
+                    {
                         "type": "mrkdwn",
-                        "text": message
+                        "text": f"Time: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')} UTC"
                     }
-                },
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"Time: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')} UTC"
-                        }
-                    ]
-                }
-            ]
-            
-            response = self.client.chat_postMessage(
-                channel=target_channel,
-                text=title,
-                blocks=blocks
-            )
-            
-            print(f"System notification sent successfully: {response['ts']}")
-            return True
-            
-        except SlackApiError as e:
-            print(f"Error sending system notification: {e.response['error']}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending system notification: {str(e)}")
-            return False
+                ]
+            }
+        ]
 
 
 # Global instance
 slack_service = SlackNotificationService()
 
 
+def default_channel():
+    """SLACK_CHANNEL, resolved without touching the Slack API."""
+    return (config('SLACK_CHANNEL', default='#general') or '').strip()
+
+
+def enrollment_channel():
+    """SLACK_ENROLLMENT, falling back to the default channel."""
+    return (config('SLACK_ENROLLMENT', default='') or '').strip() or default_channel()
+
+
+def queue_slack_message(kind, channel, text, blocks, *, outbox_channel='slack', survive_rollback=False):
+    """
+    Queue a pre-rendered Slack message on the notification outbox.
+    Delivery (rate limiting, retries, circuit breaker) happens in the background.
+    """
+    from communication.services.notification_outbox import enqueue_notification
+
+    enqueue_notification(
+        outbox_channel,
+        kind,
+        {'channel': channel, 'text': text, 'blocks': blocks},
+        survive_rollback=survive_rollback,
+    )
+    return True
+
+
 def send_contact_notification(contact_submission):
     """
-    Convenience function to send contact form notification
+    Convenience function to queue a contact form notification
     """
-    return slack_service.send_contact_form_notification(contact_submission)
+    return queue_slack_message(
+        'contact_form',
+        default_channel(),
+        "New Contact Form Submission",
+        slack_service.format_contact_message(contact_submission),
+    )
 
 
 def send_system_notification(title, message, color="#36a64f", channel=None):
     """
-    Convenience function to send system notification.
+    Convenience function to queue a system notification.
     channel: optional override (e.g. SLACK_ERROR_ALERTS for error alerts).
     """
-    return slack_service.send_system_notification(title, message, color, channel=channel)
+    return queue_slack_message(
+        'system',
+        (channel or default_channel()).strip(),
+        title,
+        slack_service.format_system_message(title, message),
+    )
 
 
 def send_assessment_notification(assessment_submission):
     """
-    Convenience function to send assessment form notification
+    Convenience function to queue an assessment form notification
     """
-    return slack_service.send_assessment_form_notification(assessment_submission)
+    return queue_slack_message(
+        'assessment_form',
+        default_channel(),
+        "New STEM Assessment Submission",
+        slack_service.format_assessment_message(assessment_submission),
+    )
 
 
 def send_enrollment_notification(enrollment):
     """
-    Convenience function to send course enrollment notification
+    Convenience function to queue a course enrollment notification
     """
-    return slack_service.send_enrollment_form_notification(enrollment)
+    return queue_slack_message(
+        'enrollment',
+        enrollment_channel(),
+        "New Course Enrollment",
+        slack_service.format_enrollment_message(enrollment),
+    )
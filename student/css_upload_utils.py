@@ -11,6 +11,8 @@ from django.core.files.base import ContentFile
 from django.conf import settings
 import logging
 
+from backend.clients import get_client
+
 logger = logging.getLogger(__name__)
 
 # Try to import GCS client for direct uploads (for overwrite capability)
@@ -140,23 +142,10 @@ def upload_css_to_gcp(css_content, title=None, snippet_id=None):
         if snippet_id and GCS_CLIENT_AVAILABLE:
             print(f"[upload_css_to_gcp] Using GCS client directly for overwrite (snippet_id provided)")
             try:
-                # Get GCS client
-                if hasattr(settings, 'GS_CREDENTIALS') and settings.GS_CREDENTIALS:
-                    if isinstance(settings.GS_CREDENTIALS, str):
-                        # Path to credentials file
-                        client = storage.Client.from_service_account_json(
-                            settings.GS_CREDENTIALS,
-                            project=settings.GS_PROJECT_ID
-                        )
-                    else:
-                        # Credentials object
-                        client = storage.Client(
-                            credentials=settings.GS_CREDENTIALS,
-                            project=settings.GS_PROJECT_ID
-                        )
-                else:
-                    # Use default credentials
-                    client = storage.Client(project=settings.GS_PROJECT_ID)
+                # Shared process-wide GCS client (backend.clients)
+                client = get_client('gcs')
+                if client is None:
+                    raise RuntimeError("GCS client not available")
                 
                 bucket = client.bucket(settings.GS_BUCKET_NAME)
                 blob = bucket.blob(storage_path)
@@ -302,23 +291,10 @@ def update_css_in_gcp(css_file_url, css_content):
         # Use GCS client directly to ensure overwrite (same pattern as upload_css_to_gcp)
         print(f"[update_css_in_gcp] Using GCS client directly for overwrite")
         try:
-            # Get GCS client
-            if hasattr(settings, 'GS_CREDENTIALS') and settings.GS_CREDENTIALS:
-                if isinstance(settings.GS_CREDENTIALS, str):
-                    # Path to credentials file
-                    client = storage.Client.from_service_account_json(
-                        settings.GS_CREDENTIALS,
-                        project=settings.GS_PROJECT_ID
-                    )
-                else:
-                    # Credentials object
-                    client = storage.Client(
-                        credentials=settings.GS_CREDENTIALS,
-                        project=settings.GS_PROJECT_ID
-                    )
-            else:
-                # Use default credentials
-                client = storage.Client(project=settings.GS_PROJECT_ID)
+            # Shared process-wide GCS client (backend.clients)
+            client = get_client('gcs')
+            if client is None:
+                raise RuntimeError("GCS client not available")
             
             bucket = client.bucket(settings.GS_BUCKET_NAME)
             blob = bucket.blob(file_path)
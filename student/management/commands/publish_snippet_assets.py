@@ -0,0 +1,24 @@
+"""
+Publish code snippet assets whose deferred publish is due (see
+student.services.snippet_assets). Picks up publishes left pending when a
+process stopped before its background publisher ran.
+
+    # Run from cron / Cloud Scheduler:
+    python manage.py publish_snippet_assets
+"""
+from django.core.management.base import BaseCommand
+
+from student.services.snippet_assets import DRAIN_BATCH_SIZE, drain_pending_publishes
+
+
+class Command(BaseCommand):
+    help = 'Publish CSS / text snippet assets whose deferred publish is due.'
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            counts = drain_pending_publishes()
+            total += counts['published']
+            if counts['due'] < DRAIN_BATCH_SIZE:
+                break
+        self.stdout.write(self.style.SUCCESS(f'Published {total} snippet asset(s).'))
@@ -0,0 +1,55 @@
+"""
+Regenerate upcoming ClassEvents for self-paced enrollment schedules.
+
+    # Sync every active schedule (diff mode: only changed rows are written):
+    python manage.py regenerate_enrollment_schedules
+
+    # One course, 8 threads, 25 schedules per chunk:
+    python manage.py regenerate_enrollment_schedules --course 42 --workers 8 --chunk-size 25
+
+    # Full rebuild (delete + insert) instead of a diff:
+    python manage.py regenerate_enrollment_schedules --mode replace
+"""
+from django.core.management.base import BaseCommand
+
+from student.services.enrollment_schedule import (
+    MODE_DIFF,
+    REGENERATION_MODES,
+    active_schedules_queryset,
+    regenerate_all_schedules,
+)
+
+
+class Command(BaseCommand):
+    help = 'Regenerate schedule-generated ClassEvents for every active self-paced enrollment schedule.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=REGENERATION_MODES, default=MODE_DIFF, help='diff (default) or replace')
+        parser.add_argument('--course', type=int, help='Only schedules for this course id')
+        parser.add_argument('--workers', type=int, default=4, help='Parallel worker threads (default 4)')
+        parser.add_argument('--chunk-size', type=int, default=50, help='Schedules per chunk (default 50)')
+        parser.add_argument('--dry-run', action='store_true', help='Count matching schedules without changing anything')
+
+    def handle(self, *args, **options):
+        qs = active_schedules_queryset()
+        if options.get('course') is not None:
+            qs = qs.filter(enrollment__course_id=options['course'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'DRY RUN - {qs.count()} schedule(s) would be regenerated'))
+            return
+
+        totals = regenerate_all_schedules(
+            qs,
+            mode=options['mode'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(
+            f"Summary: schedules={totals['schedules']} failed={totals['failed']} "
+            f"created={totals['created']} updated={totals['updated']} "
+            f"deleted={totals['deleted']} unchanged={totals['unchanged']}"
+        )
+        if totals['failed']:
+            self.stdout.write(self.style.WARNING('Some schedules failed; see the log for details.'))
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0025_alter_enrollmentschedule_end_time_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='codesnippet',
+            name='asset_publish_attempts',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='codesnippet',
+            name='asset_publish_due_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='When the saved code is due to be re-published to GCS (null when published)', null=True),
+        ),
+    ]
@@ -2,9 +2,12 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+import logging
 import uuid
 import secrets
 
+logger = logging.getLogger(__name__)
+
 User = get_user_model()
 
 
@@ -622,13 +625,11 @@ class EnrolledCourse(models.Model):
             # Save all changes
             self.save()
             
-            print(f"Successfully marked lesson '{lesson.title}' as complete for {self.student_profile.user.get_full_name()}")
+            logger.info("Marked lesson %s complete for enrollment %s", lesson.pk, self.pk)
             return True, f"Lesson '{lesson.title}' marked as complete"
             
         except Exception as e:
-            print(f"Error marking lesson complete: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error marking lesson complete: %s", e)
             return False, f"Error completing lesson: {str(e)}"
 
     def advance_to_next_lesson(self, lesson):
@@ -673,109 +674,17 @@ class EnrolledCourse(models.Model):
         - preserve learner trajectory when lessons are inserted/reordered
         - backfill inserted earlier lessons as completed for already-progressed students
         - then recalculate enrollment metadata from progress records
-        """
-        lessons = list(self.course.lessons.order_by('order'))
-        if not lessons:
-            self._recalculate_from_progress_records()
-            self.save()
-            return
 
-        highest_completed_order = (
-            StudentLessonProgress.objects.filter(
-                enrollment=self,
-                status='completed'
-            ).aggregate(max_order=models.Max('lesson__order'))['max_order']
-            or 0
-        )
-
-        # Prefer persisted pointer when available so we do not regress active students.
-        pointer_order = self.current_lesson.order if self.current_lesson else highest_completed_order
-
-        if pointer_order > 1:
-            for lesson in lessons:
-                if lesson.order >= pointer_order:
-                    break
-                progress, _ = StudentLessonProgress.objects.get_or_create(
-                    enrollment=self,
-                    lesson=lesson,
-                    defaults={'status': 'completed'}
-                )
-                if progress.status != 'completed':
-                    progress.status = 'completed'
-                    progress.completed_at = timezone.now()
-                    progress.save(update_fields=['status', 'completed_at', 'updated_at'])
-
-        self._recalculate_from_progress_records()
-        self.save()
-    
-    def _recalculate_from_progress_records(self):
-        """
-        Recalculate enrollment fields from StudentLessonProgress records (single source of truth).
-        This ensures consistency between progress records and enrollment metadata.
-        Refreshes total_lessons_count from the course and reverts to active when new lessons exist.
+        Shares the set-based engine used for whole-course resyncs
+        (student.services.lesson_structure_resync).
         """
-        # Refresh total from current course (teacher may have added/removed lessons)
-        self.total_lessons_count = self.course.lessons.count()
-
-        # Get all progress records for this enrollment
-        progress_records = StudentLessonProgress.objects.filter(
-            enrollment=self
-        ).select_related('lesson')
-        
-        # Calculate actual completed count from progress records
-        completed_lesson_ids = set()
-        for progress in progress_records:
-            if progress.is_completed:
-                completed_lesson_ids.add(progress.lesson.id)
-        
-        actual_completed_count = len(completed_lesson_ids)
-        self.completed_lessons_count = actual_completed_count
-
-        # Recalculate current_lesson from progress records
-        # Current lesson = next lesson after the highest completed lesson order
-        highest_completed_order = 0
-        for progress in progress_records:
-            if progress.is_completed:
-                highest_completed_order = max(highest_completed_order, progress.lesson.order)
-        
-        if highest_completed_order > 0:
-            # Find next lesson after highest completed order
-            next_lesson = self.course.lessons.filter(
-                order__gt=highest_completed_order
-            ).order_by('order').first()
-            if next_lesson:
-                self.current_lesson = next_lesson
-            else:
-                # All lessons completed
-                self.current_lesson = None
-                self.status = 'completed'
-                self.completion_date = timezone.now().date()
-                self.progress_percentage = 100.0
-        else:
-            # No lessons completed yet, start with first lesson
-            self.current_lesson = self.course.lessons.order_by('order').first()
-        
-        # Recalculate progress percentage
-        # Cap at 100.0 since it's a percentage (0-100%)
-        # This prevents DecimalField overflow errors
-        if self.total_lessons_count > 0:
-            calculated_percentage = (self.completed_lessons_count / self.total_lessons_count) * 100
-            # Cap at 100.0 to prevent overflow and because progress can't exceed 100%
-            self.progress_percentage = min(calculated_percentage, 100.0)
-            
-            # Debug logging for overflow detection
-            if calculated_percentage > 100.0:
-                print(f"⚠️ WARNING: Progress percentage calculated as {calculated_percentage}% (capped at 100.0%)")
-                print(f"   - completed_lessons_count: {self.completed_lessons_count}")
-                print(f"   - total_lessons_count: {self.total_lessons_count}")
-                print(f"   - Course: {self.course.title if self.course else 'Unknown'}")
-        else:
-            self.progress_percentage = 0.0
+        from student.services.lesson_structure_resync import (
+            ENROLLMENT_RESYNC_FIELDS,
+            resync_enrollments,
+        )
 
-        # If course was marked completed but teacher added more lessons, revert to active
-        if self.status == 'completed' and self.completed_lessons_count < self.total_lessons_count:
-            self.status = 'active'
-            self.completion_date = None
+        resync_enrollments(EnrolledCourse.objects.filter(pk=self.pk), self.course)
+        self.refresh_from_db(fields=ENROLLMENT_RESYNC_FIELDS)
 
 
 class EnrollmentSchedule(models.Model):
@@ -1933,6 +1842,15 @@ class CodeSnippet(models.Model):
         max_length=500,
         help_text="GCP URL for plain text files. Only populated when language is 'text'.",
     )
+    # Deferred re-publish of css_file_url / text_file_url (student.services.snippet_assets)
+    asset_publish_due_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="When the saved code is due to be re-published to GCS (null when published)",
+    )
+    asset_publish_attempts = models.PositiveIntegerField(default=0, editable=False)
     
     # Sharing (default to True as requested)
     is_shared = models.BooleanField(
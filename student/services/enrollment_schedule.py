@@ -1,18 +1,40 @@
 """
 Generate ClassEvents from an EnrollmentSchedule cadence for self-paced courses.
+
+regenerate_schedule_events() computes the desired upcoming events and, in the
+default "diff" mode, compares them with the stored generated rows by
+(lesson, start, end): unchanged rows are left alone, moved or retitled rows
+are updated in place, and only the remainder is inserted or deleted, all
+through bulk_create / bulk_update. "replace" mode deletes every upcoming
+generated row and bulk-inserts the full set.
+
+Bulk writes skip ClassEvent.save() and post_save, so the desired events are
+validated with clean() up front and the class calendar, lesson payload and
+student timeline caches are invalidated explicitly.
+
+regenerate_all_schedules() runs the same sync for many schedules in parallel
+chunks (`manage.py regenerate_enrollment_schedules`).
 """
 from __future__ import annotations
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, time as dtime, date
 from typing import Dict, List, Tuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from django.db import transaction
+from django.db import close_old_connections, transaction
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_time
 
 from courses.models import Class, ClassEvent, Lesson
+from courses.services.class_calendar import invalidate_class_calendars
+from courses.services.lesson_delivery import invalidate_course_lesson_payloads
 from student.models import EnrollmentSchedule, StudentLessonProgress
+from student.services.timeline import invalidate_student_timelines
+
+logger = logging.getLogger(__name__)
 
 
 LESSON_TYPE_TO_EVENT = {
@@ -24,6 +46,13 @@ LESSON_TYPE_TO_EVENT = {
 
 MAX_LOOKAHEAD_DAYS = 366 * 2
 
+MODE_DIFF = 'diff'
+MODE_REPLACE = 'replace'
+REGENERATION_MODES = (MODE_DIFF, MODE_REPLACE)
+
+# Columns a generated event derives from its lesson and slot.
+GENERATED_FIELDS = ('title', 'description', 'event_type', 'lesson_type', 'start_time', 'end_time', 'all_day')
+
 
 def _lesson_event_type(lesson: Lesson) -> str:
     return LESSON_TYPE_TO_EVENT.get(lesson.type, 'text')
@@ -159,59 +188,40 @@ def _aware_range(day: date, start: dtime, end: dtime, tz, all_day: bool):
     return timezone.make_aware(naive_start, tz), timezone.make_aware(naive_end, tz)
 
 
-@transaction.atomic
-def regenerate_schedule_events(schedule: EnrollmentSchedule) -> int:
-    """
-    Rebuild upcoming schedule-generated ClassEvents.
-    Wall-clock times on the cadence are interpreted in schedule.timezone
-    (browser IANA zone), matching class scheduling local-time behavior.
-    """
-    schedule.full_clean()
-    class_instance = get_or_create_personal_class(schedule)
-    tz = _resolve_schedule_tz(schedule)
-    now = timezone.now()
-    today = timezone.localtime(now, tz).date()
-
-    # Replace all generated sessions from today onward (schedule local date).
-    # Using end_time__gt=now left same-day slots that already ended, so Daily→Weekly
-    # recreates duplicates for today. Historical days before today are kept.
-    today_start = timezone.make_aware(datetime.combine(today, dtime.min), tz)
-    ClassEvent.objects.filter(
+def _generated_event(class_instance: Class, lesson: Lesson, start_dt, end_dt, all_day: bool) -> ClassEvent:
+    return ClassEvent(
+        title=lesson.title,
+        description=lesson.description or '',
         class_instance=class_instance,
+        lesson=lesson,
+        event_type='lesson',
+        lesson_type=_lesson_event_type(lesson),
+        start_time=start_dt,
+        end_time=end_dt,
+        all_day=all_day,
         is_schedule_generated=True,
-        start_time__gte=today_start,
-    ).delete()
+    )
 
+
+def _desired_events(schedule: EnrollmentSchedule, class_instance: Class, tz, today: date) -> List[ClassEvent]:
+    """Unsaved ClassEvents the cadence asks for, from today onward, one per incomplete lesson."""
     incomplete = _incomplete_lessons(schedule.enrollment)
     if not incomplete:
-        return 0
+        return []
 
-    created = 0
     use_custom = (
         schedule.frequency == 'weekly'
         and not schedule.repeat_weekly
     )
-
     if use_custom:
         slots = _parse_custom_slots(schedule)
         # only future/today slots (in scheduler's local calendar)
         slots = [(d, st, et) for (d, st, et) in slots if d >= today]
+        events = []
         for lesson, (day, st, et) in zip(incomplete, slots):
             start_dt, end_dt = _aware_range(day, st, et, tz, all_day=False)
-            ClassEvent.objects.create(
-                title=lesson.title,
-                description=lesson.description or '',
-                class_instance=class_instance,
-                lesson=lesson,
-                event_type='lesson',
-                lesson_type=_lesson_event_type(lesson),
-                start_time=start_dt,
-                end_time=end_dt,
-                all_day=False,
-                is_schedule_generated=True,
-            )
-            created += 1
-        return created
+            events.append(_generated_event(class_instance, lesson, start_dt, end_dt, all_day=False))
+        return events
 
     # Repeating cadence (daily or weekly pattern)
     slot_dates = _iter_repeating_slot_dates(schedule, today, len(incomplete))
@@ -220,6 +230,7 @@ def regenerate_schedule_events(schedule: EnrollmentSchedule) -> int:
     shared_start = schedule.start_time or dtime.min
     shared_end = schedule.end_time or dtime(23, 59, 59)
 
+    events = []
     for day, lesson in zip(slot_dates, incomplete):
         if time_by_weekday and day.weekday() in time_by_weekday:
             start_t, end_t = time_by_weekday[day.weekday()]
@@ -228,18 +239,212 @@ def regenerate_schedule_events(schedule: EnrollmentSchedule) -> int:
             start_t, end_t = shared_start, shared_end
             all_day = shared_all_day
         start_dt, end_dt = _aware_range(day, start_t, end_t, tz, all_day)
-        ClassEvent.objects.create(
-            title=lesson.title,
-            description=lesson.description or '',
-            class_instance=class_instance,
-            lesson=lesson,
-            event_type='lesson',
-            lesson_type=_lesson_event_type(lesson),
-            start_time=start_dt,
-            end_time=end_dt,
-            all_day=all_day,
-            is_schedule_generated=True,
+        events.append(_generated_event(class_instance, lesson, start_dt, end_dt, all_day))
+    return events
+
+
+@dataclass
+class ScheduleSyncResult:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """Upcoming generated events after the sync."""
+        return self.created + self.updated + self.unchanged
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+
+def _event_key(event: ClassEvent):
+    return (event.lesson_id, event.start_time, event.end_time)
+
+
+def _copy_generated_fields(target: ClassEvent, source: ClassEvent) -> bool:
+    """Copy GENERATED_FIELDS from source onto target; True when anything differed."""
+    dirty = False
+    for name in GENERATED_FIELDS:
+        value = getattr(source, name)
+        if getattr(target, name) != value:
+            setattr(target, name, value)
+            dirty = True
+    return dirty
+
+
+def _apply_diff(existing: List[ClassEvent], desired: List[ClassEvent]) -> ScheduleSyncResult:
+    """Reconcile stored generated events with the desired set using bulk writes."""
+    result = ScheduleSyncResult()
+    by_key: Dict[tuple, List[ClassEvent]] = {}
+    for event in existing:
+        by_key.setdefault(_event_key(event), []).append(event)
+
+    to_update: List[ClassEvent] = []
+    unmatched: List[ClassEvent] = []
+    # 1. Same (lesson, start, end): keep the row, refresh title/description if the lesson changed.
+    for wanted in desired:
+        bucket = by_key.get(_event_key(wanted))
+        if bucket:
+            current = bucket.pop(0)
+            if _copy_generated_fields(current, wanted):
+                to_update.append(current)
+            else:
+                result.unchanged += 1
+        else:
+            unmatched.append(wanted)
+
+    # 2. Same lesson at a different time (cadence change): move the existing row.
+    leftovers_by_lesson: Dict[object, List[ClassEvent]] = {}
+    for bucket in by_key.values():
+        for event in bucket:
+            leftovers_by_lesson.setdefault(event.lesson_id, []).append(event)
+    to_create: List[ClassEvent] = []
+    for wanted in unmatched:
+        bucket = leftovers_by_lesson.get(wanted.lesson_id)
+        if bucket:
+            current = bucket.pop(0)
+            _copy_generated_fields(current, wanted)
+            to_update.append(current)
+        else:
+            to_create.append(wanted)
+
+    # 3. Whatever is left over no longer belongs to the schedule.
+    stale_ids = [event.pk for bucket in leftovers_by_lesson.values() for event in bucket]
+
+    if stale_ids:
+        ClassEvent.objects.filter(pk__in=stale_ids).delete()
+        result.deleted = len(stale_ids)
+    if to_update:
+        ClassEvent.objects.bulk_update(to_update, GENERATED_FIELDS)
+        result.updated = len(to_update)
+    if to_create:
+        ClassEvent.objects.bulk_create(to_create)
+        result.created = len(to_create)
+    return result
+
+
+@transaction.atomic
+def sync_schedule_events(schedule: EnrollmentSchedule, *, mode: str = MODE_DIFF) -> ScheduleSyncResult:
+    """
+    Bring upcoming schedule-generated ClassEvents in line with the cadence.
+    Wall-clock times on the cadence are interpreted in schedule.timezone
+    (browser IANA zone), matching class scheduling local-time behavior.
+    """
+    if mode not in REGENERATION_MODES:
+        raise ValueError(f"Unknown regeneration mode {mode!r}")
+    schedule.full_clean()
+    class_instance = get_or_create_personal_class(schedule)
+    tz = _resolve_schedule_tz(schedule)
+    now = timezone.now()
+    today = timezone.localtime(now, tz).date()
+
+    desired = _desired_events(schedule, class_instance, tz, today)
+    # bulk_create / bulk_update bypass ClassEvent.save(), which is where clean() runs.
+    for event in desired:
+        event.clean()
+
+    # Everything generated from today onward (schedule local date) is owned by the
+    # cadence. Using end_time__gt=now left same-day slots that already ended, so
+    # Daily→Weekly recreated duplicates for today. Historical days are kept.
+    today_start = timezone.make_aware(datetime.combine(today, dtime.min), tz)
+    upcoming = ClassEvent.objects.filter(
+        class_instance=class_instance,
+        is_schedule_generated=True,
+        start_time__gte=today_start,
+    )
+
+    if mode == MODE_REPLACE:
+        _, per_model = upcoming.delete()
+        ClassEvent.objects.bulk_create(desired)
+        result = ScheduleSyncResult(
+            created=len(desired),
+            deleted=per_model.get(ClassEvent._meta.label, 0),
         )
-        created += 1
+    else:
+        result = _apply_diff(list(upcoming.order_by('start_time', 'id')), desired)
+
+    if result.changed:
+        invalidate_class_calendars(class_instance.pk)
+        # Live lessons render their first ClassEvent; bulk writes skip the signals.
+        invalidate_course_lesson_payloads(class_instance.course_id)
+        invalidate_student_timelines(*class_instance.students.values_list('id', flat=True))
+    return result
+
 
-    return created
+def regenerate_schedule_events(schedule: EnrollmentSchedule, *, mode: str = MODE_DIFF) -> int:
+    """Sync upcoming generated ClassEvents; returns how many the schedule now has."""
+    return sync_schedule_events(schedule, mode=mode).total
+
+
+def _sync_chunk(schedule_ids: List, mode: str) -> dict:
+    counts = {'schedules': 0, 'failed': 0, 'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    schedules = EnrollmentSchedule.objects.filter(pk__in=schedule_ids).select_related(
+        'enrollment__course',
+        'enrollment__student_profile__user',
+        'class_instance',
+    )
+    for schedule in schedules:
+        try:
+            result = sync_schedule_events(schedule, mode=mode)
+        except Exception as e:
+            counts['failed'] += 1
+            logger.warning("Schedule regeneration failed for %s: %s", schedule.pk, e)
+            continue
+        counts['schedules'] += 1
+        counts['created'] += result.created
+        counts['updated'] += result.updated
+        counts['deleted'] += result.deleted
+        counts['unchanged'] += result.unchanged
+    return counts
+
+
+def _sync_chunk_in_thread(schedule_ids: List, mode: str) -> dict:
+    try:
+        return _sync_chunk(schedule_ids, mode)
+    finally:
+        close_old_connections()
+
+
+def active_schedules_queryset():
+    """Schedules of active self-paced enrollments."""
+    return EnrollmentSchedule.objects.filter(
+        enrollment__status='active',
+        enrollment__course__delivery_type='self_paced',
+    )
+
+
+def regenerate_all_schedules(
+    queryset=None,
+    *,
+    mode: str = MODE_DIFF,
+    workers: int = 4,
+    chunk_size: int = 50,
+) -> dict:
+    """
+    Sync every schedule in queryset (default: active_schedules_queryset()).
+
+    Schedule ids are split into chunks of chunk_size and the chunks run on up to
+    `workers` threads; each schedule is its own transaction, so one failure does
+    not roll back the rest. Returns summed counts.
+    """
+    if mode not in REGENERATION_MODES:
+        raise ValueError(f"Unknown regeneration mode {mode!r}")
+    queryset = active_schedules_queryset() if queryset is None else queryset
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+    chunk_size = max(1, chunk_size)
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+    totals = {'schedules': 0, 'failed': 0, 'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    workers = min(max(1, workers), len(chunks))
+    if workers <= 1:
+        results = [_sync_chunk(chunk, mode) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='schedule-regen') as pool:
+            results = list(pool.map(lambda chunk: _sync_chunk_in_thread(chunk, mode), chunks))
+    for counts in results:
+        for key, value in counts.items():
+            totals[key] += value
+    return totals
@@ -0,0 +1,188 @@
+"""
+Set-based resync of enrollments after a course's lesson structure changes.
+
+Same rules as EnrolledCourse.resync_after_lesson_structure_change (Option A):
+lessons before each learner's pointer (current lesson, else highest completed
+lesson) are backfilled as completed, then counts, current lesson, progress
+percentage and status are recalculated from StudentLessonProgress.
+
+Instead of get_or_create per lesson and a full save() per enrollment, the
+whole course is handled with a fixed number of queries: one lesson read, one
+annotated enrollment read, one progress read, a bulk_create for missing rows,
+one UPDATE for rows to complete, one annotated recount and one bulk_update.
+
+bulk_update sends no post_save, so the EnrolledCourse receivers' cache
+invalidations (course access index and student timeline, see
+student.signals) are run here for the resynced students. No receivers
+listen to StudentLessonProgress, so its bulk writes need nothing extra.
+"""
+from __future__ import annotations
+
+import bisect
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from courses.models import Lesson
+from courses.services.course_access import invalidate_course_access
+from student.models import EnrolledCourse, StudentLessonProgress
+from student.services.timeline import invalidate_student_timelines
+
+BULK_BATCH_SIZE = 500
+
+ENROLLMENT_RESYNC_FIELDS = [
+    'total_lessons_count',
+    'completed_lessons_count',
+    'current_lesson',
+    'progress_percentage',
+    'status',
+    'completion_date',
+]
+
+
+def _completed_progress(enrollment_ref):
+    return StudentLessonProgress.objects.filter(
+        enrollment=enrollment_ref, status='completed'
+    ).order_by().values('enrollment')
+
+
+def _max_completed_order_subquery():
+    return Subquery(
+        _completed_progress(OuterRef('pk')).annotate(m=Max('lesson__order')).values('m'),
+        output_field=IntegerField(),
+    )
+
+
+def _completed_count_subquery():
+    return Subquery(
+        _completed_progress(OuterRef('pk')).annotate(n=Count('lesson', distinct=True)).values('n'),
+        output_field=IntegerField(),
+    )
+
+
+def _progress_percentage(completed, total):
+    if total <= 0:
+        return Decimal('0.00')
+    return Decimal(str(round(min(completed / total * 100, 100.0), 2)))
+
+
+def _backfill_progress(enrollments, lessons, now):
+    """Mark every lesson before each enrollment's pointer as completed."""
+    lesson_orders = [order for _id, order in lessons]
+    targets = {}
+    for enrollment in enrollments:
+        pointer = enrollment.pointer_order or 0
+        if pointer > 1:
+            before = lessons[:bisect.bisect_left(lesson_orders, pointer)]
+            if before:
+                targets[enrollment.pk] = {lesson_id for lesson_id, _order in before}
+    if not targets:
+        return
+
+    existing = StudentLessonProgress.objects.filter(
+        enrollment_id__in=list(targets),
+    ).values_list('id', 'enrollment_id', 'lesson_id', 'status')
+    to_complete = []
+    for progress_id, enrollment_id, lesson_id, progress_status in existing:
+        wanted = targets[enrollment_id]
+        if lesson_id in wanted:
+            wanted.discard(lesson_id)
+            if progress_status != 'completed':
+                to_complete.append(progress_id)
+
+    missing = [
+        StudentLessonProgress(
+            enrollment_id=enrollment_id,
+            lesson_id=lesson_id,
+            status='completed',
+            completed_at=now,
+        )
+        for enrollment_id, lesson_ids in targets.items()
+        for lesson_id in lesson_ids
+    ]
+    if missing:
+        # ignore_conflicts: a student may complete a lesson concurrently.
+        StudentLessonProgress.objects.bulk_create(
+            missing, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+        )
+    if to_complete:
+        StudentLessonProgress.objects.filter(id__in=to_complete).update(
+            status='completed', completed_at=now, updated_at=now
+        )
+
+
+def resync_enrollments(enrollments_qs, course) -> int:
+    """
+    Resync the given enrollments of `course`. Returns how many were updated.
+
+    enrollments_qs must only contain enrollments of `course`.
+    """
+    now = timezone.now()
+    today = now.date()
+    lessons = list(
+        Lesson.objects.filter(course=course).order_by('order').values_list('id', 'order')
+    )
+    lesson_orders = [order for _id, order in lessons]
+    total = len(lessons)
+
+    with transaction.atomic():
+        if lessons:
+            pointers = list(
+                enrollments_qs.select_related(None).annotate(
+                    pointer_order=Coalesce(
+                        F('current_lesson__order'), _max_completed_order_subquery()
+                    )
+                ).only('id')
+            )
+            _backfill_progress(pointers, lessons, now)
+
+        enrollments = list(
+            enrollments_qs.select_related(None).annotate(
+                resync_completed=_completed_count_subquery(),
+                resync_highest=_max_completed_order_subquery(),
+                resync_user_id=F('student_profile__user_id'),
+            ).only('id', 'status', 'completion_date', 'current_lesson', 'progress_percentage',
+                   'completed_lessons_count', 'total_lessons_count')
+        )
+        for enrollment in enrollments:
+            completed = enrollment.resync_completed or 0
+            highest = enrollment.resync_highest or 0
+            enrollment.total_lessons_count = total
+            enrollment.completed_lessons_count = completed
+            if highest > 0:
+                index = bisect.bisect_right(lesson_orders, highest)
+                if index < total:
+                    enrollment.current_lesson_id = lessons[index][0]
+                else:
+                    # All lessons completed
+                    enrollment.current_lesson_id = None
+                    enrollment.status = 'completed'
+                    enrollment.completion_date = today
+            else:
+                enrollment.current_lesson_id = lessons[0][0] if lessons else None
+            enrollment.progress_percentage = _progress_percentage(completed, total)
+            # Course was completed but the teacher added more lessons: back to active.
+            if enrollment.status == 'completed' and completed < total:
+                enrollment.status = 'active'
+                enrollment.completion_date = None
+
+        if enrollments:
+            EnrolledCourse.objects.bulk_update(
+                enrollments, ENROLLMENT_RESYNC_FIELDS, batch_size=BULK_BATCH_SIZE
+            )
+            # What the skipped post_save receivers would have invalidated.
+            user_ids = {enrollment.resync_user_id for enrollment in enrollments}
+            invalidate_course_access(*user_ids)
+            invalidate_student_timelines(*user_ids)
+    return len(enrollments)
+
+
+def resync_course_enrollments(course, statuses) -> int:
+    """Resync every enrollment of `course` whose status is in `statuses`."""
+    return resync_enrollments(
+        EnrolledCourse.objects.filter(course=course, status__in=list(statuses)),
+        course,
+    )
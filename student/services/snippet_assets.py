@@ -0,0 +1,229 @@
+"""
+Publishing of code snippet assets (CSS / plain text files in GCS).
+
+CSS and text snippets are mirrored to a public GCS object (css_file_url /
+text_file_url) so pages can <link> or fetch them. IDE autosave PATCHes a
+snippet every few seconds, so instead of uploading on every save:
+
+- publish_asset() hashes the content (SHA-256) and skips the upload when the
+  object at that URL was already published with the same bytes; the last
+  published (url, hash) per snippet is kept in the cache;
+- once a snippet has a URL, saves only call schedule_publish(), which flags
+  the row (CodeSnippet.asset_publish_due_at, SNIPPET_ASSET_PUBLISH_DELAY_SECONDS
+  from the first unpublished save). After commit a background drainer
+  (backend.work_queue) re-reads flagged snippets when they are due and
+  publishes their latest content, so a burst of saves becomes one upload and
+  the response returns the existing URL without waiting for GCS;
+- the first publish of a snippet (no URL yet) stays synchronous, so the
+  client gets its URL in the save response.
+
+The flag lives in the database, so a publish pending when the process stops
+is picked up by the next drain (any later save, or
+`manage.py publish_snippet_assets` from cron). A failed publish is retried
+with backoff up to MAX_PUBLISH_ATTEMPTS (the hash is only recorded on
+success). Updates overwrite the object in place, so the URL does not change;
+only a failed in-place update falls back to a new upload, which is then
+written back to the snippet.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from backend.work_queue import BackgroundDrainer, retry_delay
+
+logger = logging.getLogger(__name__)
+
+URL_FIELDS = {'css': 'css_file_url', 'text': 'text_file_url'}
+PUBLISHED_CACHE_SECONDS = 7 * 24 * 60 * 60
+DRAIN_BATCH_SIZE = 50
+MAX_PUBLISH_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 30 * 60
+
+
+def _delay_seconds() -> float:
+    return float(getattr(settings, 'SNIPPET_ASSET_PUBLISH_DELAY_SECONDS', 3))
+
+
+def content_hash(content) -> str:
+    return hashlib.sha256(str(content or '').encode('utf-8')).hexdigest()
+
+
+def _published_key(snippet_id, kind: str) -> str:
+    return f"snippet-asset:published:{snippet_id}:{kind}"
+
+
+def _is_published(snippet_id, kind: str, url: str, digest: str) -> bool:
+    try:
+        return cache.get(_published_key(snippet_id, kind)) == f"{url}|{digest}"
+    except Exception:
+        return False
+
+
+def _remember(snippet_id, kind: str, url: str, digest: str) -> None:
+    try:
+        cache.set(_published_key(snippet_id, kind), f"{url}|{digest}", PUBLISHED_CACHE_SECONDS)
+    except Exception:
+        pass
+
+
+def _upload(snippet, kind: str, content, title, current_url):
+    """One GCS round trip (two on fallback); returns the URL or None."""
+    if kind == 'css':
+        from student.css_upload_utils import update_css_in_gcp, upload_css_to_gcp
+
+        if current_url:
+            url, _path = update_css_in_gcp(current_url, content)
+            if url:
+                return url
+            logger.warning("Failed to update CSS in GCP, trying to create new file")
+        url, _path = upload_css_to_gcp(content, title=title)
+        return url
+
+    from student.text_upload_utils import delete_text_from_gcp, update_text_in_gcp, upload_text_to_gcp
+
+    if current_url:
+        url, _path = update_text_in_gcp(current_url, content)
+        if url:
+            return url
+        logger.warning("Failed to update text in GCP, re-uploading with snippet id")
+    url, _path = upload_text_to_gcp(content, title=title, snippet_id=snippet.id)
+    if current_url and url and current_url != url:
+        delete_text_from_gcp(current_url)
+    return url
+
+
+def publish_asset(snippet, kind: str, content, title=None):
+    """
+    Publish `content` for the snippet's `kind` asset now; returns the URL (None on failure).
+    Skips GCS when the current URL already holds these exact bytes.
+    """
+    current_url = getattr(snippet, URL_FIELDS[kind])
+    digest = content_hash(content)
+    if current_url and _is_published(snippet.id, kind, current_url, digest):
+        return current_url
+    url = _upload(snippet, kind, content, title or '', current_url)
+    if url:
+        _remember(snippet.id, kind, url, digest)
+    return url
+
+
+def _mark_failed(snippet_id, attempts: int) -> None:
+    """Retry with backoff, unless a newer save already re-scheduled the publish."""
+    from student.models import CodeSnippet
+
+    if attempts >= MAX_PUBLISH_ATTEMPTS:
+        logger.error("Giving up publishing snippet %s after %s attempts; next save retries", snippet_id, attempts)
+        CodeSnippet.objects.filter(id=snippet_id).update(asset_publish_attempts=0)
+        return
+    delay = retry_delay(attempts, base_seconds=RETRY_BASE_SECONDS, max_seconds=RETRY_MAX_SECONDS)
+    CodeSnippet.objects.filter(id=snippet_id, asset_publish_due_at__isnull=True).update(
+        asset_publish_due_at=timezone.now() + delay,
+        asset_publish_attempts=attempts,
+    )
+
+
+def publish_pending(snippet_id) -> bool:
+    """
+    Publish the snippet's saved content if a publish is pending. Returns
+    False when another worker claimed it first.
+
+    The pending flag is cleared before the content is read, so a save that
+    lands during the upload flags the snippet again and is published next.
+    """
+    from student.models import CodeSnippet
+
+    row = (
+        CodeSnippet.objects.filter(id=snippet_id, asset_publish_due_at__isnull=False)
+        .values('asset_publish_due_at', 'asset_publish_attempts')
+        .first()
+    )
+    if row is None:
+        return False
+    claimed = CodeSnippet.objects.filter(
+        id=snippet_id, asset_publish_due_at=row['asset_publish_due_at']
+    ).update(asset_publish_due_at=None)
+    if not claimed:
+        return False
+    attempts = row['asset_publish_attempts'] + 1
+
+    snippet = (
+        CodeSnippet.objects.filter(id=snippet_id)
+        .only('id', 'title', 'code', 'language', *URL_FIELDS.values())
+        .first()
+    )
+    kind = (snippet.language or '').lower() if snippet else None
+    if kind not in URL_FIELDS or not getattr(snippet, URL_FIELDS[kind]):
+        return True
+    field = URL_FIELDS[kind]
+    try:
+        url = publish_asset(snippet, kind, snippet.code, snippet.title)
+    except Exception as e:
+        logger.error("Deferred %s publish failed for snippet %s: %s", kind, snippet_id, e, exc_info=True)
+        url = None
+    if not url:
+        logger.warning("Deferred %s publish failed for snippet %s (attempt %s)", kind, snippet_id, attempts)
+        _mark_failed(snippet_id, attempts)
+        return True
+    updates = {'asset_publish_attempts': 0}
+    if url != getattr(snippet, field):
+        updates[field] = url
+    CodeSnippet.objects.filter(id=snippet_id).update(**updates)
+    return True
+
+
+def drain_pending_publishes(limit: int = DRAIN_BATCH_SIZE) -> dict:
+    """Publish snippets whose publish is due; returns {'published': n, 'due': rows seen}."""
+    from student.models import CodeSnippet
+
+    due = list(
+        CodeSnippet.objects.filter(asset_publish_due_at__lte=timezone.now())
+        .order_by('asset_publish_due_at')
+        .values_list('id', flat=True)[:limit]
+    )
+    published = sum(1 for snippet_id in due if publish_pending(snippet_id))
+    return {'published': published, 'due': len(due)}
+
+
+def next_publish_due():
+    from student.models import CodeSnippet
+
+    return CodeSnippet.objects.aggregate(due=Min('asset_publish_due_at'))['due']
+
+
+_drainer = BackgroundDrainer(
+    'snippet-asset-publish',
+    lambda: drain_pending_publishes(),
+    more=lambda counts: counts['due'] >= DRAIN_BATCH_SIZE,
+    next_due=lambda: next_publish_due(),
+)
+
+
+def _after_commit(snippet_id) -> None:
+    if _delay_seconds() <= 0:
+        publish_pending(snippet_id)
+    else:
+        _drainer.kick()
+
+
+def schedule_publish(snippet_id) -> None:
+    """
+    Flag the snippet for a re-publish and kick the publisher after this save
+    commits. A snippet already flagged keeps its due time, so a burst of
+    autosaves becomes one upload of the latest content.
+    """
+    from student.models import CodeSnippet
+
+    CodeSnippet.objects.filter(id=snippet_id, asset_publish_due_at__isnull=True).update(
+        asset_publish_due_at=timezone.now() + timedelta(seconds=max(0.0, _delay_seconds())),
+        asset_publish_attempts=0,
+    )
+    transaction.on_commit(lambda: _after_commit(snippet_id))
@@ -0,0 +1,162 @@
+"""
+Per-student timeline of class events.
+
+get_student_timeline(user) returns the ClassEvents on the rosters of the
+student's classes, for courses they are actively enrolled in, that are still
+relevant from TIMELINE_LOOKBACK_DAYS ago onward (by start, end or due date).
+It is one query with the class, course, lesson type, project, platform and
+submission type joined in, cached per student for
+STUDENT_TIMELINE_CACHE_SECONDS (0 disables caching).
+
+The schedule view, the parent dashboard's upcoming tasks and the student
+dashboard overview filter this timeline in memory rather than each running
+their own overlapping event queries.
+
+Signals drop a student's entry when events on their classes or their
+enrollments change (student/signals.py) and when their class rosters change
+(courses/signals.py). Bulk ClassEvent writes skip signals and must call
+invalidate_student_timelines() themselves.
+Course titles and lesson types are read at build time and may lag by up to
+the cache lifetime.
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from backend.user_cache import PerUserCache
+from courses.models import ClassEvent
+from student.models import EnrolledCourse
+
+_CACHE_PREFIX = "student-timeline"
+
+# Oldest consumer window: the schedule view shows events from a week ago.
+TIMELINE_LOOKBACK_DAYS = 7
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    id: uuid.UUID
+    title: str
+    description: str
+    event_type: str
+    lesson_type: str | None
+    all_day: bool
+    start_time: datetime | None
+    end_time: datetime | None
+    due_date: datetime | None
+    meeting_platform: str | None
+    meeting_link: str | None
+    meeting_id: str | None
+    meeting_password: str | None
+    class_id: uuid.UUID
+    class_name: str
+    class_is_active: bool
+    course_id: uuid.UUID
+    course_title: str
+    lesson_id: uuid.UUID | None
+    # Current Lesson.type (ClassEvent.lesson_type can be stale).
+    lesson_kind: str | None
+    project_id: int | None
+    # ClassEvent.project_title, then Project.title.
+    project_title: str | None
+    project_name: str | None
+    project_points: int | None
+    # Event's submission type, falling back to the project's.
+    submission_type: str | None
+    project_platform: dict | None
+
+    @property
+    def duration_minutes(self) -> int:
+        """Same as ClassEvent.duration_minutes."""
+        if self.all_day:
+            return 0
+        if self.start_time and self.end_time:
+            return int((self.end_time - self.start_time).total_seconds() / 60)
+        return 0
+
+
+@dataclass(frozen=True)
+class StudentTimeline:
+    user_id: int
+    # Events starting, ending or due on or after this instant are included.
+    since: datetime
+    events: tuple
+
+    def for_course(self, course_id):
+        return [event for event in self.events if event.course_id == course_id]
+
+
+_EVENT_FIELDS = (
+    'id', 'title', 'description', 'event_type', 'lesson_type', 'all_day',
+    'start_time', 'end_time', 'due_date',
+    'meeting_platform', 'meeting_link', 'meeting_id', 'meeting_password',
+    'lesson_id', 'project_id', 'project_title',
+)
+
+
+def build_student_timeline(user_id, *, now: datetime | None = None) -> StudentTimeline:
+    """Query the timeline for one student (no caching)."""
+    since = (now or timezone.now()) - timedelta(days=TIMELINE_LOOKBACK_DAYS)
+    active_courses = EnrolledCourse.objects.filter(
+        student_profile__user_id=user_id,
+        status='active',
+    ).values('course_id')
+    rows = (
+        ClassEvent.objects.filter(
+            class_instance__students=user_id,
+            class_instance__course_id__in=active_courses,
+        )
+        .filter(Q(start_time__gte=since) | Q(end_time__gte=since) | Q(due_date__gte=since))
+        .values(
+            *_EVENT_FIELDS,
+            class_id=F('class_instance_id'),
+            class_name=F('class_instance__name'),
+            class_is_active=F('class_instance__is_active'),
+            course_id=F('class_instance__course_id'),
+            course_title=F('class_instance__course__title'),
+            lesson_kind=F('lesson__type'),
+            project_name=F('project__title'),
+            project_points=F('project__points'),
+            submission_type_name=Coalesce('submission_type__name', 'project__submission_type__name'),
+            platform_id=F('project_platform__id'),
+            platform_name=F('project_platform__name'),
+            platform_display_name=F('project_platform__display_name'),
+            platform_base_url=F('project_platform__base_url'),
+        )
+        .order_by('start_time', 'id')
+    )
+    events = []
+    for row in rows:
+        platform_id = row.pop('platform_id')
+        platform = {
+            'id': str(platform_id),
+            'name': row.pop('platform_name'),
+            'display_name': row.pop('platform_display_name'),
+            'base_url': row.pop('platform_base_url'),
+        }
+        events.append(TimelineEvent(
+            project_platform=platform if platform_id else None,
+            submission_type=row.pop('submission_type_name'),
+            **row,
+        ))
+    return StudentTimeline(user_id=user_id, since=since, events=tuple(events))
+
+
+_cache = PerUserCache(_CACHE_PREFIX, "STUDENT_TIMELINE_CACHE_SECONDS", 300, "Student timeline")
+
+
+def get_student_timeline(user) -> StudentTimeline:
+    """The cached timeline for a student user (or user id)."""
+    user_id = getattr(user, 'pk', user)
+    return _cache.get(user_id, build_student_timeline)
+
+
+def invalidate_student_timelines(*user_ids) -> None:
+    """Drop cached timelines for these students; again after commit so pre-commit reads cannot linger."""
+    _cache.invalidate(*user_ids)
@@ -1,19 +1,24 @@
 """
 Signals for the student app.
 
-Sends a Slack notification to the enrollments channel whenever a new
+Queues a Slack notification to the enrollments channel whenever a new
 EnrolledCourse is created, regardless of which path created it (Stripe,
-free/admin util, self-enroll endpoint, Django admin).
+free/admin util, self-enroll endpoint, Django admin), and drops the
+student's cached course access index when an enrollment changes.
 """
 import logging
 import threading
 from contextlib import contextmanager
 
-from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
+from courses.models import Class, ClassEvent
+from courses.services.course_access import invalidate_course_access
+from users.models import StudentProfile
+
 from .models import EnrolledCourse
+from .services.timeline import invalidate_student_timelines
 
 logger = logging.getLogger(__name__)
 
@@ -41,17 +46,39 @@ def suppress_enrollment_notifications():
 
 @receiver(post_save, sender=EnrolledCourse, dispatch_uid="enrollment_slack_notification")
 def notify_enrollment_created(sender, instance, created, **kwargs):
-    """Send a Slack notification after a new enrollment commits."""
+    """Queue a Slack notification for a new enrollment (sent after commit)."""
     if not created or _notifications_suppressed():
         return
 
-    def _send():
-        try:
-            from slack_notifications import send_enrollment_notification
-            send_enrollment_notification(instance)
-        except Exception as exc:
-            # Never let a notification failure affect the enrollment flow.
-            logger.warning("Failed to send enrollment Slack notification: %s", exc, exc_info=True)
+    try:
+        from slack_notifications import send_enrollment_notification
+        # Queued in the enrollment's transaction; the outbox delivers after commit.
+        send_enrollment_notification(instance)
+    except Exception as exc:
+        # Never let a notification failure affect the enrollment flow.
+        logger.warning("Failed to queue enrollment Slack notification: %s", exc, exc_info=True)
+
+
+@receiver([post_save, post_delete], sender=EnrolledCourse, dispatch_uid="enrollment_course_access")
+def invalidate_enrollment_course_access(sender, instance, **kwargs):
+    """Enrollment status decides which courses a student can study."""
+    if EnrolledCourse.student_profile.is_cached(instance):
+        user_id = instance.student_profile.user_id
+    else:
+        user_id = (
+            StudentProfile.objects.filter(pk=instance.student_profile_id)
+            .values_list("user_id", flat=True)
+            .first()
+        )
+    invalidate_course_access(user_id)
+    invalidate_student_timelines(user_id)
+
+
+def _roster_ids(class_id):
+    return Class.students.through.objects.filter(class_id=class_id).values_list("user_id", flat=True)
+
 
-    # Only fire once the (often atomic) enrollment transaction has committed.
-    transaction.on_commit(_send)
+@receiver(post_save, sender=ClassEvent, dispatch_uid="student_timeline_event_save")
+@receiver(pre_delete, sender=ClassEvent, dispatch_uid="student_timeline_event_delete")
+def invalidate_timelines_for_event(sender, instance, **kwargs):
+    invalidate_student_timelines(*_roster_ids(instance.class_instance_id))
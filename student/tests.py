@@ -1,3 +1,378 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Class, ClassEvent, Course, Lesson
+from student.models import CodeSnippet, EnrolledCourse, EnrollmentSchedule, StudentLessonProgress
+from student.services import snippet_assets
+from student.services.enrollment_schedule import (
+    MODE_REPLACE,
+    regenerate_all_schedules,
+    sync_schedule_events,
+)
+from student.services.lesson_structure_resync import resync_course_enrollments
+from student.services.timeline import get_student_timeline
+from users.models import StudentProfile
+
+User = get_user_model()
+
+LOCKED_STATUSES = ('active', 'completed', 'paused')
+
+
+class LessonStructureResyncTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user(
+            username='resync-teacher@example.com',
+            email='resync-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='resync-teacher-uid',
+        )
+        self.course = Course.objects.create(
+            title='Resync Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        self.lessons = [self._lesson(order) for order in (1, 2, 3)]
+
+    def _lesson(self, order):
+        return Lesson.objects.create(
+            course=self.course,
+            title=f'Lesson {order}',
+            order=order,
+            duration=30,
+            type='text_lesson',
+        )
+
+    def _enroll(self, name, **fields):
+        user = User.objects.create_user(
+            username=f'{name}@example.com',
+            email=f'{name}@example.com',
+            password='pass',
+            role='student',
+            firebase_uid=f'{name}-uid',
+        )
+        profile = StudentProfile.objects.create(user=user)
+        return EnrolledCourse.objects.create(student_profile=profile, course=self.course, **fields)
+
+    def _completed_ids(self, enrollment):
+        return set(
+            StudentLessonProgress.objects.filter(
+                enrollment=enrollment, status='completed'
+            ).values_list('lesson_id', flat=True)
+        )
+
+    def test_backfills_lessons_before_pointer(self):
+        enrollment = self._enroll('pointer', status='active', current_lesson=self.lessons[2])
+        StudentLessonProgress.objects.create(
+            enrollment=enrollment, lesson=self.lessons[1], status='in_progress'
+        )
+
+        self.assertEqual(resync_course_enrollments(self.course, LOCKED_STATUSES), 1)
+        enrollment.refresh_from_db()
+        self.assertEqual(self._completed_ids(enrollment), {self.lessons[0].id, self.lessons[1].id})
+        self.assertEqual(enrollment.completed_lessons_count, 2)
+        self.assertEqual(enrollment.total_lessons_count, 3)
+        self.assertEqual(enrollment.current_lesson_id, self.lessons[2].id)
+        self.assertEqual(float(enrollment.progress_percentage), 66.67)
+
+    def test_completed_enrollment_reopens_when_lesson_added(self):
+        enrollment = self._enroll('finished', status='completed')
+        for lesson in self.lessons:
+            StudentLessonProgress.objects.create(enrollment=enrollment, lesson=lesson, status='completed')
+        new_lesson = self._lesson(4)
+
+        resync_course_enrollments(self.course, LOCKED_STATUSES)
+        enrollment.refresh_from_db()
+        self.assertEqual(enrollment.status, 'active')
+        self.assertIsNone(enrollment.completion_date)
+        self.assertEqual(enrollment.current_lesson_id, new_lesson.id)
+        self.assertEqual(enrollment.completed_lessons_count, 3)
+
+    def test_new_enrollment_starts_at_first_lesson(self):
+        enrollment = self._enroll('fresh', status='active')
+        dropped = self._enroll('dropped', status='dropped')
+
+        resync_course_enrollments(self.course, LOCKED_STATUSES)
+        enrollment.refresh_from_db()
+        dropped.refresh_from_db()
+        self.assertEqual(enrollment.current_lesson_id, self.lessons[0].id)
+        self.assertEqual(self._completed_ids(enrollment), set())
+        self.assertIsNone(dropped.current_lesson_id)
+
+    def test_query_count_does_not_grow_with_enrollments(self):
+        self._enroll('first', status='active', current_lesson=self.lessons[1])
+        with CaptureQueriesContext(connection) as small:
+            resync_course_enrollments(self.course, LOCKED_STATUSES)
+
+        for index in range(5):
+            self._enroll(f'more-{index}', status='active', current_lesson=self.lessons[2])
+        with CaptureQueriesContext(connection) as large:
+            resync_course_enrollments(self.course, LOCKED_STATUSES)
+
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    @patch('student.services.lesson_structure_resync.invalidate_student_timelines')
+    @patch('student.services.lesson_structure_resync.invalidate_course_access')
+    def test_bulk_resync_invalidates_what_post_save_would(self, course_access, timelines):
+        finished = self._enroll('reopened', status='completed')
+        self._enroll('other', status='active')
+        course_access.reset_mock()
+        timelines.reset_mock()
+
+        resync_course_enrollments(self.course, LOCKED_STATUSES)
+        expected = {finished.student_profile.user_id, User.objects.get(username='other@example.com').pk}
+        self.assertEqual(set(course_access.call_args.args), expected)
+        self.assertEqual(set(timelines.call_args.args), expected)
+
+    def test_single_enrollment_method_uses_same_rules(self):
+        enrollment = self._enroll('single', status='active', current_lesson=self.lessons[1])
+        enrollment.resync_after_lesson_structure_change()
+        self.assertEqual(enrollment.completed_lessons_count, 1)
+        self.assertEqual(self._completed_ids(enrollment), {self.lessons[0].id})
+
+
+class EnrollmentScheduleRegenerationTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user(
+            username='schedule-teacher@example.com',
+            email='schedule-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='schedule-teacher-uid',
+        )
+        self.course = Course.objects.create(
+            title='Self-paced Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+            delivery_type='self_paced',
+        )
+        self.lessons = [
+            Lesson.objects.create(
+                course=self.course, title=f'Lesson {order}', order=order, duration=30, type='text_lesson'
+            )
+            for order in (1, 2, 3, 4)
+        ]
+        user = User.objects.create_user(
+            username='schedule-student@example.com',
+            email='schedule-student@example.com',
+            password='pass',
+            role='student',
+            firebase_uid='schedule-student-uid',
+        )
+        profile = StudentProfile.objects.create(user=user)
+        self.enrollment = EnrolledCourse.objects.create(
+            student_profile=profile, course=self.course, status='active'
+        )
+        self.schedule = EnrollmentSchedule.objects.create(
+            enrollment=self.enrollment, frequency='daily', timezone='UTC'
+        )
+
+    def _events(self):
+        return list(
+            ClassEvent.objects.filter(is_schedule_generated=True).order_by('start_time')
+        )
+
+    def test_second_sync_writes_nothing(self):
+        first = sync_schedule_events(self.schedule)
+        self.assertEqual((first.created, first.updated, first.deleted), (4, 0, 0))
+        ids = [event.id for event in self._events()]
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = sync_schedule_events(self.schedule)
+        self.assertEqual((second.created, second.updated, second.deleted, second.unchanged), (0, 0, 0, 4))
+        self.assertEqual([event.id for event in self._events()], ids)
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        self.assertEqual(writes, [])
+
+    def test_cadence_change_moves_rows_in_place(self):
+        sync_schedule_events(self.schedule)
+        ids = {event.id for event in self._events()}
+
+        # Weekdays 4 and 5 days out, so no weekly slot lands on a daily one whatever today is.
+        today = timezone.localdate().weekday()
+        weekdays = [(today + 4) % 7, (today + 5) % 7]
+        self.schedule.frequency = 'weekly'
+        self.schedule.weekdays = weekdays
+        self.schedule.save()
+        result = sync_schedule_events(self.schedule)
+
+        self.assertEqual((result.created, result.updated, result.deleted), (0, 4, 0))
+        events = self._events()
+        self.assertEqual({event.id for event in events}, ids)
+        self.assertTrue(all(event.start_time.weekday() in weekdays for event in events))
+
+    def test_completed_lesson_drops_its_event(self):
+        sync_schedule_events(self.schedule)
+        StudentLessonProgress.objects.create(
+            enrollment=self.enrollment, lesson=self.lessons[0], status='completed'
+        )
+        result = sync_schedule_events(self.schedule)
+
+        self.assertEqual(result.deleted, 1)
+        self.assertEqual(
+            [event.lesson_id for event in self._events()], [lesson.id for lesson in self.lessons[1:]]
+        )
+
+    def test_replace_mode_rebuilds_and_batch_runs_every_schedule(self):
+        sync_schedule_events(self.schedule)
+        result = sync_schedule_events(self.schedule, mode=MODE_REPLACE)
+        self.assertEqual((result.created, result.deleted), (4, 4))
+
+        totals = regenerate_all_schedules(workers=1, chunk_size=1)
+        self.assertEqual(totals['schedules'], 1)
+        self.assertEqual(totals['failed'], 0)
+        self.assertEqual(totals['unchanged'], 4)
+
+
+class StudentTimelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(
+            username='timeline-teacher@example.com',
+            email='timeline-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='timeline-teacher-uid',
+        )
+        self.course = Course.objects.create(
+            title='Timeline Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        self.student = User.objects.create_user(
+            username='timeline-student@example.com',
+            email='timeline-student@example.com',
+            password='pass',
+            role='student',
+            firebase_uid='timeline-student-uid',
+        )
+        profile = StudentProfile.objects.create(user=self.student)
+        EnrolledCourse.objects.create(student_profile=profile, course=self.course, status='active')
+        self.mine = Class.objects.create(name='Mine', course=self.course, teacher=teacher)
+        self.mine.students.add(self.student)
+        other = Class.objects.create(name='Other', course=self.course, teacher=teacher)
+        self.now = timezone.now()
+        self._event(self.mine, 'Tomorrow', days=1)
+        self._event(other, 'Not on my roster', days=1)
+        self._event(self.mine, 'Last month', days=-30)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def _event(self, class_instance, title, days):
+        start = self.now + timedelta(days=days)
+        return ClassEvent.objects.create(
+            class_instance=class_instance,
+            title=title,
+            event_type='meeting',
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+        )
+
+    def _schedule_titles(self):
+        body = self.client.get('/api/student/schedule/').json()
+        return [event['title'] for cls in body['classes'] for event in cls['events']]
+
+    def test_consumers_share_one_cached_timeline(self):
+        self.assertEqual(self._schedule_titles(), ['Tomorrow'])
+        tasks = self.client.get('/api/student/parent/dashboard/').json()['upcoming_tasks']
+        self.assertEqual([task['title'] for task in tasks], ['Tomorrow'])
+        self.assertEqual(self.client.get('/api/student/dashboard-overview/').status_code, 200)
+
+        with CaptureQueriesContext(connection) as ctx:
+            get_student_timeline(self.student)
+        self.assertEqual(len(ctx), 0)
+
+    def test_event_and_roster_changes_invalidate(self):
+        self.assertEqual(self._schedule_titles(), ['Tomorrow'])
+
+        self._event(self.mine, 'Day after', days=2)
+        self.assertEqual(self._schedule_titles(), ['Tomorrow', 'Day after'])
+
+        self.mine.students.remove(self.student)
+        self.assertEqual(self._schedule_titles(), [])
+
+
+class SnippetAssetPublishTests(TestCase):
+    URL = 'https://storage.googleapis.com/bucket/css-files/snippet-styles.css'
+
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username='snippet-student@example.com',
+            email='snippet-student@example.com',
+            password='pass',
+            role='student',
+            firebase_uid='snippet-student-uid',
+        )
+        self.snippet = CodeSnippet.objects.create(
+            student=self.student, title='Styles', language='css', code='h1 {}', css_file_url=self.URL
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.detail_url = f'/api/student/code-snippets/{self.snippet.id}/'
+
+    def _patch(self, code):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.detail_url, {'code': code}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['css_file_url'], self.URL)
+
+    @override_settings(SNIPPET_ASSET_PUBLISH_DELAY_SECONDS=0)
+    @patch('student.css_upload_utils.update_css_in_gcp', return_value=(URL, 'css-files/snippet-styles.css'))
+    def test_unchanged_content_skips_upload(self, update):
+        self._patch('h1 { color: red; }')
+        self._patch('h1 { color: red; }')
+        self.assertEqual(update.call_count, 1)
+        self._patch('h1 { color: blue; }')
+        self.assertEqual(update.call_count, 2)
+        update.assert_called_with(self.URL, 'h1 { color: blue; }')
+
+    @override_settings(SNIPPET_ASSET_PUBLISH_DELAY_SECONDS=60)
+    @patch('student.services.snippet_assets._drainer')
+    @patch('student.css_upload_utils.update_css_in_gcp', return_value=(URL, 'css-files/snippet-styles.css'))
+    def test_rapid_saves_coalesce_into_one_deferred_upload(self, update, drainer):
+        self._patch('a {}')
+        first_due = CodeSnippet.objects.get(pk=self.snippet.pk).asset_publish_due_at
+        self._patch('b {}')
+        self.assertEqual(CodeSnippet.objects.get(pk=self.snippet.pk).asset_publish_due_at, first_due)
+        self.assertEqual(drainer.kick.call_count, 2)
+        self.assertEqual(snippet_assets.drain_pending_publishes(), {'published': 0, 'due': 0})
+        self.assertEqual(update.call_count, 0)
+
+        with patch('student.services.snippet_assets.timezone.now', return_value=first_due):
+            self.assertEqual(snippet_assets.drain_pending_publishes(), {'published': 1, 'due': 1})
+        update.assert_called_once_with(self.URL, 'b {}')
+        self.assertIsNone(CodeSnippet.objects.get(pk=self.snippet.pk).asset_publish_due_at)
+
+    @override_settings(SNIPPET_ASSET_PUBLISH_DELAY_SECONDS=0)
+    @patch('student.css_upload_utils.upload_css_to_gcp', return_value=(None, None))
+    @patch('student.css_upload_utils.update_css_in_gcp', return_value=(None, None))
+    def test_failed_publish_stays_pending_with_backoff(self, update, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.detail_url, {'code': 'c {}'}, format='json')
+        snippet = CodeSnippet.objects.get(pk=self.snippet.pk)
+        self.assertEqual(snippet.asset_publish_attempts, 1)
+        self.assertGreater(snippet.asset_publish_due_at, timezone.now())
+
+        update.return_value = (self.URL, 'css-files/snippet-styles.css')
+        with patch('student.services.snippet_assets.timezone.now', return_value=snippet.asset_publish_due_at):
+            self.assertEqual(snippet_assets.drain_pending_publishes()['published'], 1)
+        snippet.refresh_from_db()
+        self.assertEqual((snippet.asset_publish_due_at, snippet.asset_publish_attempts), (None, 0))
 
-# Create your tests here.
@@ -10,6 +10,8 @@ from django.core.files.base import ContentFile
 from django.conf import settings
 import logging
 
+from backend.clients import get_client
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -85,19 +87,10 @@ def upload_text_to_gcp(text_content, title=None, snippet_id=None):
 
         if snippet_id and GCS_CLIENT_AVAILABLE:
             try:
-                if hasattr(settings, 'GS_CREDENTIALS') and settings.GS_CREDENTIALS:
-                    if isinstance(settings.GS_CREDENTIALS, str):
-                        client = storage.Client.from_service_account_json(
-                            settings.GS_CREDENTIALS,
-                            project=settings.GS_PROJECT_ID
-                        )
-                    else:
-                        client = storage.Client(
-                            credentials=settings.GS_CREDENTIALS,
-                            project=settings.GS_PROJECT_ID
-                        )
-                else:
-                    client = storage.Client(project=settings.GS_PROJECT_ID)
+                # Shared process-wide GCS client (backend.clients)
+                client = get_client('gcs')
+                if client is None:
+                    raise RuntimeError("GCS client not available")
 
                 bucket = client.bucket(settings.GS_BUCKET_NAME)
                 blob = bucket.blob(storage_path)
@@ -203,19 +196,10 @@ def update_text_in_gcp(text_file_url, text_content):
 
     if GCS_CLIENT_AVAILABLE:
         try:
-            if hasattr(settings, 'GS_CREDENTIALS') and settings.GS_CREDENTIALS:
-                if isinstance(settings.GS_CREDENTIALS, str):
-                    client = storage.Client.from_service_account_json(
-                        settings.GS_CREDENTIALS,
-                        project=settings.GS_PROJECT_ID
-                    )
-                else:
-                    client = storage.Client(
-                        credentials=settings.GS_CREDENTIALS,
-                        project=settings.GS_PROJECT_ID
-                    )
-            else:
-                client = storage.Client(project=settings.GS_PROJECT_ID)
+            # Shared process-wide GCS client (backend.clients)
+            client = get_client('gcs')
+            if client is None:
+                raise RuntimeError("GCS client not available")
 
             bucket = client.bucket(settings.GS_BUCKET_NAME)
             blob = bucket.blob(file_path)
@@ -17,6 +17,8 @@ import logging
 import re
 
 from .models import EnrolledCourse, StudentLessonProgress, LessonAssessment, TeacherAssessment, QuizQuestionFeedback, QuizAttemptFeedback, Conversation, Message, CodeSnippet
+from .services.timeline import get_student_timeline
+from .services import snippet_assets
 from teacher.utils import FileUploadService
 from ai.api_errors import ai_error_response
 from courses.permissions import (
@@ -1454,84 +1456,53 @@ class StudentScheduleView(APIView):
                 total_events = 0
                 all_event_dates = []
                 
+                # Events from 7 days ago, grouped by active class (course title, class name order).
+                shown_from = timezone.now() - timezone.timedelta(days=7)
+                events_by_class = {}
+                for event in get_student_timeline(student_user).events:
+                    if event.class_is_active and event.start_time and event.start_time >= shown_from:
+                        events_by_class.setdefault(event.class_id, []).append(event)
+
                 for index, enrollment in enumerate(enrollments):
-                    try:
-                        # Get classes for this course - only classes the student is enrolled in
-                        classes = Class.objects.filter(
-                            course=enrollment.course,
-                            students=student_user,  # Only classes where this student is enrolled
-                            is_active=True
-                        ).select_related('course')
-                        
-                        for class_instance in classes:
-                            try:
-                                # Get events for this class
-                                events = ClassEvent.objects.filter(
-                                    class_instance=class_instance,
-                                    start_time__gte=timezone.now() - timezone.timedelta(days=7)  # Show events from 7 days ago
-                                ).select_related('lesson').order_by('start_time')
-                                
-                                if events.exists():
-                                    # Assign color to this class
-                                    color_index = (index + len(classes_with_events)) % len(color_palette)
-                                    colors = color_palette[color_index]
-                                    
-                                    # Convert events to schedule format
-                                    schedule_events = []
-                                    for event in events:
-                                        try:
-                                            # Get lesson_id - check both direct relationship and any alternative fields
-                                            lesson_id = None
-                                            if hasattr(event, 'lesson') and event.lesson:
-                                                lesson_id = str(event.lesson.id)
-                                            elif hasattr(event, 'lesson_id') and event.lesson_id:
-                                                lesson_id = str(event.lesson_id)
-                                            
-                                            schedule_event = {
-                                                'id': str(event.id),
-                                                'title': event.title,
-                                                'start': event.start_time.isoformat() if event.start_time else None,
-                                                'end': event.end_time.isoformat() if event.end_time else (
-                                                    event.start_time.isoformat() if event.start_time else None
-                                                ),
-                                                'all_day': bool(getattr(event, 'all_day', False)),
-                                                'description': event.description or '',
-                                                'event_type': event.event_type,
-                                                'lesson_id': lesson_id,
-                                                'meeting_platform': event.meeting_platform,
-                                                'meeting_link': event.meeting_link,
-                                                'meeting_id': event.meeting_id,
-                                                'meeting_password': event.meeting_password,
-                                                'backgroundColor': colors['bg'],
-                                                'borderColor': colors['border'],
-                                                'textColor': colors['text'],
-                                            }
-                                            schedule_events.append(schedule_event)
-                                            total_events += 1
-                                            all_event_dates.extend([event.start_time, event.end_time])
-                                            
-                                        except Exception as e:
-                                            print(f"⚠️ Error serializing event {event.id if hasattr(event, 'id') else 'unknown'}: {str(e)}")
-                                            import traceback
-                                            traceback.print_exc()
-                                            continue
-                                    
-                                    # Add class with events
-                                    class_with_events = {
-                                        'id': str(class_instance.id),
-                                        'name': class_instance.name,
-                                        'course_name': class_instance.course.title,
-                                        'color': colors['bg'],
-                                        'events': schedule_events
-                                    }
-                                    classes_with_events.append(class_with_events)
-                                    
-                            except Exception as e:
-                                continue
-                                
-                    except Exception as e:
-                        continue
-                
+                    course_classes = sorted(
+                        (events for events in events_by_class.values() if events[0].course_id == enrollment.course_id),
+                        key=lambda events: (events[0].course_title, events[0].class_name),
+                    )
+                    for events in course_classes:
+                        # Assign color to this class
+                        color_index = (index + len(classes_with_events)) % len(color_palette)
+                        colors = color_palette[color_index]
+
+                        schedule_events = []
+                        for event in events:
+                            schedule_events.append({
+                                'id': str(event.id),
+                                'title': event.title,
+                                'start': event.start_time.isoformat(),
+                                'end': (event.end_time or event.start_time).isoformat(),
+                                'all_day': event.all_day,
+                                'description': event.description or '',
+                                'event_type': event.event_type,
+                                'lesson_id': str(event.lesson_id) if event.lesson_id else None,
+                                'meeting_platform': event.meeting_platform,
+                                'meeting_link': event.meeting_link,
+                                'meeting_id': event.meeting_id,
+                                'meeting_password': event.meeting_password,
+                                'backgroundColor': colors['bg'],
+                                'borderColor': colors['border'],
+                                'textColor': colors['text'],
+                            })
+                            total_events += 1
+                            all_event_dates.extend([event.start_time, event.end_time])
+
+                        classes_with_events.append({
+                            'id': str(events[0].class_id),
+                            'name': events[0].class_name,
+                            'course_name': events[0].course_title,
+                            'color': colors['bg'],
+                            'events': schedule_events,
+                        })
+
             except Exception as e:
                 return Response(
                     {'error': 'Failed to fetch classes and events', 'details': str(e)},
@@ -1665,41 +1636,31 @@ class DashboardOverview(APIView):
         OPTIMIZED: Fetch all dashboard data in a single query set
         Returns a dictionary with all the data needed for dashboard
         """
-        try:
-            current_time = timezone.now()
-            
-            # Get all enrollments with related data in one query
-            enrollments = EnrolledCourse.objects.filter(
-                student_profile=student_profile,
-                status='active'
-            ).select_related('course').prefetch_related(
-                'course__lessons',
-                Prefetch(
-                    'lesson_progress',
-                    queryset=StudentLessonProgress.objects.select_related('lesson'),
-                ),
-            )
-            
-            # Get all class events for enrolled courses in one query
-            # Only get events from classes the student is enrolled in (not all classes in the course)
-            course_ids = [enrollment.course.id for enrollment in enrollments]
-            class_events = ClassEvent.objects.filter(
-                class_instance__course_id__in=course_ids,
-                class_instance__students=student_profile.user  # Only classes where this student is enrolled
-            ).select_related('class_instance', 'lesson', 'project', 'project_platform')
-            
-            return {
-                'enrollments': enrollments,
-                'class_events': class_events,
-                'current_time': current_time,
-                'student_profile': student_profile
-            }
-        except Exception as e:
-            print(f"🔍 DEBUG: Error in _get_dashboard_data: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise e
-    
+        current_time = timezone.now()
+
+        # Get all enrollments with related data in one query
+        enrollments = EnrolledCourse.objects.filter(
+            student_profile=student_profile,
+            status='active'
+        ).select_related('course').prefetch_related(
+            'course__lessons',
+            Prefetch(
+                'lesson_progress',
+                queryset=StudentLessonProgress.objects.select_related('lesson'),
+            ),
+        )
+
+        # Class events from classes the student is on (not all classes in the course),
+        # shared with the schedule and parent dashboard.
+        class_events = get_student_timeline(student_profile.user).events
+
+        return {
+            'enrollments': enrollments,
+            'class_events': class_events,
+            'current_time': current_time,
+            'student_profile': student_profile
+        }
+
     def _get_statistics_from_data(self, dashboard_data):
         """Get statistics from cached dashboard data"""
         enrollments = dashboard_data['enrollments']
@@ -1743,97 +1704,53 @@ class DashboardOverview(APIView):
         enrollments = dashboard_data['enrollments']
         class_events = dashboard_data['class_events']
         current_time = dashboard_data['current_time']
-        
-        print(f"🔍 DEBUG: Getting continue learning lessons from ClassEvent model only")
-        print(f"🔍 DEBUG: Found {enrollments.count()} active enrollments")
-        print(f"🔍 DEBUG: Found {class_events.count()} total class events")
-        print(f"🔍 DEBUG: Current time: {current_time}")
-        
+
+        # Filter continue learning lessons by date only (not time): these are not live
+        # classes, so students can access them anytime during the day. Dates are UTC
+        # dates; past dates (yesterday and earlier) are excluded.
+        today_date = current_time.date()
+
         continue_learning_lessons = []
-        
+
         for enrollment in enrollments:
-            print(f"🔍 DEBUG: Processing course: {enrollment.course.title} (ID: {enrollment.course.id})")
-            
-            # First, let's see ALL class events for this course
-            all_course_events = class_events.filter(
-                class_instance__course=enrollment.course
-            )
-            print(f"🔍 DEBUG: Total class events for course {enrollment.course.title}: {all_course_events.count()}")
-            
-            for event in all_course_events:
-                print(f"🔍 DEBUG: - Event: {event.title}, Event Type: {event.event_type}, Lesson Type: {event.lesson_type}, Start: {event.start_time}")
-            
-            # Filter continue learning lessons by date only (not time)
-            # Since these are not live classes, students can access them anytime during the day
-            # Use date-only comparison to avoid timezone issues
-            # IMPORTANT: We need to compare dates correctly - exclude past dates (yesterday and earlier)
-            # Django's __date lookup extracts date in database timezone (UTC), so we compare UTC dates
-            base_filter = {
-                'class_instance__course': enrollment.course,
-                'event_type': 'lesson',
-                'lesson_type__in': ['video', 'audio', 'text', 'interactive']
-            }
-            
-            # Get today's date in UTC (since Django stores datetimes in UTC)
-            # This ensures we're comparing dates correctly
-            today_date = current_time.date()
-            
-            if user_settings['show_today_only']:
-                # Show all lessons scheduled for today (date match only, regardless of time)
-                # Use date comparison: extract date from start_time and compare
-                time_filter = {
-                    'start_time__date': today_date
-                }
-                print(f"🔍 DEBUG: Continue learning - Filtering for TODAY ONLY (date={today_date}, current_time={current_time}, time-independent)")
-            else:
-                # Show all lessons from today onwards (date comparison only)
-                # CRITICAL: Exclude past dates - only show today and future dates
-                # Use date comparison: start_time date >= today's date
-                # This ensures lessons from yesterday (Nov 19) don't show if today is Nov 20
-                time_filter = {
-                    'start_time__date__gte': today_date
-                }
-                print(f"🔍 DEBUG: Continue learning - Filtering for ALL UPCOMING lessons (date>={today_date}, current_time={current_time}, excludes past dates)")
-            
-            # Soonest incomplete scheduled lesson for this course (one card per enrollment).
-            course_events = class_events.filter(
-                **base_filter,
-                **time_filter
-            ).order_by('start_time')[:20]
-            
-            print(f"🔍 DEBUG: Found {course_events.count()} non-live class events for course {enrollment.course.title}")
-            
+            course_events = [
+                event for event in class_events
+                if event.course_id == enrollment.course_id
+                and event.event_type == 'lesson'
+                and event.lesson_type in ('video', 'audio', 'text', 'interactive')
+                and event.start_time
+                and (
+                    # Show all lessons scheduled for today, or all lessons from today onwards
+                    event.start_time.date() == today_date
+                    if user_settings['show_today_only']
+                    else event.start_time.date() >= today_date
+                )
+            ][:20]
+
             completed_lesson_ids = {
                 p.lesson_id
                 for p in enrollment.lesson_progress.all()
                 if p.status == 'completed'
             }
 
+            # Soonest incomplete scheduled lesson for this course (one card per enrollment).
             for event in course_events:
-                print(f"🔍 DEBUG: Processing class event: {event.title} (Type: {event.lesson_type}, Start: {event.start_time})")
-
-                if not event.lesson_id:
-                    print(f"🔍 DEBUG: Skipping event without linked lesson: {event.title}")
+                if not event.lesson_id or event.lesson_id in completed_lesson_ids:
                     continue
 
-                if event.lesson_id in completed_lesson_ids:
-                    print(f"🔍 DEBUG: Skipping completed lesson event: {event.title}")
-                    continue
-                
                 # Get actual course lesson count (more reliable than enrollment.total_lessons_count)
                 actual_course_lessons = enrollment.course.lessons.count()
-                
-                # Create lesson data based on event type
+
                 lesson_data = {
-                    'id': event.lesson.id,
-                    'lesson_id': event.lesson.id,
+                    'id': event.lesson_id,
+                    'lesson_id': event.lesson_id,
                     'event_id': event.id,
                     'title': event.title,
                     'type': event.lesson_type,
                     'course_title': enrollment.course.title,
                     'course_id': enrollment.course.id,
                     'duration': event.duration_minutes,
-                    'media_url': f"/lessons/{event.lesson.id}",
+                    'media_url': f"/lessons/{event.lesson_id}",
                     'description': event.description[:100] + '...' if event.description and len(event.description) > 100 else event.description,
                     'start_time': event.start_time,  # Use actual event start time
                     'progress_percentage': float(enrollment.progress_percentage),  # Get real progress from enrollment
@@ -1843,101 +1760,63 @@ class DashboardOverview(APIView):
                     'is_completed': False,
                     'status': 'current' if enrollment.current_lesson_id == event.lesson_id else 'upcoming',
                 }
-                
-                print(f"🔍 DEBUG: Continue Learning Lesson Data: {lesson_data}")
-                print(f"🔍 DEBUG: Enrollment data - total_lessons_count: {enrollment.total_lessons_count}, completed_lessons_count: {enrollment.completed_lessons_count}, progress_percentage: {enrollment.progress_percentage}")
-                
-                # Add interactive_type for interactive lessons
-                if event.lesson_type == 'interactive':
-                    lesson_data['interactive_type'] = getattr(event, 'interactive_type', 'general')
-                
+
                 # Use appropriate serializer based on lesson type
                 if event.lesson_type in ['video', 'audio']:
                     serializer = AudioVideoLessonSerializer(data=lesson_data)
                 elif event.lesson_type == 'text':
                     serializer = TextLessonSerializer(data=lesson_data)
-                elif event.lesson_type == 'interactive':
-                    serializer = InteractiveLessonSerializer(data=lesson_data)
                 else:
-                    print(f"🔍 DEBUG: Unknown lesson type: {event.lesson_type}")
-                    continue
-                
+                    lesson_data['interactive_type'] = 'general'
+                    serializer = InteractiveLessonSerializer(data=lesson_data)
+
                 if serializer.is_valid():
-                    print(f"🔍 DEBUG: {event.lesson_type} lesson added (one per course): {event.title}")
                     continue_learning_lessons.append(serializer.data)
                     break  # One Continue Learning card per enrollment/course
-                else:
-                    print(f"🔍 DEBUG: {event.lesson_type} lesson serializer invalid: {serializer.errors}")
-        
+
         # Sort all lessons by start_time (earliest first)
         continue_learning_lessons.sort(key=lambda x: x.get('start_time', current_time))
-        
-        print(f"🔍 DEBUG: Final continue learning lessons count: {len(continue_learning_lessons)}")
-        print(f"🔍 DEBUG: Lessons sorted by start_time, returning top {min(user_settings['continue_learning_limit'], len(continue_learning_lessons))} lessons")
-        
+
         return continue_learning_lessons[:user_settings['continue_learning_limit']]  # Return user's configured limit
-    
+
     def _get_live_lessons_from_data(self, dashboard_data, user_settings):
         """Get live lessons from cached dashboard data - sorted by time"""
         enrollments = dashboard_data['enrollments']
         class_events = dashboard_data['class_events']
         current_time = dashboard_data['current_time']
-        
-        print(f"🔍 DEBUG: Getting live lessons from ClassEvent model")
-        print(f"🔍 DEBUG: Current time: {current_time}")
-        
+
+        today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = current_time.replace(hour=23, minute=59, second=59, microsecond=999999)
+
         live_lessons = []
-        
-        for enrollment in enrollments:
-            print(f"🔍 DEBUG: Processing course for live lessons: {enrollment.course.title}")
 
+        for enrollment in enrollments:
             # Self-paced study blocks belong on Calendar / Course Schedule, not Enter Class.
             if getattr(enrollment.course, 'delivery_type', 'live') == 'self_paced':
                 continue
-            
-            # Filter to only show upcoming/ongoing events (not past events)
-            # Use end_time__gt to include events that haven't ended yet
-            # This matches the parent dashboard filtering approach (line 3286)
+
+            # Only upcoming/ongoing events (end_time > now), optionally only those starting today.
             # Require current Lesson.type to still be live_class (ignore stale ClassEvent.lesson_type).
-            base_filter = {
-                'class_instance__course': enrollment.course,
-                'event_type': 'lesson',
-                'lesson_type': 'live',
-                'lesson__isnull': False,
-                'lesson__type': 'live_class',
-            }
-            
-            # Always filter by end_time > current_time to exclude past events
-            # This ensures only ongoing or future events are shown
-            time_filter = {
-                'end_time__gt': current_time  # Only include events that haven't ended yet
-            }
-            
-            if user_settings['show_today_only']:
-                # Additionally filter to show only today's events
-                today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-                today_end = current_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-                time_filter['start_time__gte'] = today_start
-                time_filter['start_time__lte'] = today_end
-                print(f"🔍 DEBUG: Live lessons - Filtering for TODAY ONLY (end_time > now): {today_start} to {today_end}")
-            else:
-                print(f"🔍 DEBUG: Live lessons - Filtering for ALL UPCOMING events (end_time > now)")
-            
-            # Filter class events for this course
-            course_events = class_events.filter(
-                **base_filter,
-                **time_filter
-            ).order_by('start_time')[:5]  # Get more events per course for better selection
-            
-            print(f"🔍 DEBUG: Found {course_events.count()} live events for course {enrollment.course.title}")
-            
+            course_events = [
+                event for event in class_events
+                if event.course_id == enrollment.course_id
+                and event.event_type == 'lesson'
+                and event.lesson_type == 'live'
+                and event.lesson_id is not None
+                and event.lesson_kind == 'live_class'
+                and event.end_time and event.end_time > current_time
+                and (
+                    not user_settings['show_today_only']
+                    or (event.start_time and today_start <= event.start_time <= today_end)
+                )
+            ][:5]  # Get more events per course for better selection
+
             for event in course_events:
-                print(f"🔍 DEBUG: Processing live event: {event.title} (Start: {event.start_time})")
                 lesson_data = {
                     'id': event.id,
                     'title': event.title,
                     'course_title': enrollment.course.title,
-                    'class_name': event.class_instance.name,
+                    'class_name': event.class_name,
                     'start_time': event.start_time.isoformat(),
                     'end_time': event.end_time.isoformat(),
                     'meeting_platform': event.meeting_platform,
@@ -1946,126 +1825,68 @@ class DashboardOverview(APIView):
                     'meeting_password': event.meeting_password,
                     'description': event.description
                 }
-                
+
                 serializer = LiveLessonSerializer(data=lesson_data)
                 if serializer.is_valid():
-                    print(f"🔍 DEBUG: Live lesson added: {event.title}")
                     live_lessons.append(serializer.data)
-                else:
-                    print(f"🔍 DEBUG: Live lesson serializer invalid: {serializer.errors}")
-        
+
         # Sort all live lessons by start_time (earliest first)
         live_lessons.sort(key=lambda x: x['start_time'])
-        
-        print(f"🔍 DEBUG: Final live lessons count: {len(live_lessons)}")
-        print(f"🔍 DEBUG: Live lessons sorted by start_time, returning top {min(user_settings['live_lessons_limit'], len(live_lessons))} lessons")
-        
+
         return live_lessons[:user_settings['live_lessons_limit']]  # Return user's configured limit
-    
+
     def _get_upcoming_projects_from_data(self, dashboard_data, user_settings):
         """Get upcoming projects from cached dashboard data - sorted by due date"""
         enrollments = dashboard_data['enrollments']
         class_events = dashboard_data['class_events']
         current_time = dashboard_data['current_time']
-        
-        print(f"🔍 DEBUG: Getting upcoming projects from ClassEvent model")
-        print(f"🔍 DEBUG: Current time: {current_time}")
-        
+
+        today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = current_time.replace(hour=23, minute=59, second=59, microsecond=999999)
+        show_today_only = user_settings.get('show_today_only', False)
+
         upcoming_projects = []
-        
+
         for enrollment in enrollments:
-            print(f"🔍 DEBUG: Processing course for projects: {enrollment.course.title}")
-            
-            # Filter to only show upcoming/not overdue projects
-            # Use due_date__gt to include projects that haven't passed their due date
-            base_filter = {
-                'class_instance__course': enrollment.course,
-                'event_type': 'project',
-                'due_date__isnull': False  # Only include projects with due dates
-            }
-            
-            # Always filter by due_date > current_time to exclude overdue projects
-            # This ensures only upcoming or due soon projects are shown
-            time_filter = {
-                'due_date__gt': current_time  # Only include projects that haven't passed due date
-            }
-            
-            if user_settings.get('show_today_only', False):
-                # Additionally filter to show only today's projects
-                today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-                today_end = current_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-                time_filter['due_date__gte'] = today_start
-                time_filter['due_date__lte'] = today_end
-                print(f"🔍 DEBUG: Projects - Filtering for TODAY ONLY (due_date > now): {today_start} to {today_end}")
-            else:
-                print(f"🔍 DEBUG: Projects - Filtering for ALL UPCOMING projects (due_date > now)")
-            
-            # Filter class events for this course
-            course_events = class_events.filter(
-                **base_filter,
-                **time_filter
-            ).order_by('due_date')[:5]  # Get more events per course for better selection
-            
-            print(f"🔍 DEBUG: Found {course_events.count()} project events for course {enrollment.course.title}")
-            
+            # Only projects that haven't passed their due date, optionally only those due today.
+            course_events = sorted(
+                (
+                    event for event in class_events
+                    if event.course_id == enrollment.course_id
+                    and event.event_type == 'project'
+                    and event.due_date is not None
+                    and event.due_date > current_time
+                    and (not show_today_only or today_start <= event.due_date <= today_end)
+                ),
+                key=lambda event: event.due_date,
+            )[:5]  # Get more events per course for better selection
+
             for event in course_events:
-                print(f"🔍 DEBUG: Processing project event: {event.title} (Due: {event.due_date})")
-                
-                # Get project title - prefer event title, fallback to project title
-                project_title = event.title
-                if not project_title and event.project:
-                    project_title = event.project.title
-                
-                # Get submission type - prefer event submission_type, fallback to project
-                submission_type_obj = event.submission_type
-                if not submission_type_obj and event.project:
-                    submission_type_obj = event.project.submission_type
-                
-                # Convert SubmissionType object to string (name field)
-                submission_type = submission_type_obj.name if submission_type_obj else None
-                
-                # Get points from project
-                points = 0
-                if event.project:
-                    points = event.project.points
-                
                 project_data = {
                     'id': str(event.id),
-                    'title': project_title or 'Untitled Project',
+                    # Prefer event title, fallback to project title
+                    'title': event.title or event.project_name or 'Untitled Project',
                     'course_title': enrollment.course.title,
                     'course_id': str(enrollment.course.id),
-                    'class_name': event.class_instance.name,
+                    'class_name': event.class_name,
                     'due_date': event.due_date.isoformat(),
-                    'project_id': event.project.id if event.project else None,
-                    'project_platform': None,
-                    'submission_type': submission_type,
-                    'points': points,
+                    'project_id': event.project_id,
+                    'project_platform': event.project_platform,
+                    # Event submission type, falling back to the project's
+                    'submission_type': event.submission_type,
+                    'points': event.project_points or 0,
                     'description': event.description
                 }
-                
-                # Add project platform if available
-                if event.project_platform:
-                    project_data['project_platform'] = {
-                        'id': str(event.project_platform.id),
-                        'name': event.project_platform.name,
-                        'display_name': event.project_platform.display_name,
-                        'base_url': event.project_platform.base_url
-                    }
-                
                 upcoming_projects.append(project_data)
-                print(f"🔍 DEBUG: Project added: {project_title}")
-        
+
         # Sort all projects by due_date (earliest first)
         upcoming_projects.sort(key=lambda x: x['due_date'])
-        
+
         # Get limit from settings (default to 5 if not set)
         projects_limit = user_settings.get('upcoming_projects_limit', 5)
-        
-        print(f"🔍 DEBUG: Final upcoming projects count: {len(upcoming_projects)}")
-        print(f"🔍 DEBUG: Projects sorted by due_date, returning top {min(projects_limit, len(upcoming_projects))} projects")
-        
+
         return upcoming_projects[:projects_limit]  # Return user's configured limit
-    
+
     def _get_recent_achievements_from_data(self, dashboard_data):
         """Get recent achievements from cached dashboard data"""
         # Placeholder - would implement achievement logic
@@ -4017,14 +3838,14 @@ class ParentDashboardView(APIView):
         Returns tasks within a date range (1 day past to 7 days future) for frontend filtering.
         Frontend will filter by local timezone to show only ongoing/future tasks.
         """
-        from courses.models import ClassEvent, Assignment, AssignmentSubmission
+        from courses.models import Assignment, AssignmentSubmission
         from student.models import StudentLessonProgress
         from django.utils import timezone
         from django.db.models import Q, Exists, OuterRef
         from datetime import timedelta
         
         tasks = []
-        enrolled_course_ids = [enrollment.course.id for enrollment in enrolled_courses]
+        enrolled_course_ids = {enrollment.course_id for enrollment in enrolled_courses}
         now_utc = timezone.now()
         
         # Calculate date range: 1 day in the past to 7 days in the future
@@ -4033,39 +3854,31 @@ class ParentDashboardView(APIView):
         past_threshold = now_utc - timedelta(days=1)
         future_threshold = now_utc + timedelta(days=7)
         
-        # 1. Get ClassEvents from enrolled courses
-        # Query all event types (lesson, meeting, project, break) from classes in enrolled courses
-        # Only include events where student is enrolled in the class
+        # 1. ClassEvents on the student's class rosters in enrolled courses (shared timeline)
         # Filter by date range (not strict filtering - frontend will filter by local timezone):
         #   - For projects: due_date within range (past_threshold to future_threshold)
-        #   - For other events: end_time within range (past_threshold to future_threshold)
-        #   Note: We use end_time >= past_threshold to include events that might still be ongoing
-        #   in different timezones, and start_time <= future_threshold to include upcoming events
-        class_events = ClassEvent.objects.filter(
-            class_instance__course_id__in=enrolled_course_ids,
-            class_instance__students=student_profile.user
-        ).filter(
-            Q(
-                event_type='project',
-                due_date__gte=past_threshold,
-                due_date__lte=future_threshold
-            ) |
-            Q(
-                event_type__in=['lesson', 'meeting', 'break'],
-                end_time__gte=past_threshold,
-                start_time__lte=future_threshold
-            )
-        ).select_related('class_instance', 'class_instance__course', 'lesson', 'project')
-        
+        #   - For lesson/meeting/break: end_time >= past_threshold and start_time <= future_threshold,
+        #     to include events that might still be ongoing in different timezones
+        class_events = []
+        for event in get_student_timeline(student_profile.user).events:
+            if event.course_id not in enrolled_course_ids:
+                continue
+            if event.event_type == 'project':
+                if event.due_date and past_threshold <= event.due_date <= future_threshold:
+                    class_events.append(event)
+            elif event.event_type in ('lesson', 'meeting', 'break'):
+                if event.end_time and event.start_time and event.end_time >= past_threshold and event.start_time <= future_threshold:
+                    class_events.append(event)
+
         for event in class_events:
-            course_title = event.class_instance.course.title if event.class_instance and event.class_instance.course else 'Unknown Course'
+            course_title = event.course_title
             task_title = event.title
             
             # For project events, use project title if available
             if event.event_type == 'project' and event.project_title:
                 task_title = event.project_title
-            elif event.event_type == 'project' and event.project:
-                task_title = event.project.title
+            elif event.event_type == 'project' and event.project_name:
+                task_title = event.project_name
             
             # For project events, use due_date
             # For other events (lesson, meeting, break), use start_time and end_time
@@ -4087,7 +3900,7 @@ class ParentDashboardView(APIView):
                         'event_type': event.event_type,
                         'title': task_title,
                         'course_name': course_title,
-                        'course_id': str(event.class_instance.course.id) if event.class_instance and event.class_instance.course else None,
+                        'course_id': str(event.course_id),
                         'due_date': due_date_iso,
                         'start_time': None,
                         'end_time': None,
@@ -4120,7 +3933,7 @@ class ParentDashboardView(APIView):
                     'event_type': event.event_type,
                     'title': task_title,
                     'course_name': course_title,
-                    'course_id': str(event.class_instance.course.id) if event.class_instance and event.class_instance.course else None,
+                    'course_id': str(event.course_id),
                     'due_date': start_time_iso,  # Use start_time for sorting
                     'start_time': start_time_iso,
                     'end_time': end_time_iso,
@@ -5349,85 +5162,24 @@ class CodeSnippetDetailView(APIView):
                 css_file_url = None
                 text_file_url = None
                 
-                # Determine if we need to update CSS in GCP
-                needs_css_upload = False
-                if language == 'css':
-                    needs_css_upload = True  # Full update always includes code
+                # CSS / text snippets are mirrored to GCS. The first publish is
+                # synchronous (the client needs the URL); later changes are
+                # published after commit by snippet_assets, coalesced per snippet.
+                needs_css_upload = language == 'css'  # Full update always includes code
+                needs_text_upload = language == 'text'
                 
-                if needs_css_upload:
-                    # Import CSS upload utility
-                    from .css_upload_utils import upload_css_to_gcp, update_css_in_gcp
-                    
+                if needs_css_upload and not snippet.css_file_url:
                     css_content = serializer.validated_data.get('code', '')
                     title = serializer.validated_data.get('title', '')
-                    
-                    # If CSS file already exists, update it in place (preserves URL)
-                    # Otherwise, create a new one
-                    if snippet.css_file_url:
-                        # Update existing CSS file in GCP (preserves the same URL)
-                        css_file_url, saved_path = update_css_in_gcp(snippet.css_file_url, css_content)
-                        
-                        if css_file_url:
-                            # CSS updated successfully - URL remains the same
-                            pass
-                        else:
-                            # GCP update failed, try creating a new file as fallback
-                            import logging
-                            logger = logging.getLogger(__name__)
-                            logger.warning(f"Failed to update CSS in GCP, trying to create new file")
-                            css_file_url, saved_path = upload_css_to_gcp(css_content, title=title)
-                    else:
-                        # No existing CSS file, create a new one
-                        css_file_url, saved_path = upload_css_to_gcp(css_content, title=title)
-                    
-                    if css_file_url:
-                        # CSS uploaded/updated successfully
-                        pass
-                    else:
-                        # GCP upload/update failed, but we'll still save to database
-                        import logging
-                        logger = logging.getLogger(__name__)
-                        logger.warning(f"Failed to upload/update CSS to GCP for snippet update, but saving to database anyway")
-                
-                # Plain text (.txt) — mirror CSS GCP upload
-                needs_text_upload = False
-                if language == 'text':
-                    needs_text_upload = True
+                    css_file_url = snippet_assets.publish_asset(snippet, 'css', css_content, title)
+                    if not css_file_url:
+                        # GCP upload failed, but we'll still save to database
+                        logger.warning("Failed to upload CSS to GCP for snippet update, but saving to database anyway")
                 
-                if needs_text_upload:
-                    import logging
-                    from .text_upload_utils import (
-                        upload_text_to_gcp,
-                        update_text_in_gcp,
-                        delete_text_from_gcp,
-                    )
-                    logger = logging.getLogger(__name__)
-
+                if needs_text_upload and not snippet.text_file_url:
                     text_content = serializer.validated_data.get('code', snippet.code)
                     title = serializer.validated_data.get('title', snippet.title) or ''
-                    old_text_url = snippet.text_file_url
-                    text_file_url = None
-
-                    if old_text_url:
-                        text_file_url, saved_path = update_text_in_gcp(old_text_url, text_content)
-                        if not text_file_url:
-                            logger.warning(
-                                'Failed to update text in GCP, re-uploading with snippet id'
-                            )
-                            text_file_url, saved_path = upload_text_to_gcp(
-                                text_content,
-                                title=title,
-                                snippet_id=snippet.id,
-                            )
-                            if old_text_url and text_file_url and old_text_url != text_file_url:
-                                delete_text_from_gcp(old_text_url)
-                    else:
-                        text_file_url, saved_path = upload_text_to_gcp(
-                            text_content,
-                            title=title,
-                            snippet_id=snippet.id,
-                        )
-
+                    text_file_url = snippet_assets.publish_asset(snippet, 'text', text_content, title)
                     if not text_file_url:
                         return Response(
                             {
@@ -5440,12 +5192,11 @@ class CodeSnippetDetailView(APIView):
                 # Save the snippet
                 serializer.save()
                 
-                # If CSS was uploaded/updated, update the css_file_url field
                 if needs_css_upload and css_file_url:
-                    # Only update if URL changed (new file created) or if it was None before
-                    if snippet.css_file_url != css_file_url or not snippet.css_file_url:
-                        snippet.css_file_url = css_file_url
-                        snippet.save(update_fields=['css_file_url'])
+                    snippet.css_file_url = css_file_url
+                    snippet.save(update_fields=['css_file_url'])
+                elif needs_css_upload and snippet.css_file_url:
+                    snippet_assets.schedule_publish(snippet.id)
                 elif language != 'css' and snippet.css_file_url:
                     # Language changed away from CSS - delete GCP file and clear css_file_url
                     from .css_upload_utils import delete_css_from_gcp
@@ -5454,9 +5205,10 @@ class CodeSnippetDetailView(APIView):
                     snippet.save(update_fields=['css_file_url'])
                 
                 if needs_text_upload and text_file_url:
-                    if snippet.text_file_url != text_file_url or not snippet.text_file_url:
-                        snippet.text_file_url = text_file_url
-                        snippet.save(update_fields=['text_file_url'])
+                    snippet.text_file_url = text_file_url
+                    snippet.save(update_fields=['text_file_url'])
+                elif needs_text_upload and snippet.text_file_url:
+                    snippet_assets.schedule_publish(snippet.id)
                 elif language != 'text' and snippet.text_file_url:
                     from .text_upload_utils import delete_text_from_gcp
                     delete_text_from_gcp(snippet.text_file_url)
@@ -5474,8 +5226,6 @@ class CodeSnippetDetailView(APIView):
         except PermissionError as e:
             return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error updating code snippet: {e}", exc_info=True)
             return Response(
                 {'error': 'Failed to update code snippet', 'details': str(e)},
@@ -5484,9 +5234,6 @@ class CodeSnippetDetailView(APIView):
     
     def patch(self, request, code_id):
         """Partially update a code snippet"""
-        print(f"[VIEWS PATCH] ===== PATCH METHOD CALLED =====")
-        print(f"[VIEWS PATCH] code_id: {code_id}")
-        print(f"[VIEWS PATCH] request.data: {request.data}")
         try:
             if request.user.role not in ['student', 'teacher']:
                 return Response(
@@ -5495,8 +5242,6 @@ class CodeSnippetDetailView(APIView):
                 )
             
             snippet = self.get_object(code_id, request.user)
-            print(f"[VIEWS PATCH] snippet.language: {snippet.language}")
-            print(f"[VIEWS PATCH] snippet.css_file_url: {snippet.css_file_url}")
             serializer = CodeSnippetCreateUpdateSerializer(snippet, data=request.data, partial=True)
             
             if serializer.is_valid():
@@ -5504,108 +5249,26 @@ class CodeSnippetDetailView(APIView):
                 language = serializer.validated_data.get('language', snippet.language).lower()
                 css_file_url = None
                 text_file_url = None
-                print(f"[VIEWS PATCH] Language: {language}, snippet.language: {snippet.language}")
-                print(f"[VIEWS PATCH] serializer.validated_data keys: {list(serializer.validated_data.keys())}")
                 
-                # Determine if we need to update CSS in GCP
-                # Case 1: Language is being changed to CSS
-                # Case 2: Language is already CSS and code is being updated
-                needs_css_upload = False
-                if language == 'css':
-                    if 'code' in serializer.validated_data or 'language' in serializer.validated_data:
-                        needs_css_upload = True
-                        print(f"[VIEWS PATCH] needs_css_upload set to True because language is css and code/language in validated_data")
-                else:
-                    print(f"[VIEWS PATCH] needs_css_upload is False (language is {language})")
+                # Language changed to CSS/text, or CSS/text code changed. The first
+                # publish is synchronous; later changes are published after commit
+                # by snippet_assets, coalesced per snippet (IDE autosave).
+                touches_asset = 'code' in serializer.validated_data or 'language' in serializer.validated_data
+                needs_css_upload = language == 'css' and touches_asset
+                needs_text_upload = language == 'text' and touches_asset
                 
-                if needs_css_upload:
-                    print(f"[VIEWS PATCH] needs_css_upload is True")
-                    # Import CSS upload utility
-                    from .css_upload_utils import upload_css_to_gcp, update_css_in_gcp
-                    
+                if needs_css_upload and not snippet.css_file_url:
                     css_content = serializer.validated_data.get('code', snippet.code)
                     title = serializer.validated_data.get('title', snippet.title)
-                    print(f"[VIEWS PATCH] css_content length: {len(css_content) if css_content else 0}")
-                    print(f"[VIEWS PATCH] title: {title}")
-                    print(f"[VIEWS PATCH] snippet.css_file_url: {snippet.css_file_url}")
-                    
-                    # If CSS file already exists, update it in place (preserves URL)
-                    # Otherwise, create a new one
-                    if snippet.css_file_url:
-                        print(f"[VIEWS PATCH] css_file_url exists, calling update_css_in_gcp")
-                        # Update existing CSS file in GCP (preserves the same URL)
-                        css_file_url, saved_path = update_css_in_gcp(snippet.css_file_url, css_content)
-                        print(f"[VIEWS PATCH] update_css_in_gcp returned: css_file_url={css_file_url}, saved_path={saved_path}")
-                        
-                        if css_file_url:
-                            # CSS updated successfully - URL remains the same
-                            print(f"[VIEWS PATCH] CSS updated successfully, URL: {css_file_url}")
-                            pass
-                        else:
-                            # GCP update failed, try creating a new file as fallback
-                            print(f"[VIEWS PATCH] GCP update failed, trying to create new file")
-                            css_file_url, saved_path = upload_css_to_gcp(css_content, title=title)
-                            print(f"[VIEWS PATCH] upload_css_to_gcp returned: css_file_url={css_file_url}, saved_path={saved_path}")
-                    else:
-                        # No existing CSS file, create a new one
-                        print(f"[VIEWS PATCH] No css_file_url, creating new file")
-                        css_file_url, saved_path = upload_css_to_gcp(css_content, title=title)
-                        print(f"[VIEWS PATCH] upload_css_to_gcp returned: css_file_url={css_file_url}, saved_path={saved_path}")
-                    
-                    if css_file_url:
-                        # CSS uploaded/updated successfully
-                        pass
-                    else:
-                        # GCP upload/update failed, but we'll still save to database
-                        # Log warning but don't fail the request
-                        import logging
-                        logger = logging.getLogger(__name__)
-                        logger.warning(f"Failed to upload/update CSS to GCP for snippet update, but saving to database anyway")
-                
-                # Plain text — mirror CSS PATCH logic
-                needs_text_upload = False
-                if language == 'text':
-                    if 'code' in serializer.validated_data or 'language' in serializer.validated_data:
-                        needs_text_upload = True
-                        print(f"[VIEWS PATCH] needs_text_upload set to True (language is text)")
+                    css_file_url = snippet_assets.publish_asset(snippet, 'css', css_content, title)
+                    if not css_file_url:
+                        # GCP upload failed, but we'll still save to database
+                        logger.warning("Failed to upload CSS to GCP for snippet update, but saving to database anyway")
                 
-                if needs_text_upload:
-                    import logging
-                    from .text_upload_utils import (
-                        upload_text_to_gcp,
-                        update_text_in_gcp,
-                        delete_text_from_gcp,
-                    )
-                    logger = logging.getLogger(__name__)
-
+                if needs_text_upload and not snippet.text_file_url:
                     text_content = serializer.validated_data.get('code', snippet.code)
                     title = serializer.validated_data.get('title', snippet.title) or ''
-                    old_text_url = snippet.text_file_url
-                    text_file_url = None
-                    print(f"[VIEWS PATCH] text upload, snippet.text_file_url: {snippet.text_file_url}")
-
-                    if old_text_url:
-                        text_file_url, saved_path = update_text_in_gcp(old_text_url, text_content)
-                        print(f"[VIEWS PATCH] update_text_in_gcp returned: {text_file_url}")
-                        if not text_file_url:
-                            print(f"[VIEWS PATCH] text GCP update failed, re-uploading with snippet id")
-                            text_file_url, saved_path = upload_text_to_gcp(
-                                text_content,
-                                title=title,
-                                snippet_id=snippet.id,
-                            )
-                            print(f"[VIEWS PATCH] upload_text_to_gcp returned: {text_file_url}")
-                            if old_text_url and text_file_url and old_text_url != text_file_url:
-                                delete_text_from_gcp(old_text_url)
-                    else:
-                        print(f"[VIEWS PATCH] No text_file_url, creating new file with snippet id")
-                        text_file_url, saved_path = upload_text_to_gcp(
-                            text_content,
-                            title=title,
-                            snippet_id=snippet.id,
-                        )
-                        print(f"[VIEWS PATCH] upload_text_to_gcp returned: {text_file_url}")
-
+                    text_file_url = snippet_assets.publish_asset(snippet, 'text', text_content, title)
                     if not text_file_url:
                         return Response(
                             {
@@ -5617,47 +5280,32 @@ class CodeSnippetDetailView(APIView):
                 
                 # Save the snippet
                 serializer.save()
-                print(f"[VIEWS PATCH] After serializer.save(), snippet.css_file_url: {snippet.css_file_url}")
                 
-                # If CSS was uploaded/updated, update the css_file_url field
                 if needs_css_upload and css_file_url:
-                    print(f"[VIEWS PATCH] needs_css_upload=True, css_file_url={css_file_url}")
-                    print(f"[VIEWS PATCH] snippet.css_file_url before update: {snippet.css_file_url}")
-                    # Only update if URL changed (new file created) or if it was None before
-                    if snippet.css_file_url != css_file_url or not snippet.css_file_url:
-                        print(f"[VIEWS PATCH] URLs differ or css_file_url was None, updating database")
-                        snippet.css_file_url = css_file_url
-                        snippet.save(update_fields=['css_file_url'])
-                        print(f"[VIEWS PATCH] After save, snippet.css_file_url: {snippet.css_file_url}")
-                    else:
-                        print(f"[VIEWS PATCH] URLs are the same, no database update needed")
+                    snippet.css_file_url = css_file_url
+                    snippet.save(update_fields=['css_file_url'])
+                elif needs_css_upload and snippet.css_file_url:
+                    snippet_assets.schedule_publish(snippet.id)
                 elif language != 'css' and snippet.css_file_url:
                     # Language changed away from CSS - delete GCP file and clear css_file_url
-                    print(f"[VIEWS PATCH] Language changed away from CSS, deleting GCP file")
                     from .css_upload_utils import delete_css_from_gcp
                     delete_css_from_gcp(snippet.css_file_url)
                     snippet.css_file_url = None
                     snippet.save(update_fields=['css_file_url'])
                 
                 if needs_text_upload and text_file_url:
-                    print(f"[VIEWS PATCH] updating text_file_url in DB")
-                    if snippet.text_file_url != text_file_url or not snippet.text_file_url:
-                        snippet.text_file_url = text_file_url
-                        snippet.save(update_fields=['text_file_url'])
+                    snippet.text_file_url = text_file_url
+                    snippet.save(update_fields=['text_file_url'])
+                elif needs_text_upload and snippet.text_file_url:
+                    snippet_assets.schedule_publish(snippet.id)
                 elif language != 'text' and snippet.text_file_url:
-                    print(f"[VIEWS PATCH] Language changed away from text, deleting GCP text file")
                     from .text_upload_utils import delete_text_from_gcp
                     delete_text_from_gcp(snippet.text_file_url)
                     snippet.text_file_url = None
                     snippet.save(update_fields=['text_file_url'])
                 
-                # Refresh snippet from database to get latest values
-                snippet.refresh_from_db()
-                print(f"[VIEWS PATCH] After refresh_from_db(), snippet.css_file_url: {snippet.css_file_url}")
-                
                 # Return full detail
                 detail_serializer = CodeSnippetDetailSerializer(snippet, context={'request': request})
-                print(f"[VIEWS PATCH] Returning response with css_file_url: {detail_serializer.data.get('css_file_url')}")
                 return Response(detail_serializer.data, status=status.HTTP_200_OK)
             
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -5667,8 +5315,6 @@ class CodeSnippetDetailView(APIView):
         except PermissionError as e:
             return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error updating code snippet: {e}", exc_info=True)
             return Response(
                 {'error': 'Failed to update code snippet', 'details': str(e)},
@@ -6513,10 +6159,10 @@ class StudentFileDeleteView(APIView):
 
 
 def _ide_explain_rate_limit_ok(user_id: int, limit: int = 40, window_seconds: int = 900) -> bool:
-    """Shared fixed-window counter for all IDE explain endpoints (40 / 15 min per user)."""
-    from backend.rate_limit_middleware import fixed_window_allow
+    """Shared sliding-window limit for all IDE explain endpoints (40 / 15 min per user)."""
+    from backend.rate_limit import RateLimitPolicy, allow
 
-    return fixed_window_allow(f"ide_explain_rl:{user_id}", limit, window_seconds)
+    return allow(f"user:{user_id}", RateLimitPolicy("ide_explain", limit, window_seconds, scope="user"))
 
 
 class StudentIdeExplainErrorView(APIView):
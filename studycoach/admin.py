@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import StudySession
+from .models import StudyCardPool, StudySession
 
 
 @admin.register(StudySession)
@@ -9,3 +9,22 @@ class StudySessionAdmin(admin.ModelAdmin):
     list_filter = ("difficulty_mode", "status", "grounding_mode")
     search_fields = ("id", "student__email", "lesson__title")
     readonly_fields = ("id", "created_at", "updated_at")
+
+
+@admin.register(StudyCardPool)
+class StudyCardPoolAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "lesson",
+        "difficulty_mode",
+        "card_count",
+        "generation_count",
+        "last_generated_at",
+    )
+    list_filter = ("difficulty_mode", "grounding_mode")
+    search_fields = ("id", "lesson__title", "content_hash")
+    readonly_fields = ("id", "content_hash", "created_at", "updated_at")
+
+    @admin.display(description="Cards")
+    def card_count(self, obj):
+        return len(obj.cards or [])
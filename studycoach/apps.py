@@ -5,3 +5,6 @@ class StudycoachConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "studycoach"
     verbose_name = "Study Coach"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,59 @@
+"""
+Precompute shared Study Coach card pools.
+
+Run after bulk content imports, or on a schedule for lessons students study:
+    python manage.py warm_study_coach_pools --course <uuid>
+    python manage.py warm_study_coach_pools --studied-since-days 30
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from courses.models import Lesson
+from studycoach.models import StudySession
+from studycoach.services.card_pool import WARM_DIFFICULTY_MODES, warm_lesson_pools
+
+
+class Command(BaseCommand):
+    help = 'Grow Study Coach card pools for lessons (one AI generation per lesson/difficulty).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lesson', type=str, help='Warm a single lesson by ID')
+        parser.add_argument('--course', type=str, help='Warm every lesson in a course')
+        parser.add_argument(
+            '--studied-since-days',
+            type=int,
+            help='Warm lessons with a Study Coach session in the last N days',
+        )
+        parser.add_argument(
+            '--difficulty',
+            action='append',
+            choices=list(WARM_DIFFICULTY_MODES),
+            help='Difficulty mode(s) to warm (default: all)',
+        )
+
+    def handle(self, *args, **options):
+        lessons = Lesson.objects.all()
+        if options.get('lesson'):
+            lessons = lessons.filter(id=options['lesson'])
+        elif options.get('course'):
+            lessons = lessons.filter(course_id=options['course'])
+        elif options.get('studied_since_days') is not None:
+            since = timezone.now() - timedelta(days=options['studied_since_days'])
+            studied = StudySession.objects.filter(created_at__gte=since).values('lesson_id')
+            lessons = lessons.filter(id__in=studied)
+        else:
+            raise CommandError('Pass --lesson, --course or --studied-since-days')
+
+        modes = options.get('difficulty') or list(WARM_DIFFICULTY_MODES)
+        lesson_ids = list(lessons.values_list('id', flat=True))
+        self.stdout.write(f'Warming {len(lesson_ids)} lesson(s) for {", ".join(modes)}')
+
+        total = 0
+        for lesson_id in lesson_ids:
+            added = warm_lesson_pools(lesson_id, difficulty_modes=modes, only_existing=False)
+            total += added
+            self.stdout.write(f'  {lesson_id}: +{added} card(s)')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Added {total} card(s).'))
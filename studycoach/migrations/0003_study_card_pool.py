@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0073_lessonvideoupload'),
+        ('studycoach', '0002_rename_studycoach__student_7a0c1d_idx_studycoach__student_ad79f3_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyCardPool',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('difficulty_mode', models.CharField(choices=[('easy', 'Easy'), ('hard', 'Hard'), ('auto', 'Auto')], default='easy', max_length=16)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('grounding_mode', models.CharField(choices=[('grounded', 'Grounded'), ('title', 'Title'), ('static', 'Static')], default='title', max_length=16)),
+                ('cards', models.JSONField(blank=True, default=list)),
+                ('generation_count', models.PositiveIntegerField(default=0)),
+                ('last_generated_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lesson', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='study_coach_card_pools', to='courses.lesson')),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studycardpool',
+            constraint=models.UniqueConstraint(fields=('lesson', 'difficulty_mode', 'content_hash'), name='studycoach_pool_lesson_difficulty_hash_uniq'),
+        ),
+    ]
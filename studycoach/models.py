@@ -63,3 +63,48 @@ class StudySession(models.Model):
 
     def __str__(self):
         return f"StudySession {self.id} ({self.difficulty_mode})"
+
+
+class StudyCardPool(models.Model):
+    """
+    Shared AI card pool for one lesson at one difficulty.
+
+    Keyed by a hash of the lesson grounding (title, description, book page
+    catalog) so a content edit starts a fresh pool instead of serving stale
+    cards. Sessions draw from the pool; live generation only tops it up.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    lesson = models.ForeignKey(
+        "courses.Lesson",
+        on_delete=models.CASCADE,
+        related_name="study_coach_card_pools",
+    )
+    difficulty_mode = models.CharField(
+        max_length=16,
+        choices=StudySession.DIFFICULTY_MODE_CHOICES,
+        default="easy",
+    )
+    content_hash = models.CharField(max_length=64)
+    grounding_mode = models.CharField(
+        max_length=16,
+        choices=StudySession.GROUNDING_MODE_CHOICES,
+        default="title",
+    )
+    cards = models.JSONField(default=list, blank=True)
+    generation_count = models.PositiveIntegerField(default=0)
+    last_generated_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-updated_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["lesson", "difficulty_mode", "content_hash"],
+                name="studycoach_pool_lesson_difficulty_hash_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"StudyCardPool {self.lesson_id} ({self.difficulty_mode}, {len(self.cards or [])} cards)"
@@ -0,0 +1,379 @@
+"""
+Shared per-lesson Study Coach card pools.
+
+Students in the same lesson at the same difficulty get near-identical grounding,
+so instead of one LLM deck per session we keep a pool per
+(lesson, difficulty_mode, content_hash). Sessions draw from the pool using the
+same dedupe / avoid_prompts fingerprints as live generation, and only fall back
+to the ai_service runner when the pool cannot fill the request. Live cards are
+folded back into the pool so the next student starts instantly.
+
+Pools are warmed in the background when lesson content changes (see
+studycoach/signals.py) and by `manage.py warm_study_coach_pools`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+import uuid
+from typing import Any
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .deck_generator import (
+    MAX_CARD_COUNT,
+    build_lesson_grounding,
+    build_page_catalog,
+    generate_deck_for_lesson,
+)
+from .static_generator import card_avoid_label, dedupe_cards
+
+logger = logging.getLogger(__name__)
+
+# Stop growing a pool once it holds this many unique cards.
+POOL_TARGET_SIZE = 60
+# Cards requested from the runner per background grow step.
+POOL_GROW_BATCH = MAX_CARD_COUNT
+# Fingerprints sent to the runner as avoid_prompts when growing (keeps prompts bounded).
+MAX_AVOID_PROMPTS = 80
+# Debounce window for background warm-ups of the same lesson (seconds).
+WARM_LOCK_SECONDS = 300
+WARM_DIFFICULTY_MODES = ("easy", "hard", "auto")
+
+
+def lesson_content_hash(lesson, catalog: list[dict[str, Any]] | None = None) -> str:
+    """Stable hash of everything the deck prompt is grounded on."""
+    if catalog is None:
+        catalog = build_page_catalog(lesson)
+    payload = {
+        "title": (getattr(lesson, "title", None) or "").strip(),
+        "grounding": build_lesson_grounding(lesson),
+        "catalog": [
+            [item["id"], item["page"], item["title"], item["excerpt"]] for item in catalog
+        ],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_current_pool(lesson, difficulty_mode: str, *, content_hash: str | None = None):
+    """Return the pool for the lesson's current content, or None if not built yet."""
+    from studycoach.models import StudyCardPool
+
+    content_hash = content_hash or lesson_content_hash(lesson)
+    return StudyCardPool.objects.filter(
+        lesson=lesson,
+        difficulty_mode=difficulty_mode,
+        content_hash=content_hash,
+    ).first()
+
+
+def select_pool_cards(
+    pool_cards: list[dict[str, Any]],
+    card_count: int,
+    *,
+    avoid_prompts: list[str] | None = None,
+    rng: random.Random | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Draw up to card_count cards from a pool, skipping avoid_prompts fingerprints.
+
+    Each drawn card gets a fresh id so answers stay scoped to the session.
+    """
+    avoid = [{"prompt": label} for label in (avoid_prompts or []) if label]
+    candidates = dedupe_cards(list(pool_cards or []), existing=avoid)
+    if not candidates or card_count <= 0:
+        return []
+    rng = rng or random
+    picked = rng.sample(candidates, min(card_count, len(candidates)))
+    drawn: list[dict[str, Any]] = []
+    for card in picked:
+        item = dict(card)
+        item["id"] = str(uuid.uuid4())
+        drawn.append(item)
+    return drawn
+
+
+def add_cards_to_pool(
+    *,
+    lesson,
+    difficulty_mode: str,
+    content_hash: str,
+    cards: list[dict[str, Any]],
+    grounding_mode: str = "title",
+) -> int:
+    """Merge generated cards into the pool (deduped). Returns how many were added."""
+    from studycoach.models import StudyCardPool
+
+    if grounding_mode not in ("grounded", "title"):
+        grounding_mode = "title"
+
+    with transaction.atomic():
+        pool = (
+            StudyCardPool.objects.select_for_update()
+            .filter(lesson=lesson, difficulty_mode=difficulty_mode, content_hash=content_hash)
+            .first()
+        )
+        if pool is None:
+            try:
+                with transaction.atomic():
+                    pool = StudyCardPool.objects.create(
+                        lesson=lesson,
+                        difficulty_mode=difficulty_mode,
+                        content_hash=content_hash,
+                        grounding_mode=grounding_mode,
+                    )
+            except IntegrityError:
+                pool = StudyCardPool.objects.select_for_update().get(
+                    lesson=lesson,
+                    difficulty_mode=difficulty_mode,
+                    content_hash=content_hash,
+                )
+            # Cards grounded on older lesson content are never served again.
+            StudyCardPool.objects.filter(
+                lesson=lesson, difficulty_mode=difficulty_mode
+            ).exclude(content_hash=content_hash).delete()
+
+        existing = list(pool.cards or [])
+        room = max(0, POOL_TARGET_SIZE - len(existing))
+        added = dedupe_cards(list(cards or []), existing=existing)[:room]
+        pool.cards = existing + added
+        pool.grounding_mode = grounding_mode
+        pool.generation_count = (pool.generation_count or 0) + 1
+        pool.last_generated_at = timezone.now()
+        pool.save(
+            update_fields=[
+                "cards",
+                "grounding_mode",
+                "generation_count",
+                "last_generated_at",
+                "updated_at",
+            ]
+        )
+    return len(added)
+
+
+def grow_pool(lesson, difficulty_mode: str, *, content_hash: str | None = None) -> int:
+    """Run one live generation for the pool if it is below target. Returns cards added."""
+    catalog = build_page_catalog(lesson)
+    content_hash = content_hash or lesson_content_hash(lesson, catalog)
+    pool = get_current_pool(lesson, difficulty_mode, content_hash=content_hash)
+    pool_cards = list(pool.cards or []) if pool else []
+    if len(pool_cards) >= POOL_TARGET_SIZE:
+        return 0
+
+    avoid_prompts = [label for label in (card_avoid_label(c) for c in pool_cards) if label]
+    deck = generate_deck_for_lesson(
+        lesson=lesson,
+        difficulty_mode=difficulty_mode,
+        card_count=POOL_GROW_BATCH,
+        avoid_prompts=avoid_prompts[-MAX_AVOID_PROMPTS:],
+    )
+    if not deck.get("success"):
+        logger.info(
+            "studycoach pool grow failed lesson=%s difficulty=%s error_code=%s",
+            getattr(lesson, "id", None),
+            difficulty_mode,
+            deck.get("error_code"),
+        )
+        return 0
+    return add_cards_to_pool(
+        lesson=lesson,
+        difficulty_mode=difficulty_mode,
+        content_hash=content_hash,
+        cards=deck.get("cards") or [],
+        grounding_mode=deck.get("grounding_mode") or "title",
+    )
+
+
+def build_session_deck(
+    *,
+    lesson,
+    difficulty_mode: str = "easy",
+    card_count: int,
+    avoid_prompts: list[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Deck for a new or extended session: pool first, live generation for the shortfall.
+
+    Returns the same shape as generate_deck_for_lesson, plus `pool_hit`
+    (number of cards served from the pool).
+    """
+    catalog = build_page_catalog(lesson)
+    content_hash = lesson_content_hash(lesson, catalog)
+    pool = get_current_pool(lesson, difficulty_mode, content_hash=content_hash)
+    pool_cards = list(pool.cards or []) if pool else []
+
+    drawn = select_pool_cards(pool_cards, card_count, avoid_prompts=avoid_prompts)
+    grounding_mode = (pool.grounding_mode if pool else "") or "title"
+
+    if len(drawn) >= card_count:
+        if len(pool_cards) < POOL_TARGET_SIZE:
+            schedule_pool_grow(lesson.id, difficulty_mode)
+        return {
+            "success": True,
+            "cards": drawn,
+            "grounding_mode": grounding_mode,
+            "provider": "",
+            "model_id": "",
+            "temperature": None,
+            "instruction_slug": "",
+            "error": "",
+            "error_code": "",
+            "status_code": 201,
+            "pool_hit": len(drawn),
+        }
+
+    # Pool exhausted for this student: generate the rest live and keep it.
+    live_avoid = list(avoid_prompts or []) + [
+        label for label in (card_avoid_label(c) for c in drawn) if label
+    ]
+    deck = generate_deck_for_lesson(
+        lesson=lesson,
+        difficulty_mode=difficulty_mode,
+        card_count=card_count - len(drawn),
+        avoid_prompts=live_avoid,
+    )
+    if not deck.get("success"):
+        if drawn:
+            logger.info(
+                "studycoach live top-up failed lesson=%s; serving %s pooled cards",
+                getattr(lesson, "id", None),
+                len(drawn),
+            )
+            return {
+                **deck,
+                "success": True,
+                "cards": drawn,
+                "grounding_mode": grounding_mode,
+                "error": "",
+                "error_code": "",
+                "status_code": 201,
+                "pool_hit": len(drawn),
+            }
+        return {**deck, "pool_hit": 0}
+
+    live_cards = list(deck.get("cards") or [])
+    try:
+        add_cards_to_pool(
+            lesson=lesson,
+            difficulty_mode=difficulty_mode,
+            content_hash=content_hash,
+            cards=live_cards,
+            grounding_mode=deck.get("grounding_mode") or "title",
+        )
+    except Exception as exc:
+        # The session still gets its cards; the pool just misses this batch.
+        logger.warning("studycoach pool merge failed lesson=%s: %s", getattr(lesson, "id", None), exc)
+
+    return {
+        **deck,
+        "cards": drawn + dedupe_cards(live_cards, existing=drawn),
+        "pool_hit": len(drawn),
+    }
+
+
+def warm_lesson_pools(lesson_id, *, difficulty_modes=None, only_existing: bool = True) -> int:
+    """
+    Grow pools for the lesson's current content.
+
+    only_existing=True is the content-change path: it only builds pools for
+    difficulties that already had one under an older hash, so lessons nobody
+    studies (or saves that did not touch the grounding) never cost an AI call.
+    """
+    from courses.models import Lesson
+    from studycoach.models import StudyCardPool
+
+    lesson = Lesson.objects.filter(id=lesson_id).first()
+    if lesson is None:
+        return 0
+
+    modes = list(difficulty_modes or WARM_DIFFICULTY_MODES)
+    if only_existing:
+        used = set(
+            StudyCardPool.objects.filter(lesson=lesson).values_list("difficulty_mode", flat=True)
+        )
+        modes = [m for m in modes if m in used]
+
+    content_hash = lesson_content_hash(lesson)
+    added = 0
+    for mode in modes:
+        if only_existing and get_current_pool(lesson, mode, content_hash=content_hash):
+            continue
+        added += grow_pool(lesson, mode, content_hash=content_hash)
+    return added
+
+
+_tasks: queue.SimpleQueue = queue.SimpleQueue()
+_worker_lock = threading.Lock()
+_worker: threading.Thread | None = None
+
+
+def _worker_loop() -> None:
+    from django.db import close_old_connections
+
+    while True:
+        lock_key, target, args, kwargs = _tasks.get()
+        try:
+            target(*args, **kwargs)
+        except Exception as exc:
+            logger.warning("studycoach pool background task failed: %s", exc, exc_info=True)
+        finally:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+            close_old_connections()
+
+
+def _run_in_background(lock_key: str, target, *args, **kwargs) -> None:
+    """
+    Queue a task on the process's single pool worker thread, once per lock
+    window (cache.add acts as the debounce). Tasks run one at a time, so a
+    burst of lesson saves never fans out into parallel AI calls.
+    """
+    global _worker
+
+    try:
+        if not cache.add(lock_key, 1, WARM_LOCK_SECONDS):
+            return
+    except Exception:
+        # Cache down: still warm, just without the debounce.
+        pass
+
+    _tasks.put((lock_key, target, args, kwargs))
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, daemon=True, name="studycoach-pool-worker")
+            _worker.start()
+
+
+def schedule_pool_grow(lesson_id, difficulty_mode: str) -> None:
+    """Grow one pool off the request path after the current transaction commits."""
+    transaction.on_commit(
+        lambda: _run_in_background(
+            f"studycoach:pool:grow:{lesson_id}:{difficulty_mode}",
+            warm_lesson_pools,
+            lesson_id,
+            difficulty_modes=[difficulty_mode],
+            only_existing=False,
+        )
+    )
+
+
+def schedule_pool_refresh(lesson_id) -> None:
+    """Rebuild pools for a lesson whose grounding may have changed."""
+    transaction.on_commit(
+        lambda: _run_in_background(
+            f"studycoach:pool:refresh:{lesson_id}",
+            warm_lesson_pools,
+            lesson_id,
+        )
+    )
@@ -0,0 +1,43 @@
+"""
+Signals for the Study Coach app.
+
+Lesson and book page edits change the grounding a card pool was built from,
+so they schedule a background pool refresh for the affected lesson(s).
+"""
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from courses.models import BookPage, Lesson
+
+from .services.card_pool import schedule_pool_refresh
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Lesson, dispatch_uid="studycoach_pool_lesson_saved")
+def refresh_pools_on_lesson_save(sender, instance, created, **kwargs):
+    if created or kwargs.get("raw"):
+        return
+    try:
+        schedule_pool_refresh(instance.id)
+    except Exception as exc:
+        logger.warning("Failed to schedule Study Coach pool refresh: %s", exc)
+
+
+@receiver(post_save, sender=BookPage, dispatch_uid="studycoach_pool_book_page_saved")
+@receiver(post_delete, sender=BookPage, dispatch_uid="studycoach_pool_book_page_deleted")
+def refresh_pools_on_book_page_change(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    try:
+        lesson_ids = list(
+            Lesson.objects.filter(lesson_materials__id=instance.book_material_id).values_list(
+                "id", flat=True
+            )
+        )
+        for lesson_id in lesson_ids:
+            schedule_pool_refresh(lesson_id)
+    except Exception as exc:
+        logger.warning("Failed to schedule Study Coach pool refresh: %s", exc)
@@ -1,5 +1,16 @@
-from django.test import SimpleTestCase
+import random
+from unittest.mock import patch
 
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from studycoach.services.card_pool import (
+    POOL_TARGET_SIZE,
+    add_cards_to_pool,
+    build_session_deck,
+    lesson_content_hash,
+    select_pool_cards,
+)
 from studycoach.services.deck_generator import (
     FALLBACK_EXPLANATION,
     attach_card_sources,
@@ -149,3 +160,129 @@ class StudyCoachGradingTests(SimpleTestCase):
         }
         with self.assertRaises(StudyCoachGradeError):
             grade_study_card(card, "electrons moving through a wire")
+
+
+POOL = [
+    {"id": "p1", "question_type": "short_answer", "prompt": "What is 2 + 2?", "answer": "4"},
+    {"id": "p2", "question_type": "short_answer", "prompt": "What is 3 + 3?", "answer": "6"},
+    {"id": "p3", "question_type": "short_answer", "prompt": "What is 4 + 4?", "answer": "8"},
+]
+
+
+class CardPoolSelectionTests(SimpleTestCase):
+    def test_draws_requested_count_with_fresh_ids(self):
+        drawn = select_pool_cards(POOL, 2, rng=random.Random(1))
+        self.assertEqual(len(drawn), 2)
+        self.assertTrue(all(c["id"] not in ("p1", "p2", "p3") for c in drawn))
+        self.assertEqual(len({c["id"] for c in drawn}), 2)
+
+    def test_skips_avoid_prompts(self):
+        drawn = select_pool_cards(
+            POOL, 3, avoid_prompts=["What is 2 + 2?", "what is 3 + 3?"]
+        )
+        self.assertEqual([c["prompt"] for c in drawn], ["What is 4 + 4?"])
+
+    def test_exhausted_pool_returns_what_is_left(self):
+        self.assertEqual(len(select_pool_cards(POOL, 10)), 3)
+        self.assertEqual(select_pool_cards([], 5), [])
+
+    def test_does_not_mutate_pool(self):
+        select_pool_cards(POOL, 3)
+        self.assertEqual([c["id"] for c in POOL], ["p1", "p2", "p3"])
+
+
+def _card(n):
+    return {"id": f"c{n}", "question_type": "short_answer", "prompt": f"What is {n} + {n}?", "answer": f"{2 * n}"}
+
+
+def _live_deck(cards, success=True):
+    if not success:
+        return {
+            "success": False,
+            "cards": [],
+            "error": "AI unavailable",
+            "error_code": "runner_failed",
+            "status_code": 503,
+        }
+    return {"success": True, "cards": cards, "grounding_mode": "title", "provider": "stub", "status_code": 201}
+
+
+@patch("studycoach.services.card_pool.schedule_pool_grow")
+class CardPoolSessionDeckTests(TestCase):
+    def setUp(self):
+        from courses.models import Course, Lesson
+
+        teacher = get_user_model().objects.create_user(
+            username="pool-teacher@example.com",
+            email="pool-teacher@example.com",
+            password="pass",
+            firebase_uid="pool-teacher-uid",
+            role="teacher",
+        )
+        course = Course.objects.create(title="Fractions", description="Fractions", teacher=teacher, price=0)
+        self.lesson = Lesson.objects.create(course=course, title="Adding fractions", order=1, duration=30, type="text_lesson")
+        self.content_hash = lesson_content_hash(self.lesson)
+
+    def _pool(self, count):
+        add_cards_to_pool(
+            lesson=self.lesson,
+            difficulty_mode="easy",
+            content_hash=self.content_hash,
+            cards=[_card(n) for n in range(count)],
+        )
+
+    def test_pool_hit_skips_live_generation(self, mock_grow):
+        self._pool(6)
+        with patch("studycoach.services.card_pool.generate_deck_for_lesson") as mock_generate:
+            deck = build_session_deck(lesson=self.lesson, card_count=4)
+        mock_generate.assert_not_called()
+        self.assertTrue(deck["success"])
+        self.assertEqual((len(deck["cards"]), deck["pool_hit"]), (4, 4))
+        mock_grow.assert_called_once_with(self.lesson.id, "easy")
+
+    def test_shortfall_is_generated_live_and_kept(self, mock_grow):
+        self._pool(2)
+        live = [_card(10), _card(11)]
+        with patch(
+            "studycoach.services.card_pool.generate_deck_for_lesson", return_value=_live_deck(live)
+        ) as mock_generate:
+            deck = build_session_deck(lesson=self.lesson, card_count=4)
+        kwargs = mock_generate.call_args.kwargs
+        self.assertEqual(kwargs["card_count"], 2)
+        self.assertEqual(len(kwargs["avoid_prompts"]), 2)
+        self.assertEqual((len(deck["cards"]), deck["pool_hit"]), (4, 2))
+        pool = self.lesson.study_coach_card_pools.get()
+        self.assertEqual(len(pool.cards), 4)
+
+    def test_failed_top_up_falls_back_to_pooled_cards(self, mock_grow):
+        self._pool(2)
+        with patch(
+            "studycoach.services.card_pool.generate_deck_for_lesson", return_value=_live_deck([], success=False)
+        ):
+            deck = build_session_deck(lesson=self.lesson, card_count=4)
+        self.assertTrue(deck["success"])
+        self.assertEqual((len(deck["cards"]), deck["pool_hit"], deck["error_code"]), (2, 2, ""))
+
+    def test_failure_without_pool_is_returned(self, mock_grow):
+        with patch(
+            "studycoach.services.card_pool.generate_deck_for_lesson", return_value=_live_deck([], success=False)
+        ):
+            deck = build_session_deck(lesson=self.lesson, card_count=4)
+        self.assertFalse(deck["success"])
+        self.assertEqual((deck["pool_hit"], deck["error_code"]), (0, "runner_failed"))
+
+    def test_add_cards_dedupes_caps_and_drops_stale_pools(self, mock_grow):
+        add_cards_to_pool(lesson=self.lesson, difficulty_mode="easy", content_hash="old", cards=[_card(1)])
+        self._pool(3)
+        added = add_cards_to_pool(
+            lesson=self.lesson,
+            difficulty_mode="easy",
+            content_hash=self.content_hash,
+            cards=[_card(n) for n in range(POOL_TARGET_SIZE + 5)],
+        )
+        self.assertEqual(added, POOL_TARGET_SIZE - 3)
+        pool = self.lesson.study_coach_card_pools.get()
+        self.assertEqual(
+            (pool.content_hash, len(pool.cards), pool.generation_count),
+            (self.content_hash, POOL_TARGET_SIZE, 2),
+        )
@@ -14,10 +14,10 @@ from .serializers import (
     StudySessionSerializer,
 )
 from .services.access import user_can_study_lesson
+from .services.card_pool import build_session_deck
 from .services.deck_generator import (
     MAX_CARD_COUNT,
     clamp_card_count,
-    generate_deck_for_lesson,
 )
 from .services.static_generator import (
     card_avoid_label,
@@ -29,7 +29,8 @@ from .services.grading import StudyCoachGradeError, grade_study_card
 class StudySessionListCreateView(APIView):
     """
     GET: list recent Study Coach sessions for the current student.
-    POST: create a session and generate an AI quiz deck for the lesson.
+    POST: create a session with a quiz deck for the lesson (shared card pool
+    first, live AI generation only when the pool runs out).
     """
 
     permission_classes = [permissions.IsAuthenticated]
@@ -87,7 +88,7 @@ class StudySessionListCreateView(APIView):
 
         difficulty_mode = serializer.validated_data["difficulty_mode"]
         card_count = clamp_card_count(serializer.validated_data.get("card_count"))
-        deck = generate_deck_for_lesson(
+        deck = build_session_deck(
             lesson=lesson,
             difficulty_mode=difficulty_mode,
             card_count=card_count,
@@ -174,7 +175,7 @@ class StudySessionExtendView(APIView):
             for label in (card_avoid_label(c) for c in existing)
             if label
         ]
-        deck = generate_deck_for_lesson(
+        deck = build_session_deck(
             lesson=session.lesson,
             difficulty_mode=session.difficulty_mode,
             card_count=card_count,
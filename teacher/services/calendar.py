@@ -1,18 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo, available_timezones
 
-from django.db.models import QuerySet
 from django.urls import NoReverseMatch, reverse
 from django.utils import timezone
 
-from courses.models import ClassEvent, ClassSession
+from courses.services.class_calendar import DaySchedule, build_day_schedules, cached_calendar
 from users.admin_calendar_tz import resolve_admin_calendar_timezone_detail
 
-_SCHEDULABLE_EVENT_TYPES = frozenset({"lesson", "meeting", "break", "test", "exam"})
-
 
 @dataclass
 class WeekMeta:
@@ -21,17 +18,6 @@ class WeekMeta:
     tz_name: str
 
 
-def _session_time_key(t: time) -> tuple[int, int]:
-    return (t.hour, t.minute)
-
-
-def _day_bounds(day: date, tz: ZoneInfo) -> tuple[datetime, datetime]:
-    return (
-        datetime.combine(day, time.min).replace(tzinfo=tz),
-        datetime.combine(day, time.max).replace(tzinfo=tz),
-    )
-
-
 def _resolve_tz_name(request, tz_name: str | None) -> str:
     if tz_name and tz_name in available_timezones():
         return tz_name
@@ -49,114 +35,84 @@ def _parse_week_start(start_date_raw: str | None, now_in_tz: datetime) -> date:
     return today - timedelta(days=today.weekday())
 
 
-def _match_day_rows(day: date, tz: ZoneInfo, sessions_qs: QuerySet[ClassSession]) -> list[dict]:
-    weekday = day.weekday()
-    sessions_today = list(
-        sessions_qs.filter(day_of_week=weekday).order_by(
-            "class_instance__course__title",
-            "class_instance__name",
-            "session_number",
-            "start_time",
-        )
-    )
-    class_ids = [s.class_instance_id for s in sessions_today]
-    day_start, day_end = _day_bounds(day, tz)
-
-    events_for_match = []
-    if class_ids:
-        events_for_match = list(
-            ClassEvent.objects.filter(
-                class_instance_id__in=class_ids,
-                event_type__in=_SCHEDULABLE_EVENT_TYPES,
-                start_time__gte=day_start,
-                start_time__lte=day_end,
-                start_time__isnull=False,
-            ).select_related("class_instance", "class_instance__course", "class_instance__teacher")
-        )
-
-    event_by_class_start = {}
-    for ev in events_for_match:
-        local_start = ev.start_time.astimezone(tz)
-        if local_start.date() != day:
-            continue
-        event_by_class_start[(ev.class_instance_id, _session_time_key(local_start.time().replace(microsecond=0)))] = ev
-
-    matched_ids: set[str] = set()
+def _class_detail_url(class_id) -> str:
+    try:
+        return reverse("admin:courses_class_detail", args=[class_id])
+    except NoReverseMatch:
+        return ""
+
+
+def _row(cls, *, event_id: str, start_dt: datetime, end_dt: datetime, status: str, event_title: str) -> dict:
+    teacher = cls.teacher
+    return {
+        "event_id": event_id,
+        "course_id": str(cls.course_id),
+        "course_title": cls.course.title,
+        "class_id": str(cls.id),
+        "class_name": cls.name,
+        "teacher_id": teacher.pk,
+        "teacher_name": teacher.get_full_name() or teacher.email or str(teacher.pk),
+        "start_at": start_dt,
+        "end_at": end_dt,
+        "status": status,
+        "event_title": event_title,
+        "class_detail_url": _class_detail_url(cls.id),
+    }
+
+
+def _day_rows(schedule: DaySchedule, tz: ZoneInfo) -> list[dict]:
+    day = schedule.day
     rows: list[dict] = []
-
-    for session in sessions_today:
-        cls = session.class_instance
+    for session, event in schedule.slots:
         st = session.start_time.replace(microsecond=0)
-        event = event_by_class_start.get((cls.id, _session_time_key(st)))
-        if event:
-            matched_ids.add(str(event.id))
-
         start_dt = datetime.combine(day, st).replace(tzinfo=tz)
         end_source = session.end_time if session.end_time else (datetime.combine(day, st) + timedelta(hours=1)).time()
         end_dt = datetime.combine(day, end_source).replace(tzinfo=tz)
         if event and event.start_time:
             start_dt = event.start_time.astimezone(tz)
             end_dt = event.end_time.astimezone(tz) if event.end_time else (start_dt + timedelta(hours=1))
-
-        teacher = cls.teacher
-        teacher_name = teacher.get_full_name() or teacher.email or str(teacher.pk)
-        try:
-            class_detail_url = reverse("admin:courses_class_detail", args=[cls.id])
-        except NoReverseMatch:
-            class_detail_url = ""
-
         rows.append(
-            {
-                "event_id": str(event.id) if event else f"session-{session.id}-{day.isoformat()}",
-                "course_id": str(cls.course_id),
-                "course_title": cls.course.title,
-                "class_id": str(cls.id),
-                "class_name": cls.name,
-                "teacher_id": teacher.pk,
-                "teacher_name": teacher_name,
-                "start_at": start_dt,
-                "end_at": end_dt,
-                "status": "scheduled" if event else "not_scheduled",
-                "event_title": event.title if event else "",
-                "class_detail_url": class_detail_url,
-            }
+            _row(
+                session.class_instance,
+                event_id=str(event.id) if event else f"session-{session.id}-{day.isoformat()}",
+                start_dt=start_dt,
+                end_dt=end_dt,
+                status="scheduled" if event else "not_scheduled",
+                event_title=event.title if event else "",
+            )
         )
 
-    orphan_events = [ev for ev in events_for_match if str(ev.id) not in matched_ids]
-    for event in orphan_events:
-        cls = event.class_instance
+    for event in schedule.orphan_events:
         start_dt = event.start_time.astimezone(tz)
-        if start_dt.date() != day:
-            continue
         end_dt = event.end_time.astimezone(tz) if event.end_time else (start_dt + timedelta(hours=1))
-        teacher = cls.teacher
-        teacher_name = teacher.get_full_name() or teacher.email or str(teacher.pk)
-        try:
-            class_detail_url = reverse("admin:courses_class_detail", args=[cls.id])
-        except NoReverseMatch:
-            class_detail_url = ""
-
         rows.append(
-            {
-                "event_id": str(event.id),
-                "course_id": str(cls.course_id),
-                "course_title": cls.course.title,
-                "class_id": str(cls.id),
-                "class_name": cls.name,
-                "teacher_id": teacher.pk,
-                "teacher_name": teacher_name,
-                "start_at": start_dt,
-                "end_at": end_dt,
-                "status": "event_only",
-                "event_title": event.title,
-                "class_detail_url": class_detail_url,
-            }
+            _row(
+                event.class_instance,
+                event_id=str(event.id),
+                start_dt=start_dt,
+                end_dt=end_dt,
+                status="event_only",
+                event_title=event.title,
+            )
         )
 
     rows.sort(key=lambda r: r["start_at"])
     return rows
 
 
+def build_calendar_rows(start_day: date, end_day: date, tz_name: str) -> list[dict]:
+    """Calendar rows for every day in [start_day, end_day], cached per range and timezone."""
+    tz = ZoneInfo(tz_name)
+
+    def _build():
+        rows: list[dict] = []
+        for schedule in build_day_schedules(start_day, end_day, tz):
+            rows.extend(_day_rows(schedule, tz))
+        return rows
+
+    return cached_calendar("week-rows", start_day, end_day, tz_name, _build)
+
+
 def get_week_calendar_data(request, *, start_date_raw: str | None = None, tz_name: str | None = None) -> tuple[WeekMeta, list[dict]]:
     tz_name_resolved = _resolve_tz_name(request, tz_name)
     tz = ZoneInfo(tz_name_resolved)
@@ -164,26 +120,7 @@ def get_week_calendar_data(request, *, start_date_raw: str | None = None, tz_nam
     week_start = _parse_week_start(start_date_raw, now_tz)
     week_end = week_start + timedelta(days=6)
 
-    sessions_qs = (
-        ClassSession.objects.filter(
-            is_active=True,
-            class_instance__is_active=True,
-            # Mirror admin dashboard rules: exclude archived + self-paced courses.
-            class_instance__course__status__in=["draft", "published"],
-            class_instance__course__delivery_type__in=["live", "hybrid"],
-        )
-        .select_related(
-            "class_instance",
-            "class_instance__course",
-            "class_instance__teacher",
-        )
-    )
-
-    events: list[dict] = []
-    for i in range(7):
-        day = week_start + timedelta(days=i)
-        events.extend(_match_day_rows(day, tz, sessions_qs))
-
+    events = build_calendar_rows(week_start, week_end, tz_name_resolved)
     return WeekMeta(week_start=week_start, week_end=week_end, tz_name=tz_name_resolved), events
 
 
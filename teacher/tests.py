@@ -1,3 +1,124 @@
-from django.test import TestCase
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from courses.models import Class as ClassModel
+from courses.models import ClassEvent, ClassSession, Course
+from teacher.services.calendar import build_calendar_rows
+
+User = get_user_model()
+
+TZ_NAME = "America/New_York"
+WEEK_START = date(2026, 3, 23)  # Monday
+WEEK_END = date(2026, 3, 29)
+
+
+@override_settings(CLASS_CALENDAR_CACHE_SECONDS=300)
+class WeekCalendarEngineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(
+            username="calendar-teacher@example.com",
+            email="calendar-teacher@example.com",
+            password="pass",
+            role="teacher",
+            firebase_uid="calendar-teacher-uid",
+        )
+        course = Course.objects.create(
+            title="Calendar Course",
+            description="Desc",
+            teacher=self.teacher,
+            category="coding",
+            price=0,
+            is_free=True,
+        )
+        self.klass = ClassModel.objects.create(name="Section A", course=course, teacher=self.teacher)
+        for day_of_week in (0, 2):  # Monday and Wednesday 17:00-18:00
+            ClassSession.objects.create(
+                class_instance=self.klass,
+                day_of_week=day_of_week,
+                start_time=time(17, 0),
+                end_time=time(18, 0),
+                session_number=day_of_week + 1,
+                is_active=True,
+            )
+
+    def _event(self, title, start_local):
+        tz = ZoneInfo(TZ_NAME)
+        start = start_local.replace(tzinfo=tz)
+        return ClassEvent.objects.create(
+            class_instance=self.klass,
+            title=title,
+            event_type="meeting",
+            start_time=start,
+            end_time=start.replace(hour=start.hour + 1),
+        )
+
+    def _rows(self):
+        return build_calendar_rows(WEEK_START, WEEK_END, TZ_NAME)
+
+    def test_matches_sessions_and_events_across_the_week(self):
+        matched = self._event("Monday lesson", datetime(2026, 3, 23, 17, 0))
+        orphan = self._event("Wednesday extra", datetime(2026, 3, 25, 9, 0))
+
+        rows = self._rows()
+        by_status = sorted((r["status"], r["start_at"].date().isoformat()) for r in rows)
+        self.assertEqual(
+            by_status,
+            [("event_only", "2026-03-25"), ("not_scheduled", "2026-03-25"), ("scheduled", "2026-03-23")],
+        )
+        self.assertEqual({r["event_id"] for r in rows if r["status"] != "not_scheduled"}, {str(matched.id), str(orphan.id)})
+
+    def test_week_is_built_with_two_queries_and_cached(self):
+        self._event("Monday lesson", datetime(2026, 3, 23, 17, 0))
+        with CaptureQueriesContext(connection) as ctx:
+            self._rows()
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self._rows()
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_event_changes_invalidate_cached_weeks(self):
+        self.assertEqual({r["status"] for r in self._rows()}, {"not_scheduled"})
+        self._event("Monday lesson", datetime(2026, 3, 23, 17, 0))
+        self.assertIn("scheduled", {r["status"] for r in self._rows()})
+
+    def test_last_event_at_a_slot_is_matched(self):
+        self._event("First", datetime(2026, 3, 23, 17, 0))
+        second = self._event("Second", datetime(2026, 3, 23, 17, 0))
+        scheduled = [r for r in self._rows() if r["status"] == "scheduled"]
+        self.assertEqual([r["event_id"] for r in scheduled], [str(second.id)])
+
+    def test_other_class_events_keep_the_week_cached(self):
+        other_course = Course.objects.create(
+            title="Self-paced", description="Desc", teacher=self.teacher, category="coding",
+            price=0, is_free=True, delivery_type="self_paced",
+        )
+        other = ClassModel.objects.create(name="Section B", course=other_course, teacher=self.teacher)
+        self._rows()
+        ClassEvent.objects.create(
+            class_instance=other, title="Elsewhere", event_type="meeting",
+            start_time=datetime(2026, 3, 24, 12, 0, tzinfo=ZoneInfo(TZ_NAME)),
+            end_time=datetime(2026, 3, 24, 13, 0, tzinfo=ZoneInfo(TZ_NAME)),
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self._rows()
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_teacher_rename_invalidates_their_rows(self):
+        self._rows()
+        self.teacher.last_login = datetime(2026, 3, 20, tzinfo=ZoneInfo(TZ_NAME))
+        self.teacher.save(update_fields=["last_login"])
+        with CaptureQueriesContext(connection) as ctx:
+            self._rows()
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        self.teacher.first_name, self.teacher.last_name = "Grace", "Hopper"
+        self.teacher.save()
+        self.assertEqual({r["teacher_name"] for r in self._rows()}, {"Grace Hopper"})
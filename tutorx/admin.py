@@ -8,6 +8,7 @@ from .models import (
     TutorXBlock,
     InteractiveVideo,
     InteractiveEvent,
+    TutorXLessonDocument,
 )
 
 
@@ -141,3 +142,11 @@ class InteractiveEventAdmin(admin.ModelAdmin):
     list_display = ['id', 'interactive_video', 'event_type', 'timestamp_seconds', 'title']
     list_filter = ['event_type']
     search_fields = ['title', 'interactive_video__lesson__title', 'interactive_video__lesson__course__title']
+
+
+@admin.register(TutorXLessonDocument)
+class TutorXLessonDocumentAdmin(admin.ModelAdmin):
+    list_display = ['lesson', 'version', 'serialized_version', 'updated_at']
+    search_fields = ['lesson__title', 'lesson__course__title']
+    readonly_fields = ['version', 'serialized_version', 'updated_at']
+    raw_id_fields = ['lesson']
@@ -3,9 +3,12 @@ Phase 2: Run scheduling checks for students at local midnight.
 Run hourly (e.g. cron / Cloud Scheduler): python manage.py run_scheduling_checks
 
 No side effects: only logs schedule | remind | skip per student/enrollment.
+Students are evaluated in chunks from preloaded data (BatchSchedulingChecker);
+--per-student uses the query-per-lookup SchedulingChecker instead.
 """
 from django.core.management.base import BaseCommand
 from django.utils import timezone as django_tz
+from tutorx.scheduling.batch import STUDENT_CHUNK_SIZE, BatchSchedulingChecker
 from tutorx.scheduling.services import SchedulingChecker
 
 
@@ -21,12 +24,26 @@ class Command(BaseCommand):
             action='store_true',
             help='Run without changing anything (this command never changes anything; just for clarity)',
         )
+        parser.add_argument(
+            '--per-student',
+            action='store_true',
+            help='Query each student separately (slower; for comparing against the batch run)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=STUDENT_CHUNK_SIZE,
+            help=f'Students preloaded per batch (default {STUDENT_CHUNK_SIZE})',
+        )
 
     def handle(self, *args, **options):
         now_utc = django_tz.now()
         self.stdout.write(f'Run at UTC: {now_utc.isoformat()}')
 
-        checker = SchedulingChecker(now_utc=now_utc)
+        if options['per_student']:
+            checker = SchedulingChecker(now_utc=now_utc)
+        else:
+            checker = BatchSchedulingChecker(now_utc=now_utc)
         timezones_at_midnight = checker.get_timezones_at_midnight()
         self.stdout.write(f'Timezones at local midnight: {len(timezones_at_midnight)}')
 
@@ -38,8 +55,12 @@ class Command(BaseCommand):
         remind_count = 0
         skip_count = 0
 
-        for student_profile in students:
-            results = checker.run_for_student(student_profile)
+        if options['per_student']:
+            runs = ((p, checker.run_for_student(p)) for p in students)
+        else:
+            runs = checker.run_for_students(students.iterator(), chunk_size=options['chunk_size'])
+
+        for student_profile, results in runs:
             for r in results:
                 decision = r['decision']
                 if decision == 'schedule':
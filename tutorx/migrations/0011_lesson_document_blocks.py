@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0073_lessonvideoupload'),
+        ('tutorx', '0010_interactiveevent_model_answer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorXLessonDocument',
+            fields=[
+                ('lesson', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='tutorx_document', serialize=False, to='courses.lesson')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('serialized_version', models.PositiveIntegerField(default=0, help_text='Document version last written to Lesson.tutorx_content')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'TutorX Lesson Document',
+                'verbose_name_plural': 'TutorX Lesson Documents',
+            },
+        ),
+        migrations.CreateModel(
+            name='TutorXDocumentBlock',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('block_id', models.CharField(help_text='BlockNote block id', max_length=64)),
+                ('position', models.FloatField(help_text='Sparse sort key; moves/inserts take the midpoint of neighbours')),
+                ('data', models.JSONField(help_text='Full BlockNote block JSON')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocks', to='tutorx.tutorxlessondocument')),
+            ],
+            options={
+                'ordering': ['document', 'position'],
+                'indexes': [models.Index(fields=['document', 'position'], name='tutorx_tuto_documen_f2bcfb_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tutorxdocumentblock',
+            constraint=models.UniqueConstraint(fields=('document', 'block_id'), name='tutorx_docblock_document_block_uniq'),
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:36
+
+import json
+from urllib.parse import unquote, urlparse
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Frozen copies of tutorx.services.media_references / storage / media_uploads
+# helpers as of this migration, so later changes to them cannot break it.
+EVENT_CONTENT_FIELDS = ('prompt', 'explanation', 'explanation_yes', 'explanation_no', 'model_answer')
+CONTENT_ADDRESSED_DIR = 'ca'
+PENDING_IMAGE_PREFIX = '__pending__'
+
+
+def _file_path(url):
+    url = url.strip()
+    if not url or url.startswith(PENDING_IMAGE_PREFIX) or not url.startswith(('http://', 'https://')):
+        return None
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    path_parts = parsed.path.strip('/').split('/', 1)
+    file_path = unquote(path_parts[1] if len(path_parts) > 1 else parsed.path.strip('/'))
+    return file_path or None
+
+
+def _is_content_addressed(url):
+    file_path = _file_path(url)
+    return bool(file_path) and f'/{CONTENT_ADDRESSED_DIR}/' in file_path
+
+
+def _collect_urls(blocks, urls):
+    for block in blocks or []:
+        if not isinstance(block, dict):
+            continue
+        props = block.get('props')
+        url = props.get('url') if isinstance(props, dict) else None
+        if isinstance(url, str) and _is_content_addressed(url):
+            urls.add(url)
+        if isinstance(block.get('children'), list):
+            _collect_urls(block['children'], urls)
+    return urls
+
+
+def block_media_urls(block):
+    return _collect_urls([block], set())
+
+
+def content_media_urls(content):
+    if not isinstance(content, str) or not content.strip().startswith('['):
+        return set()
+    try:
+        blocks = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return set()
+    return _collect_urls(blocks if isinstance(blocks, list) else [], set())
+
+
+def backfill_references(apps, schema_editor):
+    Reference = apps.get_model('tutorx', 'TutorXMediaReference')
+    Block = apps.get_model('tutorx', 'TutorXDocumentBlock')
+    Event = apps.get_model('tutorx', 'InteractiveEvent')
+    Lesson = apps.get_model('courses', 'Lesson')
+    Document = apps.get_model('tutorx', 'TutorXLessonDocument')
+
+    rows = []
+    for block_id, data in Block.objects.values_list('id', 'data').iterator():
+        rows.extend(Reference(url=url, block_id=block_id) for url in block_media_urls(data))
+    for event in Event.objects.only('id', *EVENT_CONTENT_FIELDS).iterator():
+        urls = set()
+        for field in EVENT_CONTENT_FIELDS:
+            urls |= content_media_urls(getattr(event, field))
+        rows.extend(Reference(url=url, event_id=event.id) for url in urls)
+    with_documents = Document.objects.values('lesson_id')
+    legacy = (
+        Lesson.objects.filter(type='tutorx')
+        .exclude(id__in=with_documents)
+        .values_list('id', 'tutorx_content')
+    )
+    for lesson_id, content in legacy.iterator():
+        rows.extend(Reference(url=url, lesson_id=lesson_id) for url in content_media_urls(content))
+    Reference.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0073_lessonvideoupload'),
+        ('tutorx', '0011_lesson_document_blocks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorXMediaReference',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('url', models.CharField(db_index=True, max_length=1024)),
+                ('block', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='media_references', to='tutorx.tutorxdocumentblock')),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='media_references', to='tutorx.interactiveevent')),
+                ('lesson', models.ForeignKey(blank=True, help_text='Set for legacy tutorx_content without a block store', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tutorx_media_references', to='courses.lesson')),
+            ],
+        ),
+        migrations.RunPython(backfill_references, migrations.RunPython.noop),
+    ]
@@ -407,3 +407,108 @@ class InteractiveEvent(models.Model):
     def __str__(self) -> str:
         return f"{self.event_type} at {self.timestamp_seconds}s for video {self.interactive_video_id}"
 
+
+
+class TutorXLessonDocument(models.Model):
+    """
+    Block-addressed store for a TutorX lesson's BlockNote document.
+
+    Autosaves patch individual top-level blocks (TutorXDocumentBlock) and bump
+    `version` for optimistic concurrency. Lesson.tutorx_content is rebuilt
+    lazily by readers when `serialized_version` lags behind `version`
+    (see tutorx.services.document).
+    """
+
+    lesson = models.OneToOneField(
+        'courses.Lesson',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='tutorx_document',
+    )
+    version = models.PositiveIntegerField(default=0)
+    serialized_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Document version last written to Lesson.tutorx_content',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'TutorX Lesson Document'
+        verbose_name_plural = 'TutorX Lesson Documents'
+
+    def __str__(self) -> str:
+        return f"TutorX document for lesson {self.lesson_id} (v{self.version})"
+
+    @property
+    def is_serialized_stale(self) -> bool:
+        return self.serialized_version != self.version
+
+
+class TutorXDocumentBlock(models.Model):
+    """One top-level BlockNote block (children included in `data`)."""
+
+    id = models.BigAutoField(primary_key=True)
+    document = models.ForeignKey(
+        TutorXLessonDocument,
+        on_delete=models.CASCADE,
+        related_name='blocks',
+    )
+    block_id = models.CharField(max_length=64, help_text='BlockNote block id')
+    position = models.FloatField(help_text='Sparse sort key; moves/inserts take the midpoint of neighbours')
+    data = models.JSONField(help_text='Full BlockNote block JSON')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['document', 'position']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['document', 'block_id'],
+                name='tutorx_docblock_document_block_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['document', 'position']),
+        ]
+
+    def __str__(self) -> str:
+        return f"Block {self.block_id} @ {self.position} (lesson {self.document_id})"
+
+
+class TutorXMediaReference(models.Model):
+    """
+    One use of a content-addressed media URL (tutorx-images/ca/...,
+    tutorx-media/ca/...) by a document block, an interactive event, or
+    legacy lesson content that has not been imported into blocks yet.
+
+    Written when blocks and events are saved, so deciding whether a shared
+    object can be deleted is an indexed lookup on `url`
+    (see tutorx.services.media_references).
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    url = models.CharField(max_length=1024, db_index=True)
+    block = models.ForeignKey(
+        TutorXDocumentBlock,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='media_references',
+    )
+    event = models.ForeignKey(
+        InteractiveEvent,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='media_references',
+    )
+    lesson = models.ForeignKey(
+        'courses.Lesson',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='tutorx_media_references',
+        help_text='Set for legacy tutorx_content without a block store',
+    )
+
+    def __str__(self) -> str:
+        return f"{self.url} (block {self.block_id}, event {self.event_id}, lesson {self.lesson_id})"
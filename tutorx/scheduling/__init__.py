@@ -3,7 +3,9 @@ TutorX Scheduling
 
 Scheduling logic for lessons, sessions, and availability (e.g. reminders, calendar, time slots).
 Phase 2: SchedulingChecker runs hourly; each task is a method on the class.
+BatchSchedulingChecker makes the same decisions for many students from preloaded data.
 """
+from .batch import BatchSchedulingChecker
 from .services import SchedulingChecker
 
-__all__ = ['SchedulingChecker']
+__all__ = ['BatchSchedulingChecker', 'SchedulingChecker']
@@ -0,0 +1,343 @@
+"""
+Set-based scheduling run: the same schedule | remind | skip decisions as
+SchedulingChecker.run_for_student, for many students at once.
+
+BatchSchedulingChecker loads everything the decision tree can touch for a
+chunk of students up front (enrollments, classes, last/next events via
+ROW_NUMBER() windows, module last lessons, test events, quiz and assignment
+completion) in a fixed number of queries, then overrides the per-object
+lookup methods to read from those maps. get_next_schedulable_event and
+run_for_student are inherited unchanged, so the decision logic itself is
+shared with the per-student checker.
+
+midnight_timezones() replaces the hourly scan over available_timezones()
+with an offset table cached per UTC hour: zones are grouped by UTC offset
+and a whole group is at midnight or not. Zones whose offset changes inside
+the hour (a DST switch) are checked one by one.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .services import (
+    SchedulingChecker,
+    _class_event_model,
+    _class_model,
+    _enrolled_course_model,
+    _lesson_model,
+    _module_model,
+)
+
+STUDENT_CHUNK_SIZE = 500
+
+
+@lru_cache(maxsize=1)
+def _zone_names() -> tuple[str, ...]:
+    names = []
+    for tz_name in sorted(available_timezones()):
+        try:
+            ZoneInfo(tz_name)
+        except Exception:
+            continue
+        names.append(tz_name)
+    return tuple(names)
+
+
+@lru_cache(maxsize=48)
+def _offset_table(hour_start):
+    """({offset: zone names} for offsets fixed across the hour, zones whose offset changes in it)."""
+    hour_end = hour_start + timedelta(hours=1) - timedelta(microseconds=1)
+    stable = defaultdict(list)
+    volatile = []
+    for tz_name in _zone_names():
+        zone = ZoneInfo(tz_name)
+        offset = hour_start.astimezone(zone).utcoffset()
+        if hour_end.astimezone(zone).utcoffset() == offset:
+            stable[offset].append(tz_name)
+        else:
+            volatile.append(tz_name)
+    return dict(stable), tuple(volatile)
+
+
+def midnight_timezones(now_utc) -> set[str]:
+    """IANA zones whose local time at now_utc is in the 00:00-00:59 hour."""
+    now_utc = now_utc.astimezone(timezone.utc)
+    hour_start = now_utc.replace(minute=0, second=0, microsecond=0)
+    stable, volatile = _offset_table(hour_start)
+    out = set()
+    for offset, names in stable.items():
+        if (now_utc + offset).hour == 0:
+            out.update(names)
+    for tz_name in volatile:
+        if now_utc.astimezone(ZoneInfo(tz_name)).hour == 0:
+            out.add(tz_name)
+    return out
+
+
+def _first_per_partition(queryset, partition, order_by):
+    """Rows ranked first within each `partition` group by `order_by` (one ROW_NUMBER() query)."""
+    return queryset.annotate(
+        _rank=Window(RowNumber(), partition_by=[F(partition)], order_by=order_by)
+    ).filter(_rank=1)
+
+
+class BatchSchedulingChecker(SchedulingChecker):
+    """SchedulingChecker whose lookups are served from maps preloaded per student chunk."""
+
+    def __init__(self, now_utc=None):
+        super().__init__(now_utc=now_utc)
+        self._reset()
+
+    def _reset(self):
+        self._enrollments = defaultdict(list)   # student_profile_id -> [EnrolledCourse]
+        self._classes = {}                      # (user_id, course_id) -> Class
+        self._last_events = {}                  # class_id -> ClassEvent
+        self._next_events = {}                  # class_id -> ClassEvent
+        self._modules_by_course = defaultdict(list)
+        self._modules = {}                      # module_id -> Module
+        self._last_lessons = {}                 # module_id -> Lesson
+        self._tests_by_course = defaultdict(list)
+        self._test_events = {}                  # (class_id, assessment_id) -> first ClassEvent
+        self._progress_passed = set()           # (enrollment_id, lesson_id)
+        self._quizzes_by_lesson = defaultdict(list)   # lesson_id -> [(quiz_id, visible)]
+        self._quiz_attempted = set()            # (enrollment_id, quiz_id)
+        self._quiz_passed = set()
+        self._assignments_by_lesson = defaultdict(list)
+        self._assignment_started = set()        # (enrollment_id, assignment_id)
+        self._assignment_done = set()
+
+    # --- Timezone selection ---
+
+    def get_timezones_at_midnight(self):
+        return midnight_timezones(self.now_utc)
+
+    # --- Preloading ---
+
+    def preload(self, student_profiles):
+        """Load every lookup the decision tree needs for these students."""
+        from courses.models import Assignment, AssignmentSubmission, CourseAssessment, Quiz, QuizAttempt
+        from student.models import StudentLessonProgress
+
+        EnrolledCourse = _enrolled_course_model()
+        Class = _class_model()
+        ClassEvent = _class_event_model()
+        Module = _module_model()
+        Lesson = _lesson_model()
+
+        self._reset()
+        profiles = {p.pk: p for p in student_profiles}
+        enrollments = list(
+            EnrolledCourse.objects.filter(student_profile_id__in=profiles, status='active')
+            .select_related('course')
+            .order_by('-enrollment_date')
+        )
+        for enrollment in enrollments:
+            # Reuse the caller's profile so enrollment.student_profile.user costs nothing.
+            enrollment.student_profile = profiles[enrollment.student_profile_id]
+            self._enrollments[enrollment.student_profile_id].append(enrollment)
+        if not enrollments:
+            return
+
+        user_ids = {p.user_id for p in profiles.values()}
+        course_ids = {e.course_id for e in enrollments}
+        classes = (
+            Class.objects.filter(is_active=True, course_id__in=course_ids, students__in=user_ids)
+            .annotate(_student_id=F('students'))
+            .select_related('course')
+            .order_by('course__title', 'name', 'pk')
+        )
+        for class_obj in classes:
+            self._classes.setdefault((class_obj._student_id, class_obj.course_id), class_obj)
+        class_ids = {c.pk for c in self._classes.values()}
+        if not class_ids:
+            return
+
+        for event in _first_per_partition(
+            ClassEvent.objects.filter(class_instance_id__in=class_ids, start_time__lt=self.now_utc),
+            'class_instance_id',
+            F('start_time').desc(),
+        ).select_related('lesson', 'assessment'):
+            self._last_events[event.class_instance_id] = event
+        for event in _first_per_partition(
+            ClassEvent.objects.filter(class_instance_id__in=class_ids, start_time__gt=self.now_utc),
+            'class_instance_id',
+            F('start_time').asc(),
+        ).select_related('lesson', 'assessment'):
+            self._next_events[event.class_instance_id] = event
+
+        # Modules of the enrolled courses and of any assessment a last event points at.
+        module_course_ids = set(course_ids) | {
+            e.assessment.course_id for e in self._last_events.values() if e.assessment_id
+        }
+        for module in Module.objects.filter(course_id__in=module_course_ids).order_by('order'):
+            self._modules_by_course[module.course_id].append(module)
+            self._modules[module.pk] = module
+        for lesson in _first_per_partition(
+            Lesson.objects.filter(module_id__in=self._modules).only('id', 'module_id', 'order'),
+            'module_id',
+            F('order').desc(),
+        ):
+            self._last_lessons[lesson.module_id] = lesson
+
+        for assessment in CourseAssessment.objects.filter(
+            course_id__in=course_ids, assessment_type='test'
+        ).order_by('order', 'created_at'):
+            self._tests_by_course[assessment.course_id].append(assessment)
+        for event in ClassEvent.objects.filter(
+            class_instance_id__in=class_ids,
+            assessment_id__isnull=False,
+            event_type__in=('test', 'exam'),
+        ).order_by('start_time'):
+            self._test_events.setdefault((event.class_instance_id, event.assessment_id), event)
+
+        # Lessons whose quiz/assignment completion can decide the outcome.
+        lesson_ids = set()
+        for event in self._last_events.values():
+            if event.event_type in ('test', 'exam'):
+                lesson = self.get_lesson_before_test(event)
+                if lesson:
+                    lesson_ids.add(lesson.pk)
+            elif event.lesson_id:
+                lesson_ids.add(event.lesson_id)
+        if not lesson_ids:
+            return
+        enrollment_ids = [e.pk for e in enrollments]
+
+        self._progress_passed = set(
+            StudentLessonProgress.objects.filter(
+                enrollment_id__in=enrollment_ids, lesson_id__in=lesson_ids, quiz_passed=True
+            ).values_list('enrollment_id', 'lesson_id')
+        )
+
+        quiz_ids = set()
+        for lesson_id, quiz_id, visible in Quiz.lessons.through.objects.filter(
+            lesson_id__in=lesson_ids
+        ).values_list('lesson_id', 'quiz_id', 'quiz__visible_to_students'):
+            self._quizzes_by_lesson[lesson_id].append((quiz_id, visible))
+            quiz_ids.add(quiz_id)
+        for enrollment_id, quiz_id, passed, completed_at in QuizAttempt.objects.filter(
+            enrollment_id__in=enrollment_ids, quiz_id__in=quiz_ids
+        ).values_list('enrollment_id', 'quiz_id', 'passed', 'completed_at'):
+            self._quiz_attempted.add((enrollment_id, quiz_id))
+            if passed and completed_at is not None:
+                self._quiz_passed.add((enrollment_id, quiz_id))
+
+        assignment_ids = set()
+        for lesson_id, assignment_id, visible in Assignment.lessons.through.objects.filter(
+            lesson_id__in=lesson_ids
+        ).values_list('lesson_id', 'assignment_id', 'assignment__visible_to_students'):
+            self._assignments_by_lesson[lesson_id].append((assignment_id, visible))
+            assignment_ids.add(assignment_id)
+        for enrollment_id, assignment_id, status in AssignmentSubmission.objects.filter(
+            enrollment_id__in=enrollment_ids, assignment_id__in=assignment_ids
+        ).values_list('enrollment_id', 'assignment_id', 'status'):
+            self._assignment_started.add((enrollment_id, assignment_id))
+            if status in ('submitted', 'graded'):
+                self._assignment_done.add((enrollment_id, assignment_id))
+
+    # --- Lookups served from the preloaded maps ---
+
+    def get_enrollments_for_student(self, student_profile):
+        return self._enrollments.get(student_profile.pk, [])
+
+    def get_class_for_enrollment(self, enrollment):
+        return self._classes.get((enrollment.student_profile.user_id, enrollment.course_id))
+
+    def get_last_class_event(self, class_obj):
+        return self._last_events.get(class_obj.pk)
+
+    def get_next_class_event(self, class_obj):
+        return self._next_events.get(class_obj.pk)
+
+    def is_lesson_last_in_module(self, lesson):
+        if not lesson or not lesson.module_id:
+            return False
+        last_in_module = self._last_lessons.get(lesson.module_id)
+        return last_in_module and last_in_module.id == lesson.id
+
+    def get_module_for_lesson(self, lesson):
+        if not lesson or not lesson.module_id:
+            return None
+        return self._modules.get(lesson.module_id)
+
+    def get_lesson_before_test(self, class_event):
+        if not class_event or class_event.event_type not in ('test', 'exam') or not class_event.assessment_id:
+            return None
+        assessment = class_event.assessment
+        if getattr(assessment, 'module_id', None):
+            return self._last_lessons.get(assessment.module_id)
+        modules = self._modules_by_course.get(assessment.course_id, [])
+        if not modules:
+            return None
+        idx = max(0, (assessment.order or 1) - 1)
+        if idx >= len(modules):
+            idx = len(modules) - 1
+        return self._last_lessons.get(modules[idx].pk)
+
+    def get_test_for_module(self, class_obj, module):
+        if not class_obj or not module:
+            return None
+        assessments = self._tests_by_course.get(class_obj.course_id, [])
+        linked = [a for a in assessments if a.module_id == module.pk]
+        if linked:
+            # Same (order, created_at) ordering .first() uses on CourseAssessment.
+            return self._test_events.get((class_obj.pk, linked[0].pk))
+        if not assessments:
+            return None
+        idx = min(module.order - 1 if getattr(module, 'order', None) else 0, len(assessments) - 1)
+        idx = max(0, idx)
+        return self._test_events.get((class_obj.pk, assessments[idx].pk))
+
+    def is_lesson_quiz_completed(self, enrollment, lesson):
+        if not lesson:
+            return True
+        if (enrollment.pk, lesson.pk) in self._progress_passed:
+            return True
+        quizzes = self._quizzes_by_lesson.get(lesson.pk, [])
+        if not quizzes:
+            return True
+        applicable = [
+            quiz_id for quiz_id, visible in quizzes
+            if visible or (enrollment.pk, quiz_id) in self._quiz_attempted
+        ]
+        if not applicable:
+            return True
+        return any((enrollment.pk, quiz_id) in self._quiz_passed for quiz_id in applicable)
+
+    def is_lesson_assignment_completed(self, enrollment, lesson):
+        if not lesson:
+            return True
+        assignments = self._assignments_by_lesson.get(lesson.pk, [])
+        if not assignments:
+            return True
+        applicable = [
+            assignment_id for assignment_id, visible in assignments
+            if visible or (enrollment.pk, assignment_id) in self._assignment_started
+        ]
+        if not applicable:
+            return True
+        return any((enrollment.pk, assignment_id) in self._assignment_done for assignment_id in applicable)
+
+    # --- Batch run ---
+
+    def run_for_students(self, student_profiles, chunk_size: int = STUDENT_CHUNK_SIZE):
+        """Yield (student_profile, run_for_student results), preloading one chunk at a time."""
+        chunk = []
+        for student_profile in student_profiles:
+            chunk.append(student_profile)
+            if len(chunk) >= chunk_size:
+                yield from self._run_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._run_chunk(chunk)
+
+    def _run_chunk(self, chunk):
+        self.preload(chunk)
+        for student_profile in chunk:
+            yield student_profile, self.run_for_student(student_profile)
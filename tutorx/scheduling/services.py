@@ -157,6 +157,10 @@ class SchedulingChecker:
         module = modules[idx]
         return Lesson.objects.filter(module=module).order_by('-order').first()
 
+    def get_module_for_lesson(self, lesson):
+        """The lesson's module (None when it has none)."""
+        return lesson.module if lesson and lesson.module_id else None
+
     def get_test_for_module(self, class_obj, module):
         """
         Return the ClassEvent (test) for this module in this class, if any.
@@ -313,7 +317,7 @@ class SchedulingChecker:
 
         if self.is_lesson_last_in_module(lesson):
             # Schedule module test: get test for this module (module-based)
-            next_ev = self.get_test_for_module(class_obj, lesson.module)
+            next_ev = self.get_test_for_module(class_obj, self.get_module_for_lesson(lesson))
             if next_ev:
                 return next_ev, 'module_test'
             # No test linked to module; fall back to chronologically next event
@@ -9,9 +9,12 @@ Contract:
 - Input: submission (AssignmentSubmission, saved with status='submitted').
 - Return: None.
 """
+import logging
 from decimal import Decimal
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 
 def _normalize_student_answer(value):
     """Extract string from submission.answers entry (may be string or dict with text/content)."""
@@ -108,24 +111,24 @@ def handle_assignment_submission(submission):
     Phase 3: Grade via GeminiGrader (AI questions) + local scoring (MC/TF/short_answer with key).
     Phase 4: If percentage >= assignment.passing_score -> graded; else -> return for revision (draft + return_feedback).
     """
-    print(f"[TutorX] ENTER submission_id={submission.id} assignment_id={submission.assignment_id} is_graded={submission.is_graded} status={submission.status}")
+    logger.debug("ENTER submission_id=%s assignment_id=%s is_graded=%s status=%s", submission.id, submission.assignment_id, submission.is_graded, submission.status)
 
     # Idempotency: do not re-grade if already graded
     if submission.is_graded:
-        print("[TutorX] submission already graded, skipping EXIT")
+        logger.debug("submission already graded, skipping EXIT")
         return
 
     assignment = submission.assignment
     answers = submission.answers or {}
     questions_list = list(assignment.questions.all())
-    print(f"[TutorX] assignment questions count={len(questions_list)} answer keys={list(answers.keys()) if answers else []}")
+    logger.debug("assignment questions count=%s answer keys=%s", len(questions_list), list(answers.keys()) if answers else [])
     if not questions_list:
-        print("[TutorX] assignment has no questions, skipping EXIT")
+        logger.debug("assignment has no questions, skipping EXIT")
         return
 
     # 1) Build and run AI grading for essay / fill_blank / short_answer (no key)
     ai_questions = _build_questions_for_ai(assignment, submission)
-    print(f"[TutorX] ai_questions count={len(ai_questions)}")
+    logger.debug("ai_questions count=%s", len(ai_questions))
     grade_by_qid = {}
     total_score = 0
     total_possible = 0
@@ -135,12 +138,12 @@ def handle_assignment_submission(submission):
 
     if ai_questions:
         try:
-            print(f"[TutorX] calling GeminiGrader.grade_questions_batch with {len(ai_questions)} questions")
+            logger.debug("calling GeminiGrader.grade_questions_batch with %s questions", len(ai_questions))
             from ai.gemini_grader import GeminiGrader
             grader = GeminiGrader()
             assignment_context = _build_assignment_context(assignment)
             result = grader.grade_questions_batch(ai_questions, assignment_context)
-            print(f"[TutorX] GeminiGrader returned grades count={len(result.get('grades', []))} total_score={result.get('total_score')} total_possible={result.get('total_possible')}")
+            logger.debug("GeminiGrader returned grades count=%s total_score=%s total_possible=%s", len(result.get('grades', [])), result.get('total_score'), result.get('total_possible'))
             for g in result.get("grades", []):
                 qid = str(g.get("question_id", ""))
                 if not qid:
@@ -156,7 +159,7 @@ def handle_assignment_submission(submission):
                 total_score += points_earned
                 total_possible += points_possible
         except Exception as e:
-            print(f"[TutorX] GeminiGrader FAILED: {e}")
+            logger.warning("GeminiGrader FAILED: %s", e)
             import traceback
             traceback.print_exc()
             # Fall back to 0 for AI questions so we still apply return/graded logic
@@ -189,7 +192,7 @@ def handle_assignment_submission(submission):
         total_possible += poss
 
     if total_possible <= 0:
-        print("[TutorX] total_possible is 0, skipping EXIT")
+        logger.debug("total_possible is 0, skipping EXIT")
         return
 
     percentage = float(Decimal(total_score) / Decimal(total_possible) * 100)
@@ -203,9 +206,9 @@ def handle_assignment_submission(submission):
         return_count = 0
     finalize_graded = passed or (return_count >= max_returns)
     if not passed and return_count >= max_returns:
-        print(f"[TutorX] max returns reached (return_count={return_count} max_returns={max_returns}), finalizing as graded (failed)")
+        logger.warning("max returns reached (return_count=%s max_returns=%s), finalizing as graded (failed)", return_count, max_returns)
 
-    print(f"[TutorX] total_score={total_score} total_possible={total_possible} percentage={percentage} passing_score={passing_score} passed={passed} finalize_graded={finalize_graded} return_count={return_count} max_returns={max_returns}")
+    logger.debug("total_score=%s total_possible=%s percentage=%s passing_score=%s passed=%s finalize_graded=%s return_count=%s max_returns=%s", total_score, total_possible, percentage, passing_score, passed, finalize_graded, return_count, max_returns)
 
     # Build graded_questions in same shape as teacher (AssignmentGradingSerializer)
     graded_questions = []
@@ -224,7 +227,7 @@ def handle_assignment_submission(submission):
 
     if finalize_graded:
         # Phase 3: mark as graded (or finalize after max returns with passed=False)
-        print(f"[TutorX] applying GRADED path submission_id={submission.id}")
+        logger.debug("applying GRADED path submission_id=%s", submission.id)
         submission.status = "graded"
         submission.is_graded = True
         submission.is_teacher_draft = False
@@ -237,7 +240,7 @@ def handle_assignment_submission(submission):
         submission.instructor_feedback = ""
         submission.graded_questions = graded_questions
         submission.return_feedback = None
-        print(f"[TutorX] saving submission as graded (update_fields) submission_id={submission.id}")
+        logger.debug("saving submission as graded (update_fields) submission_id=%s", submission.id)
         submission.save(update_fields=[
             "status", "is_graded", "is_teacher_draft", "points_earned", "points_possible",
             "percentage", "passed", "graded_at", "graded_by", "instructor_feedback",
@@ -247,12 +250,12 @@ def handle_assignment_submission(submission):
             enrollment = submission.enrollment
             enrollment.update_assignment_performance(float(percentage), is_graded=True)
         except Exception as e:
-            print(f"[TutorX] update_assignment_performance failed: {e}")
-        print(f"[TutorX] submission saved as GRADED submission_id={submission.id}")
+            logger.warning("update_assignment_performance failed: %s", e)
+        logger.debug("submission saved as GRADED submission_id=%s", submission.id)
     else:
         # Phase 4: return for revision (same shape as teacher return, but keep per-question scores); increment return count
         submission.return_for_revision_count = return_count + 1
-        print(f"[TutorX] applying RETURN FOR REVISION path submission_id={submission.id} return_for_revision_count={submission.return_for_revision_count}")
+        logger.debug("applying RETURN FOR REVISION path submission_id=%s return_for_revision_count=%s", submission.id, submission.return_for_revision_count)
 
         # Build per-question feedback payload that also includes points_earned/points_possible
         return_feedback = []
@@ -285,7 +288,7 @@ def handle_assignment_submission(submission):
         submission.instructor_feedback = ""
         submission.graded_questions = []
         submission.return_feedback = return_feedback
-        print(f"[TutorX] saving submission as return for revision (update_fields) submission_id={submission.id}")
+        logger.debug("saving submission as return for revision (update_fields) submission_id=%s", submission.id)
         submission.save(update_fields=[
             "status",
             "is_graded",
@@ -301,6 +304,6 @@ def handle_assignment_submission(submission):
             "return_feedback",
             "return_for_revision_count",
         ])
-        print(f"[TutorX] submission saved as RETURN FOR REVISION submission_id={submission.id} percentage={percentage} passing_score={passing_score}")
+        logger.debug("submission saved as RETURN FOR REVISION submission_id=%s percentage=%s passing_score=%s", submission.id, percentage, passing_score)
 
-    print(f"[TutorX] EXIT submission_id={submission.id}")
+    logger.debug("EXIT submission_id=%s", submission.id)
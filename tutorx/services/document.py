@@ -0,0 +1,383 @@
+"""
+Block-addressed TutorX lesson documents.
+
+Lesson.tutorx_content holds the whole BlockNote document as one JSON string.
+Autosaves instead patch individual top-level blocks stored in
+TutorXDocumentBlock, guarded by a document version (optimistic concurrency),
+so payload size and DB writes scale with the edit rather than the lesson.
+
+Readers call get_tutorx_content(), which rebuilds the serialized string only
+when the block store has moved past it.
+
+Patch operations (top-level blocks only; nested children travel inside their
+top-level parent's JSON):
+    {"op": "insert", "block": {...}, "after": "<block id>" | null}
+    {"op": "update", "block": {...}}
+    {"op": "move",   "id": "<block id>", "after": "<block id>" | null}
+    {"op": "delete", "id": "<block id>"}
+"after": null means "first block".
+"""
+import hashlib
+import json
+import logging
+
+from django.db import transaction
+
+from ..models import TutorXDocumentBlock, TutorXLessonDocument
+from .media_references import drop_lesson_content_references, sync_block_references
+from .storage import inject_uploaded_urls_into_blocks
+
+logger = logging.getLogger(__name__)
+
+POSITION_STEP = 1024.0
+# Below this gap between neighbours a midpoint loses precision; renumber instead.
+MIN_POSITION_GAP = 1e-6
+MAX_OPERATIONS = 500
+MAX_BLOCK_ID_LENGTH = TutorXDocumentBlock._meta.get_field('block_id').max_length
+
+
+class DocumentPatchError(ValueError):
+    """Invalid patch payload (bad op, unknown block id, duplicate id)."""
+
+
+class DocumentVersionConflict(Exception):
+    """The client's base_version is not the current document version."""
+
+    def __init__(self, current_version):
+        super().__init__(f"Document version conflict (current version {current_version})")
+        self.current_version = current_version
+
+
+def _parse_blocks(content):
+    if not content or not isinstance(content, str) or not content.strip():
+        return []
+    try:
+        blocks = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        logger.warning("TutorX content is not valid JSON; starting an empty block store")
+        return []
+    return blocks if isinstance(blocks, list) else []
+
+
+def _fit_block_id(block_id):
+    """Ids longer than the column keep a prefix plus a hash of the whole id."""
+    if len(block_id) <= MAX_BLOCK_ID_LENGTH:
+        return block_id
+    digest = hashlib.sha1(block_id.encode()).hexdigest()[:16]
+    return f"{block_id[:MAX_BLOCK_ID_LENGTH - len(digest) - 1]}-{digest}"
+
+
+def _unique_block_id(block_id, index, seen):
+    """
+    The block's id, or for blocks without a unique one an unused
+    "<id>-<index>[-<n>]" so they stay addressable (they cannot be patched).
+    """
+    candidate = _fit_block_id(block_id) if block_id else ''
+    if candidate and candidate not in seen:
+        return candidate
+    base = f"{block_id or 'block'}-{index}"
+    candidate, attempt = _fit_block_id(base), 1
+    while candidate in seen:
+        candidate = _fit_block_id(f"{base}-{attempt}")
+        attempt += 1
+    return candidate
+
+
+def _block_rows(document, blocks):
+    rows = []
+    seen = set()
+    for index, block in enumerate(blocks):
+        if not isinstance(block, dict):
+            continue
+        block_id = _unique_block_id(str(block.get('id') or ''), index, seen)
+        seen.add(block_id)
+        rows.append(
+            TutorXDocumentBlock(
+                document=document,
+                block_id=block_id,
+                position=(index + 1) * POSITION_STEP,
+                data=block,
+            )
+        )
+    return rows
+
+
+def get_or_create_document(lesson, *, for_update=False, import_content=True):
+    """
+    Return the lesson's document. On first use its blocks are imported from
+    tutorx_content, unless `import_content` is False (a full save is about to
+    write them anyway).
+    """
+    qs = TutorXLessonDocument.objects
+    if for_update:
+        qs = qs.select_for_update()
+    document = qs.filter(lesson=lesson).first()
+    if document is not None:
+        return document
+
+    with transaction.atomic():
+        document, created = TutorXLessonDocument.objects.get_or_create(lesson=lesson)
+        if created:
+            # Media references move from the legacy content row to the blocks.
+            drop_lesson_content_references(lesson.pk)
+            if import_content:
+                sync_block_references(
+                    TutorXDocumentBlock.objects.bulk_create(
+                        _block_rows(document, _parse_blocks(lesson.tutorx_content))
+                    ),
+                    new=True,
+                )
+    if for_update:
+        document = TutorXLessonDocument.objects.select_for_update().get(pk=document.pk)
+    return document
+
+
+def current_version(lesson):
+    """Version clients must send as base_version (0 before the first patch)."""
+    return (
+        TutorXLessonDocument.objects.filter(lesson=lesson)
+        .values_list('version', flat=True)
+        .first()
+        or 0
+    )
+
+
+def check_base_version(lesson, base_version):
+    """
+    Raise DocumentVersionConflict unless base_version is current. A cheap
+    pre-check so a stale save is refused before its media is uploaded;
+    apply_document_patch checks again under the document lock.
+    """
+    version = current_version(lesson)
+    if base_version is None or int(base_version) != version:
+        raise DocumentVersionConflict(version)
+
+
+def serialize_document(document):
+    blocks = (
+        TutorXDocumentBlock.objects.filter(document=document)
+        .order_by('position', 'id')
+        .values_list('data', flat=True)
+    )
+    return json.dumps(list(blocks))
+
+
+def get_tutorx_content(lesson):
+    """
+    Current BlockNote JSON string for a lesson.
+
+    Rebuilds Lesson.tutorx_content from the block store when patches have
+    landed since it was last serialized (a plain UPDATE, so Lesson post_save
+    signals do not fire on reads).
+    """
+    from courses.models import Lesson
+
+    document = TutorXLessonDocument.objects.filter(lesson_id=lesson.pk).first()
+    if document is None or not document.is_serialized_stale:
+        return getattr(lesson, 'tutorx_content', '') or ''
+
+    version = document.version
+    content = serialize_document(document)
+    with transaction.atomic():
+        Lesson.objects.filter(pk=lesson.pk).update(tutorx_content=content)
+        # Only advance the marker if no newer patch landed while we serialized.
+        TutorXLessonDocument.objects.filter(pk=document.pk, version=version).update(
+            serialized_version=version
+        )
+    lesson.tutorx_content = content
+    return content
+
+
+def replace_document(lesson, blocks):
+    """
+    Full-document save (PUT): make the block store match `blocks`.
+
+    Only rows whose data or position changed are written. Lesson.tutorx_content
+    is written by the caller, so the document is marked as serialized at the
+    new version.
+    """
+    document = get_or_create_document(lesson, for_update=True, import_content=False)
+    existing = {row.block_id: row for row in TutorXDocumentBlock.objects.filter(document=document)}
+    to_create, to_update = [], []
+    changed_data = set()
+    for row in _block_rows(document, blocks):
+        current = existing.pop(row.block_id, None)
+        if current is None:
+            to_create.append(row)
+        elif current.data != row.data or current.position != row.position:
+            if current.data != row.data:
+                changed_data.add(current.pk)
+            current.data, current.position = row.data, row.position
+            to_update.append(current)
+    if existing:
+        TutorXDocumentBlock.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+    if to_create:
+        TutorXDocumentBlock.objects.bulk_create(to_create)
+    if to_update:
+        TutorXDocumentBlock.objects.bulk_update(to_update, ['data', 'position'])
+    sync_block_references(to_create, new=True)
+    sync_block_references([row for row in to_update if row.pk in changed_data])
+    document.version += 1
+    document.serialized_version = document.version
+    document.save(update_fields=['version', 'serialized_version', 'updated_at'])
+    return document.version
+
+
+def _position_after(order, after_id, moving_id=None):
+    """
+    Sort key for a block placed right after `after_id` (None = first).
+
+    `order` is the current [(block_id, position)] list, sorted.
+    Returns None when the neighbours are too close and a renumber is needed.
+    """
+    order = [item for item in order if item[0] != moving_id]
+    if after_id is None:
+        next_pos = order[0][1] if order else None
+        if next_pos is None:
+            return POSITION_STEP
+        return next_pos - POSITION_STEP
+    for index, (block_id, position) in enumerate(order):
+        if block_id == after_id:
+            if index + 1 >= len(order):
+                return position + POSITION_STEP
+            next_pos = order[index + 1][1]
+            if next_pos - position < MIN_POSITION_GAP:
+                return None
+            return (position + next_pos) / 2
+    raise DocumentPatchError(f"Unknown block id in 'after': {after_id}")
+
+
+def _block_from_op(op, uploaded_urls):
+    block = op.get('block')
+    if not isinstance(block, dict) or not block.get('id'):
+        raise DocumentPatchError(f"'{op.get('op')}' needs a block object with an id")
+    if len(str(block['id'])) > MAX_BLOCK_ID_LENGTH:
+        raise DocumentPatchError(f"Block id longer than {MAX_BLOCK_ID_LENGTH} characters")
+    if uploaded_urls:
+        inject_uploaded_urls_into_blocks([block], uploaded_urls)
+    return block
+
+
+def apply_document_patch(lesson, base_version, operations, *, uploaded_urls=None):
+    """
+    Apply block operations atomically. Returns the new document version.
+
+    Operations apply in order, each against the state left by the previous
+    ones (a block deleted earlier in the patch can be inserted again).
+    Raises DocumentVersionConflict when base_version is stale and
+    DocumentPatchError for malformed operations (nothing is written).
+    """
+    if not isinstance(operations, list) or not operations:
+        raise DocumentPatchError('operations must be a non-empty list')
+    if len(operations) > MAX_OPERATIONS:
+        raise DocumentPatchError(f'At most {MAX_OPERATIONS} operations per patch')
+
+    with transaction.atomic():
+        document = get_or_create_document(lesson, for_update=True)
+        if base_version is None or int(base_version) != document.version:
+            raise DocumentVersionConflict(document.version)
+
+        rows = {
+            row.block_id: row
+            for row in TutorXDocumentBlock.objects.filter(document=document).only(
+                'id', 'block_id', 'position'
+            )
+        }
+        order = sorted(((bid, row.position) for bid, row in rows.items()), key=lambda item: item[1])
+        created, changed, deleted = {}, {}, set()
+        renumber = False
+
+        def _place(block_id, after_id):
+            nonlocal order, renumber
+            position = _position_after(order, after_id, moving_id=block_id)
+            if position is None:
+                # Gap exhausted: fall back to dense positions, then retry.
+                renumber = True
+                order = [(bid, (i + 1) * POSITION_STEP) for i, (bid, _) in enumerate(order)]
+                position = _position_after(order, after_id, moving_id=block_id)
+            order = sorted(
+                [item for item in order if item[0] != block_id] + [(block_id, position)],
+                key=lambda item: item[1],
+            )
+            return position
+
+        for op in operations:
+            kind = (op or {}).get('op')
+            if kind == 'insert':
+                block = _block_from_op(op, uploaded_urls)
+                block_id = str(block['id'])
+                if block_id in created or (block_id in rows and block_id not in deleted):
+                    raise DocumentPatchError(f'Block {block_id} already exists')
+                position = _place(block_id, op.get('after'))
+                if block_id in deleted:
+                    # Deleted earlier in this patch: the existing row is reused.
+                    deleted.discard(block_id)
+                    rows[block_id].data = block
+                    rows[block_id].position = position
+                    changed[block_id] = rows[block_id]
+                else:
+                    created[block_id] = TutorXDocumentBlock(
+                        document=document, block_id=block_id, position=position, data=block
+                    )
+            elif kind == 'update':
+                block = _block_from_op(op, uploaded_urls)
+                block_id = str(block['id'])
+                if block_id in created:
+                    created[block_id].data = block
+                elif block_id in rows and block_id not in deleted:
+                    rows[block_id].data = block
+                    changed[block_id] = rows[block_id]
+                else:
+                    raise DocumentPatchError(f'Unknown block id: {block_id}')
+            elif kind == 'move':
+                block_id = str(op.get('id') or '')
+                if block_id not in created and (block_id not in rows or block_id in deleted):
+                    raise DocumentPatchError(f'Unknown block id: {block_id}')
+                position = _place(block_id, op.get('after'))
+                target = created.get(block_id) or rows[block_id]
+                target.position = position
+                if block_id in rows:
+                    changed[block_id] = rows[block_id]
+            elif kind == 'delete':
+                block_id = str(op.get('id') or '')
+                if block_id in created:
+                    created.pop(block_id)
+                elif block_id in rows and block_id not in deleted:
+                    deleted.add(block_id)
+                    changed.pop(block_id, None)
+                else:
+                    raise DocumentPatchError(f'Unknown block id: {block_id}')
+                order = [item for item in order if item[0] != block_id]
+            else:
+                raise DocumentPatchError(f'Unknown op: {kind!r}')
+
+        if renumber:
+            positions = dict(order)
+            for block_id, row in rows.items():
+                if block_id in deleted:
+                    continue
+                if row.position != positions.get(block_id, row.position):
+                    row.position = positions[block_id]
+                    changed[block_id] = row
+            for block_id, row in created.items():
+                row.position = positions.get(block_id, row.position)
+
+        if deleted:
+            TutorXDocumentBlock.objects.filter(document=document, block_id__in=deleted).delete()
+        if created:
+            sync_block_references(
+                TutorXDocumentBlock.objects.bulk_create(list(created.values())), new=True
+            )
+        if changed:
+            # Rows were loaded with data deferred; only rows whose data was assigned carry it.
+            data_rows = [row for row in changed.values() if 'data' in row.__dict__]
+            position_only = [row for row in changed.values() if 'data' not in row.__dict__]
+            if data_rows:
+                TutorXDocumentBlock.objects.bulk_update(data_rows, ['data', 'position'])
+            sync_block_references(data_rows)
+            if position_only:
+                TutorXDocumentBlock.objects.bulk_update(position_only, ['position'])
+
+        document.version += 1
+        document.save(update_fields=['version', 'updated_at'])
+        return document.version
@@ -59,8 +59,10 @@ def get_lesson_context(lesson_id):
     except Lesson.DoesNotExist:
         return None
 
+    from .document import get_tutorx_content
+
     title = lesson.title or ''
-    body = getattr(lesson, 'tutorx_content', '') or ''
+    body = get_tutorx_content(lesson)
     context = f"Lesson: {title}\n\n{body}".strip()
 
     try:
@@ -155,8 +157,7 @@ def infer_intent(
         + (lesson_context[:12000] if lesson_context else "(no content)")
     )
     prompt = _build_conversation_prompt(conversation or [], user_message)
-    print("[Lesson chat intent] conversation prompt sent to AI:\n", prompt)
-    print("[Lesson chat intent] --- end prompt ---")
+    logger.debug("Lesson chat intent prompt: %d chars, %d prior turns", len(prompt), len(conversation or []))
     tool_schemas = get_lesson_chat_tool_schemas_vertex()
     service = GeminiService()
     result = service.generate_with_tools(
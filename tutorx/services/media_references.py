@@ -0,0 +1,98 @@
+"""
+Which content-addressed TutorX media is still in use.
+
+Content-addressed objects (see tutorx.services.media_uploads) can be shared
+between blocks, events and lessons, so one is only deleted once nothing
+references it. TutorXMediaReference keeps one row per use, written when
+blocks and events are saved:
+
+- document blocks: by tutorx.services.document after its bulk writes
+  (bulk_create/bulk_update do not send post_save);
+- interactive events: by a post_save receiver (tutorx.signals);
+- legacy Lesson.tutorx_content without a block store: by the 0012 backfill,
+  replaced by block rows when the lesson's document is first created.
+
+Deleting a block or event removes its rows by cascade.
+"""
+from __future__ import annotations
+
+import json
+
+from ..models import TutorXMediaReference
+from .media_uploads import is_content_addressed_path
+from .storage import file_path_from_tutorx_image_url
+
+EVENT_CONTENT_FIELDS = ("prompt", "explanation", "explanation_yes", "explanation_no", "model_answer")
+
+
+def _collect_urls(blocks, urls: set[str]) -> set[str]:
+    """props.url of every block (image, video, audio, ...) and its children."""
+    for block in blocks or []:
+        if not isinstance(block, dict):
+            continue
+        props = block.get("props")
+        url = props.get("url") if isinstance(props, dict) else None
+        if isinstance(url, str) and is_content_addressed_path(file_path_from_tutorx_image_url(url)):
+            urls.add(url)
+        if isinstance(block.get("children"), list):
+            _collect_urls(block["children"], urls)
+    return urls
+
+
+def block_media_urls(block) -> set[str]:
+    """Content-addressed URLs used by one BlockNote block (children included)."""
+    return _collect_urls([block], set())
+
+
+def content_media_urls(content) -> set[str]:
+    """Content-addressed URLs in a BlockNote JSON string (lesson content, event fields)."""
+    if not isinstance(content, str) or not content.strip().startswith("["):
+        return set()
+    try:
+        blocks = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return set()
+    return _collect_urls(blocks if isinstance(blocks, list) else [], set())
+
+
+def event_media_urls(event) -> set[str]:
+    urls = set()
+    for field in EVENT_CONTENT_FIELDS:
+        urls |= content_media_urls(getattr(event, field, None))
+    return urls
+
+
+def sync_block_references(rows, *, new=False) -> None:
+    """
+    Rewrite the references of saved TutorXDocumentBlock rows (data must be
+    loaded). `new` rows were just created and have none to delete.
+    """
+    rows = [row for row in rows if row.pk is not None]
+    if not rows:
+        return
+    if not new:
+        TutorXMediaReference.objects.filter(block__in=[row.pk for row in rows]).delete()
+    TutorXMediaReference.objects.bulk_create(
+        [
+            TutorXMediaReference(url=url, block_id=row.pk)
+            for row in rows
+            for url in sorted(block_media_urls(row.data))
+        ]
+    )
+
+
+def sync_event_references(event) -> None:
+    TutorXMediaReference.objects.filter(event=event).delete()
+    TutorXMediaReference.objects.bulk_create(
+        [TutorXMediaReference(url=url, event=event) for url in sorted(event_media_urls(event))]
+    )
+
+
+def drop_lesson_content_references(lesson_id) -> None:
+    """The lesson's content now lives in blocks, which carry their own references."""
+    TutorXMediaReference.objects.filter(lesson_id=lesson_id).delete()
+
+
+def media_url_is_referenced(image_url: str) -> bool:
+    """True if any TutorX block, interactive event or legacy lesson content uses the URL."""
+    return TutorXMediaReference.objects.filter(url=image_url).exists()
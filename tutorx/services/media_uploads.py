@@ -0,0 +1,287 @@
+"""
+Parallel, content-addressed media uploads for TutorX saves.
+
+The content PUT/PATCH and the events PUT can carry a dozen image_* files.
+Instead of uploading and deleting them one after another:
+
+- each file is hashed (SHA-256 of its bytes) and stored under a name derived
+  from the hash (tutorx-images/ca/<hash>.jpg, tutorx-media/ca/<hash>.<ext>),
+  so re-saving a lesson, or pasting the same image twice, skips the upload;
+- uploads run on a bounded thread pool (TUTORX_MEDIA_UPLOAD_WORKERS), so a
+  save takes roughly as long as its slowest file;
+- deletes of replaced media run on a background thread after the save
+  commits. Content-addressed objects can be shared between blocks and
+  lessons, so they are only deleted once no TutorXMediaReference row uses
+  them (tutorx.services.media_references) and no upload handed them out
+  within MEDIA_GC_GRACE_SECONDS.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from backend.work_queue import BackgroundDrainer
+
+from .storage import delete_image_and_thumbnail, file_path_from_tutorx_image_url
+
+logger = logging.getLogger(__name__)
+
+CONTENT_ADDRESSED_DIR = "ca"
+HASH_CHUNK_SIZE = 1024 * 1024
+# Known content-addressed objects: skip the storage exists() round trip.
+KNOWN_OBJECT_CACHE_SECONDS = 24 * 60 * 60
+# A shared object handed to an upload is not deleted for this long, so the
+# save that references it can commit its TutorXMediaReference rows first.
+MEDIA_GC_GRACE_SECONDS = 60 * 60
+# Upper bound on one object's reference check + delete.
+MEDIA_GC_LOCK_SECONDS = 30
+
+
+def _worker_count() -> int:
+    return max(1, int(getattr(settings, "TUTORX_MEDIA_UPLOAD_WORKERS", 6)))
+
+
+def file_sha256(uploaded_file) -> str:
+    """Hash an uploaded file's bytes and rewind it for the upload."""
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in uploaded_file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def content_addressed_path(prefix: str, digest: str, extension: str) -> str:
+    return f"{prefix}/{CONTENT_ADDRESSED_DIR}/{digest}.{extension}"
+
+
+def is_content_addressed_path(file_path: str | None) -> bool:
+    return bool(file_path) and f"/{CONTENT_ADDRESSED_DIR}/" in file_path
+
+
+def storage_url(saved_path: str) -> str:
+    file_url = default_storage.url(saved_path)
+    if not file_url.startswith("http"):
+        file_url = f"https://storage.googleapis.com/{settings.GS_BUCKET_NAME}/{saved_path}"
+    return file_url
+
+
+def _known_object_key(storage_path: str) -> str:
+    return f"tutorx:media:ca:{storage_path}"
+
+
+def existing_object_url(storage_path: str) -> str | None:
+    """URL of an already-uploaded content-addressed object, or None."""
+    try:
+        url = cache.get(_known_object_key(storage_path))
+        if url:
+            return url
+    except Exception:
+        pass
+    if not default_storage.exists(storage_path):
+        return None
+    url = storage_url(storage_path)
+    remember_object(storage_path, url)
+    return url
+
+
+def remember_object(storage_path: str, url: str) -> None:
+    try:
+        cache.set(_known_object_key(storage_path), url, KNOWN_OBJECT_CACHE_SECONDS)
+    except Exception:
+        pass
+
+
+def _forget_object(storage_path: str) -> None:
+    try:
+        cache.delete(_known_object_key(storage_path))
+    except Exception:
+        pass
+
+
+def _run_pool(fn, items: list, thread_name_prefix: str) -> list:
+    workers = min(_worker_count(), len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+
+    def _in_thread(item):
+        try:
+            return fn(item)
+        finally:
+            close_old_connections()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as pool:
+        return list(pool.map(_in_thread, items))
+
+
+def upload_files_concurrently(files: dict, upload) -> dict:
+    """
+    Upload {key: uploaded_file} with upload(uploaded_file, digest) -> url.
+
+    Returns {key: url}. Files with identical bytes are uploaded once. The
+    first ValueError/RuntimeError from any upload is re-raised after the
+    pool finishes, matching the sequential loop's error contract.
+    """
+    if not files:
+        return {}
+    keyed = [(key, uploaded_file, file_sha256(uploaded_file)) for key, uploaded_file in files.items()]
+    first_by_digest = {}
+    for key, uploaded_file, digest in keyed:
+        first_by_digest.setdefault(digest, uploaded_file)
+
+    def _upload(item):
+        digest, uploaded_file = item
+        try:
+            return digest, upload(uploaded_file, digest), None
+        except (ValueError, RuntimeError) as exc:
+            return digest, None, exc
+
+    results = _run_pool(_upload, list(first_by_digest.items()), "tutorx-upload")
+    url_by_digest = {}
+    for digest, url, error in results:
+        if error is not None:
+            raise error
+        url_by_digest[digest] = url
+    return {key: url_by_digest[digest] for key, _file, digest in keyed}
+
+
+def _recent_use_key(storage_path: str) -> str:
+    return f"tutorx:media:ca-used:{storage_path}"
+
+
+def _deleting_key(storage_path: str) -> str:
+    return f"tutorx:media:ca-deleting:{storage_path}"
+
+
+def _mark_recent_use(storage_path: str) -> None:
+    """An upload is about to hand out this object; the save that references it has not committed yet."""
+    try:
+        cache.set(_recent_use_key(storage_path), 1, MEDIA_GC_GRACE_SECONDS)
+    except Exception:
+        pass
+
+
+def _wait_for_delete(storage_path: str) -> None:
+    """Block while the GC is deleting this object, so the upload writes it again afterwards."""
+    deadline = time.monotonic() + MEDIA_GC_LOCK_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            if cache.get(_deleting_key(storage_path)) is None:
+                return
+        except Exception:
+            return
+        time.sleep(0.1)
+
+
+def reuse_or_upload_path(storage_path: str) -> str | None:
+    """
+    URL of an existing content-addressed object to reuse, or None to upload it.
+
+    Marks the object as in use first, then waits out a delete already in
+    progress (see _delete_one), so the GC never removes an object a pending
+    save is about to reference.
+    """
+    _mark_recent_use(storage_path)
+    _wait_for_delete(storage_path)
+    return existing_object_url(storage_path)
+
+
+def media_url_is_referenced(image_url: str) -> bool:
+    from .media_references import media_url_is_referenced as is_referenced
+
+    return is_referenced(image_url)
+
+
+def _delete_one(image_url: str) -> bool | None:
+    """
+    Delete one object. Returns True when removed, False when kept, and None
+    when a content-addressed object was used too recently to decide (retried
+    after the grace period).
+    """
+    file_path = file_path_from_tutorx_image_url(image_url)
+    if not file_path:
+        return False
+    try:
+        if is_content_addressed_path(file_path):
+            if not cache.add(_deleting_key(file_path), 1, MEDIA_GC_LOCK_SECONDS):
+                return None
+            try:
+                if cache.get(_recent_use_key(file_path)) is not None:
+                    return None
+                if media_url_is_referenced(image_url):
+                    return False
+                _forget_object(file_path)
+                main_deleted, _thumb_deleted = delete_image_and_thumbnail(file_path)
+                return main_deleted
+            finally:
+                cache.delete(_deleting_key(file_path))
+        main_deleted, _thumb_deleted = delete_image_and_thumbnail(file_path)
+        return main_deleted
+    except Exception as e:
+        logger.warning("Failed to delete TutorX media from GCS %s: %s", image_url[:80], e)
+        return False
+
+
+def delete_media_concurrently(image_urls) -> int:
+    """
+    Delete media URLs on the bounded pool. Returns how many objects were
+    removed; objects used within the grace period are queued again for later.
+    """
+    urls = sorted({url for url in (image_urls or []) if isinstance(url, str) and url})
+    if not urls:
+        return 0
+    results = _run_pool(_delete_one, urls, "tutorx-delete")
+    deferred = [url for url, deleted in zip(urls, results) if deleted is None]
+    if deferred:
+        _queue_deletes(deferred, delay_seconds=MEDIA_GC_GRACE_SECONDS)
+    return sum(1 for deleted in results if deleted)
+
+
+# (due, url) pairs waiting for the background GC thread.
+_pending_deletes = []
+_pending_lock = threading.Lock()
+
+
+def _queue_deletes(urls, *, delay_seconds: float = 0) -> None:
+    due = timezone.now() + timedelta(seconds=delay_seconds)
+    with _pending_lock:
+        _pending_deletes.extend((due, url) for url in urls)
+    # Nothing due yet just schedules the drainer's wake-up for `due`.
+    _drainer.kick()
+
+
+def _take_due_deletes() -> list:
+    now = timezone.now()
+    with _pending_lock:
+        due = [url for at, url in _pending_deletes if at <= now]
+        _pending_deletes[:] = [(at, url) for at, url in _pending_deletes if at > now]
+    return due
+
+
+def _next_delete_due():
+    with _pending_lock:
+        return min((at for at, _url in _pending_deletes), default=None)
+
+
+def drain_media_deletes() -> dict:
+    return {"deleted": delete_media_concurrently(_take_due_deletes())}
+
+
+_drainer = BackgroundDrainer("tutorx-media-gc", drain_media_deletes, next_due=_next_delete_due)
+
+
+def schedule_media_deletes(image_urls) -> None:
+    """Delete replaced media on the background GC thread once the save that dropped it has committed."""
+    urls = [url for url in (image_urls or []) if isinstance(url, str) and url]
+    if urls:
+        transaction.on_commit(lambda: _queue_deletes(urls))
@@ -94,6 +94,26 @@ def delete_image_and_thumbnail(file_path: str) -> tuple[bool, bool]:
     return (main_deleted, thumb_deleted)
 
 
+def inject_uploaded_urls_into_blocks(blocks: list, block_id_to_url: dict) -> None:
+    """
+    Replace __pending__ media URLs in BlockNote blocks (in place).
+
+    Image/video/audio blocks whose props.url is a pending placeholder get the
+    uploaded URL for their block id; children are walked recursively.
+    """
+    for b in blocks:
+        if not isinstance(b, dict):
+            continue
+        if b.get("type") in ("image", "video", "audio") and isinstance(b.get("props"), dict):
+            url_val = b["props"].get("url") or ""
+            if isinstance(url_val, str) and url_val.startswith(PENDING_IMAGE_PREFIX):
+                block_id = b.get("id")
+                if block_id and str(block_id) in block_id_to_url:
+                    b["props"]["url"] = block_id_to_url[str(block_id)]
+        if isinstance(b.get("children"), list):
+            inject_uploaded_urls_into_blocks(b["children"], block_id_to_url)
+
+
 def _collect_image_urls_from_blocks(blocks: list) -> list[str]:
     """Recursively collect image block props.url from BlockNote blocks (and children)."""
     urls = []
@@ -169,8 +189,11 @@ def delete_tutorx_images_from_content(tutorx_content: str) -> None:
         return
     if not isinstance(data, list):
         return
+    from .media_uploads import is_content_addressed_path, schedule_media_deletes
+
     urls = _collect_image_urls_from_blocks(data)
     seen = set()
+    shared = []
     for image_url in urls:
         if image_url in seen:
             continue
@@ -178,7 +201,12 @@ def delete_tutorx_images_from_content(tutorx_content: str) -> None:
         file_path = file_path_from_tutorx_image_url(image_url)
         if not file_path:
             continue
+        if is_content_addressed_path(file_path):
+            # May be used by other lessons; deleted after commit if nothing references it.
+            shared.append(image_url)
+            continue
         try:
             delete_image_and_thumbnail(file_path)
         except Exception as e:
             logger.warning("Failed to delete TutorX image from GCS %s: %s", image_url[:80], e)
+    schedule_media_deletes(shared)
@@ -3,6 +3,7 @@ TutorX signals.
 
 - On lesson delete: delete TutorX BlockNote images, interactive video (HLS), and event images from GCS.
 - On lesson save (type tutorx): invalidate lesson chat cache so chat sees content updates.
+- On interactive event save: record the shared media it uses (TutorXMediaReference).
 """
 import logging
 
@@ -19,6 +20,8 @@ from .services.storage import (
     delete_image_and_thumbnail,
 )
 from .services.lesson_chat import invalidate_lesson_chat_cache
+from .services.media_references import sync_event_references
+from .services.media_uploads import is_content_addressed_path, schedule_media_deletes
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,14 @@ def invalidate_lesson_chat_cache_on_save(sender, instance, **kwargs):
         logger.warning("Failed to invalidate lesson chat cache for lesson %s: %s", instance.id, e)
 
 
+@receiver(post_save, sender=InteractiveEvent)
+def record_event_media_references(sender, instance, raw=False, **kwargs):
+    """Keep the event's content-addressed media from being garbage-collected."""
+    if raw:
+        return
+    sync_event_references(instance)
+
+
 def _delete_interactive_video_assets(interactive_video):
     """Delete HLS (AudioVideoMaterial) and all event images from GCS for an InteractiveVideo."""
     if getattr(interactive_video, "audio_video_material_id", None):
@@ -51,13 +62,16 @@ def _delete_interactive_video_assets(interactive_video):
                 interactive_video.id,
                 e,
             )
+    shared = []
     for event in InteractiveEvent.objects.filter(interactive_video=interactive_video):
         for field in ("prompt", "explanation", "explanation_yes", "explanation_no", "model_answer"):
             val = getattr(event, field, None)
             if isinstance(val, str):
                 for image_url in collect_image_urls_from_blocknote_string(val):
                     file_path = file_path_from_tutorx_image_url(image_url)
-                    if file_path:
+                    if is_content_addressed_path(file_path):
+                        shared.append(image_url)
+                    elif file_path:
                         try:
                             delete_image_and_thumbnail(file_path)
                         except Exception as e:
@@ -66,6 +80,7 @@ def _delete_interactive_video_assets(interactive_video):
                                 image_url[:80] if image_url else "",
                                 e,
                             )
+    schedule_media_deletes(shared)
 
 
 @receiver(pre_delete, sender=Lesson)
@@ -79,7 +94,10 @@ def delete_tutorx_images_on_lesson_delete(sender, instance, **kwargs):
     if getattr(instance, "type", None) != "tutorx":
         return
     try:
-        content = getattr(instance, "tutorx_content", None)
+        # Block patches may not be serialized into tutorx_content yet.
+        from .services.document import get_tutorx_content
+
+        content = get_tutorx_content(instance)
         if content and isinstance(content, str) and content.strip():
             delete_tutorx_images_from_content(content)
             logger.info("Deleted TutorX BlockNote images from GCS for lesson %s", instance.id)
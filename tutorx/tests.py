@@ -1,3 +1,481 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+
+from courses.models import (
+    Assignment,
+    AssignmentSubmission,
+    Class,
+    ClassEvent,
+    Course,
+    CourseAssessment,
+    Lesson,
+    Module,
+    Quiz,
+    QuizAttempt,
+)
+from student.models import EnrolledCourse
+from tutorx.models import (
+    InteractiveEvent,
+    InteractiveVideo,
+    TutorXDocumentBlock,
+    TutorXLessonDocument,
+    TutorXMediaReference,
+)
+from tutorx.scheduling import BatchSchedulingChecker, SchedulingChecker
+from tutorx.scheduling.batch import midnight_timezones
+from tutorx.services.document import (
+    DocumentPatchError,
+    DocumentVersionConflict,
+    apply_document_patch,
+    check_base_version,
+    current_version,
+    get_tutorx_content,
+    replace_document,
+)
+from tutorx.services.media_references import media_url_is_referenced
+from tutorx.services.media_uploads import (
+    delete_media_concurrently,
+    drain_media_deletes,
+    reuse_or_upload_path,
+    upload_files_concurrently,
+)
+from users.models import StudentProfile
+
+User = get_user_model()
+
+
+def _block(block_id, text=''):
+    return {'id': block_id, 'type': 'paragraph', 'props': {}, 'content': text, 'children': []}
+
+
+SHARED_IMAGE = 'https://storage.googleapis.com/bucket/tutorx-images/ca/abc.jpg'
+
+
+def _image(block_id, url=SHARED_IMAGE):
+    return {'id': block_id, 'type': 'image', 'props': {'url': url}, 'content': [], 'children': []}
+
+
+class TutorXDocumentPatchTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create_user(
+            username='tutorx-teacher@example.com',
+            email='tutorx-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='tutorx-teacher-uid',
+        )
+        course = Course.objects.create(
+            title='TutorX Course',
+            description='Desc',
+            teacher=teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        self.lesson = Lesson.objects.create(
+            course=course,
+            title='TutorX Lesson',
+            order=1,
+            duration=30,
+            type='tutorx',
+            tutorx_content=json.dumps([_block('a', 'one'), _block('b', 'two')]),
+        )
+
+    def _ids(self):
+        lesson = Lesson.objects.get(pk=self.lesson.pk)
+        return [b['id'] for b in json.loads(get_tutorx_content(lesson))]
+
+    def _stored_ids(self):
+        return list(
+            TutorXDocumentBlock.objects.filter(document__lesson=self.lesson)
+            .order_by('position')
+            .values_list('block_id', flat=True)
+        )
+
+    def test_first_patch_imports_existing_content(self):
+        self.assertEqual(current_version(self.lesson), 0)
+        version = apply_document_patch(
+            self.lesson, 0, [{'op': 'insert', 'block': _block('c'), 'after': 'a'}]
+        )
+        self.assertEqual(version, 1)
+        self.assertEqual(self._ids(), ['a', 'c', 'b'])
+
+    def test_update_move_delete(self):
+        apply_document_patch(
+            self.lesson,
+            0,
+            [
+                {'op': 'update', 'block': _block('a', 'changed')},
+                {'op': 'move', 'id': 'b', 'after': None},
+                {'op': 'insert', 'block': _block('c'), 'after': 'a'},
+                {'op': 'delete', 'id': 'a'},
+            ],
+        )
+        self.assertEqual(self._ids(), ['b', 'c'])
+
+    def test_stale_base_version_is_rejected(self):
+        apply_document_patch(self.lesson, 0, [{'op': 'delete', 'id': 'a'}])
+        with self.assertRaises(DocumentVersionConflict) as ctx:
+            apply_document_patch(self.lesson, 0, [{'op': 'delete', 'id': 'b'}])
+        self.assertEqual(ctx.exception.current_version, 1)
+        self.assertEqual(self._ids(), ['b'])
+
+    def test_import_gives_duplicate_and_long_ids_unused_fitting_ids(self):
+        long_id = 'x' * 80
+        self.lesson.tutorx_content = json.dumps(
+            [_block(block_id) for block_id in ('a-2', 'a', 'a', long_id, long_id)]
+        )
+        self.lesson.save()
+        apply_document_patch(self.lesson, 0, [{'op': 'insert', 'block': _block('c'), 'after': None}])
+        stored = self._stored_ids()
+        self.assertEqual(stored[:4], ['c', 'a-2', 'a', 'a-2-1'])
+        self.assertEqual(len(set(stored)), 6)
+        self.assertTrue(all(len(block_id) <= 64 for block_id in stored))
+
+    def test_invalid_patch_writes_nothing(self):
+        with self.assertRaises(DocumentPatchError):
+            apply_document_patch(
+                self.lesson,
+                0,
+                [{'op': 'delete', 'id': 'a'}, {'op': 'move', 'id': 'missing', 'after': None}],
+            )
+        self.assertEqual(self._ids(), ['a', 'b'])
+
+    def test_serialization_is_lazy(self):
+        apply_document_patch(self.lesson, 0, [{'op': 'delete', 'id': 'b'}])
+        stored = Lesson.objects.get(pk=self.lesson.pk).tutorx_content
+        self.assertEqual([b['id'] for b in json.loads(stored)], ['a', 'b'])
+        self.assertTrue(TutorXLessonDocument.objects.get(lesson=self.lesson).is_serialized_stale)
+
+        self.assertEqual(self._ids(), ['a'])
+        self.assertFalse(TutorXLessonDocument.objects.get(lesson=self.lesson).is_serialized_stale)
+
+    def test_full_replace_bumps_version(self):
+        apply_document_patch(self.lesson, 0, [{'op': 'delete', 'id': 'b'}])
+        self.assertEqual(replace_document(self.lesson, [_block('x'), _block('y')]), 2)
+        apply_document_patch(self.lesson, 2, [{'op': 'move', 'id': 'y', 'after': None}])
+        self.assertEqual(self._ids(), ['y', 'x'])
+
+
+    def test_deleted_block_can_be_inserted_again(self):
+        apply_document_patch(
+            self.lesson,
+            0,
+            [
+                {'op': 'delete', 'id': 'a'},
+                {'op': 'insert', 'block': _block('a', 'back'), 'after': 'b'},
+            ],
+        )
+        lesson = Lesson.objects.get(pk=self.lesson.pk)
+        blocks = json.loads(get_tutorx_content(lesson))
+        self.assertEqual([b['id'] for b in blocks], ['b', 'a'])
+        self.assertEqual(blocks[1]['content'], 'back')
+
+    def test_first_full_replace_does_not_import_then_rewrite(self):
+        with CaptureQueriesContext(connection) as ctx:
+            replace_document(self.lesson, [_block('a', 'one'), _block('z')])
+        block_writes = [
+            q['sql'] for q in ctx.captured_queries
+            if 'tutorx_tutorxdocumentblock' in q['sql'] and q['sql'].startswith(('INSERT', 'DELETE'))
+        ]
+        self.assertEqual(len(block_writes), 1)
+        self.assertEqual(self._stored_ids(), ['a', 'z'])
+
+    def test_full_replace_only_writes_changed_rows(self):
+        apply_document_patch(self.lesson, 0, [{'op': 'insert', 'block': _block('c'), 'after': 'b'}])
+        blocks = TutorXDocumentBlock.objects
+        with patch.object(blocks, 'bulk_update', wraps=blocks.bulk_update) as bulk_update, \
+                patch.object(blocks, 'bulk_create', wraps=blocks.bulk_create) as bulk_create:
+            replace_document(self.lesson, [_block('a', 'one'), _block('b', 'edited')])
+        bulk_create.assert_not_called()
+        self.assertEqual([row.block_id for row in bulk_update.call_args.args[0]], ['b'])
+        self.assertEqual(self._stored_ids(), ['a', 'b'])
+
+    def test_stale_patch_is_refused_before_uploading(self):
+        apply_document_patch(self.lesson, 0, [{'op': 'delete', 'id': 'a'}])
+        with self.assertRaises(DocumentVersionConflict):
+            check_base_version(self.lesson, 0)
+        check_base_version(self.lesson, 1)
+
+    def test_block_saves_record_media_references(self):
+        legacy = 'https://storage.googleapis.com/bucket/tutorx-images/uuid-name.jpg'
+        apply_document_patch(
+            self.lesson, 0,
+            [{'op': 'insert', 'block': _image('img'), 'after': 'a'},
+             {'op': 'insert', 'block': _image('old', legacy), 'after': 'img'}],
+        )
+        self.assertTrue(media_url_is_referenced(SHARED_IMAGE))
+        self.assertFalse(TutorXMediaReference.objects.filter(url=legacy).exists())
+
+        apply_document_patch(self.lesson, 1, [{'op': 'update', 'block': _block('img')}])
+        self.assertFalse(media_url_is_referenced(SHARED_IMAGE))
+        replace_document(self.lesson, [_block('a'), _image('img2')])
+        self.assertTrue(media_url_is_referenced(SHARED_IMAGE))
+        apply_document_patch(self.lesson, 3, [{'op': 'delete', 'id': 'img2'}])
+        self.assertFalse(media_url_is_referenced(SHARED_IMAGE))
+
+    def test_event_saves_record_media_references(self):
+        video = InteractiveVideo.objects.create(lesson=self.lesson)
+        event = InteractiveEvent.objects.create(
+            interactive_video=video, event_type='essay', timestamp_seconds=5,
+            prompt=json.dumps([_image('p')]),
+        )
+        self.assertTrue(media_url_is_referenced(SHARED_IMAGE))
+        event.delete()
+        self.assertFalse(media_url_is_referenced(SHARED_IMAGE))
+
+@override_settings(TUTORX_MEDIA_UPLOAD_WORKERS=4)
+class TutorXMediaUploadTests(TestCase):
+    def test_identical_files_upload_once(self):
+        calls = []
+        lock = threading.Lock()
+
+        def fake_upload(uploaded_file, digest):
+            with lock:
+                calls.append(digest)
+            return f'https://storage.googleapis.com/bucket/tutorx-images/ca/{digest}.jpg'
+
+        files = {
+            'image_a': SimpleUploadedFile('a.png', b'same-bytes'),
+            'image_b': SimpleUploadedFile('b.png', b'same-bytes'),
+            'image_c': SimpleUploadedFile('c.png', b'other-bytes'),
+        }
+        urls = upload_files_concurrently(files, fake_upload)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(urls['image_a'], urls['image_b'])
+        self.assertNotEqual(urls['image_a'], urls['image_c'])
+
+    def test_upload_error_is_raised(self):
+        def fake_upload(uploaded_file, digest):
+            if uploaded_file.name == 'bad.bmp':
+                raise ValueError('Image extension "bmp" not allowed')
+            return 'https://storage.googleapis.com/bucket/x.jpg'
+
+        files = {
+            'image_ok': SimpleUploadedFile('ok.png', b'ok'),
+            'image_bad': SimpleUploadedFile('bad.bmp', b'bad'),
+        }
+        with self.assertRaises(ValueError):
+            upload_files_concurrently(files, fake_upload)
+
+    @patch('tutorx.services.media_uploads.delete_image_and_thumbnail', return_value=(True, False))
+    @patch('tutorx.services.media_uploads.media_url_is_referenced')
+    def test_shared_objects_are_kept_while_referenced(self, mock_referenced, mock_delete):
+        shared = 'https://storage.googleapis.com/bucket/tutorx-images/ca/abc.jpg'
+        unused = 'https://storage.googleapis.com/bucket/tutorx-images/ca/def.jpg'
+        legacy = 'https://storage.googleapis.com/bucket/tutorx-images/uuid-name.jpg'
+        mock_referenced.side_effect = lambda url: url == shared
+
+        self.assertEqual(delete_media_concurrently([shared, unused, legacy]), 2)
+        deleted = sorted(call.args[0] for call in mock_delete.call_args_list)
+        self.assertEqual(deleted, ['tutorx-images/ca/def.jpg', 'tutorx-images/uuid-name.jpg'])
+
+
+    @patch('tutorx.services.media_uploads.delete_image_and_thumbnail', return_value=(True, False))
+    def test_recently_reused_object_is_deleted_after_the_grace_period(self, mock_delete):
+        cache.clear()
+        path = 'tutorx-images/ca/abc.jpg'
+        with patch('tutorx.services.media_uploads.existing_object_url', return_value=SHARED_IMAGE):
+            self.assertEqual(reuse_or_upload_path(path), SHARED_IMAGE)
+
+        with patch('tutorx.services.media_uploads._drainer') as drainer:
+            self.assertEqual(delete_media_concurrently([SHARED_IMAGE]), 0)
+            drainer.kick.assert_called_once()
+        mock_delete.assert_not_called()
+        self.assertEqual(drain_media_deletes(), {'deleted': 0})  # not due yet
+
+        cache.clear()
+        later = django_timezone.now() + timedelta(hours=2)
+        with patch('tutorx.services.media_uploads.timezone.now', return_value=later):
+            self.assertEqual(drain_media_deletes(), {'deleted': 1})
+        mock_delete.assert_called_once_with(path)
+
+
+class BatchSchedulingParityTests(TestCase):
+    NOW = datetime(2026, 3, 10, 0, 30, tzinfo=timezone.utc)
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username='sched-teacher@example.com',
+            email='sched-teacher@example.com',
+            password='pass',
+            role='teacher',
+            firebase_uid='sched-teacher-uid',
+        )
+        self.course = Course.objects.create(
+            title='Scheduling Course',
+            description='Desc',
+            teacher=self.teacher,
+            category='coding',
+            price=0,
+            is_free=True,
+        )
+        module_1 = Module.objects.create(course=self.course, title='Module 1', order=1)
+        module_2 = Module.objects.create(course=self.course, title='Module 2', order=2)
+        self.l1 = self._lesson(module_1, 1)
+        self.l2 = self._lesson(module_1, 2)
+        self.l3 = self._lesson(module_2, 3)
+        self.test_1 = CourseAssessment.objects.create(
+            course=self.course, module=module_1, assessment_type='test', title='Test 1', order=1
+        )
+        self.quiz_1 = Quiz.objects.create(title='Quiz 1')
+        self.quiz_1.lessons.add(self.l1)
+        self.quiz_2 = Quiz.objects.create(title='Quiz 2')
+        self.quiz_2.lessons.add(self.l2)
+        self.assignment_2 = Assignment.objects.create(title='Assignment 2')
+        self.assignment_2.lessons.add(self.l2)
+
+    def _lesson(self, module, order):
+        return Lesson.objects.create(
+            course=self.course, module=module, title=f'Lesson {order}', order=order, duration=30
+        )
+
+    def _student(self, name, with_class=True):
+        user = User.objects.create_user(
+            username=f'{name}@example.com',
+            email=f'{name}@example.com',
+            password='pass',
+            role='student',
+            firebase_uid=f'{name}-uid',
+        )
+        profile = StudentProfile.objects.create(user=user, timezone='UTC')
+        enrollment = EnrolledCourse.objects.create(student_profile=profile, course=self.course, status='active')
+        class_obj = None
+        if with_class:
+            class_obj = Class.objects.create(name=f'{name} class', course=self.course, teacher=self.teacher)
+            class_obj.students.add(user)
+        return profile, enrollment, class_obj
+
+    def _event(self, class_obj, hours, lesson=None, assessment=None):
+        start = self.NOW + timedelta(hours=hours)
+        return ClassEvent.objects.create(
+            class_instance=class_obj,
+            title='Event',
+            event_type='test' if assessment else 'lesson',
+            lesson=lesson,
+            assessment=assessment,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+        )
+
+    def _pass_quiz(self, profile, enrollment, quiz):
+        QuizAttempt.objects.create(
+            student=profile.user,
+            quiz=quiz,
+            enrollment=enrollment,
+            attempt_number=1,
+            started_at=self.NOW - timedelta(days=1),
+            completed_at=self.NOW - timedelta(days=1),
+            passed=True,
+        )
+
+    def _module_test_student(self, name):
+        """Finished the last lesson of module 1: the decision reads its module's test."""
+        profile, enrollment, module_end = self._student(name)
+        self._event(module_end, -20, lesson=self.l2)
+        self._event(module_end, 3, lesson=self.l3)
+        self._event(module_end, 6, assessment=self.test_1)
+        self._pass_quiz(profile, enrollment, self.quiz_2)
+        AssignmentSubmission.objects.create(
+            student=profile.user,
+            assignment=self.assignment_2,
+            enrollment=enrollment,
+            attempt_number=1,
+            status='submitted',
+        )
+
+    def _build_students(self):
+        self._student('no-class', with_class=False)
+
+        _, _, first = self._student('first-lesson')
+        self._event(first, 5, lesson=self.l1)
+
+        _, _, remind = self._student('remind')
+        self._event(remind, -20, lesson=self.l1)
+        self._event(remind, 5, lesson=self.l2)
+
+        profile, enrollment, far = self._student('far-next')
+        self._event(far, -20, lesson=self.l1)
+        self._event(far, 48, lesson=self.l2)
+        self._pass_quiz(profile, enrollment, self.quiz_1)
+
+        self._module_test_student('module-test')
+
+        _, _, after_test = self._student('after-test')
+        self._event(after_test, -20, assessment=self.test_1)
+        self._event(after_test, 4, lesson=self.l3)
+
+        user = User.objects.create_user(
+            username='idle@example.com', email='idle@example.com', password='pass',
+            role='student', firebase_uid='idle-uid',
+        )
+        StudentProfile.objects.create(user=user, timezone='UTC')
+
+    @staticmethod
+    def _summary(results):
+        return [
+            (
+                r['enrollment'].pk,
+                r['class'].pk if r['class'] else None,
+                r['last_event'].pk if r['last_event'] else None,
+                r['next_event'].pk if r['next_event'] else None,
+                r['decision'],
+                r['reason'],
+            )
+            for r in results
+        ]
+
+    def test_batch_decisions_match_run_for_student(self):
+        self._build_students()
+        single = SchedulingChecker(now_utc=self.NOW)
+        students = list(single.get_students_in_timezones({'UTC'}))
+        expected = {p.pk: self._summary(single.run_for_student(p)) for p in students}
+
+        batch = BatchSchedulingChecker(now_utc=self.NOW)
+        actual = {p.pk: self._summary(results) for p, results in batch.run_for_students(students, chunk_size=4)}
+
+        self.assertEqual(actual, expected)
+        reasons = sorted(row[5] for rows in actual.values() for row in rows)
+        self.assertEqual(
+            reasons,
+            sorted([
+                'no_class', 'first_lesson', 'remind_lesson', 'next_not_within_24h',
+                'module_test', 'remind_lesson_before_test',
+            ]),
+        )
+
+    def _batch_query_count(self):
+        students = list(SchedulingChecker(now_utc=self.NOW).get_students_in_timezones({'UTC'}))
+        with CaptureQueriesContext(connection) as ctx:
+            list(BatchSchedulingChecker(now_utc=self.NOW).run_for_students(students))
+        return len(ctx.captured_queries)
+
+    def test_batch_query_count_is_flat(self):
+        self._build_students()
+        small = self._batch_query_count()
+        for i in range(5):
+            self._module_test_student(f'module-test-{i}')
+        self.assertEqual(self._batch_query_count(), small)
+        self.assertLessEqual(small, 15)
+
+    def test_midnight_timezones_match_full_scan(self):
+        for now in (
+            self.NOW,
+            datetime(2026, 3, 8, 5, 15, tzinfo=timezone.utc),   # New York midnight, DST day
+            datetime(2026, 10, 25, 23, 45, tzinfo=timezone.utc),
+        ):
+            with self.subTest(now=now):
+                self.assertEqual(
+                    midnight_timezones(now),
+                    SchedulingChecker(now_utc=now).get_timezones_at_midnight(),
+                )
@@ -17,6 +17,25 @@ from .services.storage import (
     file_path_from_tutorx_image_url,
     collect_image_urls_from_blocknote_string,
     collect_image_urls_from_event_payload,
+    inject_uploaded_urls_into_blocks,
+)
+from .services.media_uploads import (
+    content_addressed_path,
+    is_content_addressed_path,
+    remember_object,
+    reuse_or_upload_path,
+    schedule_media_deletes,
+    storage_url,
+    upload_files_concurrently,
+)
+from .services.document import (
+    DocumentPatchError,
+    DocumentVersionConflict,
+    apply_document_patch,
+    check_base_version,
+    current_version,
+    get_tutorx_content,
+    replace_document,
 )
 from courses.permissions import (
     user_is_course_member,
@@ -66,10 +85,12 @@ logger = logging.getLogger(__name__)
 PENDING_IMAGE_PREFIX = "__pending__"
 
 
-def upload_tutorx_image_file_to_gcs(uploaded_file) -> str:
+def upload_tutorx_image_file_to_gcs(uploaded_file, content_hash: str | None = None) -> str:
     """
     Process and upload a TutorX image file to GCS (tutorx-images/).
     Reused by TutorXImageUploadView and by the multipart blocks PUT.
+    With content_hash (SHA-256 of the original bytes) the image is stored at
+    tutorx-images/ca/<hash>.jpg and the upload is skipped if it already exists.
     Returns the public URL of the saved image.
     """
     original_filename = uploaded_file.name
@@ -82,6 +103,11 @@ def upload_tutorx_image_file_to_gcs(uploaded_file) -> str:
         raise ValueError(f'Image size exceeds 10MB (got {round(uploaded_file.size / (1024 * 1024), 2)}MB)')
     if not hasattr(settings, 'GS_BUCKET_NAME') or not settings.GS_BUCKET_NAME:
         raise RuntimeError('Google Cloud Storage is not configured.')
+    if content_hash:
+        storage_path = content_addressed_path('tutorx-images', content_hash, 'jpg')
+        existing_url = reuse_or_upload_path(storage_path)
+        if existing_url:
+            return existing_url
     img = PILImage.open(uploaded_file)
     if img.mode in ('RGBA', 'LA', 'P'):
         background = PILImage.new('RGB', img.size, (255, 255, 255))
@@ -99,23 +125,26 @@ def upload_tutorx_image_file_to_gcs(uploaded_file) -> str:
     output = BytesIO()
     img.save(output, format='JPEG', quality=85, optimize=True, progressive=True)
     output.seek(0)
-    unique_id = uuid.uuid4()
-    base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else 'image'
-    base_name = ''.join(c for c in base_name if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
-    filename = f"{unique_id}-{base_name}.jpg"
-    storage_path = f"tutorx-images/{filename}"
+    if not content_hash:
+        unique_id = uuid.uuid4()
+        base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else 'image'
+        base_name = ''.join(c for c in base_name if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
+        filename = f"{unique_id}-{base_name}.jpg"
+        storage_path = f"tutorx-images/{filename}"
     file_content = ContentFile(output.getvalue())
     saved_path = default_storage.save(storage_path, file_content)
-    file_url = default_storage.url(saved_path)
-    if not file_url.startswith('http'):
-        file_url = f"https://storage.googleapis.com/{settings.GS_BUCKET_NAME}/{saved_path}"
+    file_url = storage_url(saved_path)
+    if content_hash and saved_path == storage_path:
+        remember_object(storage_path, file_url)
     return file_url
 
 
-def upload_tutorx_video_file_to_gcs(uploaded_file) -> str:
+def upload_tutorx_video_file_to_gcs(uploaded_file, content_hash: str | None = None) -> str:
     """
     Upload a TutorX video file to GCS (tutorx-media/). No image processing.
     Used by the multipart content PUT when the file extension is video.
+    With content_hash the file is stored at tutorx-media/ca/<hash>.<ext> and
+    the upload is skipped if it already exists.
     Returns the public URL of the saved file.
     """
     original_filename = uploaded_file.name
@@ -132,15 +161,21 @@ def upload_tutorx_video_file_to_gcs(uploaded_file) -> str:
         )
     if not hasattr(settings, 'GS_BUCKET_NAME') or not settings.GS_BUCKET_NAME:
         raise RuntimeError('Google Cloud Storage is not configured.')
-    unique_id = uuid.uuid4()
-    base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else 'video'
-    base_name = ''.join(c for c in base_name if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
-    filename = f"{unique_id}-{base_name}.{file_extension}"
-    storage_path = f"tutorx-media/{filename}"
+    if content_hash:
+        storage_path = content_addressed_path('tutorx-media', content_hash, file_extension)
+        existing_url = reuse_or_upload_path(storage_path)
+        if existing_url:
+            return existing_url
+    else:
+        unique_id = uuid.uuid4()
+        base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else 'video'
+        base_name = ''.join(c for c in base_name if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
+        filename = f"{unique_id}-{base_name}.{file_extension}"
+        storage_path = f"tutorx-media/{filename}"
     saved_path = default_storage.save(storage_path, uploaded_file)
-    file_url = default_storage.url(saved_path)
-    if not file_url.startswith('http'):
-        file_url = f"https://storage.googleapis.com/{settings.GS_BUCKET_NAME}/{saved_path}"
+    file_url = storage_url(saved_path)
+    if content_hash and saved_path == storage_path:
+        remember_object(storage_path, file_url)
     return file_url
 
 
@@ -646,13 +681,65 @@ class __REMOVED_TutorXBlockListView_START(APIView):
         return Response({'blocks': blocks_data}, status=status.HTTP_200_OK)
 
 
+def _upload_content_files(request):
+    """
+    Upload image_<blockId> / image_ev_<i>_<field>_<blockId> files from a content save
+    (concurrently, content-addressed; see tutorx.services.media_uploads).
+
+    Returns (uploaded_urls, event_uploaded_urls) where uploaded_urls maps
+    block id -> URL and event_uploaded_urls maps (event_index, field, block_id) -> URL.
+    Raises ValueError/RuntimeError from the upload helpers.
+    """
+    uploaded_urls = {}
+    event_uploaded_urls = {}  # (event_index, field, block_id) -> url
+    files = {key: request.FILES[key] for key in request.FILES.keys() if key.startswith('image_')}
+    for key, url in upload_files_concurrently(files, upload_tutorx_media_file).items():
+        suffix = key[6:]  # after "image_"
+        if suffix.startswith('ev_'):
+            parts = suffix[3:].split('_')  # after "ev_": e.g. "0_prompt_abc123" -> ["0","prompt","abc123"]
+            if len(parts) >= 3:
+                try:
+                    event_index = int(parts[0])
+                    block_id = parts[-1]
+                    field = '_'.join(parts[1:-1])
+                    event_uploaded_urls[(event_index, field, block_id)] = url
+                except (ValueError, IndexError):
+                    pass
+        else:
+            if suffix:
+                uploaded_urls[suffix] = url
+    return uploaded_urls, event_uploaded_urls
+
+
+def _version_conflict_response(conflict):
+    return Response(
+        {
+            'error': 'The lesson was changed elsewhere; reload it before saving again.',
+            'version': conflict.current_version,
+        },
+        status=status.HTTP_409_CONFLICT
+    )
+
+
+def upload_tutorx_media_file(uploaded_file, content_hash: str | None = None) -> str:
+    """Dispatch a content/event file to the video or image uploader by extension."""
+    ext = (uploaded_file.name or '').split('.')[-1].lower() if '.' in (uploaded_file.name or '') else ''
+    if ext in TUTORX_VIDEO_EXTENSIONS:
+        return upload_tutorx_video_file_to_gcs(uploaded_file, content_hash=content_hash)
+    return upload_tutorx_image_file_to_gcs(uploaded_file, content_hash=content_hash)
+
+
 class TutorXLessonContentView(APIView):
     """
-    GET: Return lesson.tutorx_content (BlockNote JSON string, same as book page content).
+    GET: Return lesson.tutorx_content (BlockNote JSON string, same as book page content)
+         and the document `version` to use as base_version for PATCH.
     PUT: Save BlockNote JSON to lesson.tutorx_content. Multipart: content (JSON string),
          deleted_image_urls (JSON array), image_<blockId> (files). Backend uploads images,
          injects URLs into JSON, deletes removed images, saves final JSON.
     Same flow as book/material: one field, one request with images.
+    PATCH: Block-level autosave. Body (JSON or multipart): base_version, operations
+         (insert/update/move/delete by block id, see tutorx.services.document),
+         optional deleted_image_urls and image_<blockId> files. 409 on a stale base_version.
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -677,8 +764,8 @@ class TutorXLessonContentView(APIView):
                 {'error': 'Only the course teacher or enrolled students can access this lesson'},
                 status=status.HTTP_403_FORBIDDEN
             )
-        content = getattr(lesson, 'tutorx_content', '') or ''
-        response_data = {'content': content}
+        content = get_tutorx_content(lesson)
+        response_data = {'content': content, 'version': current_version(lesson)}
 
         # Recover ready staged uploads that never linked onto InteractiveVideo.
         try:
@@ -733,58 +820,17 @@ class TutorXLessonContentView(APIView):
                 {'error': 'Invalid content JSON'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        uploaded_urls = {}
-        event_uploaded_urls = {}  # (event_index, field, block_id) -> url
-        for key in list(request.FILES.keys()):
-            if not key.startswith('image_'):
-                continue
-            suffix = key[6:]  # after "image_"
-            uploaded_file = request.FILES[key]
-            ext = (uploaded_file.name or '').split('.')[-1].lower() if '.' in (uploaded_file.name or '') else ''
-            try:
-                if ext in TUTORX_VIDEO_EXTENSIONS:
-                    url = upload_tutorx_video_file_to_gcs(uploaded_file)
-                else:
-                    url = upload_tutorx_image_file_to_gcs(uploaded_file)
-            except (ValueError, RuntimeError) as e:
-                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-            if suffix.startswith('ev_'):
-                parts = suffix[3:].split('_')  # after "ev_": e.g. "0_prompt_abc123" -> ["0","prompt","abc123"]
-                if len(parts) >= 3:
-                    try:
-                        event_index = int(parts[0])
-                        block_id = parts[-1]
-                        field = '_'.join(parts[1:-1])
-                        event_uploaded_urls[(event_index, field, block_id)] = url
-                    except (ValueError, IndexError):
-                        pass
-            else:
-                if suffix:
-                    uploaded_urls[suffix] = url
-        for image_url in deleted_image_urls:
-            file_path = file_path_from_tutorx_image_url(image_url)
-            if file_path:
-                try:
-                    delete_image_and_thumbnail(file_path)
-                except Exception as e:
-                    logger.warning("Failed to delete image from GCS %s: %s", image_url[:80], e)
+        try:
+            uploaded_urls, event_uploaded_urls = _upload_content_files(request)
+        except (ValueError, RuntimeError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        schedule_media_deletes(deleted_image_urls)
         placeholder_prefix = PENDING_IMAGE_PREFIX
 
-        def inject_urls_into_blocks(block_list):
-            for b in block_list:
-                block_type = b.get('type')
-                if block_type in ('image', 'video', 'audio') and isinstance(b.get('props'), dict):
-                    url_val = b['props'].get('url') or ''
-                    if isinstance(url_val, str) and url_val.startswith(placeholder_prefix):
-                        block_id = b.get('id')
-                        if block_id and str(block_id) in uploaded_urls:
-                            b['props']['url'] = uploaded_urls[str(block_id)]
-                if isinstance(b.get('children'), list):
-                    inject_urls_into_blocks(b['children'])
-
-        inject_urls_into_blocks(blocks)
+        inject_uploaded_urls_into_blocks(blocks, uploaded_urls)
         lesson.tutorx_content = json.dumps(blocks)
         lesson.save(update_fields=['tutorx_content'])
+        document_version = replace_document(lesson, blocks)
 
         # --- Interactive video handling (optional, backwards compatible) ---
         interactive_video_raw = request.data.get('interactive_video')
@@ -928,17 +974,7 @@ class TutorXLessonContentView(APIView):
             new_urls = set()
             for ev in events_payload or []:
                 new_urls.update(collect_image_urls_from_event_payload(ev))
-            for image_url in old_urls - new_urls:
-                file_path = file_path_from_tutorx_image_url(image_url)
-                if file_path:
-                    try:
-                        delete_image_and_thumbnail(file_path)
-                    except Exception as e:
-                        logger.warning(
-                            "Failed to delete event image from GCS %s: %s",
-                            image_url[:80] if image_url else "",
-                            e,
-                        )
+            schedule_media_deletes(old_urls - new_urls)
 
             InteractiveEvent.objects.filter(
                 interactive_video=interactive_video_obj
@@ -997,7 +1033,7 @@ class TutorXLessonContentView(APIView):
 
         from .serializers import InteractiveVideoSerializer
 
-        response_data = {'content': lesson.tutorx_content}
+        response_data = {'content': lesson.tutorx_content, 'version': document_version}
         if hasattr(lesson, 'interactive_video'):
             response_data['interactive_video'] = InteractiveVideoSerializer(
                 lesson.interactive_video
@@ -1005,6 +1041,66 @@ class TutorXLessonContentView(APIView):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
+    def patch(self, request, lesson_id):
+        lesson = get_object_or_404(Lesson, id=lesson_id)
+        if not user_is_course_member(request.user, lesson.course):
+            return Response(
+                {'error': 'Only the course teacher can update content'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        if lesson.type != 'tutorx':
+            return Response(
+                {'error': 'This lesson is not a TutorX lesson'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        operations_raw = request.data.get('operations')
+        try:
+            operations = json.loads(operations_raw) if isinstance(operations_raw, str) else operations_raw
+            base_version = int(request.data.get('base_version'))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return Response(
+                {'error': 'base_version (integer) and operations (JSON array) are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        deleted_raw = request.data.get('deleted_image_urls') or '[]'
+        try:
+            deleted_image_urls = json.loads(deleted_raw) if isinstance(deleted_raw, str) else list(deleted_raw) or []
+        except (json.JSONDecodeError, TypeError):
+            deleted_image_urls = []
+
+        # Refuse a stale save before uploading its media.
+        try:
+            check_base_version(lesson, base_version)
+        except DocumentVersionConflict as conflict:
+            return _version_conflict_response(conflict)
+
+        try:
+            uploaded_urls, _event_urls = _upload_content_files(request)
+        except (ValueError, RuntimeError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            version = apply_document_patch(
+                lesson, base_version, operations, uploaded_urls=uploaded_urls
+            )
+        except (DocumentVersionConflict, DocumentPatchError) as e:
+            # Nothing references this save's uploads; drop them unless another block does.
+            schedule_media_deletes(list(uploaded_urls.values()))
+            if isinstance(e, DocumentVersionConflict):
+                return _version_conflict_response(e)
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Deleted after commit, and only once no other block still references it.
+        schedule_media_deletes(deleted_image_urls)
+
+        from .services.lesson_chat import invalidate_lesson_chat_cache
+
+        invalidate_lesson_chat_cache(lesson_id)
+        return Response(
+            {'version': version, 'uploaded_urls': uploaded_urls},
+            status=status.HTTP_200_OK
+        )
+
 
 class TutorXLessonVideoView(APIView):
     """
@@ -1240,19 +1336,15 @@ class TutorXLessonEventsView(APIView):
             )
 
         # Multipart: upload image_ev_<blockId> files and build block_id -> url
-        block_id_to_url = {}
-        for key in list(request.FILES.keys()):
-            if not key.startswith('image_ev_'):
-                continue
-            block_id = key[9:]  # after "image_ev_"
-            if not block_id:
-                continue
-            uploaded_file = request.FILES[key]
-            try:
-                url = upload_tutorx_image_file_to_gcs(uploaded_file)
-                block_id_to_url[block_id] = url
-            except (ValueError, RuntimeError) as e:
-                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        event_files = {
+            key[9:]: request.FILES[key]  # after "image_ev_"
+            for key in request.FILES.keys()
+            if key.startswith('image_ev_') and key[9:]
+        }
+        try:
+            block_id_to_url = upload_files_concurrently(event_files, upload_tutorx_image_file_to_gcs)
+        except (ValueError, RuntimeError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         def inject_urls_into_blocknote_string(field_json, id_to_url):
             if not field_json or not isinstance(field_json, str):
@@ -1299,20 +1391,9 @@ class TutorXLessonEventsView(APIView):
                 deleted_raw = json.loads(request.POST.get('deleted_image_urls'))
             except (json.JSONDecodeError, TypeError):
                 deleted_raw = []
+        removed_urls = set()
         if isinstance(deleted_raw, list):
-            for image_url in deleted_raw:
-                if not isinstance(image_url, str):
-                    continue
-                file_path = file_path_from_tutorx_image_url(image_url)
-                if file_path:
-                    try:
-                        delete_image_and_thumbnail(file_path)
-                    except Exception as e:
-                        logger.warning(
-                            'Failed to delete event image from GCS %s: %s',
-                            image_url[:80] if image_url else '',
-                            e,
-                        )
+            removed_urls.update(url for url in deleted_raw if isinstance(url, str))
 
         interactive_video_obj, _ = InteractiveVideo.objects.get_or_create(
             lesson=lesson
@@ -1336,17 +1417,8 @@ class TutorXLessonEventsView(APIView):
         new_urls = set()
         for ev in events_payload:
             new_urls.update(collect_image_urls_from_event_payload(ev))
-        for image_url in old_urls - new_urls:
-            file_path = file_path_from_tutorx_image_url(image_url)
-            if file_path:
-                try:
-                    delete_image_and_thumbnail(file_path)
-                except Exception as e:
-                    logger.warning(
-                        'Failed to delete event image from GCS %s: %s',
-                        (image_url[:80] if image_url else ''),
-                        e,
-                    )
+        removed_urls.update(old_urls - new_urls)
+        schedule_media_deletes(removed_urls)
 
         InteractiveEvent.objects.filter(
             interactive_video=interactive_video_obj
@@ -2001,6 +2073,13 @@ class TutorXImageDeleteView(APIView):
                     {'error': 'Invalid or unsupported image_url'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            if is_content_addressed_path(file_path):
+                # Content-addressed images are shared; the background GC keeps them while anything uses them.
+                schedule_media_deletes([image_url])
+                return Response(
+                    {'message': 'Image deletion scheduled; it is kept while other content uses it'},
+                    status=status.HTTP_200_OK
+                )
             logger.info("Deleting TutorX image and thumbnail from GCS: %s (from URL: %s)", file_path, image_url[:80])
             main_deleted, thumb_deleted = delete_image_and_thumbnail(file_path)
             if main_deleted or thumb_deleted:
@@ -1,5 +1,4 @@
 from calendar import monthrange
-from collections import Counter
 from datetime import datetime, time, timedelta
 from decimal import Decimal
 from urllib.parse import urlencode
@@ -14,6 +13,11 @@ from billings.models import Payment, Subscribers
 from communication.models import SmsRoutingLog
 from communication.services.staff_sms_ui import admin_queue_inbound_queryset
 from courses.models import ClassEvent, ClassSession
+from courses.services.class_calendar import (
+    SCHEDULABLE_EVENT_TYPES,
+    build_day_schedules,
+    cached_calendar,
+)
 from settings.models import get_calendar_timezone_fallback_detail
 from student.models import EnrolledCourse, Message
 from users.admin_calendar_tz import resolve_admin_calendar_timezone_detail
@@ -25,15 +29,6 @@ _PAYMENT_CARD_LIST_LIMIT = 200
 _MESSAGE_CARD_PREVIEW_LIMIT = 3
 _MESSAGE_PREVIEW_CHARS = 120
 
-_SCHEDULABLE_EVENT_TYPES = frozenset(
-    {
-        "lesson",
-        "meeting",
-        "break",
-        "test",
-        "exam",
-    },
-)
 
 
 def _teacher_admin_change_url(teacher):
@@ -181,12 +176,6 @@ def _new_student_rows(enrollments_qs):
     return rows
 
 
-def _session_time_key(t):
-    if not t:
-        return None
-    return (t.hour, t.minute, t.second)
-
-
 def _combine_today_slot(today, t, cal_tz, end_crosses_midnight=False):
     naive = datetime.combine(today, t)
     if end_crosses_midnight:
@@ -194,19 +183,12 @@ def _combine_today_slot(today, t, cal_tz, end_crosses_midnight=False):
     return naive.replace(tzinfo=cal_tz)
 
 
-def _calendar_day_bounds(today, cal_tz):
-    """[range_start, range_end) in aware UTC-compatible datetimes for DB filters."""
-    start = datetime.combine(today, time.min).replace(tzinfo=cal_tz)
-    end = datetime.combine(today + timedelta(days=1), time.min).replace(tzinfo=cal_tz)
-    return start, end
-
-
 def _window_from_session_and_event(today, session, event, cal_tz):
     if (
         event
         and event.start_time
         and event.end_time
-        and event.event_type in _SCHEDULABLE_EVENT_TYPES
+        and event.event_type in SCHEDULABLE_EVENT_TYPES
     ):
         start = event.start_time.astimezone(cal_tz)
         end = event.end_time.astimezone(cal_tz)
@@ -245,74 +227,14 @@ def _format_time_range(start, end):
     )
 
 
-def _build_timetable_sections(cal_now, today, weekday, cal_tz):
-    sessions_today = (
-        ClassSession.objects.filter(
-            is_active=True,
-            day_of_week=weekday,
-            class_instance__is_active=True,
-            # Only show live/monitorable classes: exclude archived + self-paced courses.
-            class_instance__course__status__in=["draft", "published"],
-            class_instance__course__delivery_type__in=["live", "hybrid"],
-        )
-        .select_related(
-            "class_instance",
-            "class_instance__course",
-            "class_instance__teacher",
-        )
-        .order_by(
-            "class_instance__course__title",
-            "class_instance__name",
-            "session_number",
-            "start_time",
-        )
-    )
-
-    class_ids = list(
-        sessions_today.values_list("class_instance_id", flat=True).distinct()
-    )
-
-    range_start, range_end = _calendar_day_bounds(today, cal_tz)
-    events_for_match = []
-    if class_ids:
-        events_for_match = list(
-            ClassEvent.objects.filter(
-                class_instance_id__in=class_ids,
-                event_type__in=_SCHEDULABLE_EVENT_TYPES,
-                start_time__gte=range_start,
-                start_time__lt=range_end,
-                start_time__isnull=False,
-                class_instance__is_active=True,
-                class_instance__course__status__in=["draft", "published"],
-                class_instance__course__delivery_type__in=["live", "hybrid"],
-            ).select_related("class_instance", "class_instance__course", "lesson")
-        )
-
-    event_by_class_start = {}
-    for ev in events_for_match:
-        lt = ev.start_time.astimezone(cal_tz)
-        if lt.date() != today:
-            continue
-        t = lt.time().replace(microsecond=0)
-        key = (ev.class_instance_id, _session_time_key(t))
-        if key not in event_by_class_start:
-            event_by_class_start[key] = ev
-
-    matched_event_ids = set()
+def _timetable_day_rows(today, cal_tz):
+    """Unbucketed timetable rows for one calendar day (cached by the calendar engine)."""
+    schedule = build_day_schedules(today, today, cal_tz, match_seconds=True)[0]
     rows = []
 
-    for session in sessions_today:
+    for session, event in schedule.slots:
         cls = session.class_instance
-        st = session.start_time.replace(microsecond=0)
-        key = (cls.id, _session_time_key(st))
-        event = event_by_class_start.get(key)
-        if event:
-            matched_event_ids.add(event.id)
-        scheduled = event is not None
-
         start_dt, end_dt = _window_from_session_and_event(today, session, event, cal_tz)
-        bucket = _classify_row(start_dt, end_dt, cal_now)
-
         teacher = cls.teacher
         teacher_label = (
             teacher.get_full_name() or teacher.email or str(teacher.pk)
@@ -323,25 +245,25 @@ def _build_timetable_sections(cal_now, today, weekday, cal_tz):
                 "class_instance_id": cls.id,
                 "time_range": start_dt and _format_time_range(start_dt, end_dt),
                 "start_sort": start_dt,
+                "end_sort": end_dt,
                 "class_name": cls.name,
                 "course_title": cls.course.title,
                 "teacher_label": teacher_label,
                 "teacher_admin_url": _teacher_admin_change_url(teacher),
                 "session_number": session.session_number,
                 "from_timetable": True,
-                "scheduled": scheduled,
+                "scheduled": event is not None,
                 "event_title": event.title if event else "",
-                "bucket": bucket,
             }
         )
 
-    orphan_events = [ev for ev in events_for_match if ev.id not in matched_event_ids]
+    orphan_events = schedule.orphan_events
     # Weekly timetable vs one-off ClassEvent often disagree on wall-clock time (or TZ
     # conversion), so matching fails and the same class appears twice. When there is
     # only one session row for that class on this weekday, prefer the ClassEvent row
     # and drop the timetable-only row.
     if orphan_events:
-        session_counts = Counter(s.class_instance_id for s in sessions_today)
+        session_counts = schedule.session_counts
         orphan_cids = {ev.class_instance_id for ev in orphan_events}
         rows = [
             r
@@ -354,12 +276,8 @@ def _build_timetable_sections(cal_now, today, weekday, cal_tz):
             )
         ]
     for event in orphan_events:
-        lt = event.start_time.astimezone(cal_tz)
-        if lt.date() != today:
-            continue
         cls = event.class_instance
         start_dt, end_dt = _window_from_orphan_event(event, cal_tz)
-        bucket = _classify_row(start_dt, end_dt, cal_now)
         teacher = cls.teacher
         teacher_label = (
             teacher.get_full_name() or teacher.email or str(teacher.pk)
@@ -369,6 +287,7 @@ def _build_timetable_sections(cal_now, today, weekday, cal_tz):
                 "class_instance_id": cls.id,
                 "time_range": _format_time_range(start_dt, end_dt),
                 "start_sort": start_dt,
+                "end_sort": end_dt,
                 "class_name": cls.name,
                 "course_title": cls.course.title,
                 "teacher_label": teacher_label,
@@ -377,10 +296,27 @@ def _build_timetable_sections(cal_now, today, weekday, cal_tz):
                 "from_timetable": False,
                 "scheduled": True,
                 "event_title": event.title,
-                "bucket": bucket,
             }
         )
 
+    return rows
+
+
+def _build_timetable_sections(cal_now, today, weekday, cal_tz):
+    cached_rows = cached_calendar(
+        "admin-timetable",
+        today,
+        today,
+        str(cal_tz),
+        lambda: _timetable_day_rows(today, cal_tz),
+        class_key="class_instance_id",
+    )
+    rows = []
+    for cached in cached_rows:
+        r = dict(cached)
+        r["bucket"] = _classify_row(r["start_sort"], r.pop("end_sort"), cal_now)
+        rows.append(r)
+
     scheduled_count = sum(1 for r in rows if r["scheduled"])
 
     ongoing = [r for r in rows if r["bucket"] == "ongoing"]